@@ -4,18 +4,30 @@
 from __future__ import annotations
 
 import os
+import urllib.parse
 import urllib.request
 
 
-def github_request(url: str, user_agent: str) -> bytes:
+def github_open(url: str, user_agent: str, accept: str | None = None):
+    """Open a GitHub URL for streaming; the caller closes the response."""
     headers = {"User-Agent": user_agent}
+    if accept:
+        headers["Accept"] = accept
     token = os.environ.get("GITHUB_TOKEN") or os.environ.get("GH_TOKEN")
     if token:
         headers["Authorization"] = f"token {token}"
     req = urllib.request.Request(url, headers=headers)
-    with urllib.request.urlopen(req) as resp:
+    return urllib.request.urlopen(req)
+
+
+def github_request(url: str, user_agent: str, accept: str | None = None) -> bytes:
+    with github_open(url, user_agent, accept) as resp:
         return resp.read()
 
 
 def github_api_contents_url(repo: str, path: str, ref: str) -> str:
     return f"https://api.github.com/repos/{repo}/contents/{path}?ref={ref}"
+
+
+def github_api_commit_url(repo: str, ref: str) -> str:
+    return f"https://api.github.com/repos/{repo}/commits/{urllib.parse.quote(ref)}"
@@ -6,16 +6,23 @@ from __future__ import annotations
 import argparse
 from dataclasses import dataclass
 import os
+import posixpath
+import re
 import shutil
 import subprocess
 import sys
 import tempfile
+import time
 import urllib.error
 import urllib.parse
 import zipfile
 
-from github_utils import github_request
+from github_utils import github_api_commit_url, github_open, github_request
 DEFAULT_REF = "main"
+CODELOAD_URL = "https://codeload.github.com"
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+PROGRESS_INTERVAL_SEC = 0.5
+COMMIT_SHA_RE = re.compile(r"[0-9a-f]{40}")
 
 
 @dataclass
@@ -27,6 +34,7 @@ class Args:
     dest: str | None = None
     name: str | None = None
     method: str = "auto"
+    cache: bool = True
 
 
 @dataclass
@@ -52,8 +60,12 @@ def _tmp_root() -> str:
     return base
 
 
-def _request(url: str) -> bytes:
-    return github_request(url, "codex-skill-install")
+def _archive_cache_root() -> str:
+    return os.path.join(_codex_home(), "cache", "skill-archives")
+
+
+def _request(url: str, accept: str | None = None) -> bytes:
+    return github_request(url, "codex-skill-install", accept)
 
 
 def _parse_github_url(url: str, default_ref: str) -> tuple[str, str, str, str | None]:
@@ -77,23 +89,98 @@ def _parse_github_url(url: str, default_ref: str) -> tuple[str, str, str, str |
     return owner, repo, ref, subpath or None
 
 
-def _download_repo_zip(owner: str, repo: str, ref: str, dest_dir: str) -> str:
-    zip_url = f"https://codeload.github.com/{owner}/{repo}/zip/{ref}"
-    zip_path = os.path.join(dest_dir, "repo.zip")
+def _resolve_commit(owner: str, repo: str, ref: str) -> str | None:
+    if COMMIT_SHA_RE.fullmatch(ref):
+        return ref
+    try:
+        payload = _request(github_api_commit_url(f"{owner}/{repo}", ref), accept="application/vnd.github.sha")
+    except (urllib.error.URLError, OSError):
+        return None
+    commit = payload.decode("utf-8", "replace").strip()
+    return commit if COMMIT_SHA_RE.fullmatch(commit) else None
+
+
+def _format_size(num_bytes: int) -> str:
+    return f"{num_bytes / (1024 * 1024):.1f} MB"
+
+
+def _report_progress(label: str, done: int, total: int, final: bool = False) -> None:
+    if total:
+        status = f"{_format_size(done)} / {_format_size(total)} ({done * 100 // total}%)"
+    else:
+        status = _format_size(done)
+    if sys.stderr.isatty():
+        print(f"\rDownloading {label}: {status}", end="\n" if final else "", file=sys.stderr, flush=True)
+    elif final:
+        print(f"Downloaded {label}: {status}", file=sys.stderr)
+
+
+def _stream_download(url: str, dest_path: str, label: str) -> None:
+    # Chunks go to a private .part file that is renamed into place once
+    # complete, so a failed or concurrent download never leaves a truncated
+    # archive at dest_path.
+    part_path = f"{dest_path}.{os.getpid()}.part"
     try:
-        payload = _request(zip_url)
+        with github_open(url, "codex-skill-install") as resp, open(part_path, "wb") as file_handle:
+            total = int(resp.headers.get("Content-Length") or 0)
+            done = 0
+            last_report = time.monotonic()
+            while True:
+                chunk = resp.read(DOWNLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                file_handle.write(chunk)
+                done += len(chunk)
+                now = time.monotonic()
+                if now - last_report >= PROGRESS_INTERVAL_SEC:
+                    _report_progress(label, done, total)
+                    last_report = now
+        _report_progress(label, done, total, final=True)
+        os.replace(part_path, dest_path)
     except urllib.error.HTTPError as exc:
         raise InstallError(f"Download failed: HTTP {exc.code}") from exc
-    with open(zip_path, "wb") as file_handle:
-        file_handle.write(payload)
-    with zipfile.ZipFile(zip_path, "r") as zip_file:
-        _safe_extract_zip(zip_file, dest_dir)
-        top_levels = {name.split("/")[0] for name in zip_file.namelist() if name}
-    if not top_levels:
-        raise InstallError("Downloaded archive was empty.")
-    if len(top_levels) != 1:
-        raise InstallError("Unexpected archive layout.")
-    return os.path.join(dest_dir, next(iter(top_levels)))
+    finally:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+
+
+def _select_members(zip_file: zipfile.ZipFile, top_level: str, paths: list[str]) -> list[zipfile.ZipInfo]:
+    prefixes = []
+    for path in paths:
+        rel = posixpath.normpath(path.replace(os.sep, "/")).strip("/")
+        prefixes.append(f"{top_level}/" if rel == "." else f"{top_level}/{rel}/")
+    return [info for info in zip_file.infolist() if info.filename.startswith(tuple(prefixes))]
+
+
+def _download_repo_zip(
+    owner: str, repo: str, ref: str, dest_dir: str, paths: list[str], use_cache: bool = True
+) -> str:
+    # Archives are cached per resolved commit, so installing more skills from
+    # the same repo and ref reuses the download. Refs that can't be resolved
+    # (no API access) are downloaded into dest_dir and discarded.
+    commit = _resolve_commit(owner, repo, ref) if use_cache else None
+    if commit:
+        zip_path = os.path.join(_archive_cache_root(), owner, repo, f"{commit}.zip")
+    else:
+        zip_path = os.path.join(dest_dir, "repo.zip")
+    if not os.path.isfile(zip_path):
+        os.makedirs(os.path.dirname(zip_path), exist_ok=True)
+        zip_url = f"{CODELOAD_URL}/{owner}/{repo}/zip/{commit or ref}"
+        _stream_download(zip_url, zip_path, f"{owner}/{repo}@{ref}")
+    try:
+        with zipfile.ZipFile(zip_path, "r") as zip_file:
+            top_levels = {name.split("/")[0] for name in zip_file.namelist() if name}
+            if not top_levels:
+                raise InstallError("Downloaded archive was empty.")
+            if len(top_levels) != 1:
+                raise InstallError("Unexpected archive layout.")
+            top_level = next(iter(top_levels))
+            _safe_extract_zip(zip_file, dest_dir, _select_members(zip_file, top_level, paths))
+    except zipfile.BadZipFile as exc:
+        if commit:
+            os.remove(zip_path)
+        raise InstallError("Downloaded archive is corrupt.") from exc
+    return os.path.join(dest_dir, top_level)
 
 
 def _run_git(args: list[str]) -> None:
@@ -102,14 +189,18 @@ def _run_git(args: list[str]) -> None:
         raise InstallError(result.stderr.strip() or "Git command failed.")
 
 
-def _safe_extract_zip(zip_file: zipfile.ZipFile, dest_dir: str) -> None:
+def _safe_extract_zip(
+    zip_file: zipfile.ZipFile, dest_dir: str, members: list[zipfile.ZipInfo] | None = None
+) -> None:
     dest_root = os.path.realpath(dest_dir)
-    for info in zip_file.infolist():
+    if members is None:
+        members = zip_file.infolist()
+    for info in members:
         extracted_path = os.path.realpath(os.path.join(dest_dir, info.filename))
         if extracted_path == dest_root or extracted_path.startswith(dest_root + os.sep):
             continue
         raise InstallError("Archive contains files outside the destination.")
-    zip_file.extractall(dest_dir)
+    zip_file.extractall(dest_dir, members=members)
 
 
 def _validate_relative_path(path: str) -> None:
@@ -184,10 +275,12 @@ def _build_repo_ssh(owner: str, repo: str) -> str:
     return f"git@github.com:{owner}/{repo}.git"
 
 
-def _prepare_repo(source: Source, method: str, tmp_dir: str) -> str:
+def _prepare_repo(source: Source, method: str, tmp_dir: str, use_cache: bool = True) -> str:
     if method in ("download", "auto"):
         try:
-            return _download_repo_zip(source.owner, source.repo, source.ref, tmp_dir)
+            return _download_repo_zip(
+                source.owner, source.repo, source.ref, tmp_dir, source.paths, use_cache
+            )
         except InstallError as exc:
             if method == "download":
                 raise
@@ -263,6 +356,12 @@ def _parse_args(argv: list[str]) -> Args:
         choices=["auto", "download", "git"],
         default="auto",
     )
+    parser.add_argument(
+        "--no-cache",
+        dest="cache",
+        action="store_false",
+        help="Do not reuse or keep downloaded repo archives",
+    )
     return parser.parse_args(argv, namespace=Args())
 
 
@@ -278,7 +377,7 @@ def main(argv: list[str]) -> int:
         dest_root = args.dest or _default_dest()
         tmp_dir = tempfile.mkdtemp(prefix="skill-install-", dir=_tmp_root())
         try:
-            repo_root = _prepare_repo(source, args.method, tmp_dir)
+            repo_root = _prepare_repo(source, args.method, tmp_dir, args.cache)
             installed = []
             for path in source.paths:
                 skill_name = args.name if len(source.paths) == 1 else None
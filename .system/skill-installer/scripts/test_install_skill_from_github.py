@@ -0,0 +1,160 @@
+"""Tests for install-skill-from-github.py against a local stand-in for GitHub."""
+
+from __future__ import annotations
+
+import importlib.util
+import io
+import os
+import sys
+import threading
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+SCRIPT = Path(__file__).resolve().parent / "install-skill-from-github.py"
+COMMIT = "0123456789abcdef0123456789abcdef01234567"
+
+
+def load_installer():
+    spec = importlib.util.spec_from_file_location("install_skill_from_github", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    # dataclasses looks the module up by name while building Args/Source
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+installer = load_installer()
+
+
+def make_repo_zip() -> bytes:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as zf:
+        zf.writestr("repo-main/README.md", "# repo\n")
+        zf.writestr("repo-main/skills/alpha/SKILL.md", "---\nname: alpha\n---\n")
+        zf.writestr("repo-main/skills/alpha/scripts/run.py", "print('alpha')\n")
+        zf.writestr("repo-main/skills/alpha-extra/SKILL.md", "---\nname: alpha-extra\n---\n")
+        zf.writestr("repo-main/skills/beta/SKILL.md", "---\nname: beta\n---\n")
+        zf.writestr("repo-main/other/big.bin", b"\0" * 4096)
+    return buf.getvalue()
+
+
+class FakeGitHub:
+    """Serves the commits API and codeload archives; records request paths."""
+
+    def __init__(self, archive: bytes, commit: str | None = COMMIT):
+        self.archive = archive
+        self.commit = commit
+        self.requests: list[str] = []
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                fake.requests.append(self.path)
+                if self.path.startswith("/api/") and fake.commit:
+                    body = fake.commit.encode()
+                elif self.path.startswith("/codeload/"):
+                    body = fake.archive
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def downloads(self) -> list[str]:
+        return [path for path in self.requests if path.startswith("/codeload/")]
+
+
+@pytest.fixture
+def github(monkeypatch, tmp_path):
+    fake = FakeGitHub(make_repo_zip())
+    fake.thread.start()
+    monkeypatch.setenv("CODEX_HOME", str(tmp_path / "codex-home"))
+    monkeypatch.delenv("GITHUB_TOKEN", raising=False)
+    monkeypatch.delenv("GH_TOKEN", raising=False)
+    monkeypatch.setattr(installer, "CODELOAD_URL", f"{fake.base}/codeload")
+    monkeypatch.setattr(
+        installer, "github_api_commit_url", lambda repo, ref: f"{fake.base}/api/repos/{repo}/commits/{ref}"
+    )
+    yield fake
+    fake.server.shutdown()
+    fake.server.server_close()
+
+
+def cached_archive(tmp_path: Path) -> Path:
+    return tmp_path / "codex-home" / "cache" / "skill-archives" / "owner" / "repo" / f"{COMMIT}.zip"
+
+
+def extracted_files(root: Path) -> list[str]:
+    return sorted(p.relative_to(root).as_posix() for p in root.rglob("*") if p.is_file())
+
+
+def install(tmp_path: Path, *args: str) -> int:
+    return installer.main(
+        ["--repo", "owner/repo", "--dest", str(tmp_path / "skills"), "--method", "download", *args]
+    )
+
+
+def test_only_requested_paths_are_extracted(github, tmp_path):
+    dest = tmp_path / "extract"
+    dest.mkdir()
+    repo_root = installer._download_repo_zip("owner", "repo", "main", str(dest), ["skills/alpha"])
+    assert repo_root == str(dest / "repo-main")
+    # skills/alpha-extra shares the prefix but is not inside skills/alpha
+    assert extracted_files(dest) == [
+        "repo-main/skills/alpha/SKILL.md",
+        "repo-main/skills/alpha/scripts/run.py",
+    ]
+
+
+def test_archive_is_cached_per_commit(github, tmp_path):
+    assert install(tmp_path, "--path", "skills/alpha") == 0
+    assert install(tmp_path, "--path", "skills/beta") == 0
+    assert extracted_files(tmp_path / "skills") == [
+        "alpha/SKILL.md",
+        "alpha/scripts/run.py",
+        "beta/SKILL.md",
+    ]
+    # The ref is resolved for each install, the archive downloaded once
+    assert github.downloads() == [f"/codeload/owner/repo/zip/{COMMIT}"]
+    assert len(github.requests) == 3
+    assert cached_archive(tmp_path).read_bytes() == github.archive
+
+
+def test_no_cache_downloads_every_time(github, tmp_path):
+    assert install(tmp_path, "--path", "skills/alpha", "--no-cache") == 0
+    assert install(tmp_path, "--path", "skills/beta", "--no-cache") == 0
+    assert github.downloads() == ["/codeload/owner/repo/zip/main"] * 2
+    assert not (tmp_path / "codex-home" / "cache").exists()
+
+
+def test_unresolved_ref_is_not_cached(github, tmp_path):
+    github.commit = None
+    assert install(tmp_path, "--path", "skills/alpha") == 0
+    assert github.downloads() == ["/codeload/owner/repo/zip/main"]
+    assert not (tmp_path / "codex-home" / "cache").exists()
+
+
+def test_corrupt_cached_archive_is_discarded(github, tmp_path, capsys):
+    archive = cached_archive(tmp_path)
+    archive.parent.mkdir(parents=True)
+    archive.write_bytes(b"not a zip")
+    assert install(tmp_path, "--path", "skills/alpha") == 1
+    assert "corrupt" in capsys.readouterr().err
+    assert not archive.exists()
+
+    # The next install downloads a fresh copy
+    assert install(tmp_path, "--path", "skills/alpha") == 0
+    assert github.downloads() == [f"/codeload/owner/repo/zip/{COMMIT}"]
+    assert os.path.isfile(tmp_path / "skills" / "alpha" / "SKILL.md")
@@ -16,6 +16,8 @@ from pathlib import Path
 from typing import Dict, List, Optional
 from dataclasses import dataclass, field
 
+from parsers.markdown_sections import MarkdownDocument
+
 
 @dataclass
 class ArchitectureInfo:
@@ -75,286 +77,210 @@ def parse_markdown(file_path: str) -> ArchitectureInfo:
         raw_content=content
     )
 
-    # 解析各个部分
-    _extract_project_info(content, info)
-    _extract_users_and_roles(content, info)
-    _extract_features(content, info)
-    _extract_technical_info(content, info)
-    _extract_business_info(content, info)
+    # 一次切分章节，各部分按标题查找
+    document = MarkdownDocument(content)
+    _extract_project_info(document, info)
+    _extract_users_and_roles(document, info)
+    _extract_features(document, info)
+    _extract_technical_info(document, info)
+    _extract_business_info(document, info)
 
     return info
 
 
-def _extract_project_info(content: str, info: ArchitectureInfo):
+# 各字段对应的章节标题（完整匹配标题文字），按优先级排列，先匹配者优先
+SECTION_TITLE_PATTERNS = {
+    name: tuple(re.compile(pattern, re.IGNORECASE) for pattern in patterns)
+    for name, patterns in {
+        "project_goal": (r'(?:项目)?目标[：:]', r'(?:项目)?目标', r'(?:Project\s+)?Goal[s]?'),
+        "background": (r'(?:项目)?背景[：:]', r'背景介绍', r'Background'),
+        "value_proposition": (r'(?:核心)?价值(?:主张)?[：:]?', r'Value\s+Proposition'),  # 冒号可选
+        "target_users": (r'(?:目标)?用户', r'用户(?:群体|角色)', r'(?:Target\s+)?Users?'),
+        "user_roles": (r'(?:用户)?角色[：:]', r'Roles?'),
+        "core_features": (r'(?:核心)?功能', r'功能(?:需求|列表|清单)', r'(?:Core\s+)?Features?'),
+        "functional_requirements": (r'功能性?需求', r'Functional\s+Requirements?'),
+        "mvp_scope": (r'MVP\s*(?:范围)?', r'MVP\s+Scope'),
+        "technical_stack": (r'技术栈[：:]', r'Technology\s+Stack'),
+        "architecture_style": (r'(?:架构|Architecture)(?:风格|Style)?[：:]', r'System\s+Architecture'),
+        "technical_challenges": (r'技术挑战[：:]?', r'(?:Technical\s+)?Challenges?'),  # 冒号可选
+        "constraints": (r'约束(?:条件)?[：:]', r'Constraints?'),
+        "performance_requirements": (r'性能(?:需求)?[：:]', r'Performance\s+Requirements?'),
+        "security_requirements": (r'安全(?:需求)?[：:]', r'Security\s+Requirements?'),
+        "scalability_requirements": (r'可扩展性(?:需求)?[：:]', r'Scalability\s+Requirements?'),
+        "business_goals": (r'业务目标[：:]', r'Business\s+Goals?'),
+        "success_metrics": (r'(?:成功)?(?:指标|KPI)[：:]', r'(?:Success\s+)?Metrics?'),
+    }.items()
+}
+
+
+def _section_text(document: MarkdownDocument, name: str) -> Optional[str]:
+    """
+    按SECTION_TITLE_PATTERNS查找字段对应的章节
+
+    Args:
+        document: 章节树
+        name: 字段名
+
+    Returns:
+        章节正文（到下一个标题为止），未找到返回None
+    """
+    for pattern in SECTION_TITLE_PATTERNS[name]:
+        section = document.find_title(pattern)
+        if section:
+            return section.body.strip()
+    return None
+
+
+def _extract_project_info(document: MarkdownDocument, info: ArchitectureInfo):
     """提取项目基本信息"""
 
     # 提取项目目标
-    goal_patterns = [
-        r'#+\s*(?:项目)?目标[：:]\s*\n(.*?)(?=\n#+|\Z)',
-        r'#+\s*(?:项目)?目标\s*\n+(.*?)(?=\n#+|\Z)',
-        r'##\s*(?:Project\s+)?Goal[s]?\s*\n+(.*?)(?=\n##|\Z)'
-    ]
-    for pattern in goal_patterns:
-        match = re.search(pattern, content, re.DOTALL | re.IGNORECASE)
-        if match:
-            info.project_goal = match.group(1).strip()
-            break
+    goal_text = _section_text(document, "project_goal")
+    if goal_text is not None:
+        info.project_goal = goal_text
 
     # 提取背景信息
-    bg_patterns = [
-        r'#+\s*(?:项目)?背景[：:]\s*\n(.*?)(?=\n#+|\Z)',
-        r'#+\s*背景介绍\s*\n+(.*?)(?=\n#+|\Z)',
-        r'##\s*Background\s*\n+(.*?)(?=\n##|\Z)'
-    ]
-    for pattern in bg_patterns:
-        match = re.search(pattern, content, re.DOTALL | re.IGNORECASE)
-        if match:
-            info.background = match.group(1).strip()
-            break
+    bg_text = _section_text(document, "background")
+    if bg_text is not None:
+        info.background = bg_text
 
     # 提取价值主张
-    value_patterns = [
-        r'#+\s*(?:核心)?价值(?:主张)?[：:]?\s*\n+(.*?)(?=\n#+|\Z)',  # 冒号可选
-        r'#+\s*Value\s+Proposition\s*\n+(.*?)(?=\n##|\Z)'
-    ]
-    for pattern in value_patterns:
-        match = re.search(pattern, content, re.DOTALL | re.IGNORECASE)
-        if match:
-            info.value_proposition = match.group(1).strip()
-            break
-
-
-def _extract_users_and_roles(content: str, info: ArchitectureInfo):
+    value_text = _section_text(document, "value_proposition")
+    if value_text is not None:
+        info.value_proposition = value_text
+
+
+def _extract_users_and_roles(document: MarkdownDocument, info: ArchitectureInfo):
     """提取用户和角色信息"""
 
     # 提取目标用户
-    user_patterns = [
-        r'#+\s*(?:目标)?用户\s*\n+(.*?)(?=\n#+|\Z)',
-        r'#+\s*用户(?:群体|角色)\s*\n+(.*?)(?=\n#+|\Z)',
-        r'##\s*(?:Target\s+)?Users?\s*\n+(.*?)(?=\n##|\Z)'
-    ]
-    for pattern in user_patterns:
-        match = re.search(pattern, content, re.DOTALL | re.IGNORECASE)
-        if match:
-            user_text = match.group(1).strip()
-            # 提取列表项（支持 "- **农场主**：描述" 格式）
-            users = re.findall(r'[-*]\s*\*?\*?([^：:*\n]+)\*?\*?[：:]', user_text)
+    user_text = _section_text(document, "target_users")
+    if user_text is not None:
+        # 提取列表项（支持 "- **农场主**：描述" 格式）
+        users = re.findall(r'[-*]\s*\*?\*?([^：:*\n]+)\*?\*?[：:]', user_text)
+        if users:
+            info.target_users = [u.strip() for u in users]
+        else:
+            # 尝试简单列表格式 "- 农场主"
+            users = re.findall(r'[-*]\s*([^\n]+)', user_text)
             if users:
-                info.target_users = [u.strip() for u in users]
-            else:
-                # 尝试简单列表格式 "- 农场主"
-                users = re.findall(r'[-*]\s*([^\n]+)', user_text)
-                if users:
-                    info.target_users = [u.strip().lstrip('*').rstrip('*').split('：')[0].split(':')[0].strip() for u in users]
-            break
+                info.target_users = [u.strip().lstrip('*').rstrip('*').split('：')[0].split(':')[0].strip() for u in users]
 
     # 提取角色定义
-    role_patterns = [
-        r'#+\s*(?:用户)?角色[：:]\s*\n(.*?)(?=\n#+|\Z)',
-        r'##\s*Roles?\s*\n+(.*?)(?=\n##|\Z)'
-    ]
-    for pattern in role_patterns:
-        match = re.search(pattern, content, re.DOTALL | re.IGNORECASE)
-        if match:
-            role_text = match.group(1).strip()
-            roles = re.findall(r'[-*]\s*(?:\*\*)?([^：:*\n]+)(?:\*\*)?[：:]', role_text)
-            if roles:
-                info.user_roles = [r.strip() for r in roles]
-            break
-
-
-def _extract_features(content: str, info: ArchitectureInfo):
+    role_text = _section_text(document, "user_roles")
+    if role_text is not None:
+        roles = re.findall(r'[-*]\s*(?:\*\*)?([^：:*\n]+)(?:\*\*)?[：:]', role_text)
+        if roles:
+            info.user_roles = [r.strip() for r in roles]
+
+
+def _extract_features(document: MarkdownDocument, info: ArchitectureInfo):
     """提取功能需求"""
 
     # 提取核心功能
-    feature_patterns = [
-        r'#+\s*(?:核心)?功能\s*\n+(.*?)(?=\n#+|\Z)',
-        r'#+\s*功能(?:需求|列表|清单)\s*\n+(.*?)(?=\n#+|\Z)',
-        r'##\s*(?:Core\s+)?Features?\s*\n+(.*?)(?=\n##|\Z)'
-    ]
-    for pattern in feature_patterns:
-        match = re.search(pattern, content, re.DOTALL | re.IGNORECASE)
-        if match:
-            feature_text = match.group(1).strip()
-            # 提取列表项（支持 -、*、数字列表）
-            features = re.findall(r'(?:[-*]|\d+\.)\s*([^\n（(]+)', feature_text)
-            if features:
-                info.core_features = [f.strip().lstrip('`*').rstrip('`*').strip() for f in features if len(f.strip()) > 2]
-            break
+    feature_text = _section_text(document, "core_features")
+    if feature_text is not None:
+        # 提取列表项（支持 -、*、数字列表）
+        features = re.findall(r'(?:[-*]|\d+\.)\s*([^\n（(]+)', feature_text)
+        if features:
+            info.core_features = [f.strip().lstrip('`*').rstrip('`*').strip() for f in features if len(f.strip()) > 2]
 
     # 提取功能需求
-    req_patterns = [
-        r'#+\s*功能性?需求\s*\n+(.*?)(?=\n#+|\Z)',
-        r'##\s*Functional\s+Requirements?\s*\n+(.*?)(?=\n##|\Z)'
-    ]
-    for pattern in req_patterns:
-        match = re.search(pattern, content, re.DOTALL | re.IGNORECASE)
-        if match:
-            req_text = match.group(1).strip()
-            reqs = re.findall(r'[-*]\s*([^\n]+)', req_text)
-            if reqs:
-                info.functional_requirements = [r.strip() for r in reqs]
-            break
+    req_text = _section_text(document, "functional_requirements")
+    if req_text is not None:
+        reqs = re.findall(r'[-*]\s*([^\n]+)', req_text)
+        if reqs:
+            info.functional_requirements = [r.strip() for r in reqs]
 
     # 提取MVP范围
-    mvp_patterns = [
-        r'#+\s*MVP\s*(?:范围)?\s*\n+(.*?)(?=\n#+|\Z)',
-        r'##\s*MVP\s+Scope\s*\n+(.*?)(?=\n##|\Z)'
-    ]
-    for pattern in mvp_patterns:
-        match = re.search(pattern, content, re.DOTALL | re.IGNORECASE)
-        if match:
-            mvp_text = match.group(1).strip()
-            # 支持 -、*、数字列表
-            mvp_items = re.findall(r'(?:[-*]|\d+\.)\s*([^\n（(]+)', mvp_text)
-            if mvp_items:
-                info.mvp_scope = [m.strip() for m in mvp_items if len(m.strip()) > 2]
-            break
-
-
-def _extract_technical_info(content: str, info: ArchitectureInfo):
+    mvp_text = _section_text(document, "mvp_scope")
+    if mvp_text is not None:
+        # 支持 -、*、数字列表
+        mvp_items = re.findall(r'(?:[-*]|\d+\.)\s*([^\n（(]+)', mvp_text)
+        if mvp_items:
+            info.mvp_scope = [m.strip() for m in mvp_items if len(m.strip()) > 2]
+
+
+def _extract_technical_info(document: MarkdownDocument, info: ArchitectureInfo):
     """提取技术信息"""
 
     # 提取技术栈
-    tech_patterns = [
-        r'#+\s*技术栈[：:]\s*\n(.*?)(?=\n#+|\Z)',
-        r'#+\s*Technology\s+Stack\s*\n+(.*?)(?=\n##|\Z)'
-    ]
-    for pattern in tech_patterns:
-        match = re.search(pattern, content, re.DOTALL | re.IGNORECASE)
-        if match:
-            tech_text = match.group(1).strip()
-            # 提取键值对 "前端: React"
-            tech_pairs = re.findall(r'[-*]\s*([^：:\n]+)[：:]\s*([^\n]+)', tech_text)
-            if tech_pairs:
-                info.technical_stack = {k.strip(): v.strip() for k, v in tech_pairs}
-            break
+    tech_text = _section_text(document, "technical_stack")
+    if tech_text is not None:
+        # 提取键值对 "前端: React"
+        tech_pairs = re.findall(r'[-*]\s*([^：:\n]+)[：:]\s*([^\n]+)', tech_text)
+        if tech_pairs:
+            info.technical_stack = {k.strip(): v.strip() for k, v in tech_pairs}
 
     # 提取架构风格
-    arch_patterns = [
-        r'#+\s*(?:架构|Architecture)(?:风格|Style)?[：:]\s*\n(.*?)(?=\n#+|\Z)',
-        r'#+\s*System\s+Architecture\s*\n+(.*?)(?=\n##|\Z)'
-    ]
-    for pattern in arch_patterns:
-        match = re.search(pattern, content, re.DOTALL | re.IGNORECASE)
-        if match:
-            arch_text = match.group(1).strip()
-            # 提取第一行或第一段
-            first_line = arch_text.split('\n')[0].strip()
-            if first_line and not first_line.startswith('#'):
-                info.architecture_style = first_line
-            break
+    arch_text = _section_text(document, "architecture_style")
+    if arch_text is not None:
+        # 提取第一行或第一段
+        first_line = arch_text.split('\n')[0].strip()
+        if first_line and not first_line.startswith('#'):
+            info.architecture_style = first_line
 
     # 提取技术挑战
-    challenge_patterns = [
-        r'#+\s*技术挑战[：:]?\s*\n+(.*?)(?=\n#+|\Z)',  # 冒号可选
-        r'#+\s*(?:Technical\s+)?Challenges?\s*\n+(.*?)(?=\n##|\Z)'
-    ]
-    for pattern in challenge_patterns:
-        match = re.search(pattern, content, re.DOTALL | re.IGNORECASE)
-        if match:
-            challenge_text = match.group(1).strip()
-            # 支持 -、*、数字列表
-            challenges = re.findall(r'(?:[-*]|\d+\.)\s*([^\n]+)', challenge_text)
-            if challenges:
-                info.technical_challenges = [c.strip() for c in challenges]
-            break
+    challenge_text = _section_text(document, "technical_challenges")
+    if challenge_text is not None:
+        # 支持 -、*、数字列表
+        challenges = re.findall(r'(?:[-*]|\d+\.)\s*([^\n]+)', challenge_text)
+        if challenges:
+            info.technical_challenges = [c.strip() for c in challenges]
 
     # 提取约束条件
-    constraint_patterns = [
-        r'#+\s*约束(?:条件)?[：:]\s*\n(.*?)(?=\n#+|\Z)',
-        r'##\s*Constraints?\s*\n+(.*?)(?=\n##|\Z)'
-    ]
-    for pattern in constraint_patterns:
-        match = re.search(pattern, content, re.DOTALL | re.IGNORECASE)
-        if match:
-            constraint_text = match.group(1).strip()
-            # 支持 -、*、数字列表
-            constraints = re.findall(r'(?:[-*]|\d+\.)\s*([^\n]+)', constraint_text)
-            if constraints:
-                info.constraints = [c.strip() for c in constraints]
-            break
+    constraint_text = _section_text(document, "constraints")
+    if constraint_text is not None:
+        # 支持 -、*、数字列表
+        constraints = re.findall(r'(?:[-*]|\d+\.)\s*([^\n]+)', constraint_text)
+        if constraints:
+            info.constraints = [c.strip() for c in constraints]
 
     # 提取非功能性需求
-    _extract_nonfunctional_requirements(content, info)
+    _extract_nonfunctional_requirements(document, info)
 
 
-def _extract_nonfunctional_requirements(content: str, info: ArchitectureInfo):
+def _extract_nonfunctional_requirements(document: MarkdownDocument, info: ArchitectureInfo):
     """提取非功能性需求"""
 
     # 性能需求
-    perf_patterns = [
-        r'#+\s*性能(?:需求)?[：:]\s*\n(.*?)(?=\n#+|\Z)',
-        r'##\s*Performance\s+Requirements?\s*\n+(.*?)(?=\n##|\Z)'
-    ]
-    for pattern in perf_patterns:
-        match = re.search(pattern, content, re.DOTALL | re.IGNORECASE)
-        if match:
-            perf_text = match.group(1).strip()
-            perfs = re.findall(r'[-*]\s*([^\n]+)', perf_text)
-            if perfs:
-                info.performance_requirements = [p.strip() for p in perfs]
-            break
+    perf_text = _section_text(document, "performance_requirements")
+    if perf_text is not None:
+        perfs = re.findall(r'[-*]\s*([^\n]+)', perf_text)
+        if perfs:
+            info.performance_requirements = [p.strip() for p in perfs]
 
     # 安全需求
-    sec_patterns = [
-        r'#+\s*安全(?:需求)?[：:]\s*\n(.*?)(?=\n#+|\Z)',
-        r'##\s*Security\s+Requirements?\s*\n+(.*?)(?=\n##|\Z)'
-    ]
-    for pattern in sec_patterns:
-        match = re.search(pattern, content, re.DOTALL | re.IGNORECASE)
-        if match:
-            sec_text = match.group(1).strip()
-            secs = re.findall(r'[-*]\s*([^\n]+)', sec_text)
-            if secs:
-                info.security_requirements = [s.strip() for s in secs]
-            break
+    sec_text = _section_text(document, "security_requirements")
+    if sec_text is not None:
+        secs = re.findall(r'[-*]\s*([^\n]+)', sec_text)
+        if secs:
+            info.security_requirements = [s.strip() for s in secs]
 
     # 可扩展性需求
-    scale_patterns = [
-        r'#+\s*可扩展性(?:需求)?[：:]\s*\n(.*?)(?=\n#+|\Z)',
-        r'##\s*Scalability\s+Requirements?\s*\n+(.*?)(?=\n##|\Z)'
-    ]
-    for pattern in scale_patterns:
-        match = re.search(pattern, content, re.DOTALL | re.IGNORECASE)
-        if match:
-            scale_text = match.group(1).strip()
-            scales = re.findall(r'[-*]\s*([^\n]+)', scale_text)
-            if scales:
-                info.scalability_requirements = [s.strip() for s in scales]
-            break
-
-
-def _extract_business_info(content: str, info: ArchitectureInfo):
+    scale_text = _section_text(document, "scalability_requirements")
+    if scale_text is not None:
+        scales = re.findall(r'[-*]\s*([^\n]+)', scale_text)
+        if scales:
+            info.scalability_requirements = [s.strip() for s in scales]
+
+
+def _extract_business_info(document: MarkdownDocument, info: ArchitectureInfo):
     """提取业务信息"""
 
     # 业务目标
-    biz_patterns = [
-        r'#+\s*业务目标[：:]\s*\n(.*?)(?=\n#+|\Z)',
-        r'##\s*Business\s+Goals?\s*\n+(.*?)(?=\n##|\Z)'
-    ]
-    for pattern in biz_patterns:
-        match = re.search(pattern, content, re.DOTALL | re.IGNORECASE)
-        if match:
-            biz_text = match.group(1).strip()
-            goals = re.findall(r'[-*]\s*([^\n]+)', biz_text)
-            if goals:
-                info.business_goals = [g.strip() for g in goals]
-            break
+    biz_text = _section_text(document, "business_goals")
+    if biz_text is not None:
+        goals = re.findall(r'[-*]\s*([^\n]+)', biz_text)
+        if goals:
+            info.business_goals = [g.strip() for g in goals]
 
     # 成功指标
-    metric_patterns = [
-        r'#+\s*(?:成功)?(?:指标|KPI)[：:]\s*\n(.*?)(?=\n#+|\Z)',
-        r'##\s*(?:Success\s+)?Metrics?\s*\n+(.*?)(?=\n##|\Z)'
-    ]
-    for pattern in metric_patterns:
-        match = re.search(pattern, content, re.DOTALL | re.IGNORECASE)
-        if match:
-            metric_text = match.group(1).strip()
-            metrics = re.findall(r'[-*]\s*([^\n]+)', metric_text)
-            if metrics:
-                info.success_metrics = [m.strip() for m in metrics]
-            break
+    metric_text = _section_text(document, "success_metrics")
+    if metric_text is not None:
+        metrics = re.findall(r'[-*]\s*([^\n]+)', metric_text)
+        if metrics:
+            info.success_metrics = [m.strip() for m in metrics]
 
 
 def summarize_info(info: ArchitectureInfo) -> Dict[str, any]:
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Markdown 章节树测试
+parsers/markdown_sections.py 在 01-spec-explorer-G 与 02-architecture-G 中
+保持一致，本测试文件也同样一致
+"""
+import unittest
+
+from parsers.markdown_sections import parse_sections, section_key
+
+
+DOMAIN_DOC = """# 设计草稿
+
+## Domain Modeling
+
+### 值对象
+- Money
+#hashtag note
+- Address
+
+### 聚合根
+- Order
+
+## 技术栈
+- Python
+"""
+
+
+class TestHeadingTokenizer(unittest.TestCase):
+    """测试标题行识别"""
+
+    def test_atx_headings(self):
+        doc = parse_sections("# A\n## B\n###### F\n#\n")
+        self.assertEqual([(s.level, s.title) for s in doc.sections],
+                         [(1, "A"), (2, "B"), (6, "F"), (1, "")])
+
+    def test_hash_without_space_is_body_text(self):
+        doc = parse_sections(DOMAIN_DOC)
+        self.assertNotIn("hashtag note", [s.title for s in doc.sections])
+        self.assertEqual(doc.find("值对象").body.strip(), "- Money\n#hashtag note\n- Address")
+
+    def test_hashtag_line_does_not_end_chapter(self):
+        doc = parse_sections(DOMAIN_DOC)
+        chapter = doc.find("Domain Modeling")
+        self.assertTrue(chapter.contains(doc.find("聚合根")))
+        self.assertIs(chapter.find("聚合根"), doc.find("聚合根"))
+
+    def test_more_than_six_hashes_is_body_text(self):
+        doc = parse_sections("## A\n####### not a heading\n")
+        self.assertEqual(len(doc.sections), 1)
+        self.assertIn("####### not a heading", doc.find("A").body)
+
+    def test_headings_inside_code_fences_are_ignored(self):
+        doc = parse_sections("## A\n```\n# comment\n```\n~~~\n## B\n~~~\n## C\n")
+        self.assertEqual([s.title for s in doc.sections], ["A", "C"])
+
+    def test_trailing_whitespace_and_tabs(self):
+        doc = parse_sections("##\tTabbed  \n")
+        self.assertEqual(doc.sections[0].title, "Tabbed")
+
+
+class TestSectionLookup(unittest.TestCase):
+    """测试章节查找"""
+
+    def test_section_key(self):
+        self.assertEqual(section_key("核心实体（Entities）"), "核心实体")
+        self.assertEqual(section_key("Event  Storming: notes"), "event storming")
+
+    def test_find_by_key_and_prefix(self):
+        doc = parse_sections("## 核心实体（Entities）\nx\n## Event Storming Notes\ny\n")
+        self.assertEqual(doc.find("核心实体").body.strip(), "x")
+        self.assertEqual(doc.find("Event Storming").body.strip(), "y")
+        self.assertIsNone(doc.find("missing"))
+
+    def test_text_includes_subsections(self):
+        doc = parse_sections(DOMAIN_DOC)
+        text = doc.find("Domain Modeling").text
+        self.assertIn("- Order", text)
+        self.assertNotIn("- Python", text)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,381 @@
+"""
+02-architecture 批量架构评估
+对大量设计草稿执行规模评估、技术栈推荐和架构模式选择，输出列式汇总
+
+输入：草稿目录（*.md / *.json）、JSONL文件或单个草稿文件
+输出：汇总CSV（每个草稿一行），按需输出每个草稿的评估结果和架构文档
+
+特性：
+- 进程池并行：每个工作进程只创建一次分析器，草稿按小批分发
+- 流式处理：草稿按需读取，结果按输入顺序逐行写入CSV
+- 失败隔离：单个草稿解析/评估失败（含JSONL中的坏行）只记录在error列，不影响其他草稿
+- 输出目录名唯一：草稿ID映射到同一目录名时追加序号，output列记录实际目录
+- 默认不生成ADR和ARCHITECTURE.md，需要时用generate_docs开启
+"""
+import csv
+import json
+import os
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from core.models import ArchitectureDesign, DesignDraft
+from parsers.design_draft_parser import DesignDraftParser, parse_design_draft
+from parsers.json_loader import draft_from_dict, load_json
+from analyzers.scale_estimator import ScaleEstimator
+from analyzers.tech_recommender import TechStackRecommender
+from analyzers.pattern_selector import PatternSelector
+from generators.adr_generator import ADRGenerator
+from generators.architecture_doc import ArchitectureDocGenerator
+from generators.json_exporter import generate_json, merge_json_models
+
+
+# 汇总CSV的列（顺序即输出顺序）
+SUMMARY_COLUMNS = [
+    "draft_id", "source", "output", "project_name",
+    "scale", "scale_score", "complexity_level",
+    "estimated_users", "estimated_entities", "estimated_contexts",
+    "backend_language", "frontend", "database", "cache", "message_queue", "api_style",
+    "tech_score", "primary_pattern", "supporting_patterns",
+    "error", "seconds",
+]
+# 目录输入时识别为草稿的文件后缀
+DRAFT_SUFFIXES = (".md", ".json")
+# 每个任务包含的草稿数，摊薄进程间通信开销
+DRAFTS_PER_TASK = 8
+# 每个工作进程排队的任务数，草稿按需读取
+TASKS_IN_FLIGHT_PER_WORKER = 4
+
+
+@dataclass
+class DraftSource:
+    """待评估的草稿：文件路径、Markdown文本或spec_model JSON对象三选一"""
+    draft_id: str
+    path: Optional[str] = None
+    content: Optional[str] = None
+    data: Optional[Dict[str, Any]] = None
+    # 无法读取的输入（如JSONL坏行），评估时记入error列
+    error: Optional[str] = None
+    # 输出目录名，由assign_output_names分配
+    output: str = ""
+
+    @property
+    def description(self) -> str:
+        """汇总中source列的取值"""
+        if self.path:
+            return self.path
+        return "content" if self.content is not None else "json"
+
+
+def iter_draft_sources(source: str, pattern: Optional[str] = None) -> Iterator[DraftSource]:
+    """
+    枚举待评估的草稿
+
+    - 目录：递归查找后缀为.md/.json的文件（可用pattern缩小范围），按路径排序
+    - .jsonl文件：每行一个对象，含可选的"id"，以及"path"（相对路径以JSONL所在目录为基准）、
+      "content"（Markdown文本）之一；两者都没有时整个对象按spec_model JSON处理。
+      无法解析的行也产生一个草稿，评估时报错
+    - 其他文件：单个草稿
+
+    Args:
+        source: 目录、JSONL文件或草稿文件路径
+        pattern: 目录输入时的glob模式（默认全部）
+
+    Yields:
+        DraftSource对象
+    """
+    source_path = Path(source)
+    if source_path.is_dir():
+        for path in sorted(source_path.rglob(pattern or "*")):
+            if path.is_file() and path.suffix.lower() in DRAFT_SUFFIXES:
+                yield DraftSource(draft_id=path.relative_to(source_path).as_posix(), path=str(path))
+    elif source_path.suffix.lower() == ".jsonl":
+        with open(source_path, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                    if not isinstance(record, dict):
+                        raise ValueError(f"应为JSON对象，实际为{type(record).__name__}")
+                except ValueError as e:
+                    yield DraftSource(draft_id=f"line_{line_number}", error=f"第{line_number}行无效: {e}")
+                    continue
+                draft_id = str(record.get("id") or f"line_{line_number}")
+                if "path" in record:
+                    path = source_path.parent / record["path"]
+                    yield DraftSource(draft_id=draft_id, path=str(path))
+                elif "content" in record:
+                    yield DraftSource(draft_id=draft_id, content=record["content"])
+                else:
+                    yield DraftSource(draft_id=draft_id, data=record)
+    elif source_path.exists():
+        yield DraftSource(draft_id=source_path.name, path=str(source_path))
+    else:
+        raise FileNotFoundError(f"输入不存在: {source}")
+
+
+def assign_output_names(sources: Iterable[DraftSource]) -> Iterator[DraftSource]:
+    """
+    按输入顺序为草稿分配唯一的输出目录名
+
+    不同草稿ID可能映射到同一目录名（如"a/b.md"与"a_b.md"、JSONL中重复的id），
+    后出现的追加"-2"、"-3"等序号；比较时忽略大小写，兼容不区分大小写的文件系统
+
+    Args:
+        sources: 草稿来源
+
+    Yields:
+        设置了output的DraftSource
+    """
+    used = set()
+    for source in sources:
+        base = output_name(source.draft_id)
+        name, counter = base, 1
+        while name.lower() in used:
+            counter += 1
+            name = f"{base}-{counter}"
+        used.add(name.lower())
+        source.output = name
+        yield source
+
+
+def load_draft(source: DraftSource) -> DesignDraft:
+    """
+    加载草稿（自动识别Markdown/JSON）
+
+    Args:
+        source: 草稿来源
+
+    Returns:
+        DesignDraft对象
+    """
+    if source.error is not None:
+        raise ValueError(source.error)
+    if source.content is not None:
+        return DesignDraftParser().parse_content(source.content)
+    if source.data is not None:
+        return draft_from_dict(source.data)
+    if Path(source.path).suffix.lower() == ".json":
+        return load_json(source.path)
+    return parse_design_draft(source.path)
+
+
+class BatchEvaluator:
+    """
+    批量评估器 - 单进程内复用分析器实例
+
+    Attributes:
+        output_dir: 每个草稿的输出目录（None表示只输出汇总）
+        generate_docs: 是否生成ADR和ARCHITECTURE.md
+    """
+
+    def __init__(self, output_dir: Optional[str] = None, generate_docs: bool = False) -> None:
+        """
+        初始化批量评估器
+
+        Args:
+            output_dir: 每个草稿的输出目录
+            generate_docs: 是否生成ADR和架构文档（需要output_dir）
+        """
+        self.output_dir = output_dir
+        self.generate_docs = generate_docs
+        self.scale_estimator = ScaleEstimator()
+        self.tech_recommender = TechStackRecommender()
+        self.pattern_selector = PatternSelector()
+        if generate_docs:
+            self.adr_generator = ADRGenerator()
+            self.doc_generator = ArchitectureDocGenerator()
+
+    def evaluate(self, source: DraftSource) -> Dict[str, Any]:
+        """
+        评估单个草稿
+
+        Args:
+            source: 草稿来源
+
+        Returns:
+            汇总行（键为SUMMARY_COLUMNS），失败时error列为错误信息
+        """
+        start = time.perf_counter()
+        row: Dict[str, Any] = {column: "" for column in SUMMARY_COLUMNS}
+        row["draft_id"] = source.draft_id
+        row["source"] = source.description
+        if self.output_dir:
+            row["output"] = source.output or output_name(source.draft_id)
+        try:
+            draft = load_draft(source)
+            row["project_name"] = draft.project_name
+
+            scale_assessment = self.scale_estimator.estimate(draft)
+            tech_stack = self.tech_recommender.recommend(draft, scale_assessment)
+            pattern_selection = self.pattern_selector.select(draft, scale_assessment)
+
+            row.update({
+                "scale": scale_assessment.scale.value,
+                "scale_score": scale_assessment.score,
+                "complexity_level": scale_assessment.complexity_level,
+                "estimated_users": scale_assessment.estimated_users,
+                "estimated_entities": scale_assessment.estimated_entities,
+                "estimated_contexts": scale_assessment.estimated_contexts,
+                "backend_language": tech_stack.backend_language.recommendation,
+                "frontend": tech_stack.frontend.recommendation if tech_stack.frontend else "",
+                "database": tech_stack.database.recommendation,
+                "cache": tech_stack.cache.recommendation,
+                "message_queue": tech_stack.message_queue.recommendation,
+                "api_style": tech_stack.api_style.recommendation,
+                "tech_score": tech_stack.total_score,
+                "primary_pattern": pattern_selection.primary_pattern.value,
+                "supporting_patterns": ";".join(p.value for p in pattern_selection.supporting_patterns),
+            })
+
+            if self.output_dir:
+                architecture = ArchitectureDesign(
+                    project_name=draft.project_name,
+                    version="1.0.0",
+                    date=datetime.now().strftime("%Y-%m-%d"),
+                    scale_assessment=scale_assessment,
+                    tech_stack=tech_stack,
+                    pattern_selection=pattern_selection,
+                )
+                self._write_outputs(source, draft, architecture)
+        except Exception as e:
+            # 汇总中每个草稿占一行，错误信息合并为单行
+            row["error"] = f"{type(e).__name__}: {' '.join(str(e).split())}"
+        row["seconds"] = round(time.perf_counter() - start, 4)
+        return row
+
+    def _write_outputs(self, source: DraftSource, draft: DesignDraft, architecture: ArchitectureDesign) -> None:
+        """
+        写入单个草稿的输出：evaluation.json，开启generate_docs时另有ARCHITECTURE.md/.json
+
+        Args:
+            source: 草稿来源
+            draft: 设计草稿
+            architecture: 架构设计（不含ADR）
+        """
+        draft_dir = Path(self.output_dir) / (source.output or output_name(source.draft_id))
+        draft_dir.mkdir(parents=True, exist_ok=True)
+
+        evaluation = {
+            "draft_id": source.draft_id,
+            "source": source.description,
+            "project_name": draft.project_name,
+            "scale_assessment": architecture.scale_assessment.to_dict(),
+            "tech_stack": architecture.tech_stack.to_dict(),
+            "pattern_selection": architecture.pattern_selection.to_dict(),
+        }
+        with open(draft_dir / "evaluation.json", "w", encoding="utf-8") as f:
+            json.dump(evaluation, f, indent=2, ensure_ascii=False)
+
+        if self.generate_docs:
+            architecture.adrs = self.adr_generator.generate(
+                draft, architecture.scale_assessment, architecture.tech_stack, architecture.pattern_selection
+            )
+            markdown_content = self.doc_generator.generate(draft.project_name, draft, architecture)
+            with open(draft_dir / "ARCHITECTURE.md", "w", encoding="utf-8") as f:
+                f.write(markdown_content)
+            json_data = generate_json(draft, architecture)
+            if source.path and Path(source.path).suffix.lower() == ".json":
+                json_data = merge_json_models(source.path, json_data)
+            with open(draft_dir / "ARCHITECTURE.json", "w", encoding="utf-8") as f:
+                json.dump(json_data, f, indent=2, ensure_ascii=False)
+
+
+def output_name(draft_id: str) -> str:
+    """草稿ID转换为输出目录名（路径分隔符等替换为下划线）"""
+    return re.sub(r"[^\w.-]+", "_", draft_id).strip("._") or "draft"
+
+
+# 工作进程内的评估器，由_init_worker创建
+_worker_evaluator: Optional[BatchEvaluator] = None
+
+
+def _init_worker(output_dir: Optional[str], generate_docs: bool) -> None:
+    """工作进程初始化：创建一次评估器"""
+    global _worker_evaluator
+    _worker_evaluator = BatchEvaluator(output_dir, generate_docs)
+
+
+def _evaluate_chunk(sources: List[DraftSource]) -> List[Dict[str, Any]]:
+    """在工作进程中评估一批草稿"""
+    return [_worker_evaluator.evaluate(source) for source in sources]
+
+
+def run_batch(
+    source: str,
+    summary_path: str,
+    output_dir: Optional[str] = None,
+    generate_docs: bool = False,
+    jobs: Optional[int] = None,
+    pattern: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    批量评估草稿并写入汇总CSV
+
+    Args:
+        source: 目录、JSONL文件或草稿文件路径
+        summary_path: 汇总CSV输出路径
+        output_dir: 每个草稿的输出目录（可选）
+        generate_docs: 是否生成ADR和架构文档（需要output_dir）
+        jobs: 工作进程数（默认CPU核数，1表示在当前进程中执行）
+        pattern: 目录输入时的glob模式
+
+    Returns:
+        统计结果 {"evaluated": 成功数, "failed": 失败数, "seconds": 耗时}
+
+    Raises:
+        ValueError: 开启generate_docs但未指定output_dir
+    """
+    if generate_docs and not output_dir:
+        raise ValueError("生成架构文档需要指定输出目录")
+
+    workers = jobs or os.cpu_count() or 1
+    sources = assign_output_names(iter_draft_sources(source, pattern))
+    chunks = iter(lambda: list(islice(sources, DRAFTS_PER_TASK)), [])
+
+    summary = {"evaluated": 0, "failed": 0, "seconds": 0.0}
+    start = time.perf_counter()
+
+    Path(summary_path).parent.mkdir(parents=True, exist_ok=True)
+    with open(summary_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_COLUMNS)
+        writer.writeheader()
+
+        def write_rows(rows: List[Dict[str, Any]]) -> None:
+            for row in rows:
+                writer.writerow(row)
+                summary["failed" if row["error"] else "evaluated"] += 1
+
+        if workers == 1:
+            _init_worker(output_dir, generate_docs)
+            for chunk in chunks:
+                write_rows(_evaluate_chunk(chunk))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(output_dir, generate_docs)) as executor:
+                # 按提交顺序写出：已完成但排在前面的任务未完成时先缓存
+                pending = {}
+                finished_rows = {}
+                next_index = 0
+                for index, chunk in enumerate(chunks):
+                    pending[executor.submit(_evaluate_chunk, chunk)] = index
+                    if len(pending) >= workers * TASKS_IN_FLIGHT_PER_WORKER:
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            finished_rows[pending.pop(future)] = future.result()
+                        while next_index in finished_rows:
+                            write_rows(finished_rows.pop(next_index))
+                            next_index += 1
+                for future in wait(pending).done:
+                    finished_rows[pending[future]] = future.result()
+                for index in sorted(finished_rows):
+                    write_rows(finished_rows[index])
+
+    summary["seconds"] = time.perf_counter() - start
+    return summary
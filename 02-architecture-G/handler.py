@@ -374,6 +374,43 @@ class ArchitectureHandler:
 
         return [adr.to_dict() for adr in adrs]
 
+    def design_batch(
+        self,
+        source: str,
+        summary_file: str = 'architecture_summary.csv',
+        output_dir: Optional[str] = None,
+        generate_docs: bool = False,
+        jobs: Optional[int] = None,
+        pattern: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        批量架构评估(规模评估+技术栈推荐+模式选择)
+
+        Args:
+            source: 草稿目录、JSONL文件或单个草稿文件
+            summary_file: 汇总CSV输出路径
+            output_dir: 每个草稿的输出目录(可选)
+            generate_docs: 是否生成ADR和ARCHITECTURE.md(需要output_dir)
+            jobs: 工作进程数(默认CPU核数)
+            pattern: 目录输入时的glob模式
+
+        Returns:
+            统计结果
+        """
+        from batch_evaluator import run_batch
+
+        summary = run_batch(source, summary_file, output_dir, generate_docs, jobs, pattern)
+
+        total = summary['evaluated'] + summary['failed']
+        rate = total / summary['seconds'] if summary['seconds'] else 0.0
+        print(f"✓ 评估了 {total} 个草稿 (成功 {summary['evaluated']}, 失败 {summary['failed']})")
+        print(f"  耗时: {summary['seconds']:.1f}s ({rate:.1f} 个/秒)")
+        print(f"  汇总: {summary_file}")
+        if output_dir:
+            print(f"  输出目录: {output_dir}")
+
+        return summary
+
     def _print_design_summary(self, architecture: ArchitectureDesign) -> Any:
         """
         打印设计摘要
@@ -520,6 +557,10 @@ def main() -> Any:
   # 生成ADR
   python handler.py adr -i DESIGN_DRAFT.md -o ADR.md
 
+  # 批量评估(目录或JSONL)，输出汇总CSV
+  python handler.py batch -i drafts/ -o summary.csv
+  python handler.py batch -i drafts.jsonl -o summary.csv --output-dir results --docs
+
 输入格式:
   - Markdown: DESIGN_DRAFT.md (来自01-spec-explorer)
   - JSON: DESIGN_DRAFT.json (更可靠)
@@ -560,6 +601,15 @@ def main() -> Any:
     adr_parser.add_argument('-o', '--output', help='输出文件')
     adr_parser.add_argument('--json', action='store_true', help='JSON格式输出')
 
+    # batch子命令
+    batch_parser = subparsers.add_parser('batch', help='批量架构评估')
+    batch_parser.add_argument('-i', '--input', required=True, help='草稿目录、JSONL文件或单个草稿文件')
+    batch_parser.add_argument('-o', '--output', default='architecture_summary.csv', help='汇总CSV文件')
+    batch_parser.add_argument('--output-dir', help='每个草稿的输出目录(evaluation.json)')
+    batch_parser.add_argument('--docs', action='store_true', help='同时生成ADR和ARCHITECTURE.md(需要--output-dir)')
+    batch_parser.add_argument('-j', '--jobs', type=int, help='工作进程数(默认CPU核数)')
+    batch_parser.add_argument('--glob', help='目录输入时的文件匹配模式(默认全部.md/.json)')
+
     args = parser.parse_args()
 
     # 创建处理器
@@ -601,6 +651,18 @@ def main() -> Any:
                 output_format='json' if args.json else 'markdown'
             )
 
+        elif args.command == 'batch':
+            summary = handler.design_batch(
+                args.input,
+                summary_file=args.output,
+                output_dir=args.output_dir,
+                generate_docs=args.docs,
+                jobs=args.jobs,
+                pattern=args.glob
+            )
+            if summary['failed']:
+                sys.exit(1)
+
         else:
             parser.print_help()
             sys.exit(1)
@@ -1,4 +1,5 @@
 """Parsers模块"""
 from .design_draft_parser import DesignDraftParser, parse_design_draft
+from .markdown_sections import MarkdownDocument, Section, parse_sections
 
-__all__ = ['DesignDraftParser', 'parse_design_draft']
+__all__ = ['DesignDraftParser', 'parse_design_draft', 'MarkdownDocument', 'Section', 'parse_sections']
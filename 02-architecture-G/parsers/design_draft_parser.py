@@ -6,10 +6,24 @@ DESIGN_DRAFT.md 解析器
 - 容错机制：支持宽松匹配
 - 详细错误提示：指明具体哪一章解析失败
 - 防御性编程：处理格式变化
+- 单遍解析：先建立Markdown章节树，章节/字段查找均为字典访问
 """
 import re
 from typing import Dict, List, Optional, Tuple
 from core.models import DesignDraft
+from parsers.markdown_sections import MarkdownDocument, Section
+
+
+# 章节标题（宽松匹配，忽略大小写），只与标题文字比较
+CHAPTER_TITLE_PATTERNS = {
+    "需求概览": re.compile(r"第?1章[：:]\s*需求概览.*", re.IGNORECASE),
+    "Impact Mapping": re.compile(r"第?2章[：:]\s*Impact\s*Mapping.*", re.IGNORECASE),
+    "Flow Modeling": re.compile(r"第?3章[：:]\s*Flow\s*Modeling.*", re.IGNORECASE),
+    "Domain Modeling": re.compile(r"第?4章[：:]\s*Domain\s*Modeling.*", re.IGNORECASE),
+    "BDD/ATDD": re.compile(r"第?5章[：:]\s*BDD/ATDD.*", re.IGNORECASE),
+}
+PROJECT_TITLE_RE = re.compile(r"(.+?)\s+设计草稿")
+PROJECT_META_RE = re.compile(r"项目名称[：:]\s*(.+)")
 
 
 class DesignDraftParser:
@@ -18,7 +32,9 @@ class DesignDraftParser:
     def __init__(self):
         """初始化解析器"""
         self.content = ""
+        self.document: Optional[MarkdownDocument] = None
         self.chapters = {}
+        self.chapter_sections: Dict[str, Section] = {}
 
     def parse_file(self, file_path: str) -> DesignDraft:
         """
@@ -55,6 +71,9 @@ class DesignDraftParser:
             DesignDraft对象
         """
         self.content = content
+        self.document = MarkdownDocument(content)
+        self.chapters = {}
+        self.chapter_sections = {}
 
         # 第一步：分割章节（适配新格式）
         try:
@@ -105,19 +124,13 @@ class DesignDraftParser:
         分割章节（适配01-spec-explorer V2.0格式）
         使用宽松匹配，支持多种标题格式
         """
-        chapter_patterns = {
-            "需求概览": r"##\s*第?1章[：:]\s*需求概览.*?\n(.*?)(?=##\s*第?[2-9]章|$)",
-            "Impact Mapping": r"##\s*第?2章[：:]\s*Impact\s*Mapping.*?\n(.*?)(?=##\s*第?[3-9]章|$)",
-            "Flow Modeling": r"##\s*第?3章[：:]\s*Flow\s*Modeling.*?\n(.*?)(?=##\s*第?[4-9]章|$)",
-            "Domain Modeling": r"##\s*第?4章[：:]\s*Domain\s*Modeling.*?\n(.*?)(?=##\s*第?[5-9]章|##\s*附录|$)",
-            "BDD/ATDD": r"##\s*第?5章[：:]\s*BDD/ATDD.*?\n(.*?)(?=##\s*附录|$)"
-        }
-
-        for title, pattern in chapter_patterns.items():
-            match = re.search(pattern, self.content, re.DOTALL | re.IGNORECASE)
-
-            if match:
-                self.chapters[title] = match.group(1).strip()
+        for title, pattern in CHAPTER_TITLE_PATTERNS.items():
+            section = next((sec for sec in self.document.sections
+                            if sec.level >= 2 and pattern.fullmatch(sec.title)), None)
+
+            if section:
+                self.chapter_sections[title] = section
+                self.chapters[title] = section.text.strip()
             else:
                 # BDD/ATDD 章节是可选的
                 if title != "BDD/ATDD":
@@ -134,29 +147,31 @@ class DesignDraftParser:
             (project_name, core_value, target_users, user_scale)
         """
         content = self.chapters.get("需求概览", "")
+        chapter = self.chapter_sections.get("需求概览")
 
         # 提取项目名称（从文档标题或元信息中）
         # 尝试从标题提取
-        title_match = re.search(r"#\s*(.+?)\s+设计草稿", self.content, re.MULTILINE)
+        title_match = next(filter(None, (PROJECT_TITLE_RE.match(sec.title)
+                                         for sec in self.document.sections)), None)
         if title_match:
             project_name = title_match.group(1).strip()
         else:
             # 从元信息提取
-            meta_match = re.search(r"项目名称[：:]\s*(.+)", self.content, re.MULTILINE)
+            meta_match = PROJECT_META_RE.search(self.content)
             if meta_match:
                 project_name = meta_match.group(1).strip()
             else:
                 raise ValueError("未找到项目名称字段")
 
         # 提取核心价值（从核心问题或价值主张提取）
-        core_value = self._extract_field(content, r"###\s*核心问题.*?\n(.+)")
+        core_value = self._extract_field(chapter, "核心问题")
         if not core_value:
-            core_value = self._extract_field(content, r"###\s*价值主张.*?\n(.+)")
+            core_value = self._extract_field(chapter, "价值主张")
         if not core_value:
             core_value = project_name  # 默认使用项目名称
 
         # 提取目标用户
-        target_users = self._extract_field(content, r"###\s*目标用户.*?\n(.+)")
+        target_users = self._extract_field(chapter, "目标用户")
         if not target_users:
             target_users = "通用用户"
 
@@ -172,11 +187,11 @@ class DesignDraftParser:
         Returns:
             功能列表（从交付物映射中提取）
         """
-        content = self.chapters.get("Impact Mapping", "")
+        chapter = self.chapter_sections.get("Impact Mapping")
         features = []
 
         # 从交付物映射中提取功能
-        deliverable_section = self._extract_section(content, "交付物映射")
+        deliverable_section = self._extract_section(chapter, "交付物映射")
         if deliverable_section:
             # 匹配列表项
             items = re.findall(r"\d+\.\s*(.+)", deliverable_section)
@@ -196,11 +211,11 @@ class DesignDraftParser:
         Returns:
             (user_stories, workflows)
         """
-        content = self.chapters.get("Flow Modeling", "")
+        chapter = self.chapter_sections.get("Flow Modeling")
 
         # 解析用户故事（从User Story Mapping提取）
         user_stories = []
-        us_section = self._extract_section(content, "用户故事列表")
+        us_section = self._extract_section(chapter, "用户故事列表")
         if us_section:
             # 匹配表格行
             table_rows = re.findall(
@@ -218,7 +233,7 @@ class DesignDraftParser:
 
         # 解析工作流（从Event Storming提取）
         workflows = []
-        event_section = self._extract_section(content, "Event Storming")
+        event_section = self._extract_section(chapter, "Event Storming")
         if event_section:
             # 匹配领域事件
             events = re.findall(r"[-\*]\s*\*\*(.+?)\*\*[（\(]触发[：:](.+?)[）\)]", event_section)
@@ -238,27 +253,27 @@ class DesignDraftParser:
         Returns:
             (entities, value_objects, aggregates, contexts)
         """
-        content = self.chapters.get("Domain Modeling", "")
+        chapter = self.chapter_sections.get("Domain Modeling")
 
         # 解析核心实体
-        entities = self._parse_entities(content)
+        entities = self._parse_entities(chapter)
 
         # 解析值对象
-        value_objects = self._parse_value_objects(content)
+        value_objects = self._parse_value_objects(chapter)
 
         # 解析聚合根
-        aggregates = self._parse_aggregates(content)
+        aggregates = self._parse_aggregates(chapter)
 
         # 解析限界上下文
-        contexts = self._parse_contexts(content)
+        contexts = self._parse_contexts(chapter)
 
         return entities, value_objects, aggregates, contexts
 
-    def _parse_entities(self, content: str) -> List[Dict]:
+    def _parse_entities(self, chapter: Optional[Section]) -> List[Dict]:
         """解析核心实体"""
         entities = []
 
-        entity_section = self._extract_section(content, "核心实体")
+        entity_section = self._extract_section(chapter, "核心实体")
         if not entity_section:
             return entities
 
@@ -284,11 +299,11 @@ class DesignDraftParser:
 
         return entities
 
-    def _parse_value_objects(self, content: str) -> List[str]:
+    def _parse_value_objects(self, chapter: Optional[Section]) -> List[str]:
         """解析值对象"""
         value_objects = []
 
-        vo_section = self._extract_section(content, "值对象")
+        vo_section = self._extract_section(chapter, "值对象")
         if not vo_section:
             return value_objects
 
@@ -298,11 +313,11 @@ class DesignDraftParser:
 
         return value_objects
 
-    def _parse_aggregates(self, content: str) -> List[Dict]:
+    def _parse_aggregates(self, chapter: Optional[Section]) -> List[Dict]:
         """解析聚合根"""
         aggregates = []
 
-        agg_section = self._extract_section(content, "聚合根")
+        agg_section = self._extract_section(chapter, "聚合根")
         if not agg_section:
             return aggregates
 
@@ -328,11 +343,11 @@ class DesignDraftParser:
 
         return aggregates
 
-    def _parse_contexts(self, content: str) -> List[Dict]:
+    def _parse_contexts(self, chapter: Optional[Section]) -> List[Dict]:
         """解析限界上下文"""
         contexts = []
 
-        context_section = self._extract_section(content, "限界上下文")
+        context_section = self._extract_section(chapter, "限界上下文")
         if not context_section:
             return contexts
 
@@ -357,22 +372,21 @@ class DesignDraftParser:
 
     # ===================== 辅助方法 =====================
 
-    def _extract_field(self, content: str, pattern: str) -> str:
-        """提取单个字段"""
-        match = re.search(pattern, content, re.MULTILINE | re.IGNORECASE | re.DOTALL)
-        if match:
-            result = match.group(1).strip()
+    def _extract_field(self, chapter: Optional[Section], field_name: str) -> str:
+        """提取单个字段（字段标题下的第一行）"""
+        section = chapter.find(field_name) if chapter else None
+        if section:
+            result = section.body.strip()
             # 清理可能的markdown格式
             result = result.split('\n')[0]  # 只取第一行
             return result
         return ""
 
-    def _extract_section(self, content: str, section_name: str) -> str:
+    def _extract_section(self, chapter: Optional[Section], section_name: str) -> str:
         """提取章节内容"""
-        pattern = rf"###\s*{re.escape(section_name)}.*?\n(.*?)(?=###|$)"
-        match = re.search(pattern, content, re.DOTALL | re.IGNORECASE)
-        if match:
-            return match.group(1).strip()
+        section = chapter.find(section_name) if chapter else None
+        if section:
+            return section.body.strip()
         return ""
 
     def _infer_user_scale(self, content: str) -> str:
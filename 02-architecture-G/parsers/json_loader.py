@@ -28,6 +28,19 @@ def load_json(json_file: str) -> DesignDraft:
     with open(json_path, "r", encoding="utf-8") as f:
         data = json.load(f)
     
+    return draft_from_dict(data)
+
+
+def draft_from_dict(data: Dict[str, Any]) -> DesignDraft:
+    """
+    从已解析的spec_model JSON对象构建设计草稿
+    
+    Args:
+        data: spec_model.json的内容（含meta和spec_model）
+    
+    Returns:
+        DesignDraft对象
+    """
     spec_model = data.get("spec_model", {})
     
     # 提取元数据
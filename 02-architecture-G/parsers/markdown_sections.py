@@ -0,0 +1,190 @@
+"""
+Markdown 章节树
+一次扫描切分Markdown标题，建立带偏移量的章节树
+
+特性：
+- 单遍分词：一个编译好的正则只命中标题行和 ``` / ~~~ 代码块围栏行
+- 章节树：每个标题记录层级、标题文字和在原文中的起止偏移
+- 字典索引：按规范化标题（去掉括号/冒号后的部分，忽略大小写）查找章节
+
+本文件同时被 01-spec-explorer-G/parsers 与 02-architecture-G/parsers 使用，
+两处保持一致。
+"""
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Pattern, Union
+
+
+# 只命中标题行和代码块围栏行，其余行由正则引擎跳过。
+# 标题是1-6个`#`后跟空白或行尾（ATX标题），"#hashtag" 这类行属于正文
+LINE_RE = re.compile(
+    r"^(?: {0,3}(?P<fence>```|~~~).*|(?P<hashes>#{1,6})(?=[ \t]|$)[ \t]*(?P<title>.*?)\s*)$",
+    re.MULTILINE,
+)
+# 标题中括号、冒号之后的部分是说明文字，不参与索引键
+KEY_CUT_RE = re.compile(r"[（(：:]")
+
+
+def section_key(title: str) -> str:
+    """
+    规范化标题，作为章节索引键
+
+    例如 "核心实体（Entities）" -> "核心实体"，"Event Storming" -> "event storming"
+    """
+    key = KEY_CUT_RE.split(title, 1)[0]
+    return " ".join(key.split()).casefold()
+
+
+@dataclass
+class Section:
+    """章节：一个标题及其下的内容"""
+    level: int  # 标题层级（`#`个数），文档根为0
+    title: str
+    start: int  # 标题行起始偏移
+    body_start: int  # 标题行之后的偏移
+    body_end: int  # 下一个标题（任意层级）的偏移
+    end: int  # 下一个同级或更高级标题的偏移
+    children: List["Section"] = field(default_factory=list)
+    document: Optional["MarkdownDocument"] = field(default=None, repr=False, compare=False)
+
+    @property
+    def body(self) -> str:
+        """标题下直到下一个标题为止的正文（不含子章节）"""
+        return self.document.content[self.body_start:self.body_end]
+
+    @property
+    def text(self) -> str:
+        """标题下的全部内容（含子章节）"""
+        return self.document.content[self.body_start:self.end]
+
+    def find(self, name: str) -> Optional["Section"]:
+        """
+        在子孙章节中查找标题
+
+        先按规范化标题做字典查找；找不到时退回到标题前缀匹配（与原正则
+        `#+\\s*{name}.*` 的宽松匹配一致）
+
+        Args:
+            name: 章节名
+
+        Returns:
+            文档顺序中第一个匹配的章节，未找到返回None
+        """
+        return self.document.find(name, within=self)
+
+    def find_title(self, pattern: Union[str, Pattern]) -> Optional["Section"]:
+        """在子孙章节中查找标题完整匹配pattern的第一个章节"""
+        return self.document.find_title(pattern, within=self)
+
+    def contains(self, other: "Section") -> bool:
+        """other是否为本章节的子孙章节"""
+        return other is not self and self.start <= other.start < self.end
+
+
+class MarkdownDocument:
+    """Markdown文档的章节树"""
+
+    def __init__(self, content: str):
+        """
+        单遍扫描建立章节树
+
+        Args:
+            content: Markdown文本
+        """
+        self.content = content
+        self.root = Section(level=0, title="", start=0, body_start=0,
+                            body_end=len(content), end=len(content), document=self)
+        self.sections: List[Section] = []  # 文档顺序的全部标题
+        self._by_key: Dict[str, List[Section]] = {}
+
+        stack = [self.root]
+        previous = self.root
+        fence = None
+        for match in LINE_RE.finditer(content):
+            marker = match.group("fence")
+            if marker:
+                if fence is None:
+                    fence = marker
+                elif marker == fence:
+                    fence = None
+                continue
+            if fence is not None:
+                continue
+
+            line_start = match.start()
+            level = len(match.group("hashes"))
+            section = Section(level=level, title=match.group("title"), start=line_start,
+                              body_start=min(match.end() + 1, len(content)),
+                              body_end=len(content), end=len(content), document=self)
+            previous.body_end = line_start
+            while stack[-1].level >= level:
+                stack.pop().end = line_start
+            stack[-1].children.append(section)
+            stack.append(section)
+            previous = section
+
+            self.sections.append(section)
+            self._by_key.setdefault(section_key(section.title), []).append(section)
+
+    def find(self, name: str, within: Optional[Section] = None) -> Optional[Section]:
+        """
+        按章节名查找（字典访问，必要时退回前缀匹配）
+
+        Args:
+            name: 章节名
+            within: 只在该章节的子孙中查找
+
+        Returns:
+            第一个匹配的章节，未找到返回None
+        """
+        for section in self._by_key.get(section_key(name), ()):
+            if within is None or within.contains(section):
+                return section
+        prefix = name.casefold()
+        for section in self._candidates(within):
+            if section.title.casefold().startswith(prefix):
+                return section
+        return None
+
+    def find_title(self, pattern: Union[str, Pattern], within: Optional[Section] = None) -> Optional[Section]:
+        """
+        查找标题完整匹配正则的第一个章节（只比较标题，不扫描正文）
+
+        Args:
+            pattern: 标题正则（字符串按忽略大小写编译）
+            within: 只在该章节的子孙中查找
+
+        Returns:
+            第一个匹配的章节，未找到返回None
+        """
+        if isinstance(pattern, str):
+            pattern = re.compile(pattern, re.IGNORECASE)
+        for section in self._candidates(within):
+            if pattern.fullmatch(section.title):
+                return section
+        return None
+
+    def _candidates(self, within: Optional[Section]) -> List[Section]:
+        """文档顺序的候选章节：全部标题，或within的子孙"""
+        if within is None or within is self.root:
+            return self.sections
+        result = []
+        stack = list(reversed(within.children))
+        while stack:
+            child = stack.pop()
+            result.append(child)
+            stack.extend(reversed(child.children))
+        return result
+
+
+def parse_sections(content: str) -> MarkdownDocument:
+    """
+    便捷函数：建立Markdown章节树
+
+    Args:
+        content: Markdown文本
+
+    Returns:
+        MarkdownDocument对象
+    """
+    return MarkdownDocument(content)
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+批量架构评估测试
+并行（-j N）与串行（-j 1）的结果必须一致，输出目录不互相覆盖
+"""
+import csv
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from batch_evaluator import DraftSource, assign_output_names, iter_draft_sources, run_batch
+
+
+def make_draft(project_name, entity_count):
+    """生成spec_model JSON草稿，实体数不同则评估结果不同"""
+    return {
+        "meta": {"project_name": project_name},
+        "spec_model": {
+            "context": {"value_proposition": "在线服务", "target_users": ["个人用户", "企业用户"]},
+            "flow_modeling": {
+                "user_stories": [{"id": f"US{i}", "title": f"功能{i}", "i_want": f"使用功能{i}"} for i in range(3)]
+            },
+            "domain_modeling": {
+                "entities": [{"name": f"Entity{i}", "attributes": ["id"]} for i in range(entity_count)]
+            },
+        },
+    }
+
+
+def write_draft(path, project_name, entity_count):
+    path.write_text(json.dumps(make_draft(project_name, entity_count), ensure_ascii=False), encoding="utf-8")
+
+
+def read_summary(path):
+    """读取汇总CSV，去掉耗时列"""
+    with open(path, encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f))
+    for row in rows:
+        del row["seconds"]
+    return rows
+
+
+def read_outputs(output_dir):
+    """每个输出目录下evaluation.json的草稿ID和来源"""
+    outputs = {}
+    for evaluation in sorted(Path(output_dir).glob("*/evaluation.json")):
+        data = json.loads(evaluation.read_text(encoding="utf-8"))
+        outputs[evaluation.parent.name] = (data["draft_id"], data["source"])
+    return outputs
+
+
+class TestOutputNames(unittest.TestCase):
+    """测试输出目录名分配"""
+
+    def test_colliding_ids_get_unique_names(self):
+        sources = [DraftSource(draft_id=i) for i in ["a/b.md", "a_b.md", "dup", "dup", "A_B.md", "dup-2"]]
+        names = [s.output for s in assign_output_names(sources)]
+        self.assertEqual(names, ["a_b.md", "a_b.md-2", "dup", "dup-2", "A_B.md-3", "dup-2-2"])
+
+
+class TestRunBatch(unittest.TestCase):
+    """测试批量评估"""
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        drafts = self.tmp / "drafts"
+        (drafts / "a").mkdir(parents=True)
+        for i in range(12):
+            write_draft(drafts / f"draft_{i:02d}.json", f"项目{i}", 2 + 5 * i)
+        # 同名目录冲突：a/b.json 与 a_b.json
+        write_draft(drafts / "a" / "b.json", "项目B", 3)
+        write_draft(drafts / "a_b.json", "项目AB", 40)
+        self.drafts = drafts
+
+        self.jsonl = self.tmp / "drafts.jsonl"
+        self.jsonl.write_text("\n".join([
+            json.dumps({"id": "same", "path": "drafts/draft_00.json"}),
+            "{not json",
+            json.dumps({"id": "same", **make_draft("内联项目", 30)}, ensure_ascii=False),
+            json.dumps(["not", "an", "object"]),
+            json.dumps({"path": "drafts/missing.json"}),
+        ]) + "\n", encoding="utf-8")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def run_both(self, source):
+        results = {}
+        for jobs in (1, 3):
+            out = self.tmp / f"j{jobs}"
+            summary = run_batch(str(source), str(out / "summary.csv"), output_dir=str(out / "results"), jobs=jobs)
+            results[jobs] = (summary, read_summary(out / "summary.csv"), read_outputs(out / "results"))
+        return results
+
+    def test_parallel_matches_serial_for_directory(self):
+        results = self.run_both(self.drafts)
+        serial, parallel = results[1], results[3]
+        self.assertEqual(serial[1], parallel[1])
+        self.assertEqual(serial[2], parallel[2])
+        self.assertEqual(serial[0]["evaluated"], 14)
+        self.assertEqual(serial[0]["failed"], 0)
+
+        # 每个草稿各有一个输出目录，内容对应各自的草稿
+        rows = serial[1]
+        self.assertEqual(len({row["output"] for row in rows}), len(rows))
+        for row in rows:
+            self.assertEqual(serial[2][row["output"]], (row["draft_id"], row["source"]))
+
+    def test_jsonl_bad_lines_and_duplicate_ids(self):
+        results = self.run_both(self.jsonl)
+        serial, parallel = results[1], results[3]
+        self.assertEqual(serial[1], parallel[1])
+        self.assertEqual(serial[2], parallel[2])
+
+        rows = serial[1]
+        self.assertEqual([row["draft_id"] for row in rows], ["same", "line_2", "same", "line_4", "line_5"])
+        self.assertEqual([row["output"] for row in rows], ["same", "line_2", "same-2", "line_4", "line_5"])
+        self.assertEqual([bool(row["error"]) for row in rows], [False, True, False, True, True])
+        self.assertIn("第2行无效", rows[1]["error"])
+        self.assertEqual(set(serial[2]), {"same", "same-2"})
+        self.assertEqual(serial[0], {**serial[0], "evaluated": 2, "failed": 3})
+
+    def test_missing_input(self):
+        with self.assertRaises(FileNotFoundError):
+            list(iter_draft_sources(str(self.tmp / "missing")))
+
+
+if __name__ == '__main__':
+    unittest.main()
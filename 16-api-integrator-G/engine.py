@@ -1,12 +1,24 @@
 ﻿"""16-api-integrator 引擎（精简可用版）"""
 from __future__ import annotations
 
+from collections import deque
 from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
 from enum import Enum
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Iterator, AsyncIterator, Sequence, Tuple, Union
+import asyncio
 import json
+import random
+import threading
 import time
 import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
 
 
 class AuthType(str, Enum):
@@ -32,16 +44,29 @@ class RateLimitConfig:
 @dataclass
 class RetryConfig:
     max_retries: int = 2
-    backoff_seconds: float = 0.5
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+    exponential_base: float = 2.0
+    jitter: bool = False
+    retry_statuses: Tuple[int, ...] = (429, 500, 502, 503, 504)
+    # 连接错误/超时时请求可能已被服务端处理，默认只重试幂等方法；
+    # 需要重试 POST/PATCH 等方法（例如带幂等键）时显式开启
+    retry_non_idempotent: bool = False
+    idempotent_methods: Tuple[str, ...] = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE")
 
 
 @dataclass
 class PaginationConfig:
-    pagination_type: str = "page_number"
+    pagination_type: str = "page_number"  # page_number / offset / cursor
     page_param: str = "page"
     size_param: str = "per_page"
     total_key: str = "total"
     data_key: str = "items"
+    offset_param: str = "offset"
+    limit_param: str = "limit"
+    cursor_param: str = "cursor"
+    next_cursor_key: str = "next_cursor"
+    max_pages: Optional[int] = None
 
 
 @dataclass
@@ -68,6 +93,241 @@ class APIResponse:
     body: Any
     elapsed_time: float
     retries: int = 0
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class BatchItemResult:
+    index: int
+    request: APIRequest
+    response: Optional[APIResponse] = None
+    error: Optional[str] = None
+    latency: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.response is not None and self.response.status_code < 400
+
+
+@dataclass
+class BatchResult:
+    results: List[BatchItemResult]
+    elapsed_time: float
+
+    @property
+    def succeeded(self) -> int:
+        return sum(1 for r in self.results if r.ok)
+
+    @property
+    def failed(self) -> int:
+        return len(self.results) - self.succeeded
+
+    @property
+    def total_retries(self) -> int:
+        return sum(r.response.retries for r in self.results if r.response is not None)
+
+    @property
+    def throughput(self) -> float:
+        return len(self.results) / self.elapsed_time if self.elapsed_time > 0 else 0.0
+
+    def latency_percentile(self, percentile: float) -> float:
+        latencies = sorted(r.latency for r in self.results)
+        if not latencies:
+            return 0.0
+        rank = min(len(latencies) - 1, max(0, int(round(percentile / 100 * (len(latencies) - 1)))))
+        return latencies[rank]
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "total": len(self.results),
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "total_retries": self.total_retries,
+            "elapsed_time": round(self.elapsed_time, 3),
+            "requests_per_second": round(self.throughput, 2),
+            "latency_p50": round(self.latency_percentile(50), 4),
+            "latency_p95": round(self.latency_percentile(95), 4),
+            "latency_max": round(self.latency_percentile(100), 4),
+        }
+
+
+class TokenBucket:
+    """令牌桶限流器（线程安全）"""
+
+    def __init__(self, capacity: int, refill_rate: float) -> None:
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.tokens = float(capacity)
+        self.last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.refill_rate)
+        self.last_refill = now
+
+    def consume(self, tokens: int = 1) -> bool:
+        with self._lock:
+            self._refill()
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return True
+            return False
+
+    def wait_time(self, tokens: int = 1) -> float:
+        with self._lock:
+            self._refill()
+            if self.tokens >= tokens or self.refill_rate <= 0:
+                return 0.0
+            return (tokens - self.tokens) / self.refill_rate
+
+    def acquire(self) -> None:
+        """阻塞直到拿到一个令牌"""
+        while not self.consume():
+            time.sleep(max(self.wait_time(), 0.001))
+
+    async def acquire_async(self) -> None:
+        while not self.consume():
+            await asyncio.sleep(max(self.wait_time(), 0.001))
+
+
+class SlidingWindowRateLimiter:
+    """滑动窗口限流器（线程安全）"""
+
+    def __init__(self, max_requests: int, window_size: float) -> None:
+        self.max_requests = max_requests
+        self.window_size = window_size
+        self._timestamps: deque = deque()
+        self._lock = threading.Lock()
+
+    def _evict(self, now: float) -> None:
+        while self._timestamps and now - self._timestamps[0] >= self.window_size:
+            self._timestamps.popleft()
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self._evict(now)
+            if len(self._timestamps) < self.max_requests:
+                self._timestamps.append(now)
+                return True
+            return False
+
+    def wait_time(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._evict(now)
+            if len(self._timestamps) < self.max_requests:
+                return 0.0
+            return self.window_size - (now - self._timestamps[0])
+
+    def acquire(self) -> None:
+        """阻塞直到窗口内有空位"""
+        while not self.allow_request():
+            time.sleep(max(self.wait_time(), 0.001))
+
+    async def acquire_async(self) -> None:
+        while not self.allow_request():
+            await asyncio.sleep(max(self.wait_time(), 0.001))
+
+
+RateLimiter = Union[TokenBucket, SlidingWindowRateLimiter]
+
+
+def create_rate_limiter(config: RateLimitConfig) -> RateLimiter:
+    if config.strategy == RateLimitStrategy.SLIDING_WINDOW:
+        return SlidingWindowRateLimiter(config.max_requests, config.time_window)
+    return TokenBucket(config.max_requests, config.max_requests / config.time_window)
+
+
+class RetryHandler:
+    """判断是否重试并计算退避时间，优先遵守 Retry-After（不超过 max_delay）"""
+
+    def __init__(self, config: RetryConfig) -> None:
+        self.config = config
+
+    def should_retry(self, response: Optional[APIResponse], attempt: int, method: str = "GET") -> bool:
+        if attempt >= self.config.max_retries:
+            return False
+        # response 为 None 表示网络错误/超时
+        if response is None:
+            return self.config.retry_non_idempotent or method.upper() in self.config.idempotent_methods
+        return response.status_code in self.config.retry_statuses
+
+    def get_delay(self, attempt: int, response: Optional[APIResponse] = None) -> float:
+        if response is not None:
+            retry_after = self.parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                # 不让服务端把等待时间拉长到超过 max_delay
+                return min(retry_after, self.config.max_delay)
+        delay = min(self.config.base_delay * (self.config.exponential_base ** attempt), self.config.max_delay)
+        if self.config.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+    @staticmethod
+    def parse_retry_after(value: Optional[str]) -> Optional[float]:
+        if not value:
+            return None
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+        try:
+            return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+        except (TypeError, ValueError):
+            return None
+
+
+class PaginationHandler:
+    """根据分页配置提取数据并计算下一页参数"""
+
+    def __init__(self, config: PaginationConfig) -> None:
+        self.config = config
+
+    def extract_items(self, response_data: Any) -> List[Any]:
+        if isinstance(response_data, list):
+            return response_data
+        if isinstance(response_data, dict):
+            items = response_data.get(self.config.data_key)
+            return items if isinstance(items, list) else []
+        return []
+
+    def get_next_params(self, current_params: Dict[str, Any], response_data: Any) -> Optional[Dict[str, Any]]:
+        cfg = self.config
+        data = response_data if isinstance(response_data, dict) else {}
+        items = self.extract_items(response_data)
+        params = dict(current_params)
+
+        if cfg.pagination_type == "cursor":
+            cursor = data.get(cfg.next_cursor_key)
+            if not cursor:
+                return None
+            params[cfg.cursor_param] = cursor
+            return params
+
+        if cfg.pagination_type == "offset":
+            offset = int(params.get(cfg.offset_param, 0))
+            limit = int(params.get(cfg.limit_param, len(items) or 1))
+            next_offset = offset + limit
+            if not self._has_more(data, items, limit, next_offset):
+                return None
+            params[cfg.offset_param] = next_offset
+            return params
+
+        page = int(params.get(cfg.page_param, 1))
+        size = int(params.get(cfg.size_param, len(items) or 1))
+        if not self._has_more(data, items, size, page * size):
+            return None
+        params[cfg.page_param] = page + 1
+        return params
+
+    def _has_more(self, data: Dict[str, Any], items: List[Any], size: int, consumed: int) -> bool:
+        total = data.get(self.config.total_key)
+        if total is not None:
+            return consumed < int(total)
+        # 没有 total 字段时，以本页是否填满判断
+        return len(items) >= size > 0
 
 
 class AuthenticationManager:
@@ -111,34 +371,204 @@ class OpenAPISpecParser:
 
 
 class APIIntegrator:
-    def __init__(self, base_url: str, auth_config: Optional[AuthConfig] = None) -> None:
+    def __init__(
+        self,
+        base_url: str,
+        auth_config: Optional[AuthConfig] = None,
+        rate_limit_config: Optional[RateLimitConfig] = None,
+        retry_config: Optional[RetryConfig] = None,
+        pagination_config: Optional[PaginationConfig] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        session: Optional[requests.Session] = None,
+        pool_size: int = 10,
+    ) -> None:
         self.base_url = base_url.rstrip("/")
         self.auth_manager = AuthenticationManager(auth_config or AuthConfig())
+        self.rate_limit_config = rate_limit_config
+        # 传入同一个 rate_limiter 即可在多个集成器/线程间共享配额
+        self.rate_limiter = rate_limiter or (create_rate_limiter(rate_limit_config) if rate_limit_config else None)
+        self.retry_handler = RetryHandler(retry_config or RetryConfig())
+        self.pagination_handler = PaginationHandler(pagination_config or PaginationConfig())
+        self.pool_size = pool_size
+        self.session = session or self._build_session(pool_size)
 
-    def request(self, req: APIRequest) -> APIResponse:
+    @staticmethod
+    def _build_session(pool_size: int) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self) -> "APIIntegrator":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def _prepare(self, req: APIRequest) -> Tuple[str, Dict[str, Any], Dict[str, str]]:
         headers = dict(req.headers)
         headers.update(self.auth_manager.get_auth_headers())
         params = dict(req.params)
         params.update(self.auth_manager.get_auth_params())
+        return f"{self.base_url}{req.url}", params, headers
 
-        start = time.time()
-        resp = requests.request(
-            method=req.method,
-            url=f"{self.base_url}{req.url}",
-            params=params,
-            headers=headers,
-            json=req.json_body,
-            timeout=req.timeout,
-        )
-        elapsed = time.time() - start
-
-        body: Any
+    @staticmethod
+    def _parse_body(resp: requests.Response) -> Any:
         try:
-            body = resp.json()
+            return resp.json()
         except Exception:
-            body = resp.text
+            return resp.text
+
+    def request(self, req: APIRequest) -> APIResponse:
+        url, params, headers = self._prepare(req)
+        attempt = 0
+        start = time.time()
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            response: Optional[APIResponse] = None
+            try:
+                resp = self.session.request(
+                    method=req.method,
+                    url=url,
+                    params=params,
+                    headers=headers,
+                    json=req.json_body,
+                    timeout=req.timeout,
+                )
+                response = APIResponse(
+                    status_code=resp.status_code,
+                    body=self._parse_body(resp),
+                    elapsed_time=time.time() - start,
+                    retries=attempt,
+                    headers=dict(resp.headers),
+                )
+            except (requests.ConnectionError, requests.Timeout):
+                if not self.retry_handler.should_retry(None, attempt, req.method):
+                    raise
+            if response is not None and not self.retry_handler.should_retry(response, attempt):
+                return response
+            time.sleep(self.retry_handler.get_delay(attempt, response))
+            attempt += 1
+
+    async def _arequest(self, client: Any, req: APIRequest) -> APIResponse:
+        url, params, headers = self._prepare(req)
+        attempt = 0
+        start = time.time()
+        while True:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async()
+            response: Optional[APIResponse] = None
+            try:
+                resp = await client.request(
+                    req.method,
+                    url,
+                    params=params,
+                    headers=headers,
+                    json=req.json_body,
+                    timeout=req.timeout,
+                )
+                response = APIResponse(
+                    status_code=resp.status_code,
+                    body=self._parse_body(resp),
+                    elapsed_time=time.time() - start,
+                    retries=attempt,
+                    headers=dict(resp.headers),
+                )
+            except httpx.TransportError:
+                if not self.retry_handler.should_retry(None, attempt, req.method):
+                    raise
+            if response is not None and not self.retry_handler.should_retry(response, attempt):
+                return response
+            await asyncio.sleep(self.retry_handler.get_delay(attempt, response))
+            attempt += 1
+
+    async def _run_one(self, client: Any, semaphore: asyncio.Semaphore, index: int, req: APIRequest) -> BatchItemResult:
+        async with semaphore:
+            start = time.time()
+            try:
+                if client is not None:
+                    response = await self._arequest(client, req)
+                else:
+                    # 没有 httpx 时退化为线程池 + 共享 Session
+                    response = await asyncio.get_running_loop().run_in_executor(None, self.request, req)
+                return BatchItemResult(index, req, response=response, latency=time.time() - start)
+            except Exception as exc:
+                return BatchItemResult(index, req, error=f"{type(exc).__name__}: {exc}", latency=time.time() - start)
+
+    def _async_client(self, concurrency: int) -> Any:
+        if not HTTPX_AVAILABLE:
+            return None
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        return httpx.AsyncClient(limits=limits)
+
+    async def iter_request_many(
+        self, requests_: Sequence[APIRequest], concurrency: int = 10, client: Any = None
+    ) -> AsyncIterator[BatchItemResult]:
+        """并发执行一批请求，按完成顺序逐个产出结果"""
+        semaphore = asyncio.Semaphore(concurrency)
+        owned = client is None
+        client = client if client is not None else self._async_client(concurrency)
+        try:
+            tasks = [asyncio.ensure_future(self._run_one(client, semaphore, i, req)) for i, req in enumerate(requests_)]
+            try:
+                for fut in asyncio.as_completed(tasks):
+                    yield await fut
+            finally:
+                for task in tasks:
+                    task.cancel()
+        finally:
+            if owned and client is not None:
+                await client.aclose()
+
+    async def request_many_async(
+        self, requests_: Sequence[APIRequest], concurrency: int = 10, ordered: bool = True, client: Any = None
+    ) -> BatchResult:
+        start = time.time()
+        results = [item async for item in self.iter_request_many(requests_, concurrency, client)]
+        if ordered:
+            results.sort(key=lambda item: item.index)
+        return BatchResult(results=results, elapsed_time=time.time() - start)
+
+    def request_many(self, requests_: Sequence[APIRequest], concurrency: int = 10, ordered: bool = True) -> BatchResult:
+        """同步入口；已在事件循环内时请直接 await request_many_async"""
+        return asyncio.run(self.request_many_async(requests_, concurrency, ordered))
+
+    def iter_pages(self, req: APIRequest) -> Iterator[APIResponse]:
+        """逐页请求，每次只持有当前页"""
+        params = dict(req.params)
+        max_pages = self.pagination_handler.config.max_pages
+        pages = 0
+        while True:
+            page_req = APIRequest(
+                method=req.method,
+                url=req.url,
+                params=params,
+                headers=req.headers,
+                json_body=req.json_body,
+                timeout=req.timeout,
+            )
+            response = self.request(page_req)
+            yield response
+            pages += 1
+            if response.status_code >= 400 or (max_pages is not None and pages >= max_pages):
+                return
+            next_params = self.pagination_handler.get_next_params(params, response.body)
+            if next_params is None:
+                return
+            params = next_params
 
-        return APIResponse(status_code=resp.status_code, body=body, elapsed_time=elapsed, retries=0)
+    def paginate(self, req: APIRequest) -> Iterator[Any]:
+        """按分页配置自动翻页，逐条产出数据项"""
+        for response in self.iter_pages(req):
+            items = self.pagination_handler.extract_items(response.body)
+            if not items:
+                return
+            yield from items
 
 
 if __name__ == "__main__":
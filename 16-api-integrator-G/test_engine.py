@@ -8,7 +8,6 @@ from engine import (
     AuthConfig,
     AuthType,
     RateLimitConfig,
-    RateLimitStrategy,
     RetryConfig,
     PaginationConfig,
     APIRequest,
@@ -17,6 +16,8 @@ from engine import (
 )
 import time
 
+import requests
+
 
 def test_token_bucket():
     """测试令牌桶"""
@@ -118,6 +119,21 @@ def test_retry_handler():
     delay1 = handler.get_delay(1)
     assert delay1 > delay0, "延迟应该指数增长"
 
+    # Retry-After 优先，但不超过 max_delay
+    throttled = APIResponse(status_code=429, headers={"Retry-After": "2"}, body={}, elapsed_time=0.1)
+    assert handler.get_delay(0, throttled) == 2.0, "应该遵守Retry-After"
+    throttled.headers["Retry-After"] = "86400"
+    assert handler.get_delay(0, throttled) == retry_config.max_delay, "Retry-After应该被max_delay截断"
+
+    # 连接错误只对幂等方法重试，除非显式开启
+    assert handler.should_retry(None, 0, "GET"), "GET连接错误应该重试"
+    assert handler.should_retry(None, 0, "put"), "PUT连接错误应该重试"
+    assert not handler.should_retry(None, 0, "POST"), "POST连接错误默认不重试"
+    assert not handler.should_retry(None, 0, "PATCH"), "PATCH连接错误默认不重试"
+    assert handler.should_retry(response, 0), "POST收到429仍可重试"
+    opt_in = RetryHandler(RetryConfig(max_retries=3, retry_non_idempotent=True))
+    assert opt_in.should_retry(None, 0, "POST"), "显式开启后POST连接错误应该重试"
+
     print("✓ 重试处理测试通过")
 
 
@@ -166,6 +182,178 @@ def test_pagination_handler():
     print("✓ 分页处理测试通过")
 
 
+class _FakeResponse:
+    def __init__(self, status_code, body, headers=None):
+        self.status_code = status_code
+        self._body = body
+        self.headers = headers or {}
+        self.text = str(body)
+
+    def json(self):
+        return self._body
+
+
+class _FakeSession:
+    """按顺序返回预设响应，并记录请求参数"""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def request(self, **kwargs):
+        self.calls.append(kwargs)
+        return self.responses.pop(0)
+
+    def close(self):
+        pass
+
+
+def test_request_retry_pipeline():
+    """测试请求重试管线"""
+    print("测试请求重试管线...")
+
+    session = _FakeSession([
+        _FakeResponse(503, {}, {"Retry-After": "0"}),
+        _FakeResponse(429, {}, {"Retry-After": "0"}),
+        _FakeResponse(200, {"ok": True}),
+    ])
+    integrator = APIIntegrator(
+        "https://api.test.com",
+        retry_config=RetryConfig(max_retries=3, base_delay=5.0),
+        rate_limit_config=RateLimitConfig(max_requests=10, time_window=1),
+        session=session,
+    )
+    start = time.time()
+    response = integrator.request(APIRequest(method="GET", url="/ping"))
+    assert time.time() - start < 1, "应该遵守Retry-After而不是基础退避"
+    assert response.status_code == 200
+    assert response.retries == 2, "重试次数应该被记录"
+    assert len(session.calls) == 3
+
+    # 不可重试的状态码直接返回
+    session = _FakeSession([_FakeResponse(404, {"error": "not found"})])
+    integrator = APIIntegrator("https://api.test.com", session=session)
+    response = integrator.request(APIRequest(method="GET", url="/missing"))
+    assert response.status_code == 404 and response.retries == 0
+
+    print("✓ 请求重试管线测试通过")
+
+
+class _FlakySession(_FakeSession):
+    """前几次请求抛出连接错误"""
+
+    def __init__(self, failures, responses):
+        super().__init__(responses)
+        self.failures = failures
+
+    def request(self, **kwargs):
+        if self.failures:
+            self.failures -= 1
+            self.calls.append(kwargs)
+            raise requests.ConnectionError("connection reset")
+        return super().request(**kwargs)
+
+
+def test_connection_error_retry():
+    """测试连接错误时按方法决定是否重试"""
+    print("测试连接错误重试...")
+
+    retry_config = RetryConfig(max_retries=3, base_delay=0.0)
+    session = _FlakySession(1, [_FakeResponse(200, {"ok": True})])
+    integrator = APIIntegrator("https://api.test.com", retry_config=retry_config, session=session)
+    response = integrator.request(APIRequest(method="GET", url="/ping"))
+    assert response.status_code == 200 and response.retries == 1, "GET应该在连接错误后重试"
+
+    session = _FlakySession(1, [_FakeResponse(201, {"id": 1})])
+    integrator = APIIntegrator("https://api.test.com", retry_config=retry_config, session=session)
+    try:
+        integrator.request(APIRequest(method="POST", url="/orders", json_body={"qty": 1}))
+        raise AssertionError("POST连接错误不应该被重试")
+    except requests.ConnectionError:
+        pass
+    assert len(session.calls) == 1, "POST只应该发送一次"
+
+    retry_config = RetryConfig(max_retries=3, base_delay=0.0, retry_non_idempotent=True)
+    session = _FlakySession(1, [_FakeResponse(201, {"id": 1})])
+    integrator = APIIntegrator("https://api.test.com", retry_config=retry_config, session=session)
+    response = integrator.request(APIRequest(method="POST", url="/orders", json_body={"qty": 1}))
+    assert response.status_code == 201 and response.retries == 1, "显式开启后POST应该重试"
+
+    print("✓ 连接错误重试测试通过")
+
+
+def test_paginate():
+    """测试自动分页"""
+    print("测试自动分页...")
+
+    session = _FakeSession([
+        _FakeResponse(200, {"total": 5, "items": [1, 2]}),
+        _FakeResponse(200, {"total": 5, "items": [3, 4]}),
+        _FakeResponse(200, {"total": 5, "items": [5]}),
+    ])
+    integrator = APIIntegrator(
+        "https://api.test.com",
+        pagination_config=PaginationConfig(size_param="per_page"),
+        session=session,
+    )
+    items = integrator.paginate(APIRequest(method="GET", url="/items", params={"page": 1, "per_page": 2}))
+    assert next(items) == 1
+    assert len(session.calls) == 1, "分页应该按需请求"
+    assert list(items) == [2, 3, 4, 5]
+    assert [call["params"]["page"] for call in session.calls] == [1, 2, 3]
+
+    print("✓ 自动分页测试通过")
+
+
+def test_request_many():
+    """测试异步批量请求"""
+    print("测试异步批量请求...")
+
+    import asyncio
+    from engine import HTTPX_AVAILABLE
+
+    if not HTTPX_AVAILABLE:
+        print("跳过: 未安装httpx")
+        return
+    import httpx
+
+    attempts = {}
+
+    async def handler(request):
+        item_id = int(request.url.path.rsplit("/", 1)[-1])
+        attempts[item_id] = attempts.get(item_id, 0) + 1
+        # 让靠前的请求更慢，验证结果仍按提交顺序返回
+        await asyncio.sleep(0.01 * (5 - item_id))
+        if item_id == 3 and attempts[item_id] == 1:
+            return httpx.Response(503, headers={"Retry-After": "0"})
+        return httpx.Response(200, json={"id": item_id})
+
+    integrator = APIIntegrator(
+        "https://api.test.com",
+        retry_config=RetryConfig(max_retries=2),
+        rate_limit_config=RateLimitConfig(max_requests=100, time_window=1),
+    )
+    reqs = [APIRequest(method="GET", url=f"/items/{i}") for i in range(5)]
+
+    async def run(ordered):
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with client:
+            return await integrator.request_many_async(reqs, concurrency=5, ordered=ordered, client=client)
+
+    result = asyncio.run(run(True))
+    assert [r.response.body["id"] for r in result.results] == [0, 1, 2, 3, 4]
+    assert result.succeeded == 5 and result.failed == 0
+    assert result.total_retries == 1, "503应该被重试一次"
+    assert result.results[3].response.retries == 1
+    assert result.summary()["latency_p95"] >= result.summary()["latency_p50"]
+
+    attempts.clear()
+    result = asyncio.run(run(False))
+    assert [r.index for r in result.results][0] == 4, "非有序模式应按完成顺序返回"
+
+    print("✓ 异步批量请求测试通过")
+
+
 def test_openapi_parser():
     """测试OpenAPI解析"""
     print("测试OpenAPI解析...")
@@ -233,6 +421,10 @@ def run_all_tests():
     test_authentication()
     test_retry_handler()
     test_pagination_handler()
+    test_request_retry_pipeline()
+    test_connection_error_retry()
+    test_paginate()
+    test_request_many()
     test_openapi_parser()
     test_output_format()
     test_concurrency()
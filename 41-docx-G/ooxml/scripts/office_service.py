@@ -0,0 +1,466 @@
+#!/usr/bin/env python3
+"""
+Headless LibreOffice job runner for conversion and recalculation.
+
+Starting soffice costs several seconds, most of it spent initialising a user
+profile and loading the office core. OfficeService shares that setup across a
+batch of jobs:
+
+    with OfficeService() as office:
+        for path in spreadsheets:
+            office.recalc(path)
+        office.convert("deck.pptx", "out/", "pdf")
+
+Jobs are queued and run one at a time in submission order, from any thread.
+Every job has a timeout; a job that hangs kills the office process, and the
+next job starts a fresh one.
+
+How much is shared depends on the backend:
+
+- UNO (the Python `uno` bridge is importable): all jobs run in one
+  long-lived soffice process connected over a named pipe, so the office
+  core is loaded once per service.
+- CLI (no `uno`): every job starts its own `soffice` subprocess, so each
+  job still pays for loading the office core. The jobs share the service's
+  private profile, copied from a pre-initialised template, so the first-run
+  profile setup happens only once per user.
+
+This module is kept identical in the docx and pptx ooxml scripts and in the
+xlsx skill; each skill imports its own copy.
+"""
+
+import os
+import shutil
+import signal
+import stat
+import subprocess
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+try:
+    import uno
+    from com.sun.star.beans import PropertyValue
+    from com.sun.star.connection import NoConnectException
+
+    UNO_AVAILABLE = True
+except ImportError:
+    UNO_AVAILABLE = False
+
+# Pre-initialised profile (with the recalculation macro) that every service
+# instance copies, so no instance pays for LibreOffice's first-run setup. Its
+# macros run in every job, so it lives in the per-user cache directory and is
+# only used when no other user can write to it
+if os.name == "nt":
+    _USER_CACHE_HOME = os.environ.get("LOCALAPPDATA") or Path.home() / "AppData/Local"
+else:
+    _USER_CACHE_HOME = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+PROFILE_TEMPLATE_DIR = Path(_USER_CACHE_HOME) / "office-service-profile"
+
+DEFAULT_JOB_TIMEOUT = 60  # seconds
+DEFAULT_STARTUP_TIMEOUT = 60  # seconds
+
+# Export filters by target format and document type
+EXPORT_FILTERS = {
+    "pdf": {
+        "spreadsheet": "calc_pdf_Export",
+        "presentation": "impress_pdf_Export",
+        "text": "writer_pdf_Export",
+    },
+    "html": {
+        "spreadsheet": "HTML (StarCalc)",
+        "presentation": "impress_html_Export",
+        "text": "HTML (StarWriter)",
+    },
+}
+
+RECALC_MACRO = """<?xml version="1.0" encoding="UTF-8"?>
+<!DOCTYPE script:module PUBLIC "-//OpenOffice.org//DTD OfficeDocument 1.0//EN" "module.dtd">
+<script:module xmlns:script="http://openoffice.org/2000/script" script:name="Module1" script:language="StarBasic">
+    Sub RecalculateAndSave()
+      ThisComponent.calculateAll()
+      ThisComponent.store()
+      ThisComponent.close(True)
+    End Sub
+</script:module>"""
+RECALC_MACRO_URL = (
+    "vnd.sun.star.script:Standard.Module1.RecalculateAndSave"
+    "?language=Basic&location=application"
+)
+
+
+class OfficeServiceError(RuntimeError):
+    """A LibreOffice job failed."""
+
+
+class OfficeTimeoutError(OfficeServiceError):
+    """A LibreOffice job or startup exceeded its timeout."""
+
+
+class OfficeService:
+    """Runs queued LibreOffice jobs against a shared profile.
+
+    With the UNO backend the jobs also share one running office process;
+    with the CLI backend each job starts soffice. Use as a context manager,
+    or call close() when done. Nothing is started before the first job.
+    """
+
+    def __init__(
+        self,
+        timeout=DEFAULT_JOB_TIMEOUT,
+        startup_timeout=DEFAULT_STARTUP_TIMEOUT,
+        soffice="soffice",
+        use_uno=None,
+    ):
+        """Create a service; no process is started until the first job.
+
+        Args:
+            timeout: Default per-job timeout in seconds
+            startup_timeout: Time allowed for soffice to start and accept connections
+            soffice: soffice executable
+            use_uno: Force (True) or disable (False) the UNO backend; by default
+                it is used when the `uno` module is importable
+        """
+        self.timeout = timeout
+        self.startup_timeout = startup_timeout
+        self.soffice = soffice
+        self.use_uno = UNO_AVAILABLE if use_uno is None else use_uno
+        if self.use_uno and not UNO_AVAILABLE:
+            raise OfficeServiceError("The uno module is not available")
+
+        self.jobs_run = 0
+        self.restarts = 0
+        self._queue = ThreadPoolExecutor(max_workers=1, thread_name_prefix="office")
+        self._profile_dir = None
+        self._process = None
+        self._desktop = None
+        self._pipe_name = f"office-service-{uuid.uuid4().hex}"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def submit(self, job, *args, timeout=None):
+        """Queue a job and return a Future for its result.
+
+        Args:
+            job: "recalc" or "convert"
+            *args: Arguments of the matching method
+            timeout: Per-job timeout in seconds (default: the service timeout)
+
+        Returns:
+            concurrent.futures.Future
+        """
+        method = {"recalc": self._recalc, "convert": self._convert}[job]
+        return self._queue.submit(method, *args, timeout or self.timeout)
+
+    def recalc(self, path, timeout=None):
+        """Recalculate all formulas in a spreadsheet and save it in place.
+
+        Args:
+            path: Spreadsheet path
+            timeout: Per-job timeout in seconds (default: the service timeout)
+        """
+        return self.submit("recalc", Path(path), timeout=timeout).result()
+
+    def convert(self, path, outdir, target, filter_name=None, timeout=None):
+        """Convert a document, like `soffice --convert-to target[:filter_name]`.
+
+        Args:
+            path: Source document
+            outdir: Output directory
+            target: Output extension, e.g. "pdf" or "html"
+            filter_name: Export filter; by default chosen from the document type
+            timeout: Per-job timeout in seconds (default: the service timeout)
+
+        Returns:
+            Path of the converted file (outdir / "<stem>.<target>")
+        """
+        return self.submit(
+            "convert", Path(path), Path(outdir), target, filter_name, timeout=timeout
+        ).result()
+
+    def close(self):
+        """Finish queued jobs, stop the office process and remove its profile."""
+        self._queue.shutdown(wait=True)
+        if self._desktop is not None:
+            try:
+                self._desktop.terminate()
+            except Exception:
+                pass
+            self._desktop = None
+        if self._process is not None:
+            try:
+                self._process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                _kill_process_group(self._process)
+            self._process = None
+        if self._profile_dir is not None:
+            shutil.rmtree(self._profile_dir, ignore_errors=True)
+            self._profile_dir = None
+
+    # Jobs (run on the queue thread)
+
+    def _recalc(self, path, timeout):
+        if not path.exists():
+            raise FileNotFoundError(path)
+        if self.use_uno:
+
+            def job(desktop):
+                doc = _load_document(desktop, path, read_only=False)
+                try:
+                    doc.calculateAll()
+                    doc.store()
+                finally:
+                    doc.close(True)
+
+            self._run_uno(job, timeout)
+        else:
+            returncode, stderr = self._run_cli(
+                [RECALC_MACRO_URL, str(path.absolute())], timeout
+            )
+            if returncode != 0:
+                raise OfficeServiceError(
+                    stderr.strip() or "Unknown error during recalculation"
+                )
+        self.jobs_run += 1
+
+    def _convert(self, path, outdir, target, filter_name, timeout):
+        if not path.exists():
+            raise FileNotFoundError(path)
+        outdir.mkdir(parents=True, exist_ok=True)
+        output_path = outdir / f"{path.stem}.{target}"
+        if self.use_uno:
+
+            def job(desktop):
+                doc = _load_document(desktop, path, read_only=True)
+                try:
+                    name = filter_name or EXPORT_FILTERS[target][_document_type(doc)]
+                    doc.storeToURL(
+                        uno.systemPathToFileUrl(str(output_path.absolute())),
+                        (_property("FilterName", name),),
+                    )
+                finally:
+                    doc.close(True)
+
+            self._run_uno(job, timeout)
+            stderr = ""
+        else:
+            convert_to = f"{target}:{filter_name}" if filter_name else target
+            _, stderr = self._run_cli(
+                ["--convert-to", convert_to, "--outdir", str(outdir), str(path)],
+                timeout,
+            )
+        if not output_path.exists():
+            raise OfficeServiceError(stderr.strip() or f"Conversion of {path} failed")
+        self.jobs_run += 1
+        return output_path
+
+    # Process management
+
+    def _ensure_profile(self):
+        if self._profile_dir is None:
+            template = _profile_template(self.soffice, self.startup_timeout)
+            self._profile_dir = Path(tempfile.mkdtemp(prefix="office-service-"))
+            shutil.copytree(template, self._profile_dir, dirs_exist_ok=True)
+        return self._profile_dir
+
+    def _base_command(self):
+        return [
+            self.soffice,
+            "--headless",
+            "--invisible",
+            "--nologo",
+            "--norestore",
+            "--nolockcheck",
+            f"-env:UserInstallation={self._ensure_profile().as_uri()}",
+        ]
+
+    def _run_cli(self, args, timeout):
+        process = subprocess.Popen(
+            self._base_command() + args,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            start_new_session=True,
+        )
+        try:
+            _, stderr = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            _kill_process_group(process)
+            process.communicate()
+            self.restarts += 1
+            raise OfficeTimeoutError(f"LibreOffice job timed out after {timeout}s")
+        return process.returncode, stderr
+
+    def _start(self):
+        if self._process is not None:
+            _kill_process_group(self._process)
+            self.restarts += 1
+        self._desktop = None
+        self._process = subprocess.Popen(
+            self._base_command()
+            + ["--nodefault", f"--accept=pipe,name={self._pipe_name};urp;"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+
+        local_context = uno.getComponentContext()
+        resolver = local_context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.bridge.UnoUrlResolver", local_context
+        )
+        deadline = time.monotonic() + self.startup_timeout
+        while True:
+            try:
+                context = resolver.resolve(
+                    f"uno:pipe,name={self._pipe_name};urp;StarOffice.ComponentContext"
+                )
+                break
+            except NoConnectException:
+                if self._process.poll() is not None:
+                    raise OfficeServiceError("soffice exited during startup")
+                if time.monotonic() > deadline:
+                    _kill_process_group(self._process)
+                    raise OfficeTimeoutError(
+                        f"soffice did not start within {self.startup_timeout}s"
+                    )
+                time.sleep(0.2)
+        self._desktop = context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.frame.Desktop", context
+        )
+
+    def _run_uno(self, job, timeout):
+        if self._desktop is None or self._process.poll() is not None:
+            self._start()
+
+        # Watchdog: killing the process makes the blocked UNO call raise
+        timed_out = threading.Event()
+
+        def on_timeout():
+            timed_out.set()
+            _kill_process_group(self._process)
+
+        timer = threading.Timer(timeout, on_timeout)
+        timer.daemon = True
+        timer.start()
+        try:
+            return job(self._desktop)
+        except Exception as e:
+            if timed_out.is_set():
+                self._desktop = None
+                raise OfficeTimeoutError(
+                    f"LibreOffice job timed out after {timeout}s"
+                ) from None
+            if self._process.poll() is not None:
+                self._desktop = None
+            raise OfficeServiceError(str(e)) from e
+        finally:
+            timer.cancel()
+
+
+def _profile_template(soffice, timeout):
+    """Return the shared profile template, creating it on first use."""
+    macro_file = PROFILE_TEMPLATE_DIR / "user" / "basic" / "Standard" / "Module1.xba"
+    if macro_file.exists():
+        return _check_private(PROFILE_TEMPLATE_DIR)
+
+    # Build in a scratch directory (created 0700) and move it into place, so
+    # concurrent first runs never see a half-initialised template
+    try:
+        PROFILE_TEMPLATE_DIR.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    except OSError as e:
+        raise OfficeServiceError(
+            f"Cannot create {PROFILE_TEMPLATE_DIR.parent}: {e}"
+        ) from e
+    build_dir = Path(
+        tempfile.mkdtemp(prefix="office-service-build-", dir=PROFILE_TEMPLATE_DIR.parent)
+    )
+    try:
+        subprocess.run(
+            [
+                soffice,
+                "--headless",
+                "--terminate_after_init",
+                f"-env:UserInstallation={build_dir.as_uri()}",
+            ],
+            capture_output=True,
+            timeout=timeout,
+        )
+        build_macro = build_dir / macro_file.relative_to(PROFILE_TEMPLATE_DIR)
+        build_macro.parent.mkdir(parents=True, exist_ok=True)
+        build_macro.write_text(RECALC_MACRO)
+        try:
+            build_dir.rename(PROFILE_TEMPLATE_DIR)
+        except OSError:
+            # Another process finished first; use its template
+            if not macro_file.exists():
+                raise
+    except subprocess.TimeoutExpired:
+        raise OfficeTimeoutError(f"soffice did not initialise within {timeout}s")
+    finally:
+        shutil.rmtree(build_dir, ignore_errors=True)
+    return _check_private(PROFILE_TEMPLATE_DIR)
+
+
+def _check_private(path):
+    """Return path if it is a directory only the current user can write to.
+
+    On POSIX the directory must be a real directory (not a symlink) owned by
+    the current user with no group or other permissions.
+    """
+    st = path.lstat()
+    if not stat.S_ISDIR(st.st_mode) or (
+        hasattr(os, "getuid") and (st.st_uid != os.getuid() or st.st_mode & 0o077)
+    ):
+        raise OfficeServiceError(
+            f"{path} is not a private directory of the current user; remove it "
+            "and it is rebuilt on the next job"
+        )
+    return path
+
+
+def _kill_process_group(process):
+    """Kill soffice together with the soffice.bin it spawned."""
+    if process.poll() is not None:
+        return
+    try:
+        if hasattr(os, "killpg"):
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except (ProcessLookupError, PermissionError):
+        process.kill()
+    process.wait()
+
+
+def _property(name, value):
+    prop = PropertyValue()
+    prop.Name = name
+    prop.Value = value
+    return prop
+
+
+def _load_document(desktop, path, read_only):
+    doc = desktop.loadComponentFromURL(
+        uno.systemPathToFileUrl(str(path.absolute())),
+        "_blank",
+        0,
+        (_property("Hidden", True), _property("ReadOnly", read_only)),
+    )
+    if doc is None:
+        raise OfficeServiceError(f"LibreOffice could not load {path}")
+    return doc
+
+
+def _document_type(doc):
+    if doc.supportsService("com.sun.star.sheet.SpreadsheetDocument"):
+        return "spreadsheet"
+    if doc.supportsService("com.sun.star.presentation.PresentationDocument"):
+        return "presentation"
+    return "text"
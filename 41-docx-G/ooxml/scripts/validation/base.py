@@ -2,11 +2,43 @@
 Base validator with common validation logic for document files.
 """
 
+import copy
+import hashlib
+import io
+import json
+import os
 import re
+import stat
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 import lxml.etree
 
+if os.name == "nt":
+    _USER_CACHE_HOME = os.environ.get("LOCALAPPDATA") or Path.home() / "AppData/Local"
+else:
+    _USER_CACHE_HOME = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+
+
+def _private_cache_dir(path):
+    """Create the cache directory if needed and return it, or None if unusable.
+
+    On POSIX the directory must be owned by the current user and closed to
+    group and others, so no other user can plant cache entries.
+    """
+    try:
+        path.mkdir(mode=0o700, parents=True, exist_ok=True)
+        st = path.lstat()
+    except OSError:
+        return None
+    if not stat.S_ISDIR(st.st_mode):
+        return None
+    if hasattr(os, "getuid") and (st.st_uid != os.getuid() or st.st_mode & 0o077):
+        return None
+    return path
+
 
 class BaseSchemaValidator:
     """Base validator with common validation logic for document files."""
@@ -103,10 +135,27 @@ class BaseSchemaValidator:
         "http://www.w3.org/XML/1998/namespace",
     }
 
-    def __init__(self, unpacked_dir, original_file, verbose=False):
+    # Compiled XSD schemas, keyed by schema path. Shared by all validator
+    # instances in the process since the schema files never change.
+    _schema_cache = {}
+
+    # On-disk cache of XSD errors found in original parts, keyed by part name
+    # and content hash, so repeated edit-validate loops against the same
+    # original skip the baseline step. Entries suppress errors, so the cache
+    # lives in the per-user cache directory. Set to None to disable.
+    BASELINE_CACHE_DIR = Path(_USER_CACHE_HOME) / "ooxml-validation-baseline"
+    BASELINE_CACHE_VERSION = 1
+
+    # Below this many parts a process pool costs more than it saves, since
+    # every worker has to compile its own copy of the schemas
+    PARALLEL_MIN_PARTS = 16
+
+    def __init__(self, unpacked_dir, original_file, verbose=False, jobs=None):
         self.unpacked_dir = Path(unpacked_dir).resolve()
         self.original_file = Path(original_file)
         self.verbose = verbose
+        # Worker processes for XSD validation: None uses all CPUs, 1 is serial
+        self.jobs = jobs
 
         # Set schemas directory
         self.schemas_dir = Path(__file__).parent.parent.parent / "schemas"
@@ -120,6 +169,47 @@ class BaseSchemaValidator:
         if not self.xml_files:
             print(f"Warning: No XML files found in {self.unpacked_dir}")
 
+        # Parsed documents for this run, keyed by path and invalidated by
+        # mtime/size so that every check shares a single parse per part
+        self._parsed_documents = {}
+
+        # XSD errors of original parts for this run, keyed by part name
+        self._original_errors = {}
+
+    def _parse_xml(self, xml_file):
+        """Parse an XML file once per run and return the cached ElementTree.
+
+        Callers must not mutate the returned tree; it is shared by all checks.
+        Syntax errors are cached too and re-raised on every lookup.
+        """
+        xml_file = Path(xml_file)
+        stat = xml_file.stat()
+        key = (str(xml_file), stat.st_mtime_ns, stat.st_size)
+        cached = self._parsed_documents.get(key)
+        if cached is None:
+            try:
+                cached = lxml.etree.parse(str(xml_file))
+            except lxml.etree.XMLSyntaxError as e:
+                cached = e
+            self._parsed_documents[key] = cached
+        if isinstance(cached, Exception):
+            raise cached
+        return cached
+
+    def _load_schema(self, schema_path):
+        """Load and compile an XSD schema, reusing the compiled copy if cached."""
+        key = str(schema_path)
+        schema = self._schema_cache.get(key)
+        if schema is None:
+            with open(schema_path, "rb") as xsd_file:
+                parser = lxml.etree.XMLParser()
+                xsd_doc = lxml.etree.parse(
+                    xsd_file, parser=parser, base_url=str(schema_path)
+                )
+                schema = lxml.etree.XMLSchema(xsd_doc)
+            self._schema_cache[key] = schema
+        return schema
+
     def validate(self):
         """Run all validation checks and return True if all pass."""
         raise NotImplementedError("Subclasses must implement the validate method")
@@ -131,7 +221,7 @@ class BaseSchemaValidator:
         for xml_file in self.xml_files:
             try:
                 # Try to parse the XML file
-                lxml.etree.parse(str(xml_file))
+                self._parse_xml(xml_file)
             except lxml.etree.XMLSyntaxError as e:
                 errors.append(
                     f"  {xml_file.relative_to(self.unpacked_dir)}: "
@@ -159,7 +249,7 @@ class BaseSchemaValidator:
 
         for xml_file in self.xml_files:
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
+                root = self._parse_xml(xml_file).getroot()
                 declared = set(root.nsmap.keys()) - {None}  # Exclude default namespace
 
                 for attr_val in [
@@ -190,18 +280,12 @@ class BaseSchemaValidator:
 
         for xml_file in self.xml_files:
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
+                root = self._parse_xml(xml_file).getroot()
                 file_ids = {}  # Track IDs that must be unique within this file
 
-                # Remove all mc:AlternateContent elements from the tree
-                mc_elements = root.xpath(
-                    ".//mc:AlternateContent", namespaces={"mc": self.MC_NAMESPACE}
-                )
-                for elem in mc_elements:
-                    elem.getparent().remove(elem)
-
-                # Now check IDs in the cleaned tree
-                for elem in root.iter():
+                # Check IDs, skipping mc:AlternateContent subtrees (the parsed
+                # tree is shared, so they are skipped rather than removed)
+                for elem in self._iter_outside_alternate_content(root):
                     # Get the element name without namespace
                     tag = (
                         elem.tag.split("}")[-1].lower()
@@ -310,7 +394,7 @@ class BaseSchemaValidator:
         for rels_file in rels_files:
             try:
                 # Parse relationships file
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
+                rels_root = self._parse_xml(rels_file).getroot()
 
                 # Get the directory where this .rels file is located
                 rels_dir = rels_file.parent
@@ -411,7 +495,7 @@ class BaseSchemaValidator:
 
             try:
                 # Parse the .rels file to get valid relationship IDs and their types
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
+                rels_root = self._parse_xml(rels_file).getroot()
                 rid_to_type = {}
 
                 for rel in rels_root.findall(
@@ -434,7 +518,7 @@ class BaseSchemaValidator:
                         rid_to_type[rid] = type_name
 
                 # Parse the XML file to find all r:id references
-                xml_root = lxml.etree.parse(str(xml_file)).getroot()
+                xml_root = self._parse_xml(xml_file).getroot()
 
                 # Find all elements with r:id attributes
                 for elem in xml_root.iter():
@@ -483,6 +567,19 @@ class BaseSchemaValidator:
                 print("PASSED - All relationship ID references are valid")
             return True
 
+    def _iter_outside_alternate_content(self, root):
+        """Iterate over root's subtree in document order, skipping mc:AlternateContent."""
+        alternate_content_tag = f"{{{self.MC_NAMESPACE}}}AlternateContent"
+        stack = [root]
+        while stack:
+            elem = stack.pop()
+            yield elem
+            stack.extend(
+                child
+                for child in reversed(elem)
+                if child.tag != alternate_content_tag
+            )
+
     def _get_expected_relationship_type(self, element_name):
         """
         Get the expected relationship type for an element.
@@ -531,7 +628,7 @@ class BaseSchemaValidator:
 
         try:
             # Parse and get all declared parts and extensions
-            root = lxml.etree.parse(str(content_types_file)).getroot()
+            root = self._parse_xml(content_types_file).getroot()
             declared_parts = set()
             declared_extensions = set()
 
@@ -593,7 +690,7 @@ class BaseSchemaValidator:
                     continue
 
                 try:
-                    root_tag = lxml.etree.parse(str(xml_file)).getroot().tag
+                    root_tag = self._parse_xml(xml_file).getroot().tag
                     root_name = root_tag.split("}")[-1] if "}" in root_tag else root_tag
 
                     if root_name in declarable_roots and path_str not in declared_parts:
@@ -656,6 +753,17 @@ class BaseSchemaValidator:
         is_valid, current_errors = self._validate_single_file_xsd(
             xml_file, unpacked_dir
         )
+        return self._compare_with_original(
+            xml_file, is_valid, current_errors, verbose=verbose
+        )
+
+    def _compare_with_original(self, xml_file, is_valid, current_errors, verbose=False):
+        """Reduce a file's XSD result to the errors not already in the original.
+
+        Returns:
+            tuple: (is_valid, new_errors_set) where is_valid is True/False/None (skipped)
+        """
+        unpacked_dir = self.unpacked_dir.resolve()
 
         if is_valid is None:
             return None, set()  # Skipped
@@ -692,10 +800,28 @@ class BaseSchemaValidator:
         valid_count = 0
         skipped_count = 0
 
-        for xml_file in self.xml_files:
+        # Validate every current part first, then compute the baseline for
+        # all failing parts in one pass over the original archive. Results
+        # come back in self.xml_files order whether or not a pool was used.
+        unpacked_dir = self.unpacked_dir.resolve()
+        results = [
+            (xml_file, *result)
+            for xml_file, result in zip(
+                self.xml_files,
+                self._map_parts(
+                    "_validate_single_file_xsd",
+                    [(f.resolve(), unpacked_dir) for f in self.xml_files],
+                ),
+            )
+        ]
+        self._load_original_errors(
+            [xml_file for xml_file, is_valid, _ in results if is_valid is False]
+        )
+
+        for xml_file, file_is_valid, current_errors in results:
             relative_path = str(xml_file.relative_to(self.unpacked_dir))
-            is_valid, new_file_errors = self.validate_file_against_xsd(
-                xml_file, verbose=False
+            is_valid, new_file_errors = self._compare_with_original(
+                xml_file.resolve(), file_is_valid, current_errors
             )
 
             if is_valid is None:
@@ -765,8 +891,7 @@ class BaseSchemaValidator:
     def _clean_ignorable_namespaces(self, xml_doc):
         """Remove attributes and elements not in allowed namespaces."""
         # Create a clean copy
-        xml_string = lxml.etree.tostring(xml_doc, encoding="unicode")
-        xml_copy = lxml.etree.fromstring(xml_string)
+        xml_copy = copy.deepcopy(xml_doc.getroot())
 
         # Remove attributes not in allowed namespaces
         for elem in xml_copy.iter():
@@ -830,41 +955,37 @@ class BaseSchemaValidator:
             return None, None  # Skip file
 
         try:
-            # Load schema
-            with open(schema_path, "rb") as xsd_file:
-                parser = lxml.etree.XMLParser()
-                xsd_doc = lxml.etree.parse(
-                    xsd_file, parser=parser, base_url=str(schema_path)
-                )
-                schema = lxml.etree.XMLSchema(xsd_doc)
+            xml_doc = self._parse_xml(xml_file)
+            return self._validate_document_xsd(
+                xml_doc, schema_path, xml_file.relative_to(base_path)
+            )
+        except Exception as e:
+            return False, {str(e)}
 
-            # Load and preprocess XML
-            with open(xml_file, "r") as f:
-                xml_doc = lxml.etree.parse(f)
+    def _validate_document_xsd(self, xml_doc, schema_path, relative_path):
+        """Validate a parsed document against a schema. Returns (is_valid, errors_set)."""
+        schema = self._load_schema(schema_path)
 
-            xml_doc, _ = self._remove_template_tags_from_text_nodes(xml_doc)
-            xml_doc = self._preprocess_for_mc_ignorable(xml_doc)
+        # Preprocess a private copy; xml_doc itself is left untouched
+        xml_doc, _ = self._remove_template_tags_from_text_nodes(xml_doc)
+        xml_doc = self._preprocess_for_mc_ignorable(xml_doc)
 
-            # Clean ignorable namespaces if needed
-            relative_path = xml_file.relative_to(base_path)
-            if (
-                relative_path.parts
-                and relative_path.parts[0] in self.MAIN_CONTENT_FOLDERS
-            ):
-                xml_doc = self._clean_ignorable_namespaces(xml_doc)
-
-            # Validate
-            if schema.validate(xml_doc):
-                return True, set()
-            else:
-                errors = set()
-                for error in schema.error_log:
-                    # Store normalized error message (without line numbers for comparison)
-                    errors.add(error.message)
-                return False, errors
+        # Clean ignorable namespaces if needed
+        if (
+            relative_path.parts
+            and relative_path.parts[0] in self.MAIN_CONTENT_FOLDERS
+        ):
+            xml_doc = self._clean_ignorable_namespaces(xml_doc)
 
-        except Exception as e:
-            return False, {str(e)}
+        # Validate
+        if schema.validate(xml_doc):
+            return True, set()
+        else:
+            errors = set()
+            for error in schema.error_log:
+                # Store normalized error message (without line numbers for comparison)
+                errors.add(error.message)
+            return False, errors
 
     def _get_original_file_errors(self, xml_file):
         """Get XSD validation errors from a single file in the original document.
@@ -875,33 +996,136 @@ class BaseSchemaValidator:
         Returns:
             set: Set of error messages from the original file
         """
-        import tempfile
-        import zipfile
+        part_name = self._part_name(xml_file)
+        if part_name not in self._original_errors:
+            self._load_original_errors([xml_file])
+        return self._original_errors[part_name]
 
+    def _part_name(self, xml_file):
+        """Return the archive member name of a file in unpacked_dir."""
         # Resolve both paths to handle symlinks (e.g., /var vs /private/var on macOS)
         xml_file = Path(xml_file).resolve()
-        unpacked_dir = self.unpacked_dir.resolve()
-        relative_path = xml_file.relative_to(unpacked_dir)
+        return xml_file.relative_to(self.unpacked_dir.resolve()).as_posix()
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
+    def _load_original_errors(self, xml_files):
+        """Compute baseline XSD errors for several files in one pass.
 
-            # Extract original file
-            with zipfile.ZipFile(self.original_file, "r") as zip_ref:
-                zip_ref.extractall(temp_path)
+        Only the needed members are read from the original archive, straight
+        into memory. Results are memoized for this run and persisted in the
+        baseline cache; uncached parts are validated across worker processes.
+        """
+        part_names = [
+            name
+            for name in dict.fromkeys(self._part_name(f) for f in xml_files)
+            if name not in self._original_errors
+        ]
+        if not part_names:
+            return
+
+        to_validate = []
+        with zipfile.ZipFile(self.original_file, "r") as zip_ref:
+            members = set(zip_ref.namelist())
+            for part_name in part_names:
+                if part_name not in members:
+                    # File didn't exist in original, so no original errors
+                    self._original_errors[part_name] = set()
+                    continue
+                data = zip_ref.read(part_name)
+                digest = hashlib.sha256(data).hexdigest()
+                cached = self._read_baseline_cache(part_name, digest)
+                if cached is not None:
+                    self._original_errors[part_name] = cached
+                else:
+                    to_validate.append((part_name, digest, data))
+
+        if not to_validate:
+            return
+
+        results = self._map_parts(
+            "_validate_original_part",
+            [(part_name, data) for part_name, _, data in to_validate],
+        )
 
-            # Find corresponding file in original
-            original_xml_file = temp_path / relative_path
+        for (part_name, digest, _), errors in zip(to_validate, results):
+            self._original_errors[part_name] = errors
+            self._write_baseline_cache(part_name, digest, errors)
 
-            if not original_xml_file.exists():
-                # File didn't exist in original, so no original errors
-                return set()
+    def _map_parts(self, method_name, items):
+        """Call a per-part method on every argument tuple in items.
 
-            # Validate the specific file in original
-            is_valid, errors = self._validate_single_file_xsd(
-                original_xml_file, temp_path
+        Runs in a process pool when worthwhile, otherwise serially on this
+        validator. Items are ordered by schema first so that consecutive
+        chunks sent to a worker reuse its compiled schemas; results are
+        always returned in input order.
+        """
+        workers = min(len(items), self.jobs or os.cpu_count() or 1)
+        if workers <= 1 or len(items) < self.PARALLEL_MIN_PARTS:
+            method = getattr(self, method_name)
+            return [method(*item) for item in items]
+
+        order = sorted(
+            range(len(items)),
+            key=lambda i: str(self._get_schema_path(Path(items[i][0]))),
+        )
+        chunksize = max(1, len(items) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            ordered_results = executor.map(
+                _run_part_in_worker,
+                [type(self)] * len(items),
+                [method_name] * len(items),
+                [items[i] for i in order],
+                chunksize=chunksize,
             )
-            return errors if errors else set()
+            results = [None] * len(items)
+            for i, result in zip(order, ordered_results):
+                results[i] = result
+        return results
+
+    def _validate_original_part(self, part_name, data):
+        """XSD-validate one part of the original package given its bytes."""
+        relative_path = Path(part_name)
+        schema_path = self._get_schema_path(relative_path)
+        if not schema_path:
+            return set()
+        try:
+            xml_doc = lxml.etree.parse(io.BytesIO(data))
+            _, errors = self._validate_document_xsd(xml_doc, schema_path, relative_path)
+        except Exception as e:
+            errors = {str(e)}
+        return errors if errors else set()
+
+    def _baseline_cache_file(self, part_name, digest):
+        """Cache file for a part, or None if the cache is disabled or not private."""
+        if self.BASELINE_CACHE_DIR is None:
+            return None
+        cache_dir = _private_cache_dir(self.BASELINE_CACHE_DIR)
+        if cache_dir is None:
+            return None
+        key = f"{self.BASELINE_CACHE_VERSION}\0{type(self).__name__}\0{part_name}\0{digest}"
+        return cache_dir / f"{hashlib.sha256(key.encode()).hexdigest()}.json"
+
+    def _read_baseline_cache(self, part_name, digest):
+        cache_file = self._baseline_cache_file(part_name, digest)
+        if cache_file is None:
+            return None
+        try:
+            with open(cache_file, encoding="utf-8") as f:
+                return set(json.load(f))
+        except (OSError, ValueError):
+            return None
+
+    def _write_baseline_cache(self, part_name, digest, errors):
+        cache_file = self._baseline_cache_file(part_name, digest)
+        if cache_file is None:
+            return
+        try:
+            # Write atomically so concurrent runs never see a partial entry
+            fd, tmp_name = tempfile.mkstemp(dir=cache_file.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(sorted(errors), f)
+            os.replace(tmp_name, cache_file)
+        except OSError:
+            pass
 
     def _remove_template_tags_from_text_nodes(self, xml_doc):
         """Remove template tags from XML text nodes and collect warnings.
@@ -917,8 +1141,7 @@ class BaseSchemaValidator:
         template_pattern = re.compile(r"\{\{[^}]*\}\}")
 
         # Create a copy of the document to avoid modifying the original
-        xml_string = lxml.etree.tostring(xml_doc, encoding="unicode")
-        xml_copy = lxml.etree.fromstring(xml_string)
+        xml_copy = copy.deepcopy(xml_doc.getroot())
 
         def process_text_content(text, content_type):
             if not text:
@@ -947,5 +1170,19 @@ class BaseSchemaValidator:
         return lxml.etree.ElementTree(xml_copy), warnings
 
 
+def _run_part_in_worker(validator_cls, method_name, item):
+    """Process-pool entry point: run one per-part validator method.
+
+    The worker builds a bare validator that only carries the schema
+    configuration instead of re-scanning the unpacked directory. Compiled
+    schemas live in the class-level cache, so each worker process keeps them
+    for every part it is handed.
+    """
+    validator = validator_cls.__new__(validator_cls)
+    validator.schemas_dir = Path(__file__).parent.parent.parent / "schemas"
+    validator._parsed_documents = {}
+    return getattr(validator, method_name)(*item)
+
+
 if __name__ == "__main__":
     raise RuntimeError("This module should not be run directly.")
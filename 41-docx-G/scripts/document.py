@@ -8,6 +8,7 @@ Usage:
     # Initialize
     doc = Document('workspace/unpacked')
     doc = Document('workspace/unpacked', author="John Doe", initials="JD")
+    doc = Document('workspace/unpacked', engine="lxml")  # Faster for large documents
 
     # Find nodes
     node = doc["word/document.xml"].get_node(tag="w:del", attrs={"w:id": "1"})
@@ -26,7 +27,9 @@ Usage:
     doc.save()
 """
 
+import copy
 import html
+import os
 import random
 import shutil
 import tempfile
@@ -38,11 +41,24 @@ from ooxml.scripts.pack import pack_document
 from ooxml.scripts.validation.docx import DOCXSchemaValidator
 from ooxml.scripts.validation.redlining import RedliningValidator
 
-from .utilities import XMLEditor
+from .utilities import XML_NAMESPACE, LxmlXMLEditor, XMLEditor
 
 # Path to template files
 TEMPLATE_DIR = Path(__file__).parent / "templates"
 
+# DOM engines selectable for word/document.xml
+ENGINES = ("minidom", "lxml")
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+W14_NS = "http://schemas.microsoft.com/office/word/2010/wordml"
+W16DU_NS = "http://schemas.microsoft.com/office/word/2023/wordml/word16du"
+W16CEX_NS = "http://schemas.microsoft.com/office/word/2018/wordml/cex"
+
+
+def _w(local):
+    """Clark name for an element or attribute in the main WordprocessingML namespace."""
+    return f"{{{W_NS}}}{local}"
+
 
 class DocxXMLEditor(XMLEditor):
     """XMLEditor that automatically applies RSID, author, and date to new elements.
@@ -241,26 +257,36 @@ class DocxXMLEditor(XMLEditor):
         """Replace node with automatic attribute injection."""
         nodes = super().replace_node(elem, new_content)
         self._inject_attributes_to_nodes(nodes)
+        self._reindex_nodes(nodes)
         return nodes
 
     def insert_after(self, elem, xml_content):
         """Insert after with automatic attribute injection."""
         nodes = super().insert_after(elem, xml_content)
         self._inject_attributes_to_nodes(nodes)
+        self._reindex_nodes(nodes)
         return nodes
 
     def insert_before(self, elem, xml_content):
         """Insert before with automatic attribute injection."""
         nodes = super().insert_before(elem, xml_content)
         self._inject_attributes_to_nodes(nodes)
+        self._reindex_nodes(nodes)
         return nodes
 
     def append_to(self, elem, xml_content):
         """Append to with automatic attribute injection."""
         nodes = super().append_to(elem, xml_content)
         self._inject_attributes_to_nodes(nodes)
+        self._reindex_nodes(nodes)
         return nodes
 
+    def _reindex_nodes(self, nodes):
+        """Refresh index entries for nodes whose attributes were just injected."""
+        for node in nodes:
+            self._unindex_subtree(node)
+            self._index_subtree(node)
+
     def revert_insertion(self, elem):
         """Reject an insertion by wrapping its content in a deletion.
 
@@ -305,6 +331,9 @@ class DocxXMLEditor(XMLEditor):
             if not runs:
                 continue
 
+            self.modified = True
+            self._unindex_subtree(ins_elem)
+
             # Create deletion wrapper
             del_wrapper = self.dom.createElement("w:del")
 
@@ -336,6 +365,7 @@ class DocxXMLEditor(XMLEditor):
 
             # Inject attributes to the deletion wrapper
             self._inject_attributes_to_nodes([del_wrapper])
+            self._index_subtree(ins_elem)
 
         return [elem]
 
@@ -500,6 +530,9 @@ class DocxXMLEditor(XMLEditor):
             if elem.getElementsByTagName("w:delText"):
                 raise ValueError("w:r element already contains w:delText")
 
+            self.modified = True
+            self._unindex_subtree(elem)
+
             # Convert w:t → w:delText
             for t_elem in list(elem.getElementsByTagName("w:t")):
                 del_text = self.dom.createElement("w:delText")
@@ -528,6 +561,7 @@ class DocxXMLEditor(XMLEditor):
 
             # Inject attributes to the deletion wrapper
             self._inject_attributes_to_nodes([del_wrapper])
+            self._index_subtree(del_wrapper)
 
             return del_wrapper
 
@@ -536,6 +570,9 @@ class DocxXMLEditor(XMLEditor):
             if elem.getElementsByTagName("w:ins") or elem.getElementsByTagName("w:del"):
                 raise ValueError("w:p element already contains tracked changes")
 
+            self.modified = True
+            self._unindex_subtree(elem)
+
             # Check if it's a numbered list item
             pPr_list = elem.getElementsByTagName("w:pPr")
             is_numbered = pPr_list and pPr_list[0].getElementsByTagName("w:numPr")
@@ -586,6 +623,7 @@ class DocxXMLEditor(XMLEditor):
 
             # Inject attributes to the deletion wrapper
             self._inject_attributes_to_nodes([del_wrapper])
+            self._index_subtree(elem)
 
             return elem
 
@@ -593,6 +631,315 @@ class DocxXMLEditor(XMLEditor):
             raise ValueError(f"Element must be w:r or w:p, got {elem.nodeName}")
 
 
+class LxmlDocxXMLEditor(LxmlXMLEditor):
+    """LxmlXMLEditor that applies RSID, author, and date to new elements.
+
+    lxml counterpart of DocxXMLEditor with the same tracked-change API
+    (suggest_deletion, revert_insertion, revert_deletion, suggest_paragraph) and
+    the same attribute injection on replace_node, insert_after, insert_before
+    and append_to.
+
+    Attributes:
+        dom (lxml.etree._ElementTree): The parsed tree for direct manipulation
+    """
+
+    suggest_paragraph = staticmethod(DocxXMLEditor.suggest_paragraph)
+
+    def __init__(
+        self, xml_path, rsid: str, author: str = "Claude", initials: str = "C"
+    ):
+        """Initialize with required RSID and optional author.
+
+        Args:
+            xml_path: Path to XML file to edit
+            rsid: RSID to automatically apply to new elements
+            author: Author name for tracked changes and comments (default: "Claude")
+            initials: Author initials (default: "C")
+        """
+        super().__init__(xml_path)
+        self.rsid = rsid
+        self.author = author
+        self.initials = initials
+
+    def _get_next_change_id(self):
+        """Get the next available change ID by checking all tracked change elements."""
+        max_id = -1
+        for elem in self.dom.getroot().iter(_w("ins"), _w("del")):
+            change_id = elem.get(_w("id"))
+            if not change_id:
+                continue
+            try:
+                max_id = max(max_id, int(change_id))
+            except ValueError:
+                pass
+        return max_id + 1
+
+    def _inject_attributes_to_nodes(self, nodes):
+        """Inject RSID, author, and date attributes into elements where applicable.
+
+        Applies the same rules as DocxXMLEditor._inject_attributes_to_nodes to
+        each node and its descendants.
+
+        Args:
+            nodes: List of elements to process
+        """
+        timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        comment_extensible = f"{{{W16CEX_NS}}}commentExtensible"
+
+        def set_default(elem, key, value):
+            if key not in elem.attrib:
+                elem.set(key, value)
+
+        for node in nodes:
+            if not isinstance(node.tag, str):
+                continue
+            for elem in node.iter(
+                _w("p"),
+                _w("r"),
+                _w("t"),
+                _w("ins"),
+                _w("del"),
+                _w("comment"),
+                comment_extensible,
+            ):
+                if elem.tag == _w("p"):
+                    set_default(elem, _w("rsidR"), self.rsid)
+                    set_default(elem, _w("rsidRDefault"), self.rsid)
+                    set_default(elem, _w("rsidP"), self.rsid)
+                    self._ensure_namespace("w14", W14_NS)
+                    set_default(elem, f"{{{W14_NS}}}paraId", _generate_hex_id())
+                    set_default(elem, f"{{{W14_NS}}}textId", _generate_hex_id())
+                elif elem.tag == _w("r"):
+                    # Use w:rsidDel for <w:r> inside <w:del>, otherwise w:rsidR
+                    inside_deletion = any(
+                        a.tag == _w("del") for a in elem.iterancestors()
+                    )
+                    key = _w("rsidDel") if inside_deletion else _w("rsidR")
+                    set_default(elem, key, self.rsid)
+                elif elem.tag == _w("t"):
+                    text = elem.text
+                    if text and (text[0].isspace() or text[-1].isspace()):
+                        set_default(elem, f"{{{XML_NAMESPACE}}}space", "preserve")
+                elif elem.tag in (_w("ins"), _w("del")):
+                    if _w("id") not in elem.attrib:
+                        elem.set(_w("id"), str(self._get_next_change_id()))
+                    set_default(elem, _w("author"), self.author)
+                    set_default(elem, _w("date"), timestamp)
+                    self._ensure_namespace("w16du", W16DU_NS)
+                    set_default(elem, f"{{{W16DU_NS}}}dateUtc", timestamp)
+                elif elem.tag == _w("comment"):
+                    set_default(elem, _w("author"), self.author)
+                    set_default(elem, _w("date"), timestamp)
+                    set_default(elem, _w("initials"), self.initials)
+                else:
+                    self._ensure_namespace("w16cex", W16CEX_NS)
+                    set_default(elem, f"{{{W16CEX_NS}}}dateUtc", timestamp)
+
+    def replace_node(self, elem, new_content):
+        """Replace node with automatic attribute injection."""
+        nodes = super().replace_node(elem, new_content)
+        self._inject_attributes_to_nodes(nodes)
+        return nodes
+
+    def insert_after(self, elem, xml_content):
+        """Insert after with automatic attribute injection."""
+        nodes = super().insert_after(elem, xml_content)
+        self._inject_attributes_to_nodes(nodes)
+        return nodes
+
+    def insert_before(self, elem, xml_content):
+        """Insert before with automatic attribute injection."""
+        nodes = super().insert_before(elem, xml_content)
+        self._inject_attributes_to_nodes(nodes)
+        return nodes
+
+    def append_to(self, elem, xml_content):
+        """Append to with automatic attribute injection."""
+        nodes = super().append_to(elem, xml_content)
+        self._inject_attributes_to_nodes(nodes)
+        return nodes
+
+    def revert_insertion(self, elem):
+        """Reject an insertion by wrapping its content in a deletion.
+
+        See DocxXMLEditor.revert_insertion.
+
+        Args:
+            elem: Element to process (w:ins, w:p, w:body, etc.)
+
+        Returns:
+            list: List containing the processed element(s)
+
+        Raises:
+            ValueError: If the element contains no w:ins elements
+        """
+        if elem.tag == _w("ins"):
+            ins_elements = [elem]
+        else:
+            ins_elements = list(elem.iterdescendants(_w("ins")))
+
+        if not ins_elements:
+            raise ValueError(
+                f"revert_insertion requires w:ins elements. "
+                f"The provided element <{elem.tagName}> contains no insertions. "
+            )
+
+        for ins_elem in ins_elements:
+            runs = list(ins_elem.iter(_w("r")))
+            if not runs:
+                continue
+            self.modified = True
+
+            for run in runs:
+                _move_attribute(run, _w("rsidR"), _w("rsidDel"), self.rsid)
+                for t_elem in list(run.iter(_w("t"))):
+                    t_elem.tag = _w("delText")
+
+            # Move all children from ins to a del wrapper inside it
+            del_wrapper = self.create_element("w:del")
+            del_wrapper.text, ins_elem.text = ins_elem.text, None
+            for child in list(ins_elem):
+                del_wrapper.append(child)
+            ins_elem.append(del_wrapper)
+
+            self._inject_attributes_to_nodes([del_wrapper])
+
+        return [elem]
+
+    def revert_deletion(self, elem):
+        """Reject a deletion by re-inserting the deleted content.
+
+        See DocxXMLEditor.revert_deletion.
+
+        Args:
+            elem: Element to process (w:del, w:p, w:body, etc.)
+
+        Returns:
+            list: If elem is w:del, returns [elem, new_ins]. Otherwise returns [elem].
+
+        Raises:
+            ValueError: If the element contains no w:del elements
+        """
+        is_single_del = elem.tag == _w("del")
+        if is_single_del:
+            del_elements = [elem]
+        else:
+            del_elements = list(elem.iterdescendants(_w("del")))
+
+        if not del_elements:
+            raise ValueError(
+                f"revert_deletion requires w:del elements. "
+                f"The provided element <{elem.tagName}> contains no deletions. "
+            )
+
+        created_insertion = None
+
+        for del_elem in del_elements:
+            runs = list(del_elem.iter(_w("r")))
+            if not runs:
+                continue
+
+            ins_elem = self.create_element("w:ins")
+            for run in runs:
+                new_run = copy.deepcopy(run)
+                new_run.tail = None
+                for del_text in list(new_run.iter(_w("delText"))):
+                    del_text.tag = _w("t")
+                _move_attribute(new_run, _w("rsidDel"), _w("rsidR"), self.rsid)
+                ins_elem.append(new_run)
+
+            # Insert the new insertion directly after the deletion
+            ins_elem.tail, del_elem.tail = del_elem.tail, None
+            del_elem.addnext(ins_elem)
+            self.modified = True
+            self._inject_attributes_to_nodes([ins_elem])
+
+            if is_single_del:
+                created_insertion = ins_elem
+
+        if is_single_del and created_insertion is not None:
+            return [elem, created_insertion]
+        return [elem]
+
+    def suggest_deletion(self, elem):
+        """Mark a w:r or w:p element as deleted with tracked changes (in-place).
+
+        See DocxXMLEditor.suggest_deletion.
+
+        Args:
+            elem: A w:r or w:p element without existing tracked changes
+
+        Returns:
+            Element: The modified element
+
+        Raises:
+            ValueError: If element has existing tracked changes or invalid structure
+        """
+        if elem.tag == _w("r"):
+            if next(elem.iter(_w("delText")), None) is not None:
+                raise ValueError("w:r element already contains w:delText")
+
+            self.modified = True
+            for t_elem in list(elem.iter(_w("t"))):
+                t_elem.tag = _w("delText")
+            _move_attribute(elem, _w("rsidR"), _w("rsidDel"), self.rsid)
+
+            # Wrap in w:del, keeping the run's tail outside the wrapper
+            del_wrapper = self.create_element("w:del")
+            del_wrapper.tail, elem.tail = elem.tail, None
+            elem.addprevious(del_wrapper)
+            del_wrapper.append(elem)
+
+            self._inject_attributes_to_nodes([del_wrapper])
+            return del_wrapper
+
+        elif elem.tag == _w("p"):
+            if (
+                next(elem.iterdescendants(_w("ins"), _w("del")), None) is not None
+            ):
+                raise ValueError("w:p element already contains tracked changes")
+
+            self.modified = True
+            pPr = next(elem.iterdescendants(_w("pPr")), None)
+            is_numbered = (
+                pPr is not None and next(pPr.iter(_w("numPr")), None) is not None
+            )
+
+            if is_numbered:
+                # Add <w:del/> to w:rPr in w:pPr
+                rPr = next(pPr.iterdescendants(_w("rPr")), None)
+                if rPr is None:
+                    rPr = self.create_element("w:rPr")
+                    pPr.append(rPr)
+                rPr.insert(0, self.create_element("w:del"))
+
+            for t_elem in list(elem.iter(_w("t"))):
+                t_elem.tag = _w("delText")
+            for run in elem.iter(_w("r")):
+                _move_attribute(run, _w("rsidR"), _w("rsidDel"), self.rsid)
+
+            # Wrap all non-pPr children in <w:del>
+            del_wrapper = self.create_element("w:del")
+            del_wrapper.text, elem.text = elem.text, None
+            for child in [c for c in elem if c.tag != _w("pPr")]:
+                del_wrapper.append(child)
+            elem.append(del_wrapper)
+
+            self._inject_attributes_to_nodes([del_wrapper])
+            return elem
+
+        else:
+            raise ValueError(f"Element must be w:r or w:p, got {elem.tagName}")
+
+
+def _move_attribute(elem, old_key, new_key, default):
+    """Rename old_key to new_key, or set new_key to default if neither exists."""
+    if old_key in elem.attrib:
+        elem.set(new_key, elem.attrib.pop(old_key))
+    elif new_key not in elem.attrib:
+        elem.set(new_key, default)
+
+
 def _generate_hex_id() -> str:
     """Generate random 8-character hex ID for para/durable IDs.
 
@@ -619,6 +966,7 @@ class Document:
         track_revisions=False,
         author="Claude",
         initials="C",
+        engine="minidom",
     ):
         """
         Initialize with path to unpacked Word document directory.
@@ -630,20 +978,35 @@ class Document:
             track_revisions: If True, enables track revisions in settings.xml (default: False)
             author: Default author name for comments (default: "Claude")
             initials: Default author initials for comments (default: "C")
+            engine: DOM engine for word/document.xml, "minidom" (default) or "lxml".
+                The lxml engine is much faster and lighter on large documents;
+                the other parts always use minidom.
+
+        Non-XML files under unpacked_path may be hard links to the source files.
+        Call writable_path() before writing into one in place, or replace it
+        (write a new file and move it into place); otherwise the source
+        directory changes too.
         """
         self.original_path = Path(unpacked_dir)
 
         if not self.original_path.exists() or not self.original_path.is_dir():
             raise ValueError(f"Directory not found: {unpacked_dir}")
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine: {engine}. Expected one of {ENGINES}")
+        self.engine = engine
 
-        # Create temporary directory with subdirectories for unpacked content and baseline
+        # Create temporary directory with subdirectories for unpacked content and baseline.
+        # XML parts are copied; other parts (media, fonts, embeddings) are hard links
+        # to the source files where the filesystem allows it
         self.temp_dir = tempfile.mkdtemp(prefix="docx_")
         self.unpacked_path = Path(self.temp_dir) / "unpacked"
-        shutil.copytree(self.original_path, self.unpacked_path)
+        self._clone_tree(self.original_path, self.unpacked_path)
+        # Stat of every session file as last synced with the source directory
+        self._synced = self._snapshot()
 
-        # Pack original directory into temporary .docx for validation baseline (outside unpacked dir)
+        # Validation baseline (.docx of the original XML parts, outside unpacked dir);
+        # built on first use
         self.original_docx = Path(self.temp_dir) / "original.docx"
-        pack_document(self.original_path, self.original_docx, validate=False)
 
         self.word_path = self.unpacked_path / "word"
 
@@ -657,6 +1020,9 @@ class Document:
 
         # Cache for lazy-loaded editors
         self._editors = {}
+        # Parts handed out through doc[...]; callers may keep the editor and
+        # edit its DOM directly at any time, so these are written on every save
+        self._exposed = set()
 
         # Comment file paths
         self.comments_path = self.word_path / "comments.xml"
@@ -669,7 +1035,7 @@ class Document:
         self.next_comment_id = self._get_next_comment_id()
 
         # Convenient access to document.xml editor (semi-private)
-        self._document = self["word/document.xml"]
+        self._document = self._get_editor("word/document.xml")
 
         # Setup tracked changes infrastructure
         self._setup_tracking(track_revisions=track_revisions)
@@ -700,12 +1066,22 @@ class Document:
             # Get node from comments.xml
             comment = doc["word/comments.xml"].get_node(tag="w:comment", attrs={"w:id": "0"})
         """
+        editor = self._get_editor(xml_path)
+        self._exposed.add(xml_path)
+        return editor
+
+    def _get_editor(self, xml_path: str) -> DocxXMLEditor:
+        """Get or create the editor for xml_path without marking it modified."""
         if xml_path not in self._editors:
             file_path = self.unpacked_path / xml_path
             if not file_path.exists():
                 raise ValueError(f"XML file not found: {xml_path}")
-            # Use DocxXMLEditor with RSID, author, and initials for all editors
-            self._editors[xml_path] = DocxXMLEditor(
+            # Use DocxXMLEditor with RSID, author, and initials for all editors;
+            # only the main document part honours the selected engine
+            editor_class = DocxXMLEditor
+            if xml_path == "word/document.xml" and self.engine == "lxml":
+                editor_class = LxmlDocxXMLEditor
+            self._editors[xml_path] = editor_class(
                 file_path, rsid=self.rsid, author=self.author, initials=self.initials
             )
         return self._editors[xml_path]
@@ -830,6 +1206,24 @@ class Document:
         self.next_comment_id += 1
         return comment_id
 
+    def writable_path(self, rel_path) -> Path:
+        """
+        Return the session path of a part, safe to write into in place.
+
+        Non-XML parts may be hard links to the source files; such a part is
+        first copied into a file of its own, so writes never reach the source.
+
+        Args:
+            rel_path: Path relative to the unpacked document (e.g., "word/media/image1.png")
+
+        Returns:
+            Path of the part under unpacked_path
+        """
+        path = self.unpacked_path / rel_path
+        if path.is_file() and path.stat().st_nlink > 1:
+            self._replace_with_copy(path, path)
+        return path
+
     def __del__(self):
         """Clean up temporary directory on deletion."""
         if hasattr(self, "temp_dir") and Path(self.temp_dir).exists():
@@ -842,6 +1236,8 @@ class Document:
         Raises:
             ValueError: If validation fails.
         """
+        self._ensure_baseline()
+
         # Create validators with current state
         schema_validator = DOCXSchemaValidator(
             self.unpacked_path, self.original_docx, verbose=False
@@ -861,6 +1257,12 @@ class Document:
         Save all modified XML files to disk and copy to destination directory.
 
         This persists all changes made via add_comment() and reply_to_comment().
+        Only files changed since the session started (or since the last save
+        back to the original directory) are written; a separate destination
+        also receives the unchanged files, copied from the source. Files are
+        never hard-linked into a destination, so later writes there cannot
+        change the source. Parts obtained through doc[...] are written on every save, since their
+        DOM may have been edited directly.
 
         Args:
             destination: Optional path to save to. If None, saves back to original directory.
@@ -871,17 +1273,135 @@ class Document:
             self._ensure_comment_relationships()
             self._ensure_comment_content_types()
 
-        # Save all modified XML files in temp directory
-        for editor in self._editors.values():
-            editor.save()
+        # Save modified XML files in temp directory. Parts handed out via
+        # doc[...] are always written: direct DOM edits don't set modified
+        for xml_path, editor in self._editors.items():
+            if editor.modified or xml_path in self._exposed:
+                editor.save()
+                editor.modified = False
 
         # Validate by default
         if validate:
             self.validate()
 
-        # Copy contents from temp directory to destination (or original directory)
         target_path = Path(destination) if destination else self.original_path
-        shutil.copytree(self.unpacked_path, target_path, dirs_exist_ok=True)
+        in_place = target_path.resolve() == self.original_path.resolve()
+        if in_place:
+            # The source is about to change; capture the baseline while it can
+            self._ensure_baseline()
+
+        # Write changed and new files; unchanged files only need to exist in a
+        # separate destination, where they are copied from the source. Files
+        # are replaced rather than written into, so no hard link carries the
+        # write to another directory
+        current = self._snapshot()
+        for rel_path, stat in current.items():
+            source = self.unpacked_path / rel_path
+            target = target_path / rel_path
+            if self._synced.get(rel_path) != stat:
+                if not (target.exists() and target.samefile(source)):
+                    self._replace_with_copy(source, target)
+            elif not in_place:
+                source = self.original_path / rel_path
+                if not self._is_copy_of(target, source):
+                    self._replace_with_copy(source, target)
+        if in_place:
+            self._synced = current
+
+    # ==================== Private: Session Files ====================
+
+    @classmethod
+    def _clone_tree(cls, source, target):
+        """Mirror source into target, copying XML parts and linking the rest."""
+        target.mkdir(parents=True, exist_ok=True)
+        for src in source.rglob("*"):
+            dest = target / src.relative_to(source)
+            if src.is_dir():
+                dest.mkdir(parents=True, exist_ok=True)
+            else:
+                dest.parent.mkdir(parents=True, exist_ok=True)
+                cls._link_or_copy(src, dest)
+
+    @staticmethod
+    def _replace_with_copy(src, dest):
+        """Copy src into a new file and move it over dest (src may be dest)."""
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=dest.parent, prefix=".", suffix=".tmp")
+        os.close(fd)
+        try:
+            shutil.copy2(src, tmp_name)
+            os.replace(tmp_name, dest)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+
+    @staticmethod
+    def _is_copy_of(dest, src):
+        """True if dest is a separate file that still matches the copy of src.
+
+        copy2 preserves mtime, so size and mtime identify an earlier copy.
+        """
+        try:
+            dest_stat, src_stat = dest.stat(), src.stat()
+        except OSError:
+            return False
+        return (
+            (dest_stat.st_dev, dest_stat.st_ino) != (src_stat.st_dev, src_stat.st_ino)
+            and dest_stat.st_size == src_stat.st_size
+            and dest_stat.st_mtime_ns == src_stat.st_mtime_ns
+        )
+
+    @staticmethod
+    def _link_or_copy(src, dest):
+        """Hard link src to dest unless it is an XML part or linking is not possible.
+
+        Only used to build the private session directory. XML parts are always
+        copied because editors rewrite them in place; other parts must be
+        broken out with writable_path() before they are written in place.
+        """
+        if dest.exists():
+            if dest.samefile(src):
+                return
+            dest.unlink()
+        if src.suffix not in (".xml", ".rels"):
+            try:
+                os.link(src, dest)
+                return
+            except OSError:
+                # Different filesystem or links not supported
+                pass
+        shutil.copy2(src, dest)
+
+    def _snapshot(self):
+        """Map every file in the session to (inode, size, mtime) for change detection."""
+        snapshot = {}
+        for path in self.unpacked_path.rglob("*"):
+            if path.is_file():
+                stat = path.stat()
+                snapshot[path.relative_to(self.unpacked_path)] = (
+                    stat.st_ino,
+                    stat.st_size,
+                    stat.st_mtime_ns,
+                )
+        return snapshot
+
+    def _ensure_baseline(self):
+        """Pack the source's XML parts into original.docx for validation, once.
+
+        The validators only read XML and relationship parts, so media and other
+        binary parts are left out of the baseline.
+        """
+        if self.original_docx.exists():
+            return
+        baseline_dir = Path(self.temp_dir) / "baseline"
+        for src in self.original_path.rglob("*"):
+            if src.is_file() and src.suffix in (".xml", ".rels"):
+                dest = baseline_dir / src.relative_to(self.original_path)
+                dest.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(src, dest)
+        baseline_dir.mkdir(exist_ok=True)
+        pack_document(baseline_dir, self.original_docx, validate=False)
+        shutil.rmtree(baseline_dir)
 
     # ==================== Private: Initialization ====================
 
@@ -890,7 +1410,7 @@ class Document:
         if not self.comments_path.exists():
             return 0
 
-        editor = self["word/comments.xml"]
+        editor = self._get_editor("word/comments.xml")
         max_id = -1
         for comment_elem in editor.dom.getElementsByTagName("w:comment"):
             comment_id = comment_elem.getAttribute("w:id")
@@ -906,7 +1426,7 @@ class Document:
         if not self.comments_path.exists():
             return {}
 
-        editor = self["word/comments.xml"]
+        editor = self._get_editor("word/comments.xml")
         existing = {}
 
         for comment_elem in editor.dom.getElementsByTagName("w:comment"):
@@ -959,7 +1479,7 @@ class Document:
 
     def _add_content_type_for_people(self, path):
         """Add people.xml content type to [Content_Types].xml if not already present."""
-        editor = self["[Content_Types].xml"]
+        editor = self._get_editor("[Content_Types].xml")
 
         if self._has_override(editor, "/word/people.xml"):
             return
@@ -971,7 +1491,7 @@ class Document:
 
     def _add_relationship_for_people(self, path):
         """Add people.xml relationship to document.xml.rels if not already present."""
-        editor = self["word/_rels/document.xml.rels"]
+        editor = self._get_editor("word/_rels/document.xml.rels")
 
         if self._has_relationship(editor, "people.xml"):
             return
@@ -996,7 +1516,7 @@ class Document:
         - trackRevisions: early (before defaultTabStop)
         - rsids: late (after compat)
         """
-        editor = self["word/settings.xml"]
+        editor = self._get_editor("word/settings.xml")
         root = editor.get_node(tag="w:settings")
         prefix = root.tagName.split(":")[0] if ":" in root.tagName else "w"
 
@@ -1072,7 +1592,7 @@ class Document:
         if not self.comments_path.exists():
             shutil.copy(TEMPLATE_DIR / "comments.xml", self.comments_path)
 
-        editor = self["word/comments.xml"]
+        editor = self._get_editor("word/comments.xml")
         root = editor.get_node(tag="w:comments")
 
         escaped_text = (
@@ -1095,7 +1615,7 @@ class Document:
                 TEMPLATE_DIR / "commentsExtended.xml", self.comments_extended_path
             )
 
-        editor = self["word/commentsExtended.xml"]
+        editor = self._get_editor("word/commentsExtended.xml")
         root = editor.get_node(tag="w15:commentsEx")
 
         if parent_para_id:
@@ -1109,7 +1629,7 @@ class Document:
         if not self.comments_ids_path.exists():
             shutil.copy(TEMPLATE_DIR / "commentsIds.xml", self.comments_ids_path)
 
-        editor = self["word/commentsIds.xml"]
+        editor = self._get_editor("word/commentsIds.xml")
         root = editor.get_node(tag="w16cid:commentsIds")
 
         xml = f'<w16cid:commentId w16cid:paraId="{para_id}" w16cid:durableId="{durable_id}"/>'
@@ -1122,7 +1642,7 @@ class Document:
                 TEMPLATE_DIR / "commentsExtensible.xml", self.comments_extensible_path
             )
 
-        editor = self["word/commentsExtensible.xml"]
+        editor = self._get_editor("word/commentsExtensible.xml")
         root = editor.get_node(tag="w16cex:commentsExtensible")
 
         xml = f'<w16cex:commentExtensible w16cex:durableId="{durable_id}"/>'
@@ -1186,7 +1706,7 @@ class Document:
         if not people_path.exists():
             raise ValueError("people.xml should exist after _setup_tracking")
 
-        editor = self["word/people.xml"]
+        editor = self._get_editor("word/people.xml")
         root = editor.get_node(tag="w15:people")
 
         # Check if author already exists
@@ -1202,7 +1722,7 @@ class Document:
 
     def _ensure_comment_relationships(self):
         """Ensure word/_rels/document.xml.rels has comment relationships."""
-        editor = self["word/_rels/document.xml.rels"]
+        editor = self._get_editor("word/_rels/document.xml.rels")
 
         if self._has_relationship(editor, "comments.xml"):
             return
@@ -1242,7 +1762,7 @@ class Document:
 
     def _ensure_comment_content_types(self):
         """Ensure [Content_Types].xml has comment content types."""
-        editor = self["[Content_Types].xml"]
+        editor = self._get_editor("[Content_Types].xml")
 
         if self._has_override(editor, "/word/comments.xml"):
             return
@@ -28,14 +28,20 @@ Example usage:
 
     # Save changes
     editor.save()
+
+LxmlXMLEditor offers the same API on top of lxml.etree, which parses large
+files much faster and with far less memory than minidom:
+    editor = LxmlXMLEditor("document.xml")
 """
 
 import html
+import re
 from pathlib import Path
 from typing import Optional, Union
 
 import defusedxml.minidom
 import defusedxml.sax
+import lxml.etree
 
 
 class XMLEditor:
@@ -46,10 +52,20 @@ class XMLEditor:
     of each element. This enables finding nodes by their line number in the original
     file, which is useful when working with Read tool output.
 
+    Lookups go through a lazily built index (by tag, by attribute value and by
+    source line). The index is kept up to date by replace_node, insert_after,
+    insert_before and append_to. Text for `contains` is always read from the
+    live DOM, so changing text nodes directly needs no bookkeeping. Code that
+    adds, removes or re-attributes elements directly should call
+    _unindex_subtree before and _index_subtree after the change, or
+    invalidate_index() afterwards; otherwise a lookup may miss an element the
+    index does not know about yet.
+
     Attributes:
         xml_path: Path to the XML file being edited
         encoding: Detected encoding of the XML file ('ascii' or 'utf-8')
         dom: Parsed DOM tree with parse_position attributes on elements
+        modified: True once the DOM has been changed through the editor
     """
 
     def __init__(self, xml_path):
@@ -73,6 +89,12 @@ class XMLEditor:
         parser = _create_line_tracking_parser()
         self.dom = defusedxml.minidom.parse(str(self.xml_path), parser)
 
+        # Built on first get_node call
+        self._index = None
+        # Set by the editing methods; code that changes self.dom directly
+        # should set it too so the file is written on save
+        self.modified = False
+
     def get_node(
         self,
         tag: str,
@@ -109,8 +131,11 @@ class XMLEditor:
             elem = editor.get_node(tag="w:t", contains="&#8220;Agreement")  # Entity notation
             elem = editor.get_node(tag="w:t", contains="\u201cAgreement")   # Unicode character
         """
-        matches = []
-        for elem in self.dom.getElementsByTagName(tag):
+        # Normalize the search string: convert HTML entities to Unicode characters
+        # This allows searching for both "&#8220;Rowan" and ""Rowan"
+        normalized_contains = html.unescape(contains) if contains is not None else None
+
+        def matches_filters(elem):
             # Check line_number filter
             if line_number is not None:
                 parse_pos = getattr(elem, "parse_position", (None,))
@@ -119,10 +144,10 @@ class XMLEditor:
                 # Handle both single line number and range
                 if isinstance(line_number, range):
                     if elem_line not in line_number:
-                        continue
+                        return False
                 else:
                     if elem_line != line_number:
-                        continue
+                        return False
 
             # Check attrs filter
             if attrs is not None:
@@ -130,55 +155,40 @@ class XMLEditor:
                     elem.getAttribute(attr_name) == attr_value
                     for attr_name, attr_value in attrs.items()
                 ):
-                    continue
+                    return False
 
             # Check contains filter
-            if contains is not None:
-                elem_text = self._get_element_text(elem)
-                # Normalize the search string: convert HTML entities to Unicode characters
-                # This allows searching for both "&#8220;Rowan" and ""Rowan"
-                normalized_contains = html.unescape(contains)
-                if normalized_contains not in elem_text:
-                    continue
-
-            # If all applicable filters passed, this is a match
-            matches.append(elem)
+            if normalized_contains is not None:
+                if normalized_contains not in self._get_element_text(elem):
+                    return False
+
+            return True
+
+        if tag == "*":
+            candidates = self.dom.getElementsByTagName(tag)
+        else:
+            if self._index is None:
+                self._index = _NodeIndex(self.dom)
+            candidates = self._index.candidates(tag, attrs, line_number)
+        # Candidates are re-checked against the live DOM (attributes, text and
+        # attachment), so an index entry for a removed or changed element
+        # cannot produce a match
+        matches = [
+            elem
+            for elem in candidates
+            if matches_filters(elem) and self._is_attached(elem)
+        ]
 
-        if not matches:
-            # Build descriptive error message
-            filters = []
-            if line_number is not None:
-                line_str = (
-                    f"lines {line_number.start}-{line_number.stop - 1}"
-                    if isinstance(line_number, range)
-                    else f"line {line_number}"
-                )
-                filters.append(f"at {line_str}")
-            if attrs is not None:
-                filters.append(f"with attributes {attrs}")
-            if contains is not None:
-                filters.append(f"containing '{contains}'")
-
-            filter_desc = " ".join(filters) if filters else ""
-            base_msg = f"Node not found: <{tag}> {filter_desc}".strip()
-
-            # Add helpful hint based on filters used
-            if contains:
-                hint = "Text may be split across elements or use different wording."
-            elif line_number:
-                hint = "Line numbers may have changed if document was modified."
-            elif attrs:
-                hint = "Verify attribute values are correct."
-            else:
-                hint = "Try adding filters (attrs, line_number, or contains)."
+        if not matches and tag != "*":
+            # Fall back to a full scan in case the DOM was edited behind the
+            # index's back; rebuild the index if that finds anything
+            matches = [
+                elem for elem in self.dom.getElementsByTagName(tag) if matches_filters(elem)
+            ]
+            if matches:
+                self.invalidate_index()
 
-            raise ValueError(f"{base_msg}. {hint}")
-        if len(matches) > 1:
-            raise ValueError(
-                f"Multiple nodes found: <{tag}>. "
-                f"Add more filters (attrs, line_number, or contains) to narrow the search."
-            )
-        return matches[0]
+        return _single_match(matches, tag, attrs, line_number, contains)
 
     def _get_element_text(self, elem):
         """
@@ -203,6 +213,28 @@ class XMLEditor:
                 text_parts.append(self._get_element_text(node))
         return "".join(text_parts)
 
+    def invalidate_index(self):
+        """Drop the node index; it is rebuilt on the next lookup."""
+        self._index = None
+
+    def _index_subtree(self, node):
+        """Add node and its descendant elements to the index after an edit."""
+        if self._index is not None:
+            self._index.add_subtree(node)
+
+    def _unindex_subtree(self, node):
+        """Remove node and its descendant elements from the index before an edit."""
+        if self._index is not None:
+            self._index.remove_subtree(node)
+
+    def _is_attached(self, node):
+        """Return True if node is still part of this editor's document."""
+        while node is not None:
+            if node is self.dom:
+                return True
+            node = node.parentNode
+        return False
+
     def replace_node(self, elem, new_content):
         """
         Replace a DOM element with new XML content.
@@ -219,9 +251,13 @@ class XMLEditor:
         """
         parent = elem.parentNode
         nodes = self._parse_fragment(new_content)
+        self.modified = True
+        self._unindex_subtree(elem)
         for node in nodes:
             parent.insertBefore(node, elem)
         parent.removeChild(elem)
+        for node in nodes:
+            self._index_subtree(node)
         return nodes
 
     def insert_after(self, elem, xml_content):
@@ -241,11 +277,14 @@ class XMLEditor:
         parent = elem.parentNode
         next_sibling = elem.nextSibling
         nodes = self._parse_fragment(xml_content)
+        self.modified = True
         for node in nodes:
             if next_sibling:
                 parent.insertBefore(node, next_sibling)
             else:
                 parent.appendChild(node)
+        for node in nodes:
+            self._index_subtree(node)
         return nodes
 
     def insert_before(self, elem, xml_content):
@@ -264,8 +303,11 @@ class XMLEditor:
         """
         parent = elem.parentNode
         nodes = self._parse_fragment(xml_content)
+        self.modified = True
         for node in nodes:
             parent.insertBefore(node, elem)
+        for node in nodes:
+            self._index_subtree(node)
         return nodes
 
     def append_to(self, elem, xml_content):
@@ -283,8 +325,11 @@ class XMLEditor:
             new_nodes = editor.append_to(elem, "<w:r><w:t>text</w:t></w:r>")
         """
         nodes = self._parse_fragment(xml_content)
+        self.modified = True
         for node in nodes:
             elem.appendChild(node)
+        for node in nodes:
+            self._index_subtree(node)
         return nodes
 
     def get_next_rid(self):
@@ -343,6 +388,566 @@ class XMLEditor:
         return nodes
 
 
+class _NodeIndex:
+    """
+    Lookup tables over the elements of a minidom document.
+
+    Elements are indexed by tag name, by source line (from parse_position) and,
+    for (tag, attribute) pairs that have been queried at least once, by
+    attribute value. Every table maps to dicts used as ordered sets.
+    """
+
+    def __init__(self, dom):
+        self.by_tag = {}
+        self.by_line = {}
+        self.by_attr = {}
+        # elem -> (tag, line, {attr_name: value}) as recorded at index time
+        self.records = {}
+        if dom.documentElement is not None:
+            self.add_subtree(dom.documentElement)
+
+    def candidates(self, tag, attrs=None, line_number=None):
+        """Return the smallest indexed set of elements that may match the filters."""
+        buckets = []
+        for attr_name, attr_value in (attrs or {}).items():
+            # getAttribute returns "" for missing attributes, so an empty value
+            # cannot be answered from the index and is left to the filter
+            if attr_value != "":
+                buckets.append(self._attr_table(tag, attr_name).get(attr_value, {}))
+        if line_number is not None:
+            lines = self.by_line.get(tag, {})
+            if isinstance(line_number, range):
+                if len(line_number) > len(lines):
+                    keys = [line for line in lines if line in line_number]
+                else:
+                    keys = [line for line in line_number if line in lines]
+            else:
+                keys = [line_number] if line_number in lines else []
+            bucket = {}
+            for line in keys:
+                bucket.update(lines[line])
+            buckets.append(bucket)
+        if not buckets:
+            return list(self.by_tag.get(tag, {}))
+        return list(min(buckets, key=len))
+
+    def add_subtree(self, node):
+        for elem in _iter_elements(node):
+            tag = elem.tagName
+            line = getattr(elem, "parse_position", (None,))[0]
+            values = {}
+            for (attr_tag, attr_name), table in self.by_attr.items():
+                if attr_tag == tag and elem.hasAttribute(attr_name):
+                    value = elem.getAttribute(attr_name)
+                    values[attr_name] = value
+                    table.setdefault(value, {})[elem] = None
+            self.by_tag.setdefault(tag, {})[elem] = None
+            if line is not None:
+                self.by_line.setdefault(tag, {}).setdefault(line, {})[elem] = None
+            self.records[elem] = (tag, line, values)
+
+    def remove_subtree(self, node):
+        for elem in _iter_elements(node):
+            record = self.records.pop(elem, None)
+            if record is None:
+                continue
+            tag, line, values = record
+            self.by_tag[tag].pop(elem, None)
+            if line is not None:
+                self.by_line[tag][line].pop(elem, None)
+            for attr_name, value in values.items():
+                self.by_attr[(tag, attr_name)][value].pop(elem, None)
+
+    def _attr_table(self, tag, attr_name):
+        key = (tag, attr_name)
+        table = self.by_attr.get(key)
+        if table is None:
+            table = self.by_attr[key] = {}
+            for elem in self.by_tag.get(tag, {}):
+                if elem.hasAttribute(attr_name):
+                    value = elem.getAttribute(attr_name)
+                    table.setdefault(value, {})[elem] = None
+                    self.records[elem][2][attr_name] = value
+        return table
+
+
+def _iter_elements(node):
+    """Yield node (if it is an element) and all descendant elements."""
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if current.nodeType == current.ELEMENT_NODE:
+            yield current
+        stack.extend(current.childNodes)
+
+
+XML_NAMESPACE = "http://www.w3.org/XML/1998/namespace"
+
+# Every character allowed in XML that str.strip() removes, for
+# whitespace-insensitive XPath matching
+_WHITESPACE = (
+    "\t\n\r \x85\xa0\u1680\u2000\u2001\u2002\u2003\u2004\u2005\u2006"
+    "\u2007\u2008\u2009\u200a\u2028\u2029\u202f\u205f\u3000"
+)
+_STRIP_WHITESPACE = dict.fromkeys(map(ord, _WHITESPACE))
+
+# Matches one namespace declaration inside a start tag
+_XMLNS_DECL = re.compile(r'\s+xmlns(?::([^=\s]+))?="([^"]*)"')
+
+
+class LxmlElement(lxml.etree.ElementBase):
+    """
+    lxml element exposing the parts of the minidom Element API used by the editors.
+
+    Tag and attribute names use the same qualified "prefix:local" form as minidom
+    and are resolved against the namespaces in scope on the element. Text is held
+    in .text and .tail as usual for lxml; there are no separate text nodes, so
+    childNodes/firstChild are not provided.
+    """
+
+    ELEMENT_NODE = 1
+    TEXT_NODE = 3
+    nodeType = ELEMENT_NODE
+
+    @property
+    def tagName(self):
+        local = lxml.etree.QName(self).localname
+        return f"{self.prefix}:{local}" if self.prefix else local
+
+    nodeName = tagName
+
+    @property
+    def parentNode(self):
+        return self.getparent()
+
+    @property
+    def parse_position(self):
+        """(line, column) of the start tag in the original file; column is unknown."""
+        return (self.sourceline, None)
+
+    def getAttribute(self, name):
+        key = self._attribute_key(name)
+        return self.get(key, "") if key is not None else ""
+
+    def hasAttribute(self, name):
+        key = self._attribute_key(name)
+        return key is not None and key in self.attrib
+
+    def setAttribute(self, name, value):
+        key = self._attribute_key(name)
+        if key is None:
+            raise ValueError(f"Namespace prefix of '{name}' is not declared")
+        self.set(key, value)
+
+    def removeAttribute(self, name):
+        key = self._attribute_key(name)
+        if key is not None:
+            self.attrib.pop(key, None)
+
+    def getElementsByTagName(self, name):
+        """Return descendant elements (not self) with the given qualified name."""
+        if name == "*":
+            return list(self.iterdescendants(lxml.etree.Element))
+        key = _clark_name(name, self.nsmap)
+        return list(self.iterdescendants(key)) if key is not None else []
+
+    def toxml(self):
+        """
+        Serialize the element without its tail.
+
+        Namespace declarations inherited from ancestors are left out, matching
+        minidom's output so the result can be spliced into fragments passed to
+        the editor.
+        """
+        xml = lxml.etree.tostring(self, encoding="unicode", with_tail=False)
+        parent = self.getparent()
+        if parent is None:
+            return xml
+        inherited = parent.nsmap
+
+        def drop_inherited(match):
+            if inherited.get(match.group(1)) == match.group(2):
+                return ""
+            return match.group(0)
+
+        end = xml.index(">")
+        return _XMLNS_DECL.sub(drop_inherited, xml[:end]) + xml[end:]
+
+    def _attribute_key(self, name):
+        if ":" not in name:
+            return name
+        prefix, local = name.split(":", 1)
+        uri = XML_NAMESPACE if prefix == "xml" else self.nsmap.get(prefix)
+        return f"{{{uri}}}{local}" if uri is not None else None
+
+
+class LxmlXMLEditor:
+    """
+    XMLEditor counterpart backed by lxml.etree.
+
+    Offers the same get_node, replace_node, insert_after, insert_before,
+    append_to, get_next_rid and save API as XMLEditor. Elements are LxmlElement
+    instances, so code written against the minidom editor (tagName, parentNode,
+    getAttribute, getElementsByTagName, toxml) keeps working. Line numbers come
+    from lxml's sourceline and lookups run as XPath queries, so no Python-side
+    index is needed.
+
+    Attributes:
+        xml_path: Path to the XML file being edited
+        encoding: Detected encoding of the XML file ('ascii' or 'utf-8')
+        dom: Parsed lxml.etree._ElementTree
+        modified: True once the tree has been changed through the editor
+    """
+
+    def __init__(self, xml_path):
+        """
+        Initialize with path to XML file and parse it with lxml.
+
+        Args:
+            xml_path: Path to XML file to edit (str or Path)
+
+        Raises:
+            ValueError: If the XML file does not exist
+        """
+        self.xml_path = Path(xml_path)
+        if not self.xml_path.exists():
+            raise ValueError(f"XML file not found: {xml_path}")
+
+        with open(self.xml_path, "rb") as f:
+            header = f.read(200).decode("utf-8", errors="ignore")
+        self.encoding = "ascii" if 'encoding="ascii"' in header else "utf-8"
+
+        self._parser = _create_lxml_parser()
+        self.dom = lxml.etree.parse(str(self.xml_path), self._parser)
+        # Set by the editing methods; see XMLEditor
+        self.modified = False
+
+    def get_node(
+        self,
+        tag: str,
+        attrs: Optional[dict[str, str]] = None,
+        line_number: Optional[Union[int, range]] = None,
+        contains: Optional[str] = None,
+    ):
+        """
+        Get an element by tag and identifier.
+
+        Same semantics and errors as XMLEditor.get_node. Tag and attribute
+        filters are evaluated as a single XPath query; line and text filters
+        are applied to its results.
+
+        Args:
+            tag: The XML tag name (e.g., "w:del", "w:ins", "w:r")
+            attrs: Dictionary of attribute name-value pairs to match (e.g., {"w:id": "1"})
+            line_number: Line number (int) or line range (range) in original XML file (1-indexed)
+            contains: Text string that must appear in any text node within the element.
+                      Supports both entity notation (&#8220;) and Unicode characters (\u201c).
+
+        Returns:
+            LxmlElement: The matching element
+
+        Raises:
+            ValueError: If node not found or multiple matches found
+        """
+        normalized_contains = html.unescape(contains) if contains is not None else None
+
+        namespaces = {p: uri for p, uri in self.dom.getroot().nsmap.items() if p}
+        default_ns = self.dom.getroot().nsmap.get(None)
+        if default_ns is not None:
+            namespaces["_default"] = default_ns
+
+        def xpath_name(name, attribute=False):
+            if ":" in name or name == "*" or attribute:
+                return name
+            return f"_default:{name}" if default_ns is not None else name
+
+        path = "//" + xpath_name(tag)
+        variables = {}
+        for i, (attr_name, attr_value) in enumerate((attrs or {}).items()):
+            # string() of a missing attribute is "", like minidom's getAttribute
+            path += f"[string(@{xpath_name(attr_name, attribute=True)})=$a{i}]"
+            variables[f"a{i}"] = attr_value
+        if normalized_contains is not None:
+            # Cheap superset of the exact check below: whitespace-only text is
+            # skipped there, so compare with all whitespace removed on both sides
+            path += "[contains(translate(string(.), $ws, ''), $needle)]"
+            variables["ws"] = _WHITESPACE
+            variables["needle"] = normalized_contains.translate(_STRIP_WHITESPACE)
+        try:
+            candidates = self.dom.xpath(path, namespaces=namespaces, **variables)
+        except (lxml.etree.XPathEvalError, ValueError):
+            # Undeclared prefix in tag or attrs, or a value that is not valid
+            # XML text: nothing can match
+            candidates = []
+
+        matches = []
+        for elem in candidates:
+            if line_number is not None:
+                if isinstance(line_number, range):
+                    if elem.sourceline not in line_number:
+                        continue
+                elif elem.sourceline != line_number:
+                    continue
+            if normalized_contains is not None:
+                if normalized_contains not in self._get_element_text(elem):
+                    continue
+            matches.append(elem)
+
+        return _single_match(matches, tag, attrs, line_number, contains)
+
+    def _get_element_text(self, elem):
+        """
+        Extract all text content from an element, skipping whitespace-only text.
+
+        Args:
+            elem: Element to extract text from
+
+        Returns:
+            str: Concatenated text from all non-whitespace text within the element
+        """
+        return "".join(text for text in elem.itertext() if text.strip())
+
+    def replace_node(self, elem, new_content):
+        """
+        Replace an element with new XML content.
+
+        Args:
+            elem: Element to replace
+            new_content: String containing XML to replace the node with
+
+        Returns:
+            List[LxmlElement]: All inserted nodes
+        """
+        text, nodes = self._parse_fragment(new_content)
+        self.modified = True
+        for node in nodes:
+            elem.addprevious(node)
+        _append_text_before(nodes[0], text)
+        tail, elem.tail = elem.tail, None
+        elem.getparent().remove(elem)
+        nodes[-1].tail = _join_text(nodes[-1].tail, tail)
+        return nodes
+
+    def insert_after(self, elem, xml_content):
+        """
+        Insert XML content after an element.
+
+        Args:
+            elem: Element to insert after
+            xml_content: String containing XML to insert
+
+        Returns:
+            List[LxmlElement]: All inserted nodes
+        """
+        text, nodes = self._parse_fragment(xml_content)
+        self.modified = True
+        tail, elem.tail = elem.tail, text
+        anchor = elem
+        for node in nodes:
+            anchor.addnext(node)
+            anchor = node
+        anchor.tail = _join_text(anchor.tail, tail)
+        return nodes
+
+    def insert_before(self, elem, xml_content):
+        """
+        Insert XML content before an element.
+
+        Args:
+            elem: Element to insert before
+            xml_content: String containing XML to insert
+
+        Returns:
+            List[LxmlElement]: All inserted nodes
+        """
+        text, nodes = self._parse_fragment(xml_content)
+        self.modified = True
+        for node in nodes:
+            elem.addprevious(node)
+        _append_text_before(nodes[0], text)
+        return nodes
+
+    def append_to(self, elem, xml_content):
+        """
+        Append XML content as children of an element.
+
+        Args:
+            elem: Element to append to
+            xml_content: String containing XML to append
+
+        Returns:
+            List[LxmlElement]: All inserted nodes
+        """
+        text, nodes = self._parse_fragment(xml_content)
+        self.modified = True
+        if len(elem):
+            elem[-1].tail = _join_text(elem[-1].tail, text)
+        else:
+            elem.text = _join_text(elem.text, text)
+        for node in nodes:
+            elem.append(node)
+        return nodes
+
+    def get_next_rid(self):
+        """Get the next available rId for relationships files."""
+        max_id = 0
+        for rel_elem in self.dom.getroot().iter("{*}Relationship"):
+            rel_id = rel_elem.get("Id", "")
+            if rel_id.startswith("rId"):
+                try:
+                    max_id = max(max_id, int(rel_id[3:]))
+                except ValueError:
+                    pass
+        return f"rId{max_id + 1}"
+
+    def save(self):
+        """
+        Save the edited XML back to the file.
+
+        Preserves the original encoding (ascii or utf-8) and standalone="yes".
+        """
+        # docinfo reports False both for standalone="no" and for no declaration
+        standalone = True if self.dom.docinfo.standalone else None
+        self.dom.write(
+            str(self.xml_path),
+            encoding=self.encoding,
+            xml_declaration=True,
+            standalone=standalone,
+        )
+
+    def create_element(self, name):
+        """Create a detached element from a qualified name declared on the root."""
+        root_nsmap = self.dom.getroot().nsmap
+        key = _clark_name(name, root_nsmap)
+        if key is None:
+            raise ValueError(f"Namespace prefix of '{name}' is not declared")
+        prefix = name.rpartition(":")[0] or None
+        nsmap = {prefix: root_nsmap[prefix]} if prefix in root_nsmap else None
+        return self._parser.makeelement(key, nsmap=nsmap)
+
+    def _ensure_namespace(self, prefix, uri):
+        """Declare prefix on the root element so attributes can use it."""
+        root = self.dom.getroot()
+        if prefix in root.nsmap:
+            return
+        # cleanup_namespaces drops unused declarations, so every prefix declared
+        # in the document is kept explicitly; the probe element makes the new
+        # one used. Scanning the serialized tree is much faster than walking
+        # elem.nsmap, and a false hit only keeps a declaration that exists anyway.
+        serialized = lxml.etree.tostring(root, encoding="unicode")
+        prefixes = {m.group(1) for m in _XMLNS_DECL.finditer(serialized) if m.group(1)}
+        probe = lxml.etree.SubElement(root, f"{{{uri}}}_")
+        lxml.etree.cleanup_namespaces(
+            root, top_nsmap={prefix: uri}, keep_ns_prefixes=sorted(prefixes)
+        )
+        root.remove(probe)
+
+    def _parse_fragment(self, xml_content):
+        """
+        Parse XML fragment using the root element's namespace declarations.
+
+        Args:
+            xml_content: String containing XML fragment
+
+        Returns:
+            Tuple of (leading text, list of top-level nodes in the fragment)
+
+        Raises:
+            AssertionError: If fragment contains no element nodes
+        """
+        namespaces = [
+            f'xmlns:{prefix}="{uri}"' if prefix else f'xmlns="{uri}"'
+            for prefix, uri in self.dom.getroot().nsmap.items()
+        ]
+        wrapper = f"<root {' '.join(namespaces)}>{xml_content}</root>"
+        fragment = lxml.etree.fromstring(wrapper, self._parser)
+        nodes = list(fragment)
+        elements = [n for n in nodes if isinstance(n.tag, str)]
+        assert elements, "Fragment must contain at least one element"
+        # New content has no line in the original file
+        for node in nodes:
+            for elem in node.iter():
+                elem.sourceline = 0
+        return fragment.text, nodes
+
+
+def _single_match(matches, tag, attrs, line_number, contains):
+    """Return the only element in matches or raise a descriptive ValueError."""
+    if not matches:
+        # Build descriptive error message
+        filters = []
+        if line_number is not None:
+            line_str = (
+                f"lines {line_number.start}-{line_number.stop - 1}"
+                if isinstance(line_number, range)
+                else f"line {line_number}"
+            )
+            filters.append(f"at {line_str}")
+        if attrs is not None:
+            filters.append(f"with attributes {attrs}")
+        if contains is not None:
+            filters.append(f"containing '{contains}'")
+
+        filter_desc = " ".join(filters) if filters else ""
+        base_msg = f"Node not found: <{tag}> {filter_desc}".strip()
+
+        # Add helpful hint based on filters used
+        if contains:
+            hint = "Text may be split across elements or use different wording."
+        elif line_number:
+            hint = "Line numbers may have changed if document was modified."
+        elif attrs:
+            hint = "Verify attribute values are correct."
+        else:
+            hint = "Try adding filters (attrs, line_number, or contains)."
+
+        raise ValueError(f"{base_msg}. {hint}")
+    if len(matches) > 1:
+        raise ValueError(
+            f"Multiple nodes found: <{tag}>. "
+            f"Add more filters (attrs, line_number, or contains) to narrow the search."
+        )
+    return matches[0]
+
+
+def _clark_name(name, nsmap):
+    """Convert a "prefix:local" element name to {uri}local, or None if undeclared."""
+    prefix, _, local = name.rpartition(":")
+    uri = XML_NAMESPACE if prefix == "xml" else nsmap.get(prefix or None)
+    if uri is None:
+        return local if not prefix else None
+    return f"{{{uri}}}{local}"
+
+
+def _join_text(first, second):
+    if not second:
+        return first
+    return (first or "") + second
+
+
+def _append_text_before(node, text):
+    """Append text to whatever text directly precedes node in its parent."""
+    if not text:
+        return
+    previous = node.getprevious()
+    if previous is not None:
+        previous.tail = _join_text(previous.tail, text)
+    else:
+        parent = node.getparent()
+        parent.text = _join_text(parent.text, text)
+
+
+def _create_lxml_parser():
+    """Create an lxml parser that builds LxmlElement nodes and never resolves entities."""
+    parser = lxml.etree.XMLParser(
+        resolve_entities=False, no_network=True, huge_tree=True
+    )
+    parser.set_element_class_lookup(
+        lxml.etree.ElementDefaultClassLookup(element=LxmlElement)
+    )
+    return parser
+
+
 def _create_line_tracking_parser():
     """
     Create a SAX parser that tracks line and column numbers for each element.
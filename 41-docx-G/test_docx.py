@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""41-docx 测试脚本"""
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SKILL_ROOT = Path(__file__).resolve().parent
+
+
+def run_from_skill_root(code):
+    """在技能根目录下用新的解释器执行代码（与实际使用方式一致）"""
+    return subprocess.run(
+        [sys.executable, "-c", code], cwd=SKILL_ROOT, capture_output=True, text=True
+    )
+
+
+def test_document_library_imports_from_skill_root():
+    """scripts.document 经由 ooxml.scripts.pack 导入 office_service"""
+    result = run_from_skill_root("from scripts.document import Document")
+    assert result.returncode == 0, result.stderr
+
+
+def test_pack_runs_as_script():
+    """pack.py 作为脚本运行时使用顶层导入"""
+    result = subprocess.run(
+        [sys.executable, "pack.py", "--help"],
+        cwd=SKILL_ROOT / "ooxml" / "scripts",
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+
+
+XML = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">\n'
+    "<w:body>\n"
+    "<w:p><w:r><w:t>Alpha</w:t></w:r><w:r><w:t> Beta</w:t></w:r></w:p>\n"
+    "<w:p><w:r><w:t>Gamma</w:t></w:r></w:p>\n"
+    "</w:body>\n"
+    "</w:document>\n"
+)
+
+
+def make_editor(tmp_path):
+    from scripts.utilities import XMLEditor
+
+    path = tmp_path / "document.xml"
+    path.write_text(XML, encoding="utf-8")
+    return XMLEditor(path)
+
+
+def test_contains_sees_runs_removed_directly(tmp_path):
+    """直接删除 w:r 后，contains 查找不应再命中旧文本"""
+    editor = make_editor(tmp_path)
+    para = editor.get_node(tag="w:p", contains="Alpha Beta")
+    para.removeChild(para.getElementsByTagName("w:r")[1])
+    assert editor.get_node(tag="w:p", contains="Alpha") is para
+    with pytest.raises(ValueError):
+        editor.get_node(tag="w:p", contains="Alpha Beta")
+
+
+def test_contains_sees_text_changed_directly(tmp_path):
+    """直接修改文本节点后，contains 按新文本查找"""
+    editor = make_editor(tmp_path)
+    para = editor.get_node(tag="w:p", contains="Gamma")
+    para.getElementsByTagName("w:t")[0].firstChild.data = "Delta"
+    assert editor.get_node(tag="w:p", contains="Delta") is para
+
+
+def test_contains_reports_ambiguity_after_direct_edit(tmp_path):
+    """直接编辑造成的多个匹配必须报错，而不是返回旧的唯一结果"""
+    editor = make_editor(tmp_path)
+    editor.get_node(tag="w:p", contains="Alpha")
+    gamma = editor.get_node(tag="w:t", contains="Gamma")
+    gamma.firstChild.data = "Alpha again"
+    with pytest.raises(ValueError, match="Multiple"):
+        editor.get_node(tag="w:p", contains="Alpha")
+
+
+def test_direct_edits_after_save_are_written(tmp_path):
+    """通过 doc[...] 取得的编辑器，在 save() 之后的直接修改也要写回"""
+    import zipfile
+
+    import docx
+    from scripts.document import Document
+
+    source = tmp_path / "in.docx"
+    word = docx.Document()
+    word.add_paragraph("Alpha")
+    word.save(source)
+    unpacked = tmp_path / "unpacked"
+    with zipfile.ZipFile(source) as zf:
+        zf.extractall(unpacked)
+
+    doc = Document(unpacked)
+    editor = doc["word/document.xml"]
+    doc.save(validate=False)
+    editor.get_node(tag="w:t", contains="Alpha").firstChild.data = "Omega"
+    doc.save(validate=False)
+    assert "Omega" in (unpacked / "word" / "document.xml").read_text(encoding="utf-8")
+
+
+def make_unpacked_docx(tmp_path):
+    """生成 docx 并解包，另放一个媒体文件；返回解包目录"""
+    import zipfile
+
+    import docx
+
+    word = docx.Document()
+    word.add_paragraph("Alpha")
+    word.save(tmp_path / "in.docx")
+    unpacked = tmp_path / "unpacked"
+    with zipfile.ZipFile(tmp_path / "in.docx") as zf:
+        zf.extractall(unpacked)
+    (unpacked / "word" / "media").mkdir()
+    (unpacked / "word" / "media" / "image1.png").write_bytes(b"original image")
+    return unpacked
+
+
+def test_save_to_destination_does_not_share_files_with_source(tmp_path):
+    """另存到其他目录时不使用硬链接，写目标文件不会改动源文件"""
+    from scripts.document import Document
+
+    unpacked = make_unpacked_docx(tmp_path)
+    media = unpacked / "word" / "media" / "image1.png"
+    original = media.read_bytes()
+
+    doc = Document(unpacked)
+    out = tmp_path / "out"
+    doc.save(out, validate=False)
+    copied = out / media.relative_to(unpacked)
+    assert not copied.samefile(media)
+    with open(copied, "r+b") as f:
+        f.write(b"changed")
+    assert media.read_bytes() == original
+
+    # 再次保存会修复目标目录中被改动的文件
+    doc.save(out, validate=False)
+    assert copied.read_bytes() == original
+
+
+def test_writable_path_breaks_session_link(tmp_path):
+    """writable_path 返回的会话文件可以原地写入而不影响源文件"""
+    from scripts.document import Document
+
+    unpacked = make_unpacked_docx(tmp_path)
+    media = unpacked / "word" / "media" / "image1.png"
+    original = media.read_bytes()
+
+    doc = Document(unpacked)
+    path = doc.writable_path(media.relative_to(unpacked))
+    with open(path, "r+b") as f:
+        f.write(b"changed")
+    assert media.read_bytes() == original
+
+    out = tmp_path / "out"
+    doc.save(out, validate=False)
+    assert (out / media.relative_to(unpacked)).read_bytes().startswith(b"changed")
+    assert media.read_bytes() == original
+
+
+PARITY_PARTS = ["word/document.xml", "word/comments.xml", "word/commentsExtended.xml", "word/people.xml"]
+
+
+def edit_with_engine(tmp_path, engine):
+    """用指定引擎对同一份 docx 做一组修订和批注，返回保存后的各部件"""
+    import random
+    import zipfile
+
+    import docx
+    from scripts.document import Document
+
+    word = docx.Document()
+    for text in ["First paragraph", "Second paragraph", "Third paragraph", "Fourth paragraph"]:
+        word.add_paragraph(text)
+    word.save(tmp_path / f"{engine}.docx")
+    unpacked = tmp_path / engine
+    with zipfile.ZipFile(tmp_path / f"{engine}.docx") as zf:
+        zf.extractall(unpacked)
+
+    # 批注的 paraId/durableId 取自 random
+    random.seed(7)
+    doc = Document(unpacked, rsid="00AB12CD", author="Tester", initials="T", engine=engine)
+    editor = doc["word/document.xml"]
+    editor.suggest_deletion(editor.get_node(tag="w:r", contains="First paragraph"))
+    editor.replace_node(
+        editor.get_node(tag="w:r", contains="Second paragraph"),
+        "<w:del><w:r><w:delText>Second paragraph</w:delText></w:r></w:del>"
+        "<w:ins><w:r><w:t>Second, revised</w:t></w:r></w:ins>",
+    )
+    editor.insert_after(
+        editor.get_node(tag="w:p", contains="Third paragraph"),
+        "<w:p><w:ins><w:r><w:t>Inserted paragraph</w:t></w:r></w:ins></w:p>",
+    )
+    editor.revert_insertion(editor.get_node(tag="w:ins", contains="Second, revised"))
+    fourth = editor.get_node(tag="w:p", contains="Fourth paragraph")
+    comment_id = doc.add_comment(fourth, fourth, "Check this")
+    doc.reply_to_comment(comment_id, "Agreed")
+    doc.save(validate=False)
+    return {part: (unpacked / part).read_bytes() for part in PARITY_PARTS}
+
+
+def canonical_xml(data):
+    """C14N 规范化：忽略 XML 声明、属性顺序、空白和时间戳"""
+    import re
+
+    from lxml import etree
+
+    data = re.sub(rb'w:date="[^"]*"', b'w:date=""', data)
+    root = etree.fromstring(data, etree.XMLParser(remove_blank_text=True))
+    return etree.tostring(root, method="c14n")
+
+
+def test_lxml_engine_matches_minidom(tmp_path):
+    """minidom 与 lxml 引擎执行同样的修订、批注和回复，结果文档一致"""
+    pytest.importorskip("lxml")
+    minidom_parts = edit_with_engine(tmp_path, "minidom")
+    lxml_parts = edit_with_engine(tmp_path, "lxml")
+
+    document = minidom_parts["word/document.xml"].decode("utf-8")
+    for marker in ["<w:delText>First paragraph", "Inserted paragraph", "commentRangeStart", "Second paragraph"]:
+        assert marker in document
+    assert "Agreed" in minidom_parts["word/comments.xml"].decode("utf-8")
+
+    for part in PARITY_PARTS:
+        assert canonical_xml(lxml_parts[part]) == canonical_xml(minidom_parts[part]), part
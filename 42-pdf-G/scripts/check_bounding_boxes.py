@@ -1,12 +1,18 @@
 from dataclasses import dataclass
+from collections import defaultdict
+import argparse
+import heapq
 import json
-import sys
 
 
 # Script to check that the `fields.json` file that Claude creates when analyzing PDFs
 # does not have overlapping bounding boxes. See forms.md.
 
 
+# Output is cut off after this many messages (including the "Read N fields" line).
+MAX_MESSAGES = 20
+
+
 @dataclass
 class RectAndField:
     rect: list[float]
@@ -14,57 +20,134 @@ class RectAndField:
     field: dict
 
 
-# Returns a list of messages that are printed to stdout for Claude to read.
-def get_bounding_box_messages(fields_json_stream) -> list[str]:
-    messages = []
-    fields = json.load(fields_json_stream)
-    messages.append(f"Read {len(fields['form_fields'])} fields")
+def rects_intersect(r1, r2):
+    disjoint_horizontal = r1[0] >= r2[2] or r1[2] <= r2[0]
+    disjoint_vertical = r1[1] >= r2[3] or r1[3] <= r2[1]
+    return not (disjoint_horizontal or disjoint_vertical)
+
+
+# Returns the sorted (i, j) index pairs, i < j, of intersecting rects on one page.
+#
+# Rects are swept along the axis on which they are thinnest relative to the page
+# (usually y for forms, whose rows are short but whose columns are long), keeping
+# a heap of rects whose extent on that axis still covers the sweep position, so
+# only rects that overlap on that axis are compared.
+def intersecting_pairs(indexed_rects):
+    proper = [(i, r) for i, r in indexed_rects if r[2] > r[0] and r[3] > r[1]]
+    # Inverted or empty rects don't fit the sweep; compare them directly
+    degenerate = [(i, r) for i, r in indexed_rects if not (r[2] > r[0] and r[3] > r[1])]
+
+    pairs = []
+    for i, ri in degenerate:
+        for j, rj in indexed_rects:
+            if i != j and rects_intersect(ri, rj):
+                pairs.append((min(i, j), max(i, j)))
+
+    if proper:
+        def sweep_cost(lo, hi):
+            span = max(r[hi] for _, r in proper) - min(r[lo] for _, r in proper)
+            return sum(r[hi] - r[lo] for _, r in proper) / span if span > 0 else float("inf")
 
-    def rects_intersect(r1, r2):
-        disjoint_horizontal = r1[0] >= r2[2] or r1[2] <= r2[0]
-        disjoint_vertical = r1[1] >= r2[3] or r1[3] <= r2[1]
-        return not (disjoint_horizontal or disjoint_vertical)
+        lo, hi = (0, 2) if sweep_cost(0, 2) < sweep_cost(1, 3) else (1, 3)
+        active = []  # heap of (end on sweep axis, index, rect)
+        for j, rj in sorted(proper, key=lambda item: item[1][lo]):
+            while active and active[0][0] <= rj[lo]:
+                heapq.heappop(active)
+            for _, i, ri in active:
+                if rects_intersect(ri, rj):
+                    pairs.append((min(i, j), max(i, j)))
+            heapq.heappush(active, (rj[hi], j, rj))
 
+    # A pair of two degenerate rects is found from both sides
+    return sorted(set(pairs))
+
+
+# Returns {"field_count": ..., "failures": [...], "aborted": ...} where each failure
+# has a "type" ("intersection" or "entry_height"), its details, and the "message"
+# that get_bounding_box_messages prints for it.
+def check_bounding_boxes(fields) -> dict:
     rects_and_fields = []
     for f in fields["form_fields"]:
         rects_and_fields.append(RectAndField(f["label_bounding_box"], "label", f))
         rects_and_fields.append(RectAndField(f["entry_bounding_box"], "entry", f))
 
-    has_error = False
+    # Rects on different pages never intersect, so only compare within a page.
+    rects_by_page = defaultdict(list)
+    for i, rf in enumerate(rects_and_fields):
+        rects_by_page[rf.field["page_number"]].append((i, rf.rect))
+    pairs_by_first = defaultdict(list)
+    for indexed_rects in rects_by_page.values():
+        for i, j in intersecting_pairs(indexed_rects):
+            pairs_by_first[i].append(j)
+
+    result = {"field_count": len(fields["form_fields"]), "failures": [], "aborted": False}
+    failures = result["failures"]
+
+    def add_failure(failure):
+        failures.append(failure)
+        # One message is the "Read N fields" line.
+        if len(failures) + 1 >= MAX_MESSAGES:
+            result["aborted"] = True
+        return result["aborted"]
+
+    # Report in the same order as comparing every rect with every later one.
     for i, ri in enumerate(rects_and_fields):
-        # This is O(N^2); we can optimize if it becomes a problem.
-        for j in range(i + 1, len(rects_and_fields)):
+        for j in sorted(pairs_by_first.get(i, ())):
             rj = rects_and_fields[j]
-            if ri.field["page_number"] == rj.field["page_number"] and rects_intersect(ri.rect, rj.rect):
-                has_error = True
-                if ri.field is rj.field:
-                    messages.append(f"FAILURE: intersection between label and entry bounding boxes for `{ri.field['description']}` ({ri.rect}, {rj.rect})")
-                else:
-                    messages.append(f"FAILURE: intersection between {ri.rect_type} bounding box for `{ri.field['description']}` ({ri.rect}) and {rj.rect_type} bounding box for `{rj.field['description']}` ({rj.rect})")
-                if len(messages) >= 20:
-                    messages.append("Aborting further checks; fix bounding boxes and try again")
-                    return messages
+            if ri.field is rj.field:
+                message = f"FAILURE: intersection between label and entry bounding boxes for `{ri.field['description']}` ({ri.rect}, {rj.rect})"
+            else:
+                message = f"FAILURE: intersection between {ri.rect_type} bounding box for `{ri.field['description']}` ({ri.rect}) and {rj.rect_type} bounding box for `{rj.field['description']}` ({rj.rect})"
+            failure = {
+                "type": "intersection",
+                "page_number": ri.field["page_number"],
+                "boxes": [
+                    {"description": r.field["description"], "rect_type": r.rect_type, "rect": r.rect}
+                    for r in (ri, rj)
+                ],
+                "message": message,
+            }
+            if add_failure(failure):
+                return result
         if ri.rect_type == "entry":
             if "entry_text" in ri.field:
                 font_size = ri.field["entry_text"].get("font_size", 14)
                 entry_height = ri.rect[3] - ri.rect[1]
                 if entry_height < font_size:
-                    has_error = True
-                    messages.append(f"FAILURE: entry bounding box height ({entry_height}) for `{ri.field['description']}` is too short for the text content (font size: {font_size}). Increase the box height or decrease the font size.")
-                    if len(messages) >= 20:
-                        messages.append("Aborting further checks; fix bounding boxes and try again")
-                        return messages
+                    failure = {
+                        "type": "entry_height",
+                        "page_number": ri.field["page_number"],
+                        "description": ri.field["description"],
+                        "rect": ri.rect,
+                        "entry_height": entry_height,
+                        "font_size": font_size,
+                        "message": f"FAILURE: entry bounding box height ({entry_height}) for `{ri.field['description']}` is too short for the text content (font size: {font_size}). Increase the box height or decrease the font size.",
+                    }
+                    if add_failure(failure):
+                        return result
+    return result
+
 
-    if not has_error:
+# Returns a list of messages that are printed to stdout for Claude to read.
+def get_bounding_box_messages(fields_json_stream) -> list[str]:
+    result = check_bounding_boxes(json.load(fields_json_stream))
+    messages = [f"Read {result['field_count']} fields"]
+    messages.extend(failure["message"] for failure in result["failures"])
+    if result["aborted"]:
+        messages.append("Aborting further checks; fix bounding boxes and try again")
+    elif not result["failures"]:
         messages.append("SUCCESS: All bounding boxes are valid")
     return messages
 
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: check_bounding_boxes.py [fields.json]")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description="Check fields.json bounding boxes for overlaps and short entry boxes.")
     # Input file should be in the `fields.json` format described in forms.md.
-    with open(sys.argv[1]) as f:
-        messages = get_bounding_box_messages(f)
-    for msg in messages:
-        print(msg)
+    parser.add_argument("fields_json", help="fields.json file")
+    parser.add_argument("--json", action="store_true", help="print the result as JSON instead of messages")
+    args = parser.parse_args()
+    with open(args.fields_json) as f:
+        if args.json:
+            print(json.dumps(check_bounding_boxes(json.load(f)), indent=2))
+        else:
+            for msg in get_bounding_box_messages(f):
+                print(msg)
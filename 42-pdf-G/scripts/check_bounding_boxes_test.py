@@ -1,7 +1,7 @@
 import unittest
 import json
 import io
-from check_bounding_boxes import get_bounding_box_messages
+from check_bounding_boxes import check_bounding_boxes, get_bounding_box_messages
 
 
 # Currently this is not run automatically in CI; it's just for documentation and manual checking.
@@ -221,6 +221,30 @@ class TestGetBoundingBoxMessages(unittest.TestCase):
         self.assertTrue(any("SUCCESS" in msg for msg in messages))
         self.assertFalse(any("FAILURE" in msg for msg in messages))
     
+    def test_structured_result(self):
+        """Test that the JSON result describes each failure and matches the messages"""
+        data = {
+            "form_fields": [
+                {
+                    "description": "Name",
+                    "page_number": 2,
+                    "label_bounding_box": [10, 10, 60, 30],
+                    "entry_bounding_box": [50, 10, 150, 20],  # Overlaps label, too short
+                    "entry_text": {"font_size": 14}
+                }
+            ]
+        }
+        
+        result = check_bounding_boxes(data)
+        self.assertEqual(result["field_count"], 1)
+        self.assertFalse(result["aborted"])
+        self.assertEqual([f["type"] for f in result["failures"]], ["intersection", "entry_height"])
+        self.assertEqual(result["failures"][0]["page_number"], 2)
+        self.assertEqual([b["rect_type"] for b in result["failures"][0]["boxes"]], ["label", "entry"])
+        self.assertEqual(result["failures"][1]["entry_height"], 10)
+        messages = get_bounding_box_messages(self.create_json_stream(data))
+        self.assertEqual(messages[1:], [f["message"] for f in result["failures"]])
+    
 
 if __name__ == '__main__':
     unittest.main()
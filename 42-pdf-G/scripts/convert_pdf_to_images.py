@@ -1,35 +1,158 @@
+import argparse
+import math
 import os
-import sys
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 
+from PIL import Image
 from pdf2image import convert_from_path
+from pypdf import PdfReader
 
 
 # Converts each page of a PDF to a PNG image.
+#
+# Pages are rendered straight to PNG by pdftoppm in small batches, so memory
+# use does not grow with the page count. Each page is rendered at the DPI
+# that makes its longer side land on `max_dim` (never above DEFAULT_DPI), so
+# no resize is needed, and batches run in parallel pdftoppm processes.
+# Pages whose PNG is already newer than the PDF and of the expected size
+# are skipped.
 
 
-def convert(pdf_path, output_dir, max_dim=1000):
-    images = convert_from_path(pdf_path, dpi=200)
+DEFAULT_DPI = 200
+# Pages per pdftoppm call; bounds the work lost if a batch fails and keeps
+# batches small enough to spread across workers
+MAX_BATCH_PAGES = 16
 
-    for i, image in enumerate(images):
-        # Scale image if needed to keep width/height under `max_dim`
-        width, height = image.size
-        if width > max_dim or height > max_dim:
-            scale_factor = min(max_dim / width, max_dim / height)
-            new_width = int(width * scale_factor)
-            new_height = int(height * scale_factor)
-            image = image.resize((new_width, new_height))
-        
-        image_path = os.path.join(output_dir, f"page_{i+1}.png")
-        image.save(image_path)
-        print(f"Saved page {i+1} as {image_path} (size: {image.size})")
 
-    print(f"Converted {len(images)} pages to PNG images")
+# Returns the longer side of each page in points, from the MediaBox (which
+# pdftoppm renders by default) and UserUnit.
+def page_long_sides(pdf_path):
+    long_sides = []
+    for page in PdfReader(pdf_path).pages:
+        box = page.mediabox
+        user_unit = float(page.get("/UserUnit", 1))
+        long_sides.append(max(abs(float(box.width)), abs(float(box.height))) * user_unit)
+    return long_sides
+
+
+# DPI at which a page's longer side comes out at `max_dim` pixels, or
+# `dpi` if the page is already small enough at that resolution.
+def render_dpi(long_side_pt, max_dim, dpi=DEFAULT_DPI):
+    if math.ceil(long_side_pt * dpi / 72) <= max_dim:
+        return dpi
+    # Round down so pdftoppm's rounding up of the pixel size stays within max_dim
+    return math.floor(max_dim * 72 / long_side_pt * 1000) / 1000
+
+
+def image_path_for_page(output_dir, page_number):
+    return os.path.join(output_dir, f"page_{page_number}.png")
+
+
+# A page's PNG is reusable if it is newer than the PDF and its longer side
+# matches what rendering at `dpi` would produce.
+def is_up_to_date(image_path, pdf_mtime, long_side_pt, dpi):
+    try:
+        if os.path.getmtime(image_path) < pdf_mtime:
+            return False
+        with Image.open(image_path) as img:
+            long_side_px = max(img.size)
+    except (OSError, ValueError):
+        return False
+    return abs(long_side_px - math.ceil(long_side_pt * dpi / 72)) <= 1
+
+
+# Splits pages into (first, last, dpi) ranges of consecutive pages sharing a
+# DPI, at most `batch_size` pages each.
+def make_batches(pages, dpis, batch_size):
+    batches = []
+    for page in pages:
+        dpi = dpis[page - 1]
+        if batches:
+            first, last, batch_dpi = batches[-1]
+            if page == last + 1 and dpi == batch_dpi and last - first + 1 < batch_size:
+                batches[-1] = (first, page, dpi)
+                continue
+        batches.append((page, page, dpi))
+    return batches
+
+
+# Renders pages first..last into output_dir as page_N.png and returns
+# [(page_number, path, size), ...].
+def render_batch(pdf_path, output_dir, first, last, dpi, max_dim):
+    # Render into a scratch directory next to the output so finished pages
+    # appear under their final names atomically
+    scratch_dir = tempfile.mkdtemp(prefix=".render-", dir=output_dir)
+    try:
+        paths = convert_from_path(
+            pdf_path,
+            dpi=dpi,
+            first_page=first,
+            last_page=last,
+            fmt="png",
+            output_folder=scratch_dir,
+            output_file="page",
+            paths_only=True,
+        )
+        results = []
+        for page_number, rendered_path in zip(range(first, last + 1), paths):
+            image_path = image_path_for_page(output_dir, page_number)
+            with Image.open(rendered_path) as image:
+                size = image.size
+                # Safety net for pages whose rendered size doesn't follow the
+                # MediaBox (e.g. odd boxes); normally nothing is resized
+                if size[0] > max_dim or size[1] > max_dim:
+                    scale_factor = min(max_dim / size[0], max_dim / size[1])
+                    size = (int(size[0] * scale_factor), int(size[1] * scale_factor))
+                    image.resize(size).save(rendered_path)
+            os.replace(rendered_path, image_path)
+            results.append((page_number, image_path, size))
+        return results
+    finally:
+        shutil.rmtree(scratch_dir, ignore_errors=True)
+
+
+def convert(pdf_path, output_dir, max_dim=1000, jobs=None, force=False):
+    os.makedirs(output_dir, exist_ok=True)
+    long_sides_pt = page_long_sides(pdf_path)
+    dpis = [render_dpi(long_side_pt, max_dim) for long_side_pt in long_sides_pt]
+    pdf_mtime = os.path.getmtime(pdf_path)
+
+    to_render = []
+    for page_number in range(1, len(dpis) + 1):
+        image_path = image_path_for_page(output_dir, page_number)
+        if not force and is_up_to_date(image_path, pdf_mtime, long_sides_pt[page_number - 1], dpis[page_number - 1]):
+            print(f"Skipped page {page_number} ({image_path} is up to date)")
+        else:
+            to_render.append(page_number)
+
+    # Size batches so every worker gets some, but cap them to keep memory
+    # and pdftoppm run time per call small
+    workers = min(len(to_render), jobs or os.cpu_count() or 1) or 1
+    batch_size = max(1, min(MAX_BATCH_PAGES, math.ceil(len(to_render) / workers)))
+    batches = make_batches(to_render, dpis, batch_size)
+
+    # The rendering happens in the pdftoppm processes, so threads are enough
+    # to keep several of them busy
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(render_batch, pdf_path, output_dir, first, last, dpi, max_dim)
+            for first, last, dpi in batches
+        ]
+        for future in futures:
+            for page_number, image_path, size in future.result():
+                print(f"Saved page {page_number} as {image_path} (size: {size})")
+
+    print(f"Converted {len(to_render)} pages to PNG images ({len(dpis) - len(to_render)} up to date)")
 
 
 if __name__ == "__main__":
-    if len(sys.argv) != 3:
-        print("Usage: convert_pdf_to_images.py [input pdf] [output directory]")
-        sys.exit(1)
-    pdf_path = sys.argv[1]
-    output_directory = sys.argv[2]
-    convert(pdf_path, output_directory)
+    parser = argparse.ArgumentParser(description="Convert each page of a PDF to a PNG image.")
+    parser.add_argument("pdf_path", help="input pdf")
+    parser.add_argument("output_dir", help="output directory")
+    parser.add_argument("--max-dim", type=int, default=1000, help="maximum width/height in pixels (default: 1000)")
+    parser.add_argument("-j", "--jobs", type=int, help="parallel pdftoppm processes (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="re-render pages even if their PNG is up to date")
+    args = parser.parse_args()
+    convert(args.pdf_path, args.output_dir, args.max_dim, args.jobs, args.force)
@@ -0,0 +1,100 @@
+import math
+import os
+import shutil
+import tempfile
+import unittest
+
+from PIL import Image
+
+from convert_pdf_to_images import DEFAULT_DPI, is_up_to_date, make_batches, render_dpi
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+
+
+def rendered_long_side(long_side_pt, dpi):
+    """Pixels pdftoppm produces for the longer side (it rounds up)"""
+    return math.ceil(long_side_pt * dpi / 72)
+
+
+class TestRenderDpi(unittest.TestCase):
+
+    def test_small_page_keeps_default_dpi(self):
+        # 200pt at 200 DPI is 556px
+        self.assertEqual(render_dpi(200, 1000), DEFAULT_DPI)
+        self.assertEqual(render_dpi(200, 1000, dpi=100), 100)
+
+    def test_page_exactly_at_max_dim_keeps_default_dpi(self):
+        self.assertEqual(render_dpi(360, 1000), DEFAULT_DPI)
+
+    def test_large_page_lands_on_max_dim(self):
+        for long_side_pt in [361, 612, 792, 842, 1191, 2384, 14400, 1000.5, 791.999]:
+            for max_dim in [100, 999, 1000, 1568, 2000]:
+                dpi = render_dpi(long_side_pt, max_dim)
+                if dpi == DEFAULT_DPI:
+                    continue
+                self.assertLess(dpi, DEFAULT_DPI)
+                pixels = rendered_long_side(long_side_pt, dpi)
+                self.assertLessEqual(pixels, max_dim, (long_side_pt, max_dim, dpi))
+                self.assertGreaterEqual(pixels, max_dim - 1, (long_side_pt, max_dim, dpi))
+
+
+class TestMakeBatches(unittest.TestCase):
+
+    def test_consecutive_pages_with_same_dpi_are_grouped(self):
+        dpis = [200] * 10
+        self.assertEqual(make_batches(list(range(1, 11)), dpis, 4), [(1, 4, 200), (5, 8, 200), (9, 10, 200)])
+
+    def test_gaps_and_dpi_changes_split_batches(self):
+        dpis = [200, 200, 200, 200, 90.909, 90.909, 90.909, 200]
+        self.assertEqual(make_batches([1, 2, 4, 5, 6, 7, 8], dpis, 16), [
+            (1, 2, 200),
+            (4, 4, 200),
+            (5, 7, 90.909),
+            (8, 8, 200),
+        ])
+
+    def test_batch_size_one(self):
+        self.assertEqual(make_batches([2, 3], [200, 200, 200], 1), [(2, 2, 200), (3, 3, 200)])
+
+    def test_no_pages(self):
+        self.assertEqual(make_batches([], [200], 4), [])
+
+
+class TestIsUpToDate(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.image_path = os.path.join(self.tmp, "page_1.png")
+        # A 612x792pt page at 90.909 DPI renders as 773x1000
+        self.dpi = render_dpi(792, 1000)
+        Image.new("RGB", (773, rendered_long_side(792, self.dpi))).save(self.image_path)
+        self.image_mtime = os.path.getmtime(self.image_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_matching_image_is_up_to_date(self):
+        self.assertTrue(is_up_to_date(self.image_path, self.image_mtime - 10, 792, self.dpi))
+
+    def test_image_older_than_pdf_is_stale(self):
+        self.assertFalse(is_up_to_date(self.image_path, self.image_mtime + 10, 792, self.dpi))
+
+    def test_image_of_other_size_is_stale(self):
+        # Rendered for a different --max-dim
+        self.assertFalse(is_up_to_date(self.image_path, self.image_mtime - 10, 792, render_dpi(792, 2000)))
+        self.assertFalse(is_up_to_date(self.image_path, self.image_mtime - 10, 792, DEFAULT_DPI))
+
+    def test_off_by_one_pixel_is_tolerated(self):
+        Image.new("RGB", (773, 999)).save(self.image_path)
+        self.assertTrue(is_up_to_date(self.image_path, 0, 792, self.dpi))
+
+    def test_missing_or_broken_image_is_stale(self):
+        self.assertFalse(is_up_to_date(os.path.join(self.tmp, "page_2.png"), 0, 792, self.dpi))
+        with open(self.image_path, "wb") as f:
+            f.write(b"not a png")
+        self.assertFalse(is_up_to_date(self.image_path, 0, 792, self.dpi))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,13 +1,37 @@
+import contextlib
+import hashlib
+import io
 import json
+import os
+import stat
 import sys
+import tempfile
+from pathlib import Path
 
 from pypdf import PdfReader
+from pypdf.generic import DictionaryObject, IndirectObject
 
 
 # Extracts data for the fillable form fields in a PDF and outputs JSON that
 # Claude uses to fill the fields. See forms.md.
 
 
+# Field JSON is cached by the PDF's content hash so that repeated runs on the
+# same form skip parsing entirely. The cache lives in the per-user cache
+# directory, since its contents are trusted as extraction output. Set to None
+# to disable.
+if os.name == "nt":
+    _USER_CACHE_HOME = os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local"
+else:
+    _USER_CACHE_HOME = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+FIELD_INFO_CACHE_DIR = Path(_USER_CACHE_HOME) / "pdf-field-info"
+# Bump when the field JSON format or extraction logic changes
+FIELD_INFO_CACHE_VERSION = "2"
+
+# Field flag bit for radio button groups (PDF 32000-1:2008, table 226)
+RADIO_FLAG = 1 << 15
+
+
 # This matches the format used by PdfReader `get_fields` and `update_page_form_field_values` methods.
 def get_full_annotation_field_id(annotation):
     components = []
@@ -50,6 +74,84 @@ def make_field_dict(field, field_id):
     return field_dict
 
 
+def get_qualified_field_name(field, depth=0):
+    # Same naming as `PdfReader.get_fields`: /TM overrides the dotted /T path.
+    if depth > 100:
+        raise ValueError("Cycle in form field /Parent hierarchy")
+    if "/TM" in field:
+        return field["/TM"]
+    if "/Parent" in field:
+        return get_qualified_field_name(field["/Parent"], depth + 1) + "." + field.get("/T", "")
+    return field.get("/T", "")
+
+
+def reference_key(obj):
+    ref = obj if isinstance(obj, IndirectObject) else getattr(obj, "indirect_reference", None)
+    return (ref.idnum, ref.generation) if ref is not None else None
+
+
+# Returns {field_id: field} with the same keys and order as `PdfReader.get_fields`,
+# where each field is a dict holding "/FT", "/Kids", "/_States_" and the
+# "reference" of its field dictionary.
+#
+# `get_fields` checks every field against every field parsed before it, which is
+# quadratic in the number of fields; this walks the AcroForm /Fields and /Kids
+# tree once and remembers visited fields by object reference.
+def get_form_fields(reader: PdfReader):
+    acro_form = reader.trailer["/Root"].get("/AcroForm")
+    if isinstance(acro_form, IndirectObject):
+        acro_form = acro_form.get_object()
+    if not isinstance(acro_form, DictionaryObject):
+        return {}
+    fields = {}
+    visited = set()
+
+    def visit(node):
+        if not isinstance(node, DictionaryObject) or ("/T" not in node and "/TM" not in node):
+            return
+        field = {"/FT": node.get("/FT"), "/Kids": node.get("/Kids"), "reference": node.indirect_reference}
+        field_type = node.get("/FT", "")
+        if field_type == "/Ch" and node.get("/Opt"):
+            field["/_States_"] = node["/Opt"]
+        if field_type == "/Btn" and "/AP" in node:
+            states = list(node["/AP"]["/N"].keys())
+            if "/Off" not in states:
+                states.append("/Off")
+            field["/_States_"] = states
+        fields[get_qualified_field_name(node)] = field
+
+        key = reference_key(node)
+        if key is not None:
+            if key in visited:
+                return
+            visited.add(key)
+        for kid in node.get("/Kids") or []:
+            visit(kid.get_object())
+
+    for f in acro_form.get("/Fields") or []:
+        visit(f.get_object())
+    return fields
+
+
+# Yields (page_index, annotation) for the given widget annotations in page order
+# (and /Annots order within a page), like walking every page's /Annots array.
+# Only the /Annots arrays are read to build the page index; other annotations
+# (links, comments, ...) are never resolved.
+def locate_widgets(reader: PdfReader, widget_refs):
+    wanted = {key: ref for key, ref in ((reference_key(r), r) for r in widget_refs) if key is not None}
+    if not wanted:
+        return
+    located = []
+    for page_index, page in enumerate(reader.pages):
+        for position, ann in enumerate(page.get("/Annots") or []):
+            if isinstance(ann, IndirectObject):
+                key = (ann.idnum, ann.generation)
+                if key in wanted:
+                    located.append((page_index, position, key))
+    for page_index, _, key in sorted(located):
+        yield page_index, wanted[key].get_object()
+
+
 # Returns a list of fillable PDF fields:
 # [
 #   {
@@ -60,10 +162,13 @@ def make_field_dict(field, field_id):
 #   },
 # ]
 def get_field_info(reader: PdfReader):
-    fields = reader.get_fields()
+    fields = get_form_fields(reader)
 
     field_info_by_id = {}
     possible_radio_names = set()
+    # Widget annotations that can hold a field's location: terminal fields are
+    # their own widget, radio options are the kids of their group.
+    widget_refs = []
 
     for field_id, field in fields.items():
         # Skip if this is a container field with children, except that it might be
@@ -71,8 +176,10 @@ def get_field_info(reader: PdfReader):
         if field.get("/Kids"):
             if field.get("/FT") == "/Btn":
                 possible_radio_names.add(field_id)
+                widget_refs.extend(field["/Kids"])
             continue
         field_info_by_id[field_id] = make_field_dict(field, field_id)
+        widget_refs.append(field["reference"])
 
     # Bounding rects are stored in annotations in page objects.
 
@@ -81,37 +188,35 @@ def get_field_info(reader: PdfReader):
     # See https://westhealth.github.io/exploring-fillable-forms-with-pdfrw.html
     radio_fields_by_id = {}
 
-    for page_index, page in enumerate(reader.pages):
-        annotations = page.get('/Annots', [])
-        for ann in annotations:
-            field_id = get_full_annotation_field_id(ann)
-            if field_id in field_info_by_id:
-                field_info_by_id[field_id]["page"] = page_index + 1
-                field_info_by_id[field_id]["rect"] = ann.get('/Rect')
-            elif field_id in possible_radio_names:
-                try:
-                    # ann['/AP']['/N'] should have two items. One of them is '/Off',
-                    # the other is the active value.
-                    on_values = [v for v in ann["/AP"]["/N"] if v != "/Off"]
-                except KeyError:
-                    continue
-                if len(on_values) == 1:
-                    rect = ann.get("/Rect")
-                    if field_id not in radio_fields_by_id:
-                        radio_fields_by_id[field_id] = {
-                            "field_id": field_id,
-                            "type": "radio_group",
-                            "page": page_index + 1,
-                            "radio_options": [],
-                        }
-                    # Note: at least on macOS 15.7, Preview.app doesn't show selected
-                    # radio buttons correctly. (It does if you remove the leading slash
-                    # from the value, but that causes them not to appear correctly in
-                    # Chrome/Firefox/Acrobat/etc).
-                    radio_fields_by_id[field_id]["radio_options"].append({
-                        "value": on_values[0],
-                        "rect": rect,
-                    })
+    for page_index, ann in locate_widgets(reader, widget_refs):
+        field_id = get_full_annotation_field_id(ann)
+        if field_id in field_info_by_id:
+            field_info_by_id[field_id]["page"] = page_index + 1
+            field_info_by_id[field_id]["rect"] = ann.get('/Rect')
+        elif field_id in possible_radio_names:
+            try:
+                # ann['/AP']['/N'] should have two items. One of them is '/Off',
+                # the other is the active value.
+                on_values = [v for v in ann["/AP"]["/N"] if v != "/Off"]
+            except KeyError:
+                continue
+            if len(on_values) == 1:
+                rect = ann.get("/Rect")
+                if field_id not in radio_fields_by_id:
+                    radio_fields_by_id[field_id] = {
+                        "field_id": field_id,
+                        "type": "radio_group",
+                        "page": page_index + 1,
+                        "radio_options": [],
+                    }
+                # Note: at least on macOS 15.7, Preview.app doesn't show selected
+                # radio buttons correctly. (It does if you remove the leading slash
+                # from the value, but that causes them not to appear correctly in
+                # Chrome/Firefox/Acrobat/etc).
+                radio_fields_by_id[field_id]["radio_options"].append({
+                    "value": on_values[0],
+                    "rect": rect,
+                })
 
     # Some PDFs have form field definitions without corresponding annotations,
     # so we can't tell where they are. Ignore these fields for now.
@@ -137,9 +242,61 @@ def get_field_info(reader: PdfReader):
     return sorted_fields
 
 
+# Creates the cache directory if needed and returns it, or None if it cannot be
+# used. On POSIX the directory must be owned by the current user and closed to
+# group and others, so no other user can plant or read cached field info.
+def private_cache_dir(path: Path):
+    try:
+        path.mkdir(mode=0o700, parents=True, exist_ok=True)
+        st = path.lstat()
+    except OSError:
+        return None
+    if not stat.S_ISDIR(st.st_mode):
+        return None
+    if hasattr(os, "getuid") and (st.st_uid != os.getuid() or st.st_mode & 0o077):
+        return None
+    return path
+
+
+# Returns the field info for the PDF at pdf_path, from the cache if this exact
+# file was seen before. Messages printed during extraction are cached as well
+# and printed again on a cache hit.
+def load_field_info(pdf_path: str, reader: PdfReader = None):
+    cache_file = None
+    cache_dir = None
+    if FIELD_INFO_CACHE_DIR is not None:
+        cache_dir = private_cache_dir(FIELD_INFO_CACHE_DIR)
+    if cache_dir is not None:
+        digest = hashlib.sha256(FIELD_INFO_CACHE_VERSION.encode())
+        with open(pdf_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        cache_file = cache_dir / f"{digest.hexdigest()}.json"
+        try:
+            cached = json.loads(cache_file.read_text())
+            print(cached["messages"], end="")
+            return cached["fields"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        field_info = get_field_info(reader or PdfReader(pdf_path))
+    print(output.getvalue(), end="")
+
+    if cache_file is not None:
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump({"fields": field_info, "messages": output.getvalue()}, f)
+            os.replace(tmp_path, cache_file)
+        except OSError:
+            pass  # Caching is best-effort
+    return field_info
+
+
 def write_field_info(pdf_path: str, json_output_path: str):
-    reader = PdfReader(pdf_path)
-    field_info = get_field_info(reader)
+    field_info = load_field_info(pdf_path)
     with open(json_output_path, "w") as f:
         json.dump(field_info, f, indent=2)
     print(f"Wrote {len(field_info)} fields to {json_output_path}")
@@ -3,7 +3,7 @@ import sys
 
 from pypdf import PdfReader, PdfWriter
 
-from extract_form_field_info import get_field_info
+from extract_form_field_info import load_field_info
 
 
 # Fills fillable form fields in a PDF. See forms.md.
@@ -12,37 +12,54 @@ from extract_form_field_info import get_field_info
 def fill_pdf_fields(input_pdf_path: str, fields_json_path: str, output_pdf_path: str):
     with open(fields_json_path) as f:
         fields = json.load(f)
-    # Group by page number.
-    fields_by_page = {}
-    for field in fields:
-        if "value" in field:
-            field_id = field["field_id"]
-            page = field["page"]
-            if page not in fields_by_page:
-                fields_by_page[page] = {}
-            fields_by_page[page][field_id] = field["value"]
     
     reader = PdfReader(input_pdf_path)
 
-    has_error = False
-    field_info = get_field_info(reader)
-    fields_by_ids = {f["field_id"]: f for f in field_info}
+    fields_by_ids = index_fields(input_pdf_path, reader)
+    errors = field_value_errors(fields, fields_by_ids)
+    for err in errors:
+        print(err)
+    if errors:
+        sys.exit(1)
+
+    write_filled_pdf(reader, fields, output_pdf_path)
+
+
+# Maps field_id to the field info from `get_field_info` (cached per PDF file).
+# Computing this is the expensive part of filling, so callers filling many
+# copies keep it around.
+def index_fields(input_pdf_path: str, reader: PdfReader):
+    return {f["field_id"]: f for f in load_field_info(input_pdf_path, reader)}
+
+
+# Returns the error messages for field values that don't match the form.
+def field_value_errors(fields, fields_by_ids):
+    errors = []
     for field in fields:
         existing_field = fields_by_ids.get(field["field_id"])
         if not existing_field:
-            has_error = True
-            print(f"ERROR: `{field['field_id']}` is not a valid field ID")
+            errors.append(f"ERROR: `{field['field_id']}` is not a valid field ID")
         elif field["page"] != existing_field["page"]:
-            has_error = True
-            print(f"ERROR: Incorrect page number for `{field['field_id']}` (got {field['page']}, expected {existing_field['page']})")
+            errors.append(f"ERROR: Incorrect page number for `{field['field_id']}` (got {field['page']}, expected {existing_field['page']})")
         else:
             if "value" in field:
                 err = validation_error_for_field_value(existing_field, field["value"])
                 if err:
-                    print(err)
-                    has_error = True
-    if has_error:
-        sys.exit(1)
+                    errors.append(err)
+    return errors
+
+
+# Writes a copy of the form with the given (already validated) field values.
+def write_filled_pdf(reader: PdfReader, fields, output_pdf_path):
+    # Group by page number.
+    fields_by_page = {}
+    for field in fields:
+        if "value" in field:
+            field_id = field["field_id"]
+            page = field["page"]
+            if page not in fields_by_page:
+                fields_by_page[page] = {}
+            fields_by_page[page][field_id] = field["value"]
 
     writer = PdfWriter(clone_from=reader)
     for page, field_values in fields_by_page.items():
@@ -0,0 +1,180 @@
+import argparse
+import csv
+import json
+import os
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+
+from pypdf import PdfReader
+
+from fill_fillable_fields import field_value_errors, index_fields, monkeypatch_pydpf_method, write_filled_pdf
+from fill_pdf_form_with_annotations import get_entry_boxes, write_annotated_pdf
+
+
+# Fills one PDF form template with many records (mail merge). See forms.md.
+#
+# Records come from a CSV file (one column per field) or a JSONL file (one
+# object per line). With fillable fields, keys are field IDs from
+# `extract_form_field_info.py`; with a fields.json (annotation mode), keys are
+# field descriptions and the values replace each field's entry_text text.
+# The template is parsed and indexed once per worker process, records are
+# handed out in small chunks, and each output PDF is written as soon as it
+# is filled.
+
+
+# Records per task sent to a worker; amortizes inter-process overhead
+RECORDS_PER_TASK = 16
+# Tasks queued per worker, so records are read from disk as they are needed
+TASKS_IN_FLIGHT_PER_WORKER = 4
+# Print a progress line every this many records
+PROGRESS_EVERY = 1000
+
+
+class FormTemplate:
+    """A form template parsed once and filled many times"""
+
+    def __init__(self, input_pdf_path, fields_json_path=None):
+        self.reader = PdfReader(input_pdf_path)
+        if fields_json_path:
+            # `fields.json` format described in forms.md.
+            with open(fields_json_path) as f:
+                fields_data = json.load(f)
+            self.entry_boxes = get_entry_boxes(self.reader, fields_data)
+            self.descriptions = {field["description"] for _, _, field in self.entry_boxes}
+            self.fields_by_ids = None
+        else:
+            self.fields_by_ids = index_fields(input_pdf_path, self.reader)
+
+    def fill(self, values, output_pdf_path):
+        """Write a filled copy for one record; returns error messages (nothing is written if any)"""
+        if self.fields_by_ids is not None:
+            fields = [
+                {"field_id": field_id, "page": self.fields_by_ids.get(field_id, {}).get("page"), "value": value}
+                for field_id, value in values.items()
+            ]
+            errors = field_value_errors(fields, self.fields_by_ids)
+            if not errors:
+                write_filled_pdf(self.reader, fields, output_pdf_path)
+        else:
+            errors = [
+                f"ERROR: `{description}` does not match any field description"
+                for description in values if description not in self.descriptions
+            ]
+            if not errors:
+                write_annotated_pdf(self.reader, self.entry_boxes, output_pdf_path, texts=values)
+        return errors
+
+
+# Yields (output name, {key: value}) for each record. Empty values are left
+# out so that blank CSV cells don't overwrite anything. Records without a
+# name are named record_<n>, and a name already used (ignoring case, for
+# case-insensitive file systems) gets a -2, -3, ... suffix, so every record
+# has its own output file.
+def read_records(records_path, name_field=None):
+    used = set()
+    with open(records_path, newline="") as f:
+        if records_path.lower().endswith(".csv"):
+            rows = csv.DictReader(f)
+        else:
+            rows = (json.loads(line) for line in f if line.strip())
+        for number, row in enumerate(rows, 1):
+            name = row.pop(name_field, None) if name_field else None
+            name = re.sub(r"[^\w.-]+", "_", str(name)).strip(".") if name not in (None, "") else ""
+            name = name or f"record_{number}"
+            unique, suffix = name, 2
+            while unique.lower() in used:
+                unique, suffix = f"{name}-{suffix}", suffix + 1
+            used.add(unique.lower())
+            values = {key: value if isinstance(value, str) else str(value)
+                      for key, value in row.items() if value not in (None, "")}
+            yield unique, values
+
+
+_worker_template = None
+
+
+def _init_worker(input_pdf_path, fields_json_path):
+    global _worker_template
+    if not fields_json_path:
+        monkeypatch_pydpf_method()
+    _worker_template = FormTemplate(input_pdf_path, fields_json_path)
+
+
+# Fills a chunk of records with this process's template and returns
+# [(name, output path, errors), ...].
+def _fill_records(records, output_dir):
+    results = []
+    for name, values in records:
+        output_pdf_path = os.path.join(output_dir, f"{name}.pdf")
+        try:
+            errors = _worker_template.fill(values, output_pdf_path)
+        except Exception as e:
+            errors = [f"ERROR: {type(e).__name__}: {e}"]
+        results.append((name, output_pdf_path, errors))
+    return results
+
+
+def fill_batch(input_pdf_path, records_path, output_dir, fields_json_path=None, name_field=None, jobs=None):
+    """
+    Fill the template once per record in records_path, writing <name>.pdf
+    files to output_dir, and return {"filled": ..., "failed": ..., "seconds": ...}
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    workers = jobs or os.cpu_count() or 1
+    records = read_records(records_path, name_field)
+    chunks = iter(lambda: list(islice(records, RECORDS_PER_TASK)), [])
+
+    summary = {"filled": 0, "failed": 0, "seconds": 0.0}
+    start = time.perf_counter()
+
+    def report(results):
+        for name, output_pdf_path, errors in results:
+            if errors:
+                summary["failed"] += 1
+                print(f"FAILED {name}:")
+                for err in errors:
+                    print(f"  {err}")
+            else:
+                summary["filled"] += 1
+            done = summary["filled"] + summary["failed"]
+            if done % PROGRESS_EVERY == 0:
+                print(f"{done} records done ({done / (time.perf_counter() - start):.1f} records/s)")
+
+    if workers == 1:
+        _init_worker(input_pdf_path, fields_json_path)
+        for chunk in chunks:
+            report(_fill_records(chunk, output_dir))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(input_pdf_path, fields_json_path)) as executor:
+            pending = set()
+            for chunk in chunks:
+                if len(pending) >= workers * TASKS_IN_FLIGHT_PER_WORKER:
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        report(future.result())
+                pending.add(executor.submit(_fill_records, chunk, output_dir))
+            for future in wait(pending).done:
+                report(future.result())
+
+    summary["seconds"] = time.perf_counter() - start
+    total = summary["filled"] + summary["failed"]
+    rate = total / summary["seconds"] if summary["seconds"] else 0.0
+    print(f"Filled {summary['filled']} of {total} records into {output_dir} in {summary['seconds']:.1f}s ({rate:.1f} records/s)")
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fill a PDF form once per record in a CSV or JSONL file.")
+    parser.add_argument("input_pdf", help="template pdf")
+    parser.add_argument("records", help="CSV (.csv) or JSONL file with one record per row/line")
+    parser.add_argument("output_dir", help="directory for the filled PDFs")
+    parser.add_argument("--fields-json", help="fields.json for forms without fillable fields (adds text annotations)")
+    parser.add_argument("--name-field", help="record key used as the output file name (default: record_<n>); repeated names get a -2, -3, ... suffix")
+    parser.add_argument("-j", "--jobs", type=int, help="worker processes (default: CPU count)")
+    args = parser.parse_args()
+    summary = fill_batch(args.input_pdf, args.records, args.output_dir, args.fields_json, args.name_field, args.jobs)
+    if summary["failed"]:
+        raise SystemExit(1)
@@ -0,0 +1,210 @@
+import csv
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from pypdf import PdfReader, PdfWriter
+from pypdf.generic import ArrayObject, DictionaryObject, FloatObject, NameObject, NumberObject, TextStringObject
+
+import extract_form_field_info
+from fill_fillable_fields import fill_pdf_fields, monkeypatch_pydpf_method
+from fill_forms_batch import fill_batch, read_records
+from fill_pdf_form_with_annotations import fill_pdf_form
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+
+
+def make_form(path, field_names=("name", "city")):
+    """Write a one-page PDF with a fillable text field for each name"""
+    writer = PdfWriter()
+    page = writer.add_blank_page(612, 792)
+    widgets = ArrayObject()
+    for i, field_name in enumerate(field_names):
+        top = 700 - 40 * i
+        widget = DictionaryObject({
+            NameObject("/Type"): NameObject("/Annot"),
+            NameObject("/Subtype"): NameObject("/Widget"),
+            NameObject("/FT"): NameObject("/Tx"),
+            NameObject("/T"): TextStringObject(field_name),
+            NameObject("/Rect"): ArrayObject([FloatObject(100), FloatObject(top - 20), FloatObject(300), FloatObject(top)]),
+            NameObject("/F"): NumberObject(4),
+            NameObject("/DA"): TextStringObject("/Helv 12 Tf 0 g"),
+            NameObject("/P"): page.indirect_reference,
+        })
+        widgets.append(writer._add_object(widget))
+    page[NameObject("/Annots")] = widgets
+    # Most real forms keep /AcroForm as an indirect object
+    acro_form = DictionaryObject({NameObject("/Fields"): ArrayObject(widgets)})
+    writer._root_object[NameObject("/AcroForm")] = writer._add_object(acro_form)
+    with open(path, "wb") as f:
+        writer.write(f)
+
+
+FIELDS_JSON = {
+    "pages": [{"page_number": 1, "image_width": 1224, "image_height": 1584}],
+    "form_fields": [
+        {
+            "description": "Name",
+            "page_number": 1,
+            "label_bounding_box": [20, 100, 180, 140],
+            "entry_bounding_box": [200, 100, 600, 140],
+            "entry_text": {"text": "Default name"},
+        },
+        {
+            "description": "City",
+            "page_number": 1,
+            "label_bounding_box": [20, 180, 180, 220],
+            "entry_bounding_box": [200, 180, 600, 220],
+        },
+    ],
+}
+
+
+def field_values(pdf_path):
+    return {name: field.get("/V") for name, field in PdfReader(pdf_path).get_fields().items()}
+
+
+def annotation_texts(pdf_path):
+    annotations = PdfReader(pdf_path).pages[0].get("/Annots") or []
+    return [annotation.get_object().get("/Contents") for annotation in annotations]
+
+
+class FormTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        # Keep field info out of the user's cache
+        patcher = mock.patch.object(extract_form_field_info, "FIELD_INFO_CACHE_DIR", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.form = self.path("form.pdf")
+        make_form(self.form)
+        self.fields_json = self.write_json("fields.json", FIELDS_JSON)
+        monkeypatch_pydpf_method()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def path(self, name):
+        return os.path.join(self.tmp, name)
+
+    def write_json(self, name, data):
+        with open(self.path(name), "w") as f:
+            json.dump(data, f)
+        return self.path(name)
+
+    def write_jsonl(self, name, records):
+        with open(self.path(name), "w") as f:
+            f.writelines(json.dumps(record) + "\n" for record in records)
+        return self.path(name)
+
+
+class TestFillFillableFields(FormTestCase):
+
+    def test_fills_field_values(self):
+        values = self.write_json("values.json", [
+            {"field_id": "name", "page": 1, "value": "Ann"},
+            {"field_id": "city", "page": 1, "value": "Oslo"},
+        ])
+        fill_pdf_fields(self.form, values, self.path("out.pdf"))
+        self.assertEqual(field_values(self.path("out.pdf")), {"name": "Ann", "city": "Oslo"})
+
+    def test_invalid_field_is_rejected(self):
+        values = self.write_json("values.json", [
+            {"field_id": "name", "page": 2, "value": "Ann"},
+            {"field_id": "zip", "page": 1, "value": "0150"},
+        ])
+        with mock.patch("builtins.print") as printed, self.assertRaises(SystemExit):
+            fill_pdf_fields(self.form, values, self.path("out.pdf"))
+        messages = [call.args[0] for call in printed.call_args_list]
+        self.assertTrue(any("Incorrect page number for `name`" in m for m in messages))
+        self.assertTrue(any("`zip` is not a valid field ID" in m for m in messages))
+        self.assertFalse(os.path.exists(self.path("out.pdf")))
+
+
+class TestFillPdfFormWithAnnotations(FormTestCase):
+
+    def test_adds_annotation_for_each_non_empty_field(self):
+        with mock.patch("builtins.print"):
+            fill_pdf_form(self.form, self.fields_json, self.path("out.pdf"))
+        annotations = PdfReader(self.path("out.pdf")).pages[0]["/Annots"]
+        free_text = [a.get_object() for a in annotations if a.get_object()["/Subtype"] == "/FreeText"]
+        self.assertEqual([a["/Contents"] for a in free_text], ["Default name"])
+        # Image coordinates (1224x1584, origin top-left) scaled to the 612x792 page
+        self.assertEqual([float(v) for v in free_text[0]["/Rect"]], [100, 722, 300, 742])
+
+
+class TestReadRecords(FormTestCase):
+
+    def test_names_are_unique(self):
+        records = self.write_jsonl("records.jsonl", [
+            {"id": "a/b", "name": "1"},
+            {"id": "a_b", "name": "2"},
+            {"id": "A_B", "name": "3"},
+            {"id": "", "name": "4"},
+            {"name": "5"},
+            {"id": "record_5", "name": "6"},
+            {"id": "a_b-2", "name": "7"},
+            {"id": "..", "name": "8"},
+        ])
+        names = [name for name, _ in read_records(records, "id")]
+        self.assertEqual(names, ["a_b", "a_b-2", "A_B-3", "record_4", "record_5", "record_5-2", "a_b-2-2", "record_8"])
+
+    def test_csv_blank_cells_are_left_out(self):
+        with open(self.path("records.csv"), "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerows([["id", "name", "city"], ["x", "Ann", ""], ["x", "Bob", "Oslo"]])
+        self.assertEqual(list(read_records(self.path("records.csv"), "id")), [
+            ("x", {"name": "Ann"}),
+            ("x-2", {"name": "Bob", "city": "Oslo"}),
+        ])
+
+
+class TestFillBatch(FormTestCase):
+
+    def fill(self, records, jobs, **kwargs):
+        output_dir = self.path(f"out-{jobs}")
+        with mock.patch("builtins.print"):
+            summary = fill_batch(self.form, records, output_dir, jobs=jobs, **kwargs)
+        return summary, output_dir
+
+    def test_duplicate_names_do_not_overwrite(self):
+        records = self.write_jsonl("records.jsonl", [
+            {"id": "same", "name": "Ann"},
+            {"id": "same", "name": "Bob"},
+            {"id": "", "name": "Cid"},
+            {"id": "bad", "zip": "0150"},
+        ])
+        for jobs in (1, 2):
+            summary, output_dir = self.fill(records, jobs, name_field="id")
+            self.assertEqual((summary["filled"], summary["failed"]), (3, 1))
+            self.assertEqual(sorted(os.listdir(output_dir)), ["record_3.pdf", "same-2.pdf", "same.pdf"])
+            self.assertEqual(field_values(os.path.join(output_dir, "same.pdf"))["name"], "Ann")
+            self.assertEqual(field_values(os.path.join(output_dir, "same-2.pdf"))["name"], "Bob")
+
+    def test_parallel_matches_serial(self):
+        records = self.write_jsonl("records.jsonl", [{"name": f"Person {i}", "city": f"City {i}"} for i in range(40)])
+        outputs = {}
+        for jobs in (1, 3):
+            summary, output_dir = self.fill(records, jobs)
+            self.assertEqual((summary["filled"], summary["failed"]), (40, 0))
+            outputs[jobs] = {name: field_values(os.path.join(output_dir, name)) for name in os.listdir(output_dir)}
+        self.assertEqual(outputs[1], outputs[3])
+        self.assertEqual(outputs[1]["record_7.pdf"], {"name": "Person 6", "city": "City 6"})
+
+    def test_annotation_mode(self):
+        records = self.write_jsonl("records.jsonl", [{"City": "Oslo"}, {"Name": "Bob", "City": "Bergen"}, {"Zip": "0150"}])
+        summary, output_dir = self.fill(records, 1, fields_json_path=self.fields_json)
+        self.assertEqual((summary["filled"], summary["failed"]), (2, 1))
+        self.assertEqual(sorted(os.listdir(output_dir)), ["record_1.pdf", "record_2.pdf"])
+        self.assertIn("Default name", annotation_texts(os.path.join(output_dir, "record_1.pdf")))
+        self.assertIn("Oslo", annotation_texts(os.path.join(output_dir, "record_1.pdf")))
+        self.assertIn("Bob", annotation_texts(os.path.join(output_dir, "record_2.pdf")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -34,19 +34,23 @@ def fill_pdf_form(input_pdf_path, fields_json_path, output_pdf_path):
     
     # Open the PDF
     reader = PdfReader(input_pdf_path)
-    writer = PdfWriter()
+    entry_boxes = get_entry_boxes(reader, fields_data)
     
-    # Copy all pages to writer
-    writer.append(reader)
+    annotation_count = write_annotated_pdf(reader, entry_boxes, output_pdf_path)
     
+    print(f"Successfully filled PDF form and saved to {output_pdf_path}")
+    print(f"Added {annotation_count} text annotations")
+
+
+def get_entry_boxes(reader, fields_data):
+    """Return (page_number, entry box in PDF coordinates, field) for each form field"""
     # Get PDF dimensions for each page
     pdf_dimensions = {}
     for i, page in enumerate(reader.pages):
         mediabox = page.mediabox
         pdf_dimensions[i + 1] = [mediabox.width, mediabox.height]
     
-    # Process each form field
-    annotations = []
+    entry_boxes = []
     for field in fields_data["form_fields"]:
         page_num = field["page_number"]
         
@@ -61,12 +65,29 @@ def fill_pdf_form(input_pdf_path, fields_json_path, output_pdf_path):
             image_width, image_height,
             pdf_width, pdf_height
         )
-        
+        entry_boxes.append((page_num, transformed_entry_box, field))
+    return entry_boxes
+
+
+def write_annotated_pdf(reader, entry_boxes, output_pdf_path, texts=None):
+    """
+    Copy the PDF with a text annotation for each non-empty field and return
+    the number of annotations. `texts` maps field descriptions to text that
+    replaces the field's own entry_text text.
+    """
+    writer = PdfWriter()
+    
+    # Copy all pages to writer
+    writer.append(reader)
+    
+    # Process each form field
+    annotation_count = 0
+    for page_num, transformed_entry_box, field in entry_boxes:
+        entry_text = field.get("entry_text", {})
+        text = entry_text.get("text")
+        if texts and field["description"] in texts:
+            text = texts[field["description"]]
         # Skip empty fields
-        if "entry_text" not in field or "text" not in field["entry_text"]:
-            continue
-        entry_text = field["entry_text"]
-        text = entry_text["text"]
         if not text:
             continue
         
@@ -85,16 +106,14 @@ def fill_pdf_form(input_pdf_path, fields_json_path, output_pdf_path):
             border_color=None,
             background_color=None,
         )
-        annotations.append(annotation)
+        annotation_count += 1
         # page_number is 0-based for pypdf
         writer.add_annotation(page_number=page_num - 1, annotation=annotation)
         
     # Save the filled PDF
     with open(output_pdf_path, "wb") as output:
         writer.write(output)
-    
-    print(f"Successfully filled PDF form and saved to {output_pdf_path}")
-    print(f"Added {len(annotations)} text annotations")
+    return annotation_count
 
 
 if __name__ == "__main__":
@@ -2,30 +2,69 @@
 """
 Tool to pack a directory into a .docx, .pptx, or .xlsx file with XML formatting undone.
 
+Parts are streamed straight into the archive in OOXML-canonical order: XML is
+condensed in memory on a thread pool, already-compressed media is stored as-is,
+and the other parts are deflated unless that saves too little.
+
 Example usage:
-    python pack.py <input_directory> <office_file> [--force]
+    python pack.py <input_directory> <office_file> [--force] [--jobs N]
 """
 
 import argparse
+import os
 import shutil
-import subprocess
 import sys
 import tempfile
-import defusedxml.minidom
 import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import lxml.etree
+
+# Relative when imported as ooxml.scripts.pack (e.g. by scripts/document.py),
+# top-level when pack.py is run as a script
+try:
+    from .office_service import OfficeService, OfficeServiceError, OfficeTimeoutError
+except ImportError:
+    from office_service import OfficeService, OfficeServiceError, OfficeTimeoutError
+
+# Formats that are already compressed; deflating them again wastes CPU for
+# little or no gain, so they are stored
+STORED_EXTENSIONS = {
+    ".jpg", ".jpeg", ".png", ".gif", ".wdp", ".jxr", ".emz", ".wmz",
+    ".mp3", ".m4a", ".wma", ".mp4", ".m4v", ".mov", ".wmv", ".avi",
+    ".zip", ".gz", ".docx", ".xlsx", ".pptx", ".docm", ".xlsm", ".pptm",
+}  # fmt: skip
+
+# Deflated output that does not save at least this fraction is stored instead
+MIN_DEFLATE_SAVING = 0.02
+
+COMPRESS_LEVEL = 6
+STREAM_CHUNK_SIZE = 1024 * 1024
+
 
 def main():
     parser = argparse.ArgumentParser(description="Pack a directory into an Office file")
     parser.add_argument("input_directory", help="Unpacked Office document directory")
     parser.add_argument("output_file", help="Output Office file (.docx/.pptx/.xlsx)")
     parser.add_argument("--force", action="store_true", help="Skip validation")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="Threads used to condense and compress parts (default: CPU count)",
+    )
     args = parser.parse_args()
 
     try:
         success = pack_document(
-            args.input_directory, args.output_file, validate=not args.force
+            args.input_directory,
+            args.output_file,
+            validate=not args.force,
+            jobs=args.jobs,
         )
 
         # Show warning if validation was skipped
@@ -42,13 +81,19 @@ def main():
         sys.exit(f"Error: {e}")
 
 
-def pack_document(input_dir, output_file, validate=False):
+def pack_document(input_dir, output_file, validate=False, jobs=None, service=None):
     """Pack a directory into an Office file (.docx/.pptx/.xlsx).
 
+    The input directory is read in place; nothing is copied to disk first.
+
     Args:
         input_dir: Path to unpacked Office document directory
         output_file: Path to output Office file
         validate: If True, validates with soffice (default: False)
+        jobs: Number of threads preparing parts (default: CPU count)
+        service: OfficeService to validate with; pass one when packing many
+            files so they share its LibreOffice profile (default: a one-off
+            instance)
 
     Returns:
         bool: True if successful, False if validation failed
@@ -61,70 +106,138 @@ def pack_document(input_dir, output_file, validate=False):
     if output_file.suffix.lower() not in {".docx", ".pptx", ".xlsx"}:
         raise ValueError(f"{output_file} must be a .docx, .pptx, or .xlsx file")
 
-    # Work in temporary directory to avoid modifying original
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_content_dir = Path(temp_dir) / "content"
-        shutil.copytree(input_dir, temp_content_dir)
-
-        # Process XML files to remove pretty-printing whitespace
-        for pattern in ["*.xml", "*.rels"]:
-            for xml_file in temp_content_dir.rglob(pattern):
-                condense_xml(xml_file)
-
-        # Create final Office file as zip archive
-        output_file.parent.mkdir(parents=True, exist_ok=True)
-        with zipfile.ZipFile(output_file, "w", zipfile.ZIP_DEFLATED) as zf:
-            for f in temp_content_dir.rglob("*"):
-                if f.is_file():
-                    zf.write(f, f.relative_to(temp_content_dir))
-
-        # Validate if requested
-        if validate:
-            if not validate_document(output_file):
-                output_file.unlink()  # Delete the corrupt file
-                return False
+    parts = sorted(
+        (f for f in input_dir.rglob("*") if f.is_file()),
+        key=lambda f: _part_order(f.relative_to(input_dir).as_posix()),
+    )
+    jobs = max(1, jobs or os.cpu_count() or 1)
+
+    # Create final Office file as zip archive
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    with zipfile.ZipFile(output_file, "w", zipfile.ZIP_DEFLATED) as zf:
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            # Prepare a bounded number of parts ahead of the writer so memory
+            # stays proportional to the thread count, not the package size
+            pending = deque()
+            for f in parts:
+                arcname = f.relative_to(input_dir).as_posix()
+                pending.append(executor.submit(_prepare_part, f, arcname))
+                if len(pending) >= 2 * jobs:
+                    _write_part(zf, *pending.popleft().result())
+            while pending:
+                _write_part(zf, *pending.popleft().result())
+
+    # Validate if requested
+    if validate:
+        if not validate_document(output_file, service):
+            output_file.unlink()  # Delete the corrupt file
+            return False
 
     return True
 
 
-def validate_document(doc_path):
-    """Validate document by converting to HTML with soffice."""
+def _part_order(arcname):
+    """Sort key placing parts in the order Office applications write them.
+
+    [Content_Types].xml comes first and the package relationships second, so
+    readers that stream the archive can resolve every later part. XML parts
+    follow, then binary parts such as media.
+    """
+    if arcname == "[Content_Types].xml":
+        rank = 0
+    elif arcname == "_rels/.rels":
+        rank = 1
+    elif arcname.endswith((".xml", ".rels")):
+        rank = 2
+    else:
+        rank = 3
+    return (rank, arcname)
+
+
+def _prepare_part(path, arcname):
+    """Read, condense and pick the compression of one part (runs on a worker thread).
+
+    Returns:
+        Tuple of (path, ZipInfo, data). Data is None for stored media, which
+        the writer streams from disk instead.
+    """
+    zinfo = zipfile.ZipInfo.from_file(path, arcname)
+    if path.suffix.lower() in STORED_EXTENSIONS:
+        zinfo.compress_type = zipfile.ZIP_STORED
+        return path, zinfo, None
+
+    data = path.read_bytes()
+    zinfo.compress_type = zipfile.ZIP_DEFLATED
+    # Checked on the name because "_rels/.rels" has no suffix
+    if path.name.endswith((".xml", ".rels")):
+        # Condensed XML always deflates well
+        data = condense_xml_bytes(data)
+    elif _deflated_size(data) > len(data) * (1 - MIN_DEFLATE_SAVING):
+        zinfo.compress_type = zipfile.ZIP_STORED
+    return path, zinfo, data
+
+
+def _deflated_size(data):
+    """Size of data once deflated, measured in chunks to bound memory."""
+    compressor = zlib.compressobj(COMPRESS_LEVEL, zlib.DEFLATED, -15)
+    size = 0
+    for start in range(0, len(data), STREAM_CHUNK_SIZE):
+        size += len(compressor.compress(data[start : start + STREAM_CHUNK_SIZE]))
+    return size + len(compressor.flush())
+
+
+def _write_part(zf, path, zinfo, data):
+    """Append a prepared part to the archive."""
+    if data is None:
+        # Stored media: stream from disk without loading it into memory
+        with open(path, "rb") as src, zf.open(
+            zinfo, "w", force_zip64=zinfo.file_size > zipfile.ZIP64_LIMIT
+        ) as dest:
+            shutil.copyfileobj(src, dest, STREAM_CHUNK_SIZE)
+    else:
+        zf.writestr(zinfo, data, compresslevel=COMPRESS_LEVEL)
+
+
+def validate_document(doc_path, service=None):
+    """Validate document by converting to HTML with soffice.
+
+    Args:
+        doc_path: Path to the Office file
+        service: OfficeService to run the conversion on (default: a
+            one-off instance)
+
+    Returns:
+        bool: True if LibreOffice could convert the file (or is not installed)
+    """
     # Determine the correct filter based on file extension
     match doc_path.suffix.lower():
         case ".docx":
-            filter_name = "html:HTML"
+            filter_name = "HTML"
         case ".pptx":
-            filter_name = "html:impress_html_Export"
+            filter_name = "impress_html_Export"
         case ".xlsx":
-            filter_name = "html:HTML (StarCalc)"
+            filter_name = "HTML (StarCalc)"
 
     with tempfile.TemporaryDirectory() as temp_dir:
         try:
-            result = subprocess.run(
-                [
-                    "soffice",
-                    "--headless",
-                    "--convert-to",
-                    filter_name,
-                    "--outdir",
-                    temp_dir,
-                    str(doc_path),
-                ],
-                capture_output=True,
-                timeout=10,
-                text=True,
-            )
-            if not (Path(temp_dir) / f"{doc_path.stem}.html").exists():
-                error_msg = result.stderr.strip() or "Document validation failed"
-                print(f"Validation error: {error_msg}", file=sys.stderr)
-                return False
+            if service is None:
+                with OfficeService(timeout=10) as one_off:
+                    one_off.convert(doc_path, temp_dir, "html", filter_name)
+            else:
+                service.convert(doc_path, temp_dir, "html", filter_name, timeout=10)
             return True
         except FileNotFoundError:
             print("Warning: soffice not found. Skipping validation.", file=sys.stderr)
             return True
-        except subprocess.TimeoutExpired:
+        except OfficeTimeoutError:
             print("Validation error: Timeout during conversion", file=sys.stderr)
             return False
+        except OfficeServiceError as e:
+            print(
+                f"Validation error: {str(e) or 'Document validation failed'}",
+                file=sys.stderr,
+            )
+            return False
         except Exception as e:
             print(f"Validation error: {e}", file=sys.stderr)
             return False
@@ -132,27 +245,67 @@ def validate_document(doc_path):
 
 def condense_xml(xml_file):
     """Strip unnecessary whitespace and remove comments."""
-    with open(xml_file, "r", encoding="utf-8") as f:
-        dom = defusedxml.minidom.parse(f)
+    xml_file = Path(xml_file)
+    xml_file.write_bytes(condense_xml_bytes(xml_file.read_bytes()))
 
-    # Process each element to remove whitespace and comments
-    for element in dom.getElementsByTagName("*"):
+
+def condense_xml_bytes(data):
+    """Return XML with whitespace-only text and comments removed.
+
+    Text inside text-run elements (any prefixed "t" element such as w:t or a:t)
+    is left untouched, comments included.
+
+    Args:
+        data: Serialized XML part
+
+    Returns:
+        bytes: Condensed XML encoded as UTF-8, with an XML declaration
+    """
+    parser = lxml.etree.XMLParser(
+        resolve_entities=False, no_network=True, huge_tree=True
+    )
+    root = lxml.etree.fromstring(data, parser)
+
+    comments = []
+    for element in root.iter():
+        if not isinstance(element.tag, str):
+            if element.tag is lxml.etree.Comment:
+                comments.append(element)
+            continue
         # Skip w:t elements and their processing
-        if element.tagName.endswith(":t"):
+        if element.prefix and lxml.etree.QName(element).localname == "t":
+            continue
+        # Text before the first child and every child's tail are this
+        # element's text nodes
+        if element.text is not None and not element.text.strip():
+            element.text = None
+        for child in element:
+            if child.tail is not None and not child.tail.strip():
+                child.tail = None
+
+    for comment in comments:
+        parent = comment.getparent()
+        if parent is None or (
+            parent.prefix and lxml.etree.QName(parent).localname == "t"
+        ):
             continue
+        # Keep any remaining text that followed the comment
+        if comment.tail:
+            previous = comment.getprevious()
+            if previous is not None:
+                previous.tail = (previous.tail or "") + comment.tail
+            else:
+                parent.text = (parent.text or "") + comment.tail
+        parent.remove(comment)
 
-        # Remove whitespace-only text nodes and comment nodes
-        for child in list(element.childNodes):
-            if (
-                child.nodeType == child.TEXT_NODE
-                and child.nodeValue
-                and child.nodeValue.strip() == ""
-            ) or child.nodeType == child.COMMENT_NODE:
-                element.removeChild(child)
-
-    # Write back the condensed XML
-    with open(xml_file, "wb") as f:
-        f.write(dom.toxml(encoding="UTF-8"))
+    standalone = True if root.getroottree().docinfo.standalone else None
+    # Serialize the whole tree so processing instructions before the root survive
+    return lxml.etree.tostring(
+        root.getroottree(),
+        encoding="UTF-8",
+        xml_declaration=True,
+        standalone=standalone,
+    )
 
 
 if __name__ == "__main__":
@@ -18,18 +18,32 @@ Main Functions:
     extract_text_inventory: Extract all text from a presentation
     save_inventory: Save extracted data to JSON
 
+Slides are extracted in worker processes when a deck is large enough, and
+per-slide results are cached on disk by content hash, so re-running on a
+deck where only a few slides changed recomputes only those slides.
+
 Usage:
     python inventory.py input.pptx output.json
 """
 
 import argparse
+import functools
+import hashlib
 import json
+import os
 import platform
+import posixpath
 import sys
+import stat
+import tempfile
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple, Union
 
+from lxml import etree
 from PIL import Image, ImageDraw, ImageFont
 from pptx import Presentation
 from pptx.enum.text import PP_ALIGN
@@ -45,6 +59,77 @@ InventoryData = Dict[
     str, Dict[str, "ShapeData"]
 ]  # Dict of slide_id -> {shape_id -> ShapeData}
 InventoryDict = Dict[str, Dict[str, ShapeDict]]  # JSON-serializable inventory
+SlideRecord = Dict[str, ShapeDict]  # shape_id -> ShapeDict for one slide
+
+# Per-user cache directory. The on-disk caches here are trusted on a hit, so
+# they live where no other user can write
+if os.name == "nt":
+    USER_CACHE_HOME = Path(
+        os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local"
+    )
+else:
+    USER_CACHE_HOME = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+
+# On-disk cache of per-slide inventory records, keyed by a hash of the parts
+# that determine a slide's inventory. Set to None to disable.
+INVENTORY_CACHE_DIR = USER_CACHE_HOME / "pptx-inventory"
+INVENTORY_CACHE_VERSION = 1
+# Entries unused for this long are removed, then the least recently used ones
+# until the cache fits in the size limit
+INVENTORY_CACHE_MAX_AGE = 30 * 24 * 3600  # seconds
+INVENTORY_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Below this many slides to extract, a process pool costs more than it saves,
+# since every worker has to open the package itself
+PARALLEL_MIN_SLIDES = 8
+
+_PML_NS = "http://schemas.openxmlformats.org/presentationml/2006/main"
+_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+
+# Shared surface for text measurement; fonts and word widths are cached below
+_MEASURE_DRAW = ImageDraw.Draw(Image.new("RGB", (1, 1)))
+
+
+@functools.lru_cache(maxsize=None)
+def _list_font_dir(font_dir: str) -> Tuple[Path, ...]:
+    """List the files in a font directory once per process.
+
+    Args:
+        font_dir: Font directory path (may start with ~)
+
+    Returns:
+        Tuple of file paths in the directory, empty if it cannot be read
+    """
+    font_dir_path = Path(font_dir).expanduser()
+    try:
+        return tuple(p for p in font_dir_path.iterdir() if p.is_file())
+    except (OSError, PermissionError):
+        return ()
+
+
+@functools.lru_cache(maxsize=64)
+def load_font(font_path: Optional[str], size: int) -> Any:
+    """Load a font for text measurement, caching by (path, size).
+
+    Args:
+        font_path: Path to a TrueType/OpenType font file, or None
+        size: Font size in pixels
+
+    Returns:
+        A FreeTypeFont, or PIL's default font if the file cannot be loaded
+    """
+    if font_path:
+        try:
+            return ImageFont.truetype(font_path, size=size)
+        except Exception:
+            pass
+    return ImageFont.load_default()
+
+
+@functools.lru_cache(maxsize=65536)
+def text_width(font: Any, text: str) -> float:
+    """Measure the advance width of text in pixels, caching by (font, text)."""
+    return _MEASURE_DRAW.textlength(text, font=font)
 
 
 def main():
@@ -76,6 +161,18 @@ The output JSON includes:
         action="store_true",
         help="Include only text shapes that have overflow or overlap issues",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="Worker processes for slide extraction (default: all CPUs, 1 = serial)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore and do not update the on-disk inventory cache",
+    )
 
     args = parser.parse_args()
 
@@ -94,11 +191,16 @@ The output JSON includes:
             print(
                 "Filtering to include only text shapes with issues (overflow/overlap)"
             )
-        inventory = extract_text_inventory(input_path, issues_only=args.issues_only)
+        inventory = get_inventory_as_dict(
+            input_path,
+            issues_only=args.issues_only,
+            jobs=args.jobs,
+            use_cache=not args.no_cache,
+        )
 
         output_path = Path(args.output)
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        save_inventory(inventory, output_path)
+        write_inventory_json(inventory, output_path)
 
         print(f"Output saved to: {args.output}")
 
@@ -277,9 +379,12 @@ class ShapeData:
         return int(inches * dpi)
 
     @staticmethod
+    @functools.lru_cache(maxsize=None)
     def get_font_path(font_name: str) -> Optional[str]:
         """Get the font file path for a given font name.
 
+        Lookups are cached per process, and each font directory is listed once.
+
         Args:
             font_name: Name of the font (e.g., 'Arial', 'Calibri')
 
@@ -313,8 +418,6 @@ class ShapeData:
             extensions = [".ttf", ".otf"]
 
         # Try to find the font file
-        from pathlib import Path
-
         for font_dir in font_dirs:
             font_dir_path = Path(font_dir).expanduser()
             if not font_dir_path.exists():
@@ -328,17 +431,13 @@ class ShapeData:
                         return str(font_path)
 
             # Then try fuzzy matching - find files containing the font name
-            try:
-                for file_path in font_dir_path.iterdir():
-                    if file_path.is_file():
-                        file_name_lower = file_path.name.lower()
-                        font_name_lower = font_name.lower().replace(" ", "")
-                        if font_name_lower in file_name_lower and any(
-                            file_name_lower.endswith(ext) for ext in extensions
-                        ):
-                            return str(file_path)
-            except (OSError, PermissionError):
-                continue
+            font_name_lower = font_name.lower().replace(" ", "")
+            for file_path in _list_font_dir(font_dir):
+                file_name_lower = file_path.name.lower()
+                if font_name_lower in file_name_lower and any(
+                    file_name_lower.endswith(ext) for ext in extensions
+                ):
+                    return str(file_path)
 
         return None
 
@@ -391,6 +490,7 @@ class ShapeData:
         absolute_left: Optional[int] = None,
         absolute_top: Optional[int] = None,
         slide: Optional[Any] = None,
+        measure_text: bool = True,
     ):
         """Initialize from a PowerPoint shape object.
 
@@ -399,6 +499,8 @@ class ShapeData:
             absolute_left: Absolute left position in EMUs (for shapes in groups)
             absolute_top: Absolute top position in EMUs (for shapes in groups)
             slide: Optional slide object to get dimensions and layout information
+            measure_text: If False, skip the text overflow estimate (used when
+                the result is restored from a cached slide record)
         """
         self.shape = shape  # Store reference to original shape
         self.shape_id: str = ""  # Will be set after sorting
@@ -461,7 +563,8 @@ class ShapeData:
             str, float
         ] = {}  # Dict of shape_id -> overlap area in sq inches
         self.warnings: List[str] = []
-        self._estimate_frame_overflow()
+        if measure_text:
+            self._estimate_frame_overflow()
         self._calculate_slide_overflow()
         self._detect_bullet_issues()
 
@@ -531,28 +634,42 @@ class ShapeData:
             self.inches_to_pixels(usable_height),
         )
 
-    def _wrap_text_line(self, line: str, max_width_px: int, draw, font) -> List[str]:
-        """Wrap a single line of text to fit within max_width_px."""
+    def _wrap_text_line(self, line: str, max_width_px: int, font) -> List[str]:
+        """Wrap a single line of text to fit within max_width_px.
+
+        Line widths are accumulated from cached word and space advances, so
+        each distinct word is measured once instead of re-measuring every
+        candidate line.
+        """
         if not line:
             return [""]
 
-        # Use textlength for efficient width calculation
-        if draw.textlength(line, font=font) <= max_width_px:
+        words = line.split(" ")
+        word_widths = [text_width(font, word) for word in words]
+        space_width = text_width(font, " ")
+        if sum(word_widths) + space_width * (len(words) - 1) <= max_width_px:
             return [line]
 
-        # Need to wrap - split into words
+        # Need to wrap
         wrapped = []
-        words = line.split(" ")
         current_line = ""
+        current_width = 0.0
 
-        for word in words:
-            test_line = current_line + (" " if current_line else "") + word
-            if draw.textlength(test_line, font=font) <= max_width_px:
+        for word, word_width in zip(words, word_widths):
+            if current_line:
+                test_line = current_line + " " + word
+                test_width = current_width + space_width + word_width
+            else:
+                test_line = word
+                test_width = word_width
+            if test_width <= max_width_px:
                 current_line = test_line
+                current_width = test_width
             else:
                 if current_line:
                     wrapped.append(current_line)
                 current_line = word
+                current_width = word_width
 
         if current_line:
             wrapped.append(current_line)
@@ -573,10 +690,6 @@ class ShapeData:
         if usable_width_px <= 0 or usable_height_px <= 0:
             return
 
-        # Set up PIL for text measurement
-        dummy_img = Image.new("RGB", (1, 1))
-        draw = ImageDraw.Draw(dummy_img)
-
         # Get default font size from placeholder or use conservative estimate
         default_font_size = self._get_default_font_size()
 
@@ -593,20 +706,12 @@ class ShapeData:
             font_name = para_data.font_name or "Arial"
             font_size = int(para_data.font_size or default_font_size)
 
-            font = None
-            font_path = self.get_font_path(font_name)
-            if font_path:
-                try:
-                    font = ImageFont.truetype(font_path, size=font_size)
-                except Exception:
-                    font = ImageFont.load_default()
-            else:
-                font = ImageFont.load_default()
+            font = load_font(self.get_font_path(font_name), font_size)
 
             # Wrap all lines in this paragraph
             all_wrapped_lines = []
             for line in paragraph.text.split("\n"):
-                wrapped = self._wrap_text_line(line, usable_width_px, draw, font)
+                wrapped = self._wrap_text_line(line, usable_width_px, font)
                 all_wrapped_lines.extend(wrapped)
 
             if all_wrapped_lines:
@@ -885,41 +990,409 @@ def detect_overlaps(shapes: List[ShapeData]) -> None:
     This function requires each ShapeData to have its shape_id already set.
     It modifies the shapes in-place, adding shape IDs with overlap areas in square inches.
 
+    Shapes are swept left to right, so only pairs whose horizontal extents
+    intersect are passed to calculate_overlap. Entries are recorded in the
+    same order as a full pairwise comparison.
+
     Args:
         shapes: List of ShapeData objects with shape_id attributes set
     """
-    n = len(shapes)
+    for i, shape in enumerate(shapes):
+        assert shape.shape_id, f"Shape at index {i} has no shape_id"
+
+    rects = [(s.left, s.top, s.width, s.height) for s in shapes]
+    order = sorted(range(len(shapes)), key=lambda k: rects[k][0])
+
+    # Sweep by left edge; a shape starting at or past another's right edge
+    # cannot overlap it by more than the (non-negative) tolerance
+    pairs = []
+    for pos, i in enumerate(order):
+        right_i = rects[i][0] + rects[i][2]
+        for j in order[pos + 1 :]:
+            if rects[j][0] >= right_i:
+                break
+            first, second = (i, j) if i < j else (j, i)
+            overlaps, overlap_area = calculate_overlap(rects[first], rects[second])
+            if overlaps:
+                pairs.append((first, second, overlap_area))
 
-    # Compare each pair of shapes
-    for i in range(n):
-        for j in range(i + 1, n):
-            shape1 = shapes[i]
-            shape2 = shapes[j]
+    for first, second, overlap_area in sorted(pairs):
+        # Add shape IDs with overlap area in square inches
+        shapes[first].overlapping_shapes[shapes[second].shape_id] = overlap_area
+        shapes[second].overlapping_shapes[shapes[first].shape_id] = overlap_area
 
-            # Ensure shape IDs are set
-            assert shape1.shape_id, f"Shape at index {i} has no shape_id"
-            assert shape2.shape_id, f"Shape at index {j} has no shape_id"
 
-            rect1 = (shape1.left, shape1.top, shape1.width, shape1.height)
-            rect2 = (shape2.left, shape2.top, shape2.width, shape2.height)
+def extract_slide_shapes(slide: Any) -> List[ShapeData]:
+    """Extract the text shapes of one slide, sorted with IDs and overlaps set.
 
-            overlaps, overlap_area = calculate_overlap(rect1, rect2)
+    Args:
+        slide: Slide object
 
-            if overlaps:
-                # Add shape IDs with overlap area in square inches
-                shape1.overlapping_shapes[shape2.shape_id] = overlap_area
-                shape2.overlapping_shapes[shape1.shape_id] = overlap_area
+    Returns:
+        ShapeData objects in visual order, or an empty list if the slide has no text
+    """
+    # Collect all valid shapes from this slide with absolute positions
+    shapes_with_positions = []
+    for shape in slide.shapes:  # type: ignore
+        shapes_with_positions.extend(collect_shapes_with_absolute_positions(shape))
+
+    if not shapes_with_positions:
+        return []
+
+    # Convert to ShapeData with absolute positions and slide reference
+    shape_data_list = [
+        ShapeData(swp.shape, swp.absolute_left, swp.absolute_top, slide)
+        for swp in shapes_with_positions
+    ]
+
+    # Sort by visual position and assign stable IDs in one step
+    sorted_shapes = sort_shapes_by_position(shape_data_list)
+    for idx, shape_data in enumerate(sorted_shapes):
+        shape_data.shape_id = f"shape-{idx}"
+
+    # Detect overlaps using the stable shape IDs
+    if len(sorted_shapes) > 1:
+        detect_overlaps(sorted_shapes)
+
+    return sorted_shapes
+
+
+def restore_slide_shapes(slide: Any, record: SlideRecord) -> Optional[List[ShapeData]]:
+    """Rebuild a slide's ShapeData objects from a cached slide record.
+
+    Positions, placeholders and shape references come from the live slide;
+    the text overflow estimate and overlaps are taken from the record instead
+    of being recomputed.
+
+    Args:
+        slide: Slide object the record was computed from
+        record: Slide record as produced by slide_record()
+
+    Returns:
+        ShapeData objects in visual order, or None if the record does not
+        match the slide's shapes
+    """
+    shapes_with_positions = []
+    for shape in slide.shapes:  # type: ignore
+        shapes_with_positions.extend(collect_shapes_with_absolute_positions(shape))
+
+    sorted_shapes = sort_shapes_by_position(
+        [
+            ShapeData(
+                swp.shape, swp.absolute_left, swp.absolute_top, slide, measure_text=False
+            )
+            for swp in shapes_with_positions
+        ]
+    )
+    if len(sorted_shapes) != len(record):
+        return None
+
+    for idx, shape_data in enumerate(sorted_shapes):
+        shape_data.shape_id = f"shape-{idx}"
+        shape_dict = record.get(shape_data.shape_id)
+        if shape_dict is None:
+            return None
+        overflow = shape_dict.get("overflow", {})
+        shape_data.frame_overflow_bottom = overflow.get("frame", {}).get(  # type: ignore
+            "overflow_bottom"
+        )
+        shape_data.overlapping_shapes = dict(
+            shape_dict.get("overlap", {}).get("overlapping_shapes", {})  # type: ignore
+        )
+        shape_data.warnings = list(shape_dict.get("warnings", []))  # type: ignore
+
+    return sorted_shapes
+
+
+def slide_record(shapes: List[ShapeData]) -> SlideRecord:
+    """Convert a slide's ShapeData objects to a JSON-serializable slide record."""
+    return {shape_data.shape_id: shape_data.to_dict() for shape_data in shapes}
+
+
+def _shape_dict_has_issues(shape_dict: ShapeDict) -> bool:
+    """Dictionary counterpart of ShapeData.has_any_issues."""
+    return any(key in shape_dict for key in ("overflow", "overlap", "warnings"))
+
+
+def _rels_targets(zf: zipfile.ZipFile, part_name: str) -> Dict[str, Tuple[str, str]]:
+    """Map relationship IDs of a package part to (type, target part name)."""
+    rels_name = posixpath.join(
+        posixpath.dirname(part_name), "_rels", posixpath.basename(part_name) + ".rels"
+    )
+    try:
+        root = etree.fromstring(zf.read(rels_name))
+    except KeyError:
+        return {}
+
+    targets = {}
+    for rel in root:
+        if rel.get("TargetMode") == "External":
+            continue
+        target = rel.get("Target", "")
+        if target.startswith("/"):
+            target = target[1:]
+        else:
+            target = posixpath.normpath(
+                posixpath.join(posixpath.dirname(part_name), target)
+            )
+        targets[rel.get("Id")] = (rel.get("Type", ""), target)
+    return targets
+
+
+def _target_of_type(targets: Dict[str, Tuple[str, str]], rel_type: str) -> Optional[str]:
+    """Return the first relationship target whose type ends with rel_type."""
+    for target_type, target in targets.values():
+        if target_type.endswith("/" + rel_type):
+            return target
+    return None
+
+
+def slide_cache_keys(pptx_path: Path) -> Optional[List[str]]:
+    """Compute a cache key for every slide of a presentation, in slide order.
+
+    A slide's key hashes the parts its inventory depends on: the slide XML,
+    its layout and master XML, and the slide size. Media and unrelated parts
+    are not read, so keys are cheap to compute even for large decks.
+
+    Args:
+        pptx_path: Path to the PowerPoint file
+
+    Returns:
+        List of hex digests, or None if the package cannot be read this way
+    """
+    try:
+        with zipfile.ZipFile(pptx_path) as zf:
+            package_rels = _rels_targets(zf, "")
+            presentation_name = _target_of_type(package_rels, "officeDocument")
+            if presentation_name is None:
+                return None
+            presentation = etree.fromstring(zf.read(presentation_name))
+            presentation_rels = _rels_targets(zf, presentation_name)
+
+            slide_size = presentation.find(f"{{{_PML_NS}}}sldSz")
+            size_key = (
+                f"{slide_size.get('cx')}x{slide_size.get('cy')}"
+                if slide_size is not None
+                else ""
+            )
+
+            part_hashes: Dict[str, str] = {}
+
+            def part_hash(name: Optional[str]) -> str:
+                if name is None:
+                    return ""
+                if name not in part_hashes:
+                    part_hashes[name] = hashlib.sha256(zf.read(name)).hexdigest()
+                return part_hashes[name]
+
+            keys = []
+            for sld_id in presentation.iterfind(
+                f"{{{_PML_NS}}}sldIdLst/{{{_PML_NS}}}sldId"
+            ):
+                _, slide_name = presentation_rels[sld_id.get(f"{{{_REL_NS}}}id")]
+                layout_name = _target_of_type(
+                    _rels_targets(zf, slide_name), "slideLayout"
+                )
+                master_name = (
+                    _target_of_type(_rels_targets(zf, layout_name), "slideMaster")
+                    if layout_name
+                    else None
+                )
+                key = "\0".join(
+                    [
+                        str(INVENTORY_CACHE_VERSION),
+                        size_key,
+                        part_hash(slide_name),
+                        part_hash(layout_name),
+                        part_hash(master_name),
+                    ]
+                )
+                keys.append(hashlib.sha256(key.encode()).hexdigest())
+            return keys
+    except (OSError, KeyError, zipfile.BadZipFile, etree.XMLSyntaxError):
+        return None
+
+
+def private_cache_dir(path: Optional[Path]) -> Optional[Path]:
+    """Create a cache directory if needed and return it, or None if unusable.
+
+    On POSIX the directory must be owned by the current user and closed to
+    group and others, so no other user can plant or read cache entries.
+    """
+    if path is None:
+        return None
+    try:
+        path.mkdir(mode=0o700, parents=True, exist_ok=True)
+        st = path.lstat()
+    except OSError:
+        return None
+    if not stat.S_ISDIR(st.st_mode):
+        return None
+    if hasattr(os, "getuid") and (st.st_uid != os.getuid() or st.st_mode & 0o077):
+        return None
+    return path
+
+
+def prune_cache(cache_dir: Path, max_bytes: int, max_age: float) -> None:
+    """Bound a <cache_dir>/<xx>/<entry> cache by age and total size.
+
+    Entries not used (read or written) for max_age seconds are removed, then
+    the least recently used ones until the rest fit in max_bytes. Readers
+    touch the entries they use, so the mtime records the last use.
+    """
+    now = time.time()
+    entries = []
+    for entry in cache_dir.glob("*/*"):
+        try:
+            st = entry.stat()
+            if now - st.st_mtime > max_age:
+                entry.unlink()
+            else:
+                entries.append((st.st_mtime, st.st_size, entry))
+        except OSError:
+            pass
+    total = sum(size for _, size, _ in entries)
+    for _, size, entry in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            entry.unlink()
+            total -= size
+        except OSError:
+            pass
+
+
+# Cache directories already pruned by this process
+_pruned_cache_dirs = set()
+
+
+def _cache_file(key: str) -> Optional[Path]:
+    cache_dir = private_cache_dir(INVENTORY_CACHE_DIR)
+    return cache_dir / key[:2] / f"{key}.json" if cache_dir else None
+
+
+def _read_slide_cache(key: str) -> Optional[SlideRecord]:
+    cache_file = _cache_file(key)
+    if cache_file is None:
+        return None
+    try:
+        with open(cache_file, encoding="utf-8") as f:
+            record = json.load(f)
+        os.utime(cache_file)  # Mark as recently used for pruning
+        return record
+    except (OSError, ValueError):
+        return None
+
+
+def _write_slide_cache(key: str, record: SlideRecord) -> None:
+    cache_file = _cache_file(key)
+    if cache_file is None:
+        return
+    cache_dir = cache_file.parent.parent
+    if cache_dir not in _pruned_cache_dirs:
+        _pruned_cache_dirs.add(cache_dir)
+        prune_cache(cache_dir, INVENTORY_CACHE_MAX_BYTES, INVENTORY_CACHE_MAX_AGE)
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        # Write atomically so concurrent runs never see a partial entry
+        fd, tmp_name = tempfile.mkstemp(dir=cache_file.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(record, f, ensure_ascii=False)
+        os.replace(tmp_name, cache_file)
+    except OSError:
+        pass
+
+
+def _extract_slide_records(pptx_path: str, slide_indices: List[int]) -> List[SlideRecord]:
+    """Open a presentation and compute the records of the given slides.
+
+    Runs in worker processes, so every call opens its own copy of the package.
+    """
+    slides = list(Presentation(pptx_path).slides)
+    return [slide_record(extract_slide_shapes(slides[i])) for i in slide_indices]
+
+
+def _compute_slide_records(
+    pptx_path: Path, slide_indices: List[int], jobs: Optional[int]
+) -> Dict[int, SlideRecord]:
+    """Compute slide records for the given slides, in parallel when worthwhile.
+
+    Returns an empty dict when a process pool is not worthwhile, leaving the
+    slides to be extracted in the calling process.
+    """
+    workers = min(len(slide_indices), jobs or os.cpu_count() or 1)
+    if workers <= 1 or len(slide_indices) < PARALLEL_MIN_SLIDES:
+        return {}
+
+    # Interleave slides across workers so expensive runs of slides are spread out
+    chunks = [slide_indices[w::workers] for w in range(workers)]
+    records: Dict[int, SlideRecord] = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for chunk, chunk_records in zip(
+            chunks,
+            executor.map(_extract_slide_records, [str(pptx_path)] * workers, chunks),
+        ):
+            records.update(zip(chunk, chunk_records))
+    return records
+
+
+def _load_slide_records(
+    pptx_path: Path, slide_count: Optional[int], jobs: Optional[int], use_cache: bool
+) -> Tuple[Optional[List[str]], Dict[int, SlideRecord]]:
+    """Collect cached slide records and compute missing ones in worker processes.
+
+    Args:
+        pptx_path: Path to the PowerPoint file
+        slide_count: Number of slides, if known; used when caching is disabled
+        jobs: Worker processes (None uses all CPUs, 1 is serial)
+        use_cache: Whether to read and update the on-disk cache
+
+    Returns:
+        Tuple of (cache keys or None, records by slide index). Slides missing
+        from the records still need to be extracted by the caller.
+    """
+    keys = slide_cache_keys(pptx_path) if use_cache and INVENTORY_CACHE_DIR else None
+    if slide_count is None:
+        slide_count = len(keys) if keys is not None else None
+    if keys is not None and slide_count is not None and len(keys) != slide_count:
+        keys = None
+
+    records: Dict[int, SlideRecord] = {}
+    if keys is not None:
+        for idx, key in enumerate(keys):
+            record = _read_slide_cache(key)
+            if record is not None:
+                records[idx] = record
+
+    if slide_count is None:
+        return keys, records
+
+    missing = [idx for idx in range(slide_count) if idx not in records]
+    computed = _compute_slide_records(pptx_path, missing, jobs) if missing else {}
+    if keys is not None:
+        for idx, record in computed.items():
+            _write_slide_cache(keys[idx], record)
+    records.update(computed)
+    return keys, records
 
 
 def extract_text_inventory(
-    pptx_path: Path, prs: Optional[Any] = None, issues_only: bool = False
+    pptx_path: Path,
+    prs: Optional[Any] = None,
+    issues_only: bool = False,
+    jobs: Optional[int] = None,
+    use_cache: bool = True,
 ) -> InventoryData:
     """Extract text content from all slides in a PowerPoint presentation.
 
     Args:
         pptx_path: Path to the PowerPoint file
         prs: Optional Presentation object to use. If not provided, will load from pptx_path.
+            It must have been loaded from pptx_path and not modified since.
         issues_only: If True, only include shapes that have overflow or overlap issues
+        jobs: Worker processes for slides that are not cached (None uses all
+            CPUs, 1 is serial)
+        use_cache: Reuse and update the on-disk per-slide inventory cache
 
     Returns a nested dictionary: {slide-N: {shape-N: ShapeData}}
     Shapes are sorted by visual position (top-to-bottom, left-to-right).
@@ -928,36 +1401,18 @@ def extract_text_inventory(
     """
     if prs is None:
         prs = Presentation(str(pptx_path))
+    slides = list(prs.slides)
+    keys, records = _load_slide_records(pptx_path, len(slides), jobs, use_cache)
     inventory: InventoryData = {}
 
-    for slide_idx, slide in enumerate(prs.slides):
-        # Collect all valid shapes from this slide with absolute positions
-        shapes_with_positions = []
-        for shape in slide.shapes:  # type: ignore
-            shapes_with_positions.extend(collect_shapes_with_absolute_positions(shape))
-
-        if not shapes_with_positions:
-            continue
-
-        # Convert to ShapeData with absolute positions and slide reference
-        shape_data_list = [
-            ShapeData(
-                swp.shape,
-                swp.absolute_left,
-                swp.absolute_top,
-                slide,
-            )
-            for swp in shapes_with_positions
-        ]
-
-        # Sort by visual position and assign stable IDs in one step
-        sorted_shapes = sort_shapes_by_position(shape_data_list)
-        for idx, shape_data in enumerate(sorted_shapes):
-            shape_data.shape_id = f"shape-{idx}"
-
-        # Detect overlaps using the stable shape IDs
-        if len(sorted_shapes) > 1:
-            detect_overlaps(sorted_shapes)
+    for slide_idx, slide in enumerate(slides):
+        sorted_shapes = None
+        if slide_idx in records:
+            sorted_shapes = restore_slide_shapes(slide, records[slide_idx])
+        if sorted_shapes is None:
+            sorted_shapes = extract_slide_shapes(slide)
+            if keys is not None:
+                _write_slide_cache(keys[slide_idx], slide_record(sorted_shapes))
 
         # Filter for issues only if requested (after overlap detection)
         if issues_only:
@@ -974,28 +1429,51 @@ def extract_text_inventory(
     return inventory
 
 
-def get_inventory_as_dict(pptx_path: Path, issues_only: bool = False) -> InventoryDict:
+def get_inventory_as_dict(
+    pptx_path: Path,
+    issues_only: bool = False,
+    jobs: Optional[int] = None,
+    use_cache: bool = True,
+) -> InventoryDict:
     """Extract text inventory and return as JSON-serializable dictionaries.
 
     This is a convenience wrapper around extract_text_inventory that returns
     dictionaries instead of ShapeData objects, useful for testing and direct
-    JSON serialization.
+    JSON serialization. When every slide is cached, the presentation is not
+    loaded at all.
 
     Args:
         pptx_path: Path to the PowerPoint file
         issues_only: If True, only include shapes that have overflow or overlap issues
+        jobs: Worker processes for slides that are not cached (None uses all
+            CPUs, 1 is serial)
+        use_cache: Reuse and update the on-disk per-slide inventory cache
 
     Returns:
         Nested dictionary with all data serialized for JSON
     """
-    inventory = extract_text_inventory(pptx_path, issues_only=issues_only)
+    keys, records = _load_slide_records(pptx_path, None, jobs, use_cache)
+    if keys is None or len(records) < len(keys):
+        slides = list(Presentation(str(pptx_path)).slides)
+        if keys is None:
+            keys, records = _load_slide_records(pptx_path, len(slides), jobs, False)
+        for slide_idx, slide in enumerate(slides):
+            if slide_idx not in records:
+                records[slide_idx] = slide_record(extract_slide_shapes(slide))
+                if keys is not None:
+                    _write_slide_cache(keys[slide_idx], records[slide_idx])
 
-    # Convert ShapeData objects to dictionaries
     dict_inventory: InventoryDict = {}
-    for slide_key, shapes in inventory.items():
-        dict_inventory[slide_key] = {
-            shape_key: shape_data.to_dict() for shape_key, shape_data in shapes.items()
-        }
+    for slide_idx in sorted(records):
+        record = records[slide_idx]
+        if issues_only:
+            record = {
+                shape_key: shape_dict
+                for shape_key, shape_dict in record.items()
+                if _shape_dict_has_issues(shape_dict)
+            }
+        if record:
+            dict_inventory[f"slide-{slide_idx}"] = record
 
     return dict_inventory
 
@@ -1012,8 +1490,13 @@ def save_inventory(inventory: InventoryData, output_path: Path) -> None:
             shape_key: shape_data.to_dict() for shape_key, shape_data in shapes.items()
         }
 
+    write_inventory_json(json_inventory, output_path)
+
+
+def write_inventory_json(inventory: InventoryDict, output_path: Path) -> None:
+    """Write an already serialized inventory to a JSON file."""
     with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(json_inventory, f, indent=2, ensure_ascii=False)
+        json.dump(inventory, f, indent=2, ensure_ascii=False)
 
 
 if __name__ == "__main__":
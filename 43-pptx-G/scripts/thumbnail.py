@@ -38,18 +38,35 @@ Examples:
 
     python thumbnail.py template.pptx analysis --outline-placeholders
     # Creates thumbnail grids with red outlines around text placeholders
+
+Rendered slides are cached on disk, keyed by each slide's XML and the parts
+it renders from (layout, master, theme, media), so repeated runs during an
+edit loop only re-render the slides that changed.
 """
 
 import argparse
+import hashlib
+import os
+import shutil
 import subprocess
 import sys
 import tempfile
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-from inventory import extract_text_inventory
+from inventory import (
+    USER_CACHE_HOME,
+    extract_text_inventory,
+    private_cache_dir,
+    prune_cache,
+)
 from PIL import Image, ImageDraw, ImageFont
 from pptx import Presentation
 
+sys.path.insert(0, str(Path(__file__).parent.parent / "ooxml" / "scripts"))
+from office_service import OfficeService  # noqa: E402
+
 # Constants
 THUMBNAIL_WIDTH = 300  # Fixed thumbnail width in pixels
 CONVERSION_DPI = 100  # DPI for PDF to image conversion
@@ -63,6 +80,20 @@ BORDER_WIDTH = 2  # Border width around thumbnails
 FONT_SIZE_RATIO = 0.12  # Font size as fraction of thumbnail width
 LABEL_PADDING_RATIO = 0.4  # Label padding as fraction of font size
 
+# Render cache: one JPEG per slide, keyed by slide content and DPI. Cached
+# images go straight into the grid, so the cache lives in the private per-user
+# cache directory. Set to None to disable.
+RENDER_CACHE_DIR = USER_CACHE_HOME / "pptx-thumbnails"
+RENDER_CACHE_VERSION = 1
+# Renders unused for this long are removed, then the least recently used ones
+# until the cache fits in the size limit
+RENDER_CACHE_MAX_AGE = 30 * 24 * 3600  # seconds
+RENDER_CACHE_MAX_BYTES = 256 * 1024 * 1024
+MIN_PAGES_PER_WORKER = 4  # Fewer pages than this aren't worth another pdftoppm
+
+# Relationships that do not affect how a slide renders (notes, hyperlink targets)
+NON_RENDER_RELTYPES = ("/notesSlide", "/slide")
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -86,6 +117,18 @@ def main():
         action="store_true",
         help="Outline text placeholders with a colored border",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="Parallel pdftoppm workers (default: all CPUs, 1 = serial)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-render every slide and do not update the render cache",
+    )
 
     args = parser.parse_args()
 
@@ -119,7 +162,13 @@ def main():
                     print(f"Found placeholders on {len(placeholder_regions)} slides")
 
             # Convert slides to images
-            slide_images = convert_to_images(input_path, Path(temp_dir), CONVERSION_DPI)
+            slide_images = convert_to_images(
+                input_path,
+                Path(temp_dir),
+                CONVERSION_DPI,
+                jobs=args.jobs,
+                use_cache=not args.no_cache,
+            )
             if not slide_images:
                 print("Error: No slides found")
                 sys.exit(1)
@@ -194,63 +243,203 @@ def get_placeholder_regions(pptx_path):
     return placeholder_regions, (slide_width_inches, slide_height_inches)
 
 
-def convert_to_images(pptx_path, temp_dir, dpi):
-    """Convert PowerPoint to images via PDF, handling hidden slides."""
+def slide_render_keys(prs, pptx_path, dpi):
+    """Compute a render cache key for every slide, in slide order.
+
+    A key covers the slide's position, the slide size, the DPI, and every part
+    the slide renders from: the parts reachable through its relationships
+    (layout, master, theme, media, charts, ...) and their .rels files. Parts
+    are fingerprinted by their zip CRC-32 and size, so media is never re-read.
+    """
+    with zipfile.ZipFile(pptx_path) as zf:
+        fingerprints = {
+            info.filename: f"{info.CRC:08x}:{info.file_size}" for info in zf.infolist()
+        }
+
+    keys = []
+    for idx, slide in enumerate(prs.slides):
+        # Collect every part this slide renders from
+        part_names = set()
+        pending = [slide.part]
+        while pending:
+            part = pending.pop()
+            part_name = str(part.partname).lstrip("/")
+            if part_name in part_names:
+                continue
+            part_names.add(part_name)
+            for rel in part.rels.values():
+                if rel.is_external or rel.reltype.endswith(NON_RENDER_RELTYPES):
+                    continue
+                pending.append(rel.target_part)
+
+        digest = hashlib.sha256(
+            f"{RENDER_CACHE_VERSION}\0{dpi}\0{idx}\0"
+            f"{prs.slide_width}x{prs.slide_height}".encode()
+        )
+        for part_name in sorted(part_names):
+            directory, _, base = part_name.rpartition("/")
+            rels_name = f"{directory}/_rels/{base}.rels" if directory else f"_rels/{base}.rels"
+            digest.update(
+                f"\0{part_name}={fingerprints.get(part_name, '')}"
+                f"|{fingerprints.get(rels_name, '')}".encode()
+            )
+        keys.append(digest.hexdigest())
+
+    return keys
+
+
+def _render_cache_path(cache_dir, key):
+    return cache_dir / key[:2] / f"{key}.jpg"
+
+
+def _store_render(cache_dir, key, image_path):
+    """Copy a rendered slide into the render cache (atomically)."""
+    cache_path = _render_cache_path(cache_dir, key)
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=cache_path.parent, suffix=".tmp")
+        os.close(fd)
+        shutil.copyfile(image_path, tmp_name)
+        os.replace(tmp_name, cache_path)
+    except OSError:
+        pass
+
+
+def rasterize_pdf(pdf_path, output_dir, dpi, page_count, jobs=None):
+    """Rasterize PDF pages to JPEG, splitting page ranges across pdftoppm workers.
+
+    Returns the image paths in page order.
+    """
+    workers = min(
+        jobs or os.cpu_count() or 1, max(1, page_count // MIN_PAGES_PER_WORKER)
+    )
+    pages_per_worker = -(-page_count // workers)
+    page_ranges = [
+        (first, min(first + pages_per_worker - 1, page_count))
+        for first in range(1, page_count + 1, pages_per_worker)
+    ]
+
+    def run(worker_idx, first, last):
+        prefix = output_dir / f"slide{worker_idx}"
+        result = subprocess.run(
+            [
+                "pdftoppm",
+                "-jpeg",
+                "-r",
+                str(dpi),
+                "-f",
+                str(first),
+                "-l",
+                str(last),
+                str(pdf_path),
+                str(prefix),
+            ],
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            raise RuntimeError("Image conversion failed")
+        # pdftoppm zero-pads page numbers consistently within one document
+        return sorted(output_dir.glob(f"{prefix.name}-*.jpg"))
+
+    with ThreadPoolExecutor(max_workers=len(page_ranges)) as executor:
+        futures = [
+            executor.submit(run, worker_idx, first, last)
+            for worker_idx, (first, last) in enumerate(page_ranges)
+        ]
+        return [path for future in futures for path in future.result()]
+
+
+def convert_to_images(
+    pptx_path, temp_dir, dpi, jobs=None, use_cache=True, service=None
+):
+    """Convert PowerPoint to images via PDF, handling hidden slides.
+
+    Slides found in the render cache are hidden in a temporary copy of the
+    deck, so LibreOffice only exports the slides that changed; slide numbering
+    is unaffected because hidden slides keep their position. Pass an
+    OfficeService as service to share its LibreOffice profile across calls
+    (and, with the UNO backend, one running LibreOffice).
+    """
     # Detect hidden slides
     print("Analyzing presentation...")
     prs = Presentation(str(pptx_path))
-    total_slides = len(prs.slides)
+    slides = list(prs.slides)
+    total_slides = len(slides)
 
     # Find hidden slides (1-based indexing for display)
     hidden_slides = {
-        idx + 1
-        for idx, slide in enumerate(prs.slides)
-        if slide.element.get("show") == "0"
+        idx + 1 for idx, slide in enumerate(slides) if slide.element.get("show") == "0"
     }
 
     print(f"Total slides: {total_slides}")
     if hidden_slides:
         print(f"Hidden slides: {sorted(hidden_slides)}")
 
-    pdf_path = temp_dir / f"{pptx_path.stem}.pdf"
-
-    # Convert to PDF
-    print("Converting to PDF...")
-    result = subprocess.run(
-        [
-            "soffice",
-            "--headless",
-            "--convert-to",
-            "pdf",
-            "--outdir",
-            str(temp_dir),
-            str(pptx_path),
-        ],
-        capture_output=True,
-        text=True,
-    )
-    if result.returncode != 0 or not pdf_path.exists():
-        raise RuntimeError("PDF conversion failed")
-
-    # Convert PDF to images
-    print(f"Converting to images at {dpi} DPI...")
-    result = subprocess.run(
-        ["pdftoppm", "-jpeg", "-r", str(dpi), str(pdf_path), str(temp_dir / "slide")],
-        capture_output=True,
-        text=True,
-    )
-    if result.returncode != 0:
-        raise RuntimeError("Image conversion failed")
-
-    visible_images = sorted(temp_dir.glob("slide-*.jpg"))
+    visible_slides = [n for n in range(1, total_slides + 1) if n not in hidden_slides]
+    cache_dir = private_cache_dir(RENDER_CACHE_DIR) if use_cache else None
+    keys = None
+    if cache_dir is not None:
+        # Prune before looking up renders, so none of the hits is removed
+        prune_cache(cache_dir, RENDER_CACHE_MAX_BYTES, RENDER_CACHE_MAX_AGE)
+        keys = slide_render_keys(prs, pptx_path, dpi)
+
+    # Reuse cached renders
+    slide_images = {}
+    if keys is not None:
+        for slide_num in visible_slides:
+            cache_path = _render_cache_path(cache_dir, keys[slide_num - 1])
+            try:
+                os.utime(cache_path)  # Mark as recently used for pruning
+            except OSError:
+                continue
+            slide_images[slide_num] = cache_path
+
+    to_render = [n for n in visible_slides if n not in slide_images]
+    if slide_images:
+        print(f"Reusing {len(slide_images)} cached slide image(s)")
+
+    if to_render:
+        deck_path = pptx_path
+        if slide_images:
+            # Export only the changed slides
+            for slide_num in slide_images:
+                slides[slide_num - 1].element.set("show", "0")
+            deck_path = temp_dir / f"{pptx_path.stem}.pptx"
+            prs.save(str(deck_path))
+
+        pdf_path = temp_dir / f"{deck_path.stem}.pdf"
+
+        # Convert to PDF
+        print(f"Converting {len(to_render)} slide(s) to PDF...")
+        try:
+            if service is None:
+                with OfficeService() as one_off:
+                    one_off.convert(deck_path, temp_dir, "pdf")
+            else:
+                service.convert(deck_path, temp_dir, "pdf")
+        except Exception as e:
+            raise RuntimeError("PDF conversion failed") from e
+        if not pdf_path.exists():
+            raise RuntimeError("PDF conversion failed")
+
+        # Convert PDF to images
+        print(f"Converting to images at {dpi} DPI...")
+        rendered = rasterize_pdf(pdf_path, temp_dir, dpi, len(to_render), jobs)
+
+        # Only cache when every exported page maps to exactly one slide
+        cacheable = keys is not None and len(rendered) == len(to_render)
+        for slide_num, image_path in zip(to_render, rendered):
+            slide_images[slide_num] = image_path
+            if cacheable:
+                _store_render(cache_dir, keys[slide_num - 1], image_path)
 
     # Create full list with placeholders for hidden slides
     all_images = []
-    visible_idx = 0
 
     # Get placeholder dimensions from first visible slide
-    if visible_images:
-        with Image.open(visible_images[0]) as img:
+    if slide_images:
+        with Image.open(slide_images[min(slide_images)]) as img:
             placeholder_size = img.size
     else:
         placeholder_size = (1920, 1080)
@@ -262,11 +451,9 @@ def convert_to_images(pptx_path, temp_dir, dpi):
             placeholder_img = create_hidden_slide_placeholder(placeholder_size)
             placeholder_img.save(placeholder_path, "JPEG")
             all_images.append(placeholder_path)
-        else:
+        elif slide_num in slide_images:
             # Use the actual visible slide image
-            if visible_idx < len(visible_images):
-                all_images.append(visible_images[visible_idx])
-                visible_idx += 1
+            all_images.append(slide_images[slide_num])
 
     return all_images
 
@@ -379,7 +566,13 @@ def create_grid(
             orig_w, orig_h = img.size
 
             # Apply placeholder outlines if enabled
-            if placeholder_regions and (start_slide_num + i) in placeholder_regions:
+            outline = placeholder_regions and (start_slide_num + i) in placeholder_regions
+            if not outline:
+                # Let the JPEG decoder downscale while decoding, so the
+                # full-size slide is never held in memory
+                img.draft("RGB", (width, height))
+
+            if outline:
                 # Convert to RGBA for transparency support
                 if img.mode != "RGBA":
                     img = img.convert("RGBA")
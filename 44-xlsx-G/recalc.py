@@ -5,58 +5,46 @@ Recalculates all formulas in an Excel file using LibreOffice
 """
 
 import json
-import sys
-import subprocess
 import os
-import platform
+import posixpath
+import sys
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from openpyxl import load_workbook
+import defusedxml.ElementTree as ET
+from openpyxl.utils.cell import coordinate_to_tuple, get_column_letter
+from office_service import OfficeService, OfficeServiceError, OfficeTimeoutError
 
 
-def setup_libreoffice_macro():
-    """Setup LibreOffice macro for recalculation if not already configured"""
-    if platform.system() == 'Darwin':
-        macro_dir = os.path.expanduser('~/Library/Application Support/LibreOffice/4/user/basic/Standard')
-    else:
-        macro_dir = os.path.expanduser('~/.config/libreoffice/4/user/basic/Standard')
-    
-    macro_file = os.path.join(macro_dir, 'Module1.xba')
-    
-    if os.path.exists(macro_file):
-        with open(macro_file, 'r') as f:
-            if 'RecalculateAndSave' in f.read():
-                return True
-    
-    if not os.path.exists(macro_dir):
-        subprocess.run(['soffice', '--headless', '--terminate_after_init'], 
-                      capture_output=True, timeout=10)
-        os.makedirs(macro_dir, exist_ok=True)
-    
-    macro_content = '''<?xml version="1.0" encoding="UTF-8"?>
-<!DOCTYPE script:module PUBLIC "-//OpenOffice.org//DTD OfficeDocument 1.0//EN" "module.dtd">
-<script:module xmlns:script="http://openoffice.org/2000/script" script:name="Module1" script:language="StarBasic">
-    Sub RecalculateAndSave()
-      ThisComponent.calculateAll()
-      ThisComponent.store()
-      ThisComponent.close(True)
-    End Sub
-</script:module>'''
-    
-    try:
-        with open(macro_file, 'w') as f:
-            f.write(macro_content)
-        return True
-    except Exception:
-        return False
+EXCEL_ERRORS = ['#VALUE!', '#DIV/0!', '#REF!', '#NAME?', '#NULL!', '#NUM!', '#N/A']
+MAX_LOCATIONS = 20  # Locations reported per error type
+
+# Below this much sheet XML, starting worker processes costs more than it saves
+PARALLEL_MIN_BYTES = 8 * 1024 * 1024
+
+SHEET_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+REL_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+SHEET_DATA_TAG = f'{{{SHEET_NS}}}sheetData'
+ROW_TAG = f'{{{SHEET_NS}}}row'
+CELL_TAG = f'{{{SHEET_NS}}}c'
+V_TAG = f'{{{SHEET_NS}}}v'
+F_TAG = f'{{{SHEET_NS}}}f'
+IS_TAG = f'{{{SHEET_NS}}}is'
+SI_TAG = f'{{{SHEET_NS}}}si'
+T_TAG = f'{{{SHEET_NS}}}t'
+R_TAG = f'{{{SHEET_NS}}}r'
 
 
-def recalc(filename, timeout=30):
+def recalc(filename, timeout=30, service=None):
     """
     Recalculate formulas in Excel file and report any errors
     
     Args:
         filename: Path to Excel file
         timeout: Maximum time to wait for recalculation (seconds)
+        service: OfficeService to recalculate on; pass one when processing
+            many files so they share its LibreOffice profile (and, with the
+            UNO backend, one running LibreOffice)
     
     Returns:
         dict with error locations and counts
@@ -64,62 +52,25 @@ def recalc(filename, timeout=30):
     if not Path(filename).exists():
         return {'error': f'File {filename} does not exist'}
     
-    abs_path = str(Path(filename).absolute())
-    
-    if not setup_libreoffice_macro():
-        return {'error': 'Failed to setup LibreOffice macro'}
-    
-    cmd = [
-        'soffice', '--headless', '--norestore',
-        'vnd.sun.star.script:Standard.Module1.RecalculateAndSave?language=Basic&location=application',
-        abs_path
-    ]
-    
-    # Handle timeout command differences between Linux and macOS
-    if platform.system() != 'Windows':
-        timeout_cmd = 'timeout' if platform.system() == 'Linux' else None
-        if platform.system() == 'Darwin':
-            # Check if gtimeout is available on macOS
-            try:
-                subprocess.run(['gtimeout', '--version'], capture_output=True, timeout=1, check=False)
-                timeout_cmd = 'gtimeout'
-            except (FileNotFoundError, subprocess.TimeoutExpired):
-                pass
-        
-        if timeout_cmd:
-            cmd = [timeout_cmd, str(timeout)] + cmd
-    
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    
-    if result.returncode != 0 and result.returncode != 124:  # 124 is timeout exit code
-        error_msg = result.stderr or 'Unknown error during recalculation'
-        if 'Module1' in error_msg or 'RecalculateAndSave' not in error_msg:
-            return {'error': 'LibreOffice macro not configured properly'}
+    try:
+        if service is None:
+            with OfficeService(timeout=timeout) as one_off:
+                one_off.recalc(filename)
         else:
-            return {'error': error_msg}
+            service.recalc(filename, timeout=timeout)
+    except FileNotFoundError:
+        return {'error': 'LibreOffice (soffice) not found'}
+    except OfficeTimeoutError:
+        # As before, a recalculation that outlives the timeout is not an
+        # error by itself; the scan below reports what was saved
+        pass
+    except OfficeServiceError as e:
+        return {'error': str(e) or 'Unknown error during recalculation'}
     
     # Check for Excel errors in the recalculated file - scan ALL cells
     try:
-        wb = load_workbook(filename, data_only=True)
-        
-        excel_errors = ['#VALUE!', '#DIV/0!', '#REF!', '#NAME?', '#NULL!', '#NUM!', '#N/A']
-        error_details = {err: [] for err in excel_errors}
-        total_errors = 0
-        
-        for sheet_name in wb.sheetnames:
-            ws = wb[sheet_name]
-            # Check ALL rows and columns - no limits
-            for row in ws.iter_rows():
-                for cell in row:
-                    if cell.value is not None and isinstance(cell.value, str):
-                        for err in excel_errors:
-                            if err in cell.value:
-                                location = f"{sheet_name}!{cell.coordinate}"
-                                error_details[err].append(location)
-                                total_errors += 1
-                                break
-        
-        wb.close()
+        error_counts, error_locations, formula_count = scan_workbook(filename)
+        total_errors = sum(error_counts.values())
         
         # Build result summary
         result = {
@@ -129,24 +80,14 @@ def recalc(filename, timeout=30):
         }
         
         # Add non-empty error categories
-        for err_type, locations in error_details.items():
-            if locations:
+        for err_type in EXCEL_ERRORS:
+            if error_counts[err_type]:
                 result['error_summary'][err_type] = {
-                    'count': len(locations),
-                    'locations': locations[:20]  # Show up to 20 locations
+                    'count': error_counts[err_type],
+                    'locations': error_locations[err_type]  # Up to MAX_LOCATIONS
                 }
         
-        # Add formula count for context - also check ALL cells
-        wb_formulas = load_workbook(filename, data_only=False)
-        formula_count = 0
-        for sheet_name in wb_formulas.sheetnames:
-            ws = wb_formulas[sheet_name]
-            for row in ws.iter_rows():
-                for cell in row:
-                    if cell.value and isinstance(cell.value, str) and cell.value.startswith('='):
-                        formula_count += 1
-        wb_formulas.close()
-        
+        # Add formula count for context
         result['total_formulas'] = formula_count
         
         return result
@@ -155,24 +96,242 @@ def recalc(filename, timeout=30):
         return {'error': str(e)}
 
 
+def scan_workbook(filename, jobs=None):
+    """
+    Find Excel error values and count formulas in one streaming pass
+    
+    Sheet XML parts are read straight from the package with defusedxml's
+    iterparse (entity declarations are refused), one row in memory at a
+    time, and sheets are scanned in parallel processes when the workbook
+    is large. Cells are interpreted the way openpyxl does:
+    any string value (cached formula result, shared or inline string, error)
+    containing an error code is an error, and a cell counts as a formula if
+    it has a non-array, non-data-table formula or a string value starting
+    with '='.
+    
+    Args:
+        filename: Path to the .xlsx/.xlsm file
+        jobs: Worker processes (default: all CPUs, 1 = serial)
+    
+    Returns:
+        (error_counts, error_locations, formula_count) where error_counts
+        maps each error code to its count and error_locations maps it to
+        the first MAX_LOCATIONS 'Sheet!A1' locations in workbook order
+    """
+    with zipfile.ZipFile(filename) as zf:
+        sheets, shared_strings_part = _workbook_parts(zf)
+        shared_errors, shared_formula_like = _scan_shared_strings(zf, shared_strings_part)
+        sheet_bytes = sum(zf.getinfo(part).file_size for _, part in sheets)
+    
+    args = [(str(filename), name, part, shared_errors, shared_formula_like)
+            for name, part in sheets]
+    workers = min(len(sheets), jobs or os.cpu_count() or 1)
+    if workers > 1 and sheet_bytes >= PARALLEL_MIN_BYTES:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            sheet_results = list(executor.map(_scan_sheet, *zip(*args)))
+    else:
+        sheet_results = [_scan_sheet(*a) for a in args]
+    
+    error_counts = {err: 0 for err in EXCEL_ERRORS}
+    error_locations = {err: [] for err in EXCEL_ERRORS}
+    formula_count = 0
+    for counts, locations, formulas in sheet_results:
+        for err in EXCEL_ERRORS:
+            error_counts[err] += counts[err]
+            room = MAX_LOCATIONS - len(error_locations[err])
+            error_locations[err].extend(locations[err][:room])
+        formula_count += formulas
+    return error_counts, error_locations, formula_count
+
+
+def _match_error(text):
+    """Return the first error code contained in text, or None"""
+    for err in EXCEL_ERRORS:
+        if err in text:
+            return err
+    return None
+
+
+def _read_rels(zf, part_name):
+    """Map relationship IDs of a package part to (type, target part name)"""
+    directory, _, base = part_name.rpartition('/')
+    rels_name = f'{directory}/_rels/{base}.rels' if directory else f'_rels/{base}.rels'
+    root = ET.fromstring(zf.read(rels_name))
+    rels = {}
+    for rel in root:
+        target = rel.get('Target', '')
+        if rel.get('TargetMode') == 'External':
+            continue
+        if target.startswith('/'):
+            target = target[1:]
+        else:
+            target = posixpath.normpath(posixpath.join(directory, target))
+        rels[rel.get('Id')] = (rel.get('Type', ''), target)
+    return rels
+
+
+def _workbook_parts(zf):
+    """Return ([(sheet_name, part_name), ...], shared_strings_part) in workbook order"""
+    workbook_part = next(target for rel_type, target in _read_rels(zf, '').values()
+                         if rel_type.endswith('/officeDocument'))
+    workbook_rels = _read_rels(zf, workbook_part)
+    root = ET.fromstring(zf.read(workbook_part))
+    
+    sheets = []
+    for sheet in root.iterfind(f'{{{SHEET_NS}}}sheets/{{{SHEET_NS}}}sheet'):
+        rel_type, target = workbook_rels[sheet.get(f'{{{REL_NS}}}id')]
+        # Chartsheets and dialog sheets have no cells
+        if rel_type.endswith('/worksheet'):
+            sheets.append((sheet.get('name'), target))
+    
+    shared_strings_part = next((target for rel_type, target in workbook_rels.values()
+                                if rel_type.endswith('/sharedStrings')), None)
+    return sheets, shared_strings_part
+
+
+def _text_content(element):
+    """Plain text of a shared or inline string (<t> and rich-text runs, no phonetics)"""
+    parts = [element.findtext(T_TAG) or '']
+    parts.extend(run.findtext(T_TAG) or '' for run in element.iterfind(R_TAG))
+    return ''.join(parts)
+
+
+def _scan_shared_strings(zf, part_name):
+    """
+    Stream the shared string table, keeping only what the cell scan needs
+    
+    Returns:
+        (shared_errors, shared_formula_like): index -> error code for strings
+        containing one, and the set of indexes of strings starting with '='
+    """
+    shared_errors = {}
+    shared_formula_like = set()
+    if part_name is None:
+        return shared_errors, shared_formula_like
+    
+    with zf.open(part_name) as f:
+        context = ET.iterparse(f, events=('start', 'end'))
+        _, root = next(context)
+        index = 0
+        for event, elem in context:
+            if event == 'end' and elem.tag == SI_TAG:
+                text = _text_content(elem).replace('x005F_', '')
+                err = _match_error(text)
+                if err:
+                    shared_errors[index] = err
+                if text.startswith('='):
+                    shared_formula_like.add(index)
+                index += 1
+                root.clear()
+    return shared_errors, shared_formula_like
+
+
+def _scan_sheet(filename, sheet_name, part_name, shared_errors, shared_formula_like):
+    """
+    Scan one worksheet part for error values and formulas
+    
+    Returns:
+        (error_counts, error_locations, formula_count) for this sheet, with
+        at most MAX_LOCATIONS locations per error code
+    """
+    error_counts = {err: 0 for err in EXCEL_ERRORS}
+    error_locations = {err: [] for err in EXCEL_ERRORS}
+    formula_count = 0
+    row_number = 0
+    column_number = 0
+    sheet_data = None
+    
+    with zipfile.ZipFile(filename) as zf, zf.open(part_name) as f:
+        for event, elem in ET.iterparse(f, events=('start', 'end')):
+            tag = elem.tag
+            if event == 'start':
+                if tag == ROW_TAG:
+                    r = elem.get('r')
+                    row_number = int(float(r)) if r else row_number + 1
+                    column_number = 0
+                elif tag == SHEET_DATA_TAG:
+                    sheet_data = elem
+                continue
+            
+            if tag == ROW_TAG:
+                # Drop the finished row so memory is bounded by one row
+                elem.clear()
+                if sheet_data is not None:
+                    sheet_data.remove(elem)
+                continue
+            if tag != CELL_TAG:
+                continue
+            
+            coordinate = elem.get('r')
+            if coordinate:
+                column_number = None  # Resolved lazily if a later cell has no r
+                last_coordinate = coordinate
+            else:
+                if column_number is None:
+                    column_number = coordinate_to_tuple(last_coordinate)[1]
+                column_number += 1
+                coordinate = f'{get_column_letter(column_number)}{row_number}'
+            
+            data_type = elem.get('t', 'n')
+            formula = elem.find(F_TAG)
+            if formula is not None and formula.get('t') not in ('array', 'dataTable'):
+                formula_count += 1
+            
+            err = None
+            formula_like = False
+            if data_type == 'inlineStr':
+                inline = elem.find(IS_TAG)
+                if inline is not None:
+                    text = _text_content(inline)
+                    err = _match_error(text)
+                    formula_like = text.startswith('=')
+            elif data_type in ('s', 'str', 'e'):
+                value = elem.findtext(V_TAG)
+                if value:
+                    if data_type == 's':
+                        index = int(value)
+                        err = shared_errors.get(index)
+                        formula_like = index in shared_formula_like
+                    else:
+                        err = _match_error(value)
+                        formula_like = value.startswith('=')
+            
+            if formula is None and formula_like:
+                formula_count += 1
+            if err:
+                error_counts[err] += 1
+                if len(error_locations[err]) < MAX_LOCATIONS:
+                    error_locations[err].append(f'{sheet_name}!{coordinate}')
+    
+    return error_counts, error_locations, formula_count
+
+
 def main():
     if len(sys.argv) < 2:
-        print("Usage: python recalc.py <excel_file> [timeout_seconds]")
-        print("\nRecalculates all formulas in an Excel file using LibreOffice")
+        print("Usage: python recalc.py <excel_file> [<excel_file> ...] [timeout_seconds]")
+        print("\nRecalculates all formulas in Excel files using LibreOffice")
         print("\nReturns JSON with error details:")
         print("  - status: 'success' or 'errors_found'")
         print("  - total_errors: Total number of Excel errors found")
         print("  - total_formulas: Number of formulas in the file")
         print("  - error_summary: Breakdown by error type with locations")
         print("    - #VALUE!, #DIV/0!, #REF!, #NAME?, #NULL!, #NUM!, #N/A")
+        print("\nWith several files, they share one LibreOffice profile and the")
+        print("output is a JSON object mapping each file to its result.")
         sys.exit(1)
     
-    filename = sys.argv[1]
-    timeout = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+    filenames = sys.argv[1:]
+    timeout = 30
+    if len(filenames) > 1 and filenames[-1].isdigit():
+        timeout = int(filenames.pop())
     
-    result = recalc(filename, timeout)
+    if len(filenames) == 1:
+        result = recalc(filenames[0], timeout)
+    else:
+        with OfficeService(timeout=timeout) as service:
+            result = {name: recalc(name, timeout, service) for name in filenames}
     print(json.dumps(result, indent=2))
 
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
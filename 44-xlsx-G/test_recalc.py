@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""44-xlsx recalc.py 扫描测试"""
+import zipfile
+
+import pytest
+from defusedxml import EntitiesForbidden
+from openpyxl import Workbook, load_workbook
+
+import recalc
+from recalc import EXCEL_ERRORS, MAX_LOCATIONS, scan_workbook
+
+
+def openpyxl_scan(filename):
+    """用 openpyxl 逐个单元格扫描（与流式扫描对照）"""
+    error_counts = {err: 0 for err in EXCEL_ERRORS}
+    error_locations = {err: [] for err in EXCEL_ERRORS}
+    wb = load_workbook(filename, data_only=True)
+    for ws in wb.worksheets:
+        for row in ws.iter_rows():
+            for cell in row:
+                if isinstance(cell.value, str):
+                    err = next((e for e in EXCEL_ERRORS if e in cell.value), None)
+                    if err:
+                        error_counts[err] += 1
+                        if len(error_locations[err]) < MAX_LOCATIONS:
+                            error_locations[err].append(f"{ws.title}!{cell.coordinate}")
+    wb.close()
+
+    formula_count = 0
+    wb = load_workbook(filename, data_only=False)
+    for ws in wb.worksheets:
+        for row in ws.iter_rows():
+            for cell in row:
+                if isinstance(cell.value, str) and cell.value.startswith("="):
+                    formula_count += 1
+    wb.close()
+    return error_counts, error_locations, formula_count
+
+
+def make_workbook(path):
+    """生成含公式、错误值、含错误码字符串和多个工作表的工作簿"""
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Data"
+    for r in range(1, 60):
+        ws.cell(r, 1, r)
+        ws.cell(r, 2, f"=A{r}*2")
+        ws.cell(r, 3, EXCEL_ERRORS[r % len(EXCEL_ERRORS)] if r % 3 == 0 else f"text {r}")
+    ws["E1"] = "see #N/A here"
+    ws["E2"] = "#REF!"
+    ws["E3"] = "#REF!"
+    other = wb.create_sheet("Other Sheet")
+    other["A1"] = "=SUM(Data!A1:A10)"
+    other["B7"] = "#DIV/0!"
+    other["AA100"] = "=1/0"
+    wb.create_sheet("Empty")
+    wb.save(path)
+
+
+def test_scan_matches_openpyxl(tmp_path):
+    """流式扫描与 openpyxl 扫描结果一致"""
+    path = tmp_path / "book.xlsx"
+    make_workbook(path)
+    expected = openpyxl_scan(path)
+    assert scan_workbook(path, jobs=1) == expected
+    assert expected[2] == 61
+    assert expected[0]["#REF!"] > 2
+
+
+def test_parallel_scan_matches_serial(tmp_path, monkeypatch):
+    """多进程扫描与串行扫描结果一致"""
+    path = tmp_path / "book.xlsx"
+    make_workbook(path)
+    monkeypatch.setattr(recalc, "PARALLEL_MIN_BYTES", 0)
+    assert scan_workbook(path, jobs=2) == scan_workbook(path, jobs=1)
+
+
+def test_entity_declarations_are_refused(tmp_path):
+    """工作表 XML 中的实体声明会被拒绝，不会展开"""
+    path = tmp_path / "book.xlsx"
+    make_workbook(path)
+    bomb = tmp_path / "bomb.xlsx"
+    with zipfile.ZipFile(path) as src, zipfile.ZipFile(bomb, "w") as dst:
+        for item in src.infolist():
+            data = src.read(item)
+            if item.filename == "xl/worksheets/sheet1.xml":
+                data = data.replace(
+                    b"<worksheet",
+                    b'<!DOCTYPE worksheet [<!ENTITY a "#REF!#REF!#REF!">]><worksheet',
+                    1,
+                )
+            dst.writestr(item, data)
+    with pytest.raises(EntitiesForbidden):
+        scan_workbook(bomb, jobs=1)
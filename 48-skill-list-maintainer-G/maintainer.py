@@ -11,55 +11,83 @@ Skill List Maintainer - 技能列表维护工具
 import json
 import os
 import re
-import shutil
+import tempfile
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 
+from skill_registry import PRIORITY_ORDER, SkillRegistry
+
+
+DEFAULT_CONFIG = {
+    "matchMode": "keyword",
+    "caseSensitive": False,
+    "enablePatternMatch": True,
+    "defaultSkill": None,
+    "logMatches": True,
+}
+
 
 class SkillMaintainer:
     """技能列表维护器类"""
 
-    def __init__(self, skills_json_path=None):
-        """初始化维护器"""
+    def __init__(self, skills_json_path=None, registry_path=None):
+        """
+        初始化维护器
+        :param skills_json_path: skills.json路径（技能路由读取的文件）
+        :param registry_path: 注册表数据库路径（默认与skills.json同目录的同名.db文件）
+        """
         if skills_json_path is None:
             # 默认路径：上级目录的skill-router/skills.json
             current_dir = Path(__file__).parent
             skills_json_path = current_dir.parent / "skill-router" / "skills.json"
 
         self.skills_json_path = Path(skills_json_path)
-        self.backup_dir = self.skills_json_path.parent / "backups"
-        self.skills_data = {}
+        if registry_path is None:
+            registry_path = self.skills_json_path.with_suffix(".db")
+        self.registry = SkillRegistry(registry_path)
         self.config = {}
-
-        # 确保备份目录存在
-        self.backup_dir.mkdir(exist_ok=True)
+        self._skills_cache = None
 
         # 加载配置
         self.load_config()
 
+    @property
+    def skills_data(self) -> Dict[str, Dict]:
+        """全部技能（首次访问时从注册表加载，写入后失效）"""
+        if self._skills_cache is None:
+            self._skills_cache = self.registry.all()
+        return self._skills_cache
+
     def load_config(self):
-        """加载技能配置文件"""
+        """
+        加载技能配置
+        注册表是主存储；skills.json在上次导出后被手工修改过（或注册表
+        尚未建立）时，把它的内容同步进注册表
+        """
+        self._skills_cache = None
         if not self.skills_json_path.exists():
-            print(f"⚠️ 配置文件不存在，将创建新文件: {self.skills_json_path}")
-            self.skills_data = {}
-            self.config = {
-                "matchMode": "keyword",
-                "caseSensitive": False,
-                "enablePatternMatch": True,
-                "defaultSkill": None,
-                "logMatches": True,
-            }
+            if self.registry.get_meta("json_mtime_ns") is None and self.registry.count() == 0:
+                print(f"⚠️ 配置文件不存在，将创建新文件: {self.skills_json_path}")
+            self.config = self.registry.get_meta("config", dict(DEFAULT_CONFIG))
             self.save_config()
             return
 
+        mtime_ns = self.skills_json_path.stat().st_mtime_ns
+        if mtime_ns == self.registry.get_meta("json_mtime_ns"):
+            self.config = self.registry.get_meta("config", dict(DEFAULT_CONFIG))
+            print(f"✅ 成功加载 {self.registry.count()} 个技能配置")
+            return
+
         try:
             with open(self.skills_json_path, "r", encoding="utf-8") as f:
                 data = json.load(f)
-                self.skills_data = data.get("skills", {})
-                self.config = data.get("config", {})
+            changed = self.registry.replace_all(data.get("skills", {}), op="import")
+            self.config = data.get("config", {})
+            self.registry.set_meta("config", self.config)
+            self.registry.set_meta("json_mtime_ns", mtime_ns)
 
-            print(f"✅ 成功加载 {len(self.skills_data)} 个技能配置")
+            print(f"✅ 成功加载 {self.registry.count()} 个技能配置（同步 {changed} 项变更）")
         except json.JSONDecodeError as e:
             print(f"❌ JSON解析错误: {e}")
             raise
@@ -68,11 +96,12 @@ class SkillMaintainer:
             raise
 
     def save_config(self):
-        """保存技能配置文件"""
-        # 先备份
-        self.backup_config()
-
-        # 准备数据
+        """
+        把注册表导出为skills.json（技能路由读取该文件）
+        先写临时文件再替换，不会留下写了一半的配置；历史版本由注册表的
+        变更日志保存，不再整份备份
+        """
+        self._skills_cache = None
         data = {
             "version": "1.0.0",
             "lastUpdated": datetime.now().strftime("%Y-%m-%d"),
@@ -81,9 +110,19 @@ class SkillMaintainer:
         }
 
         try:
-            # 写入文件
-            with open(self.skills_json_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            self.skills_json_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(
+                dir=self.skills_json_path.parent, prefix=".skills-", suffix=".json"
+            )
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(data, f, ensure_ascii=False, indent=2)
+                os.replace(tmp_path, self.skills_json_path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+            self.registry.set_meta("config", self.config)
+            self.registry.set_meta("json_mtime_ns", self.skills_json_path.stat().st_mtime_ns)
 
             print(f"✅ 配置已保存: {self.skills_json_path}")
             return True
@@ -91,38 +130,52 @@ class SkillMaintainer:
             print(f"❌ 保存配置失败: {e}")
             return False
 
-    def backup_config(self):
-        """备份配置文件"""
-        if not self.skills_json_path.exists():
+    def show_history(self, skill_name: Optional[str] = None, limit: int = 20):
+        """
+        显示变更日志（替代原来的备份文件）
+        :param skill_name: 只看某个技能（可选）
+        :param limit: 条数
+        """
+        entries = self.registry.history(skill_name, limit)
+        if not entries:
+            print("📭 没有变更记录")
             return
+        print(f"\n📜 最近 {len(entries)} 条变更:\n")
+        for entry in entries:
+            print(f"  #{entry['id']} {entry['ts']} {entry['op']:<8} {entry['name']}")
 
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_path = self.backup_dir / f"skills_{timestamp}.json"
-
-        try:
-            shutil.copy2(self.skills_json_path, backup_path)
-            print(f"📦 已备份到: {backup_path}")
-
-            # 清理旧备份（只保留最近10个）
-            self.cleanup_old_backups(keep=10)
-
-        except Exception as e:
-            print(f"⚠️ 备份失败: {e}")
-
-    def cleanup_old_backups(self, keep=10):
-        """清理旧备份文件"""
-        try:
-            backups = sorted(
-                self.backup_dir.glob("skills_*.json"), key=lambda p: p.stat().st_mtime
-            )
-
-            # 删除旧备份
-            for backup in backups[:-keep]:
-                backup.unlink()
-                print(f"🗑️ 删除旧备份: {backup.name}")
+    def rollback(self, entry_id: int) -> bool:
+        """
+        回滚到某条变更之前的状态
+        :param entry_id: 变更日志id（见show_history）
+        :return: 是否成功
+        """
+        undone = self.registry.rollback(entry_id)
+        if not undone:
+            print(f"❌ 没有id >= {entry_id} 的变更")
+            return False
+        if self.save_config():
+            print(f"✅ 已撤销 {undone} 项变更")
+            return True
+        return False
 
-        except Exception as e:
-            print(f"⚠️ 清理备份失败: {e}")
+    def refresh_from_skill_dirs(self, roots: Optional[List] = None) -> Dict[str, int]:
+        """
+        按mtime增量扫描技能目录中的SKILL.md，把新增/修改/删除同步到注册表
+        :param roots: 技能根目录列表（默认本技能的上级目录）
+        :return: {"scanned", "changed", "removed", "skipped"}
+        """
+        if roots is None:
+            roots = [Path(__file__).resolve().parent.parent]
+        stats = self.registry.scan_skill_dirs(roots, defaults={"type": "domain", "priority": "medium"})
+        if stats["changed"] or stats["removed"]:
+            self.save_config()
+        print(
+            f"🔄 扫描 {stats['scanned']} 个SKILL.md：更新 {stats['changed']} 个，移除 {stats['removed']} 个"
+        )
+        if stats["skipped"]:
+            print(f"⚠️ {stats['skipped']} 个SKILL.md与手工加入的技能同名，未覆盖")
+        return stats
 
     def validate_skill_data(self, skill_name: str, skill_data: Dict) -> bool:
         """
@@ -189,7 +242,7 @@ class SkillMaintainer:
         :param enforcement: 强制模式
         :return: 是否成功
         """
-        if skill_name in self.skills_data:
+        if skill_name in self.registry:
             print(f"⚠️ 技能已存在: {skill_name}，请使用update_skill更新")
             return False
 
@@ -210,7 +263,7 @@ class SkillMaintainer:
             return False
 
         # 添加技能
-        self.skills_data[skill_name] = skill_data
+        self.registry.put(skill_name, skill_data, op="add")
 
         # 保存
         if self.save_config():
@@ -244,12 +297,11 @@ class SkillMaintainer:
         :param enforcement: 新的强制模式（可选）
         :return: 是否成功
         """
-        if skill_name not in self.skills_data:
+        skill_data = self.registry.get(skill_name)
+        if skill_data is None:
             print(f"❌ 技能不存在: {skill_name}")
             return False
 
-        skill_data = self.skills_data[skill_name]
-
         # 更新字段
         if skill_type is not None:
             skill_data["type"] = skill_type
@@ -293,6 +345,8 @@ class SkillMaintainer:
         if not self.validate_skill_data(skill_name, skill_data):
             return False
 
+        self.registry.put(skill_name, skill_data, op="update")
+
         # 保存
         if self.save_config():
             print(f"✅ 成功更新技能: {skill_name}")
@@ -306,12 +360,12 @@ class SkillMaintainer:
         :param skill_name: 技能名称
         :return: 是否成功
         """
-        if skill_name not in self.skills_data:
+        if skill_name not in self.registry:
             print(f"❌ 技能不存在: {skill_name}")
             return False
 
         # 删除技能
-        del self.skills_data[skill_name]
+        self.registry.delete(skill_name)
 
         # 保存
         if self.save_config():
@@ -320,38 +374,48 @@ class SkillMaintainer:
 
         return False
 
-    def list_skills(self, skill_name: Optional[str] = None):
+    def list_skills(self, skill_name: Optional[str] = None, tag: Optional[str] = None):
         """
         列出技能
         :param skill_name: 特定技能名称（可选）
+        :param tag: 只列出带该标签（关键词）的技能（可选）
         """
         if skill_name:
             # 显示特定技能
-            if skill_name in self.skills_data:
+            skill_data = self.registry.get(skill_name)
+            if skill_data is not None:
                 print(f"\n📍 技能: {skill_name}")
                 print("-" * 50)
-                self._print_skill_info(skill_name, self.skills_data[skill_name])
+                self._print_skill_info(skill_name, skill_data)
             else:
                 print(f"❌ 技能不存在: {skill_name}")
+        elif tag:
+            # 按标签索引查找
+            skills = self.registry.by_tag(tag)
+            print(f"\n🏷️ 标签 {tag} 共有 {len(skills)} 个技能:\n")
+            for name, data in skills:
+                self._print_skill_info(name, data, indent=2)
         else:
             # 显示所有技能
-            print(f"\n📋 共有 {len(self.skills_data)} 个技能:\n")
-
-            # 按优先级分组
-            by_priority = {"high": [], "medium": [], "low": []}
+            print(f"\n📋 共有 {self.registry.count()} 个技能:\n")
 
-            for name, data in self.skills_data.items():
-                priority = data.get("priority", "low")
-                by_priority[priority].append((name, data))
-
-            # 输出
-            for priority in ["high", "medium", "low"]:
-                if by_priority[priority]:
+            # 按优先级分组输出（走优先级索引；缺少priority的归入LOW）
+            for priority in PRIORITY_ORDER:
+                skills = self.registry.by_priority(priority)
+                if skills:
                     print(f"⭐ {priority.upper()} 优先级:")
-                    for name, data in by_priority[priority]:
+                    for name, data in skills:
                         self._print_skill_info(name, data, indent=2)
                     print()
 
+            # 优先级不是high/medium/low的技能放在最后
+            skills = self.registry.by_other_priority(PRIORITY_ORDER)
+            if skills:
+                print("⭐ 其他优先级:")
+                for name, data in skills:
+                    self._print_skill_info(name, data, indent=2)
+                print()
+
     def _print_skill_info(self, name: str, data: Dict, indent: int = 0):
         """打印技能信息"""
         prefix = " " * indent
@@ -388,6 +452,23 @@ class SkillMaintainer:
         elif "删除技能" in command or "移除技能" in command:
             self._parse_remove_command(command)
 
+        # 扫描技能目录
+        elif "刷新技能" in command or "扫描技能" in command:
+            self._parse_refresh_command(command)
+
+        # 变更日志
+        elif "变更记录" in command or "历史" in command:
+            name_match = re.search(r"(?:变更记录|历史)[:：]\s*([^\n,，]+)", command)
+            self.show_history(name_match.group(1).strip() if name_match else None)
+
+        # 回滚
+        elif "回滚" in command:
+            id_match = re.search(r"回滚[^\d]*(\d+)", command)
+            if id_match:
+                self.rollback(int(id_match.group(1)))
+            else:
+                print("❌ 请指定变更id，例如: 回滚: 12")
+
         # 查看技能
         elif "显示" in command or "查看" in command or "列出" in command:
             self._parse_list_command(command)
@@ -399,6 +480,10 @@ class SkillMaintainer:
             print("  - 更新技能: <技能名称>, 添加关键词: <关键词>")
             print("  - 删除技能: <技能名称>")
             print("  - 显示所有技能")
+            print("  - 显示标签: <关键词>")
+            print("  - 刷新技能[: <技能根目录>]")
+            print("  - 变更记录[: <技能名称>]")
+            print("  - 回滚: <变更id>")
 
     def _parse_add_command(self, command: str):
         """解析添加命令"""
@@ -493,8 +578,23 @@ class SkillMaintainer:
         # 删除技能
         self.remove_skill(skill_name)
 
+    def _parse_refresh_command(self, command: str):
+        """解析扫描命令"""
+        dir_match = re.search(r"[刷新扫描]技能(?:目录)?[:：]\s*([^\n]+)", command)
+        if dir_match:
+            roots = [root.strip() for root in re.split(r"[,，]", dir_match.group(1)) if root.strip()]
+            self.refresh_from_skill_dirs(roots)
+        else:
+            self.refresh_from_skill_dirs()
+
     def _parse_list_command(self, command: str):
         """解析查看命令"""
+        # 按标签查看
+        tag_match = re.search(r"标签[:：]\s*([^\n,，]+)", command)
+        if tag_match:
+            self.list_skills(tag=tag_match.group(1).strip())
+            return
+
         # 检查是否指定了特定技能
         name_match = re.search(r"[查看显示列出]技能[:：]?\s*([^\n,，]+)", command)
 
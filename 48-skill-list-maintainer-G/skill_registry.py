@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+================================================================
+Skill Registry - 技能注册表存储
+功能：以SQLite保存技能配置，供SkillMaintainer读写
+特性：
+- 名称主键 + 优先级/标签索引，查询不再线性扫描整个skills.json
+- 单条记录原子更新（每次增删改是一个事务）
+- 变更日志（journal）记录每次修改前后的记录，替代整份备份拷贝，可回滚
+- 按mtime增量扫描技能目录下SKILL.md的front matter
+================================================================
+"""
+
+import json
+import os
+import re
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS skills (
+    name TEXT PRIMARY KEY,
+    priority TEXT,
+    data TEXT NOT NULL,
+    source TEXT,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_skills_priority ON skills(priority);
+CREATE INDEX IF NOT EXISTS idx_skills_source ON skills(source);
+CREATE TABLE IF NOT EXISTS skill_tags (
+    tag TEXT NOT NULL,
+    name TEXT NOT NULL,
+    PRIMARY KEY (tag, name)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_skill_tags_name ON skill_tags(name);
+CREATE TABLE IF NOT EXISTS journal (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts TEXT NOT NULL,
+    op TEXT NOT NULL,
+    name TEXT NOT NULL,
+    before TEXT,
+    after TEXT,
+    before_source TEXT,
+    after_source TEXT
+);
+CREATE TABLE IF NOT EXISTS skill_files (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    name TEXT
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# 变更日志保留的条目数（替代原来保留最近10个备份文件）
+JOURNAL_KEEP = 1000
+
+PRIORITY_ORDER = ["high", "medium", "low"]
+
+FRONT_MATTER_RE = re.compile(r"\A\ufeff?---[ \t]*\r?\n(.*?)\r?\n---[ \t]*(?:\r?\n|\Z)", re.DOTALL)
+FRONT_MATTER_KEY_RE = re.compile(r"^([A-Za-z_][\w-]*)[ \t]*:[ \t]*(.*)$")
+
+
+def _dumps(data: Optional[Dict]) -> Optional[str]:
+    return None if data is None else json.dumps(data, ensure_ascii=False)
+
+
+def _loads(text: Optional[str]) -> Optional[Dict]:
+    return None if text is None else json.loads(text)
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+
+# _write的source参数默认值：保持记录原有的来源
+_KEEP = object()
+
+
+def skill_tags(data: Dict) -> List[str]:
+    """
+    技能的索引标签：触发关键词加上可选的tags字段
+    :param data: 技能数据
+    :return: 去重后的标签列表（小写）
+    """
+    tags = list(data.get("promptTriggers", {}).get("keywords", [])) + list(data.get("tags", []))
+    return sorted({str(tag).strip().lower() for tag in tags if str(tag).strip()})
+
+
+def _parse_scalar(value: str) -> Any:
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+        return value[1:-1]
+    if value.startswith("[") and value.endswith("]"):
+        return [_parse_scalar(item) for item in value[1:-1].split(",") if item.strip()]
+    return value
+
+
+def parse_front_matter(text: str) -> Dict[str, Any]:
+    """
+    解析SKILL.md开头的front matter（只支持 key: value、行内[a, b]列表和 - item 列表）
+    :param text: SKILL.md内容
+    :return: 字段字典，没有front matter时为空
+    """
+    match = FRONT_MATTER_RE.match(text)
+    if not match:
+        return {}
+
+    result: Dict[str, Any] = {}
+    current_key = None
+    for line in match.group(1).splitlines():
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        if stripped.startswith("- ") and current_key and line[:1] in " \t-":
+            if not isinstance(result.get(current_key), list):
+                result[current_key] = []
+            result[current_key].append(_parse_scalar(stripped[2:]))
+            continue
+        key_match = FRONT_MATTER_KEY_RE.match(line)
+        if key_match:
+            current_key = key_match.group(1)
+            value = key_match.group(2)
+            result[current_key] = _parse_scalar(value) if value.strip() else ""
+    return result
+
+
+class SkillRegistry:
+    """基于SQLite的技能注册表"""
+
+    def __init__(self, db_path):
+        """
+        打开（必要时创建）注册表
+        :param db_path: SQLite数据库路径
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        # 旧版本的数据库没有记录来源的journal列
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(journal)")}
+        for column in ("before_source", "after_source"):
+            if column not in columns:
+                self.conn.execute(f"ALTER TABLE journal ADD COLUMN {column} TEXT")
+
+    def close(self):
+        """关闭数据库连接"""
+        self.conn.close()
+
+    # ------------------------------------------------------------ 查询
+
+    def get(self, name: str) -> Optional[Dict]:
+        """按名称读取一个技能（主键查找）"""
+        row = self.conn.execute("SELECT data FROM skills WHERE name = ?", (name,)).fetchone()
+        return _loads(row[0]) if row else None
+
+    def __contains__(self, name: str) -> bool:
+        return self.conn.execute("SELECT 1 FROM skills WHERE name = ?", (name,)).fetchone() is not None
+
+    def count(self) -> int:
+        """技能总数"""
+        return self.conn.execute("SELECT COUNT(*) FROM skills").fetchone()[0]
+
+    def all(self) -> Dict[str, Dict]:
+        """全部技能，按加入顺序"""
+        rows = self.conn.execute("SELECT name, data FROM skills ORDER BY rowid")
+        return {name: json.loads(data) for name, data in rows}
+
+    def by_priority(self, priority: str) -> List[Tuple[str, Dict]]:
+        """某个优先级的技能（走优先级索引）"""
+        rows = self.conn.execute("SELECT name, data FROM skills WHERE priority = ? ORDER BY rowid", (priority,))
+        return [(name, json.loads(data)) for name, data in rows]
+
+    def by_other_priority(self, priorities: Iterable[str]) -> List[Tuple[str, Dict]]:
+        """优先级不在priorities中的技能（无效值等）"""
+        priorities = list(priorities)
+        placeholders = ", ".join("?" * len(priorities))
+        rows = self.conn.execute(
+            f"SELECT name, data FROM skills WHERE priority IS NULL OR priority NOT IN ({placeholders}) ORDER BY rowid",
+            priorities,
+        )
+        return [(name, json.loads(data)) for name, data in rows]
+
+    def by_tag(self, tag: str) -> List[Tuple[str, Dict]]:
+        """带某个标签（关键词）的技能（走标签索引）"""
+        rows = self.conn.execute(
+            "SELECT s.name, s.data FROM skill_tags t JOIN skills s ON s.name = t.name "
+            "WHERE t.tag = ? ORDER BY s.rowid",
+            (tag.strip().lower(),),
+        )
+        return [(name, json.loads(data)) for name, data in rows]
+
+    # ------------------------------------------------------------ 写入
+
+    def _write(self, name: str, data: Optional[Dict], op: str, source: Any = _KEEP):
+        # 调用方负责事务；同时更新标签索引并记录变更日志（含前后来源）。
+        # source是登记该技能的SKILL.md路径（手工加入为None），默认保持不变
+        before_row = self.conn.execute("SELECT data, source FROM skills WHERE name = ?", (name,)).fetchone()
+        before, before_source = before_row if before_row else (None, None)
+        after = _dumps(data)
+        if data is None:
+            after_source = None
+        else:
+            after_source = before_source if source is _KEEP else source
+        if before == after and before_source == after_source:
+            return
+
+        if before_source is not None and before_source != after_source:
+            # 技能不再由这个SKILL.md登记：忘掉文件的mtime，下次扫描重新解析
+            self.conn.execute("DELETE FROM skill_files WHERE path = ?", (before_source,))
+        if after_source is not None and after_source != before_source:
+            # 技能改由这个SKILL.md登记（如回滚恢复）：登记一个必然过期的文件状态，
+            # 下次扫描按文件现状更新技能，文件已不存在时删除技能
+            self.conn.execute(
+                "INSERT OR IGNORE INTO skill_files (path, mtime_ns, size, name) VALUES (?, 0, -1, ?)",
+                (after_source, name),
+            )
+        self.conn.execute("DELETE FROM skill_tags WHERE name = ?", (name,))
+        if data is None:
+            self.conn.execute("DELETE FROM skills WHERE name = ?", (name,))
+        else:
+            self.conn.execute(
+                "INSERT INTO skills (name, priority, data, source, updated_at) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET priority = excluded.priority, data = excluded.data, "
+                "source = excluded.source, updated_at = excluded.updated_at",
+                (name, data.get("priority") or "low", after, after_source, _now()),
+            )
+            self.conn.executemany(
+                "INSERT INTO skill_tags (tag, name) VALUES (?, ?)", [(tag, name) for tag in skill_tags(data)]
+            )
+        self.conn.execute(
+            "INSERT INTO journal (ts, op, name, before, after, before_source, after_source) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (_now(), op, name, before, after, before_source, after_source),
+        )
+
+    def _prune_journal(self):
+        self.conn.execute(
+            "DELETE FROM journal WHERE id <= (SELECT MAX(id) FROM journal) - ?", (JOURNAL_KEEP,)
+        )
+
+    def put(self, name: str, data: Dict, op: str = "update"):
+        """
+        新增或替换一个技能（单个事务）
+        :param name: 技能名称
+        :param data: 技能数据
+        :param op: 记录到变更日志的操作名
+        """
+        with self.conn:
+            self._write(name, data, op)
+            self._prune_journal()
+
+    def delete(self, name: str, op: str = "remove"):
+        """删除一个技能（单个事务）"""
+        with self.conn:
+            self._write(name, None, op)
+            self._prune_journal()
+
+    def replace_all(self, skills: Dict[str, Dict], op: str = "import") -> int:
+        """
+        用一组技能整体替换注册表内容（一个事务，只记录有变化的技能）
+        :param skills: {技能名称: 技能数据}
+        :param op: 记录到变更日志的操作名
+        :return: 变化的技能数
+        """
+        with self.conn:
+            last_id = self.conn.execute("SELECT COALESCE(MAX(id), 0) FROM journal").fetchone()[0]
+            for name in set(self.all()) - set(skills):
+                self._write(name, None, op)
+            for name, data in skills.items():
+                self._write(name, data, op)
+            self._prune_journal()
+            return self.conn.execute("SELECT COUNT(*) FROM journal WHERE id > ?", (last_id,)).fetchone()[0]
+
+    # ------------------------------------------------------------ 元数据
+
+    def get_meta(self, key: str, default: Any = None) -> Any:
+        """读取元数据（JSON值）"""
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set_meta(self, key: str, value: Any):
+        """写入元数据（JSON值）"""
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, json.dumps(value, ensure_ascii=False))
+            )
+
+    # ------------------------------------------------------------ 变更日志
+
+    def history(self, name: Optional[str] = None, limit: int = 20) -> List[Dict]:
+        """
+        最近的变更记录，新的在前
+        :param name: 只看某个技能（可选）
+        :param limit: 条数
+        :return: [{"id", "ts", "op", "name", "before", "after"}, ...]
+        """
+        sql = "SELECT id, ts, op, name, before, after FROM journal"
+        params: Tuple = ()
+        if name:
+            sql += " WHERE name = ?"
+            params = (name,)
+        rows = self.conn.execute(sql + " ORDER BY id DESC LIMIT ?", params + (limit,))
+        return [
+            {"id": r[0], "ts": r[1], "op": r[2], "name": r[3], "before": _loads(r[4]), "after": _loads(r[5])}
+            for r in rows
+        ]
+
+    def rollback(self, entry_id: int) -> int:
+        """
+        回滚到某条变更之前的状态（撤销该条及之后的全部变更）
+        技能的来源（扫描登记的SKILL.md）一并恢复；回滚本身也记入变更日志，
+        因此可以再次回滚
+        :param entry_id: 变更日志id
+        :return: 撤销的变更条数
+        """
+        with self.conn:
+            rows = self.conn.execute(
+                "SELECT name, before, before_source FROM journal WHERE id >= ? ORDER BY id DESC", (entry_id,)
+            ).fetchall()
+            for name, before, before_source in rows:
+                self._write(name, _loads(before), "rollback", source=before_source)
+            self._prune_journal()
+        return len(rows)
+
+    # ------------------------------------------------------------ 目录扫描
+
+    def scan_skill_dirs(self, roots: Iterable, defaults: Dict[str, Any]) -> Dict[str, int]:
+        """
+        增量扫描技能目录：只解析mtime或大小变化了的 <root>/<skill>/SKILL.md
+
+        扫描新建的技能使用defaults里的type/priority/enforcement，之后只更新
+        描述和关键词（front matter的tags/keywords）；SKILL.md被删除时，
+        由它登记的技能一并删除。手工加入（非扫描创建）的同名技能不会被
+        修改或删除，对应的SKILL.md计入skipped，每次扫描重新检查
+        :param roots: 技能根目录列表
+        :param defaults: 新技能的默认字段
+        :return: {"scanned", "changed", "removed", "skipped"}
+        """
+        found: Dict[str, os.stat_result] = {}
+        for root in roots:
+            try:
+                entries = list(os.scandir(root))
+            except OSError:
+                continue
+            for entry in entries:
+                if not entry.is_dir():
+                    continue
+                skill_md = os.path.join(entry.path, "SKILL.md")
+                try:
+                    found[os.path.abspath(skill_md)] = os.stat(skill_md)
+                except OSError:
+                    continue
+
+        known = {
+            path: (mtime_ns, size, name)
+            for path, mtime_ns, size, name in self.conn.execute("SELECT path, mtime_ns, size, name FROM skill_files")
+        }
+        changed = [
+            path for path, st in found.items()
+            if known.get(path, (None, None))[:2] != (st.st_mtime_ns, st.st_size)
+        ]
+        removed = [path for path in known if path not in found]
+        applied = 0
+        skipped = 0
+
+        with self.conn:
+            for path in changed:
+                st = found[path]
+                try:
+                    meta = parse_front_matter(Path(path).read_text(encoding="utf-8", errors="replace"))
+                except OSError:
+                    continue
+                name = str(meta.get("name") or Path(path).parent.name)
+                previous = known.get(path, (None, None, None))[2]
+                if previous and previous != name:
+                    self._drop_sourced(previous, path)
+
+                row = self.conn.execute("SELECT source FROM skills WHERE name = ?", (name,)).fetchone()
+                if row is not None and row[0] is None:
+                    # 手工加入的同名技能：保持原样，也不登记这个文件
+                    self.conn.execute("DELETE FROM skill_files WHERE path = ?", (path,))
+                    skipped += 1
+                    continue
+
+                data = self.get(name) or {
+                    "type": defaults.get("type", "domain"),
+                    "enforcement": defaults.get("enforcement", "suggest"),
+                    "priority": defaults.get("priority", "medium"),
+                    "description": "",
+                    "promptTriggers": {"keywords": [], "patterns": []},
+                }
+                if meta.get("description"):
+                    data["description"] = str(meta["description"])
+                tags = meta.get("tags") or meta.get("keywords")
+                if tags:
+                    if isinstance(tags, str):
+                        tags = [tag.strip() for tag in tags.split(",")]
+                    data.setdefault("promptTriggers", {})["keywords"] = [str(tag) for tag in tags if str(tag).strip()]
+                data.setdefault("promptTriggers", {}).setdefault("patterns", [])
+
+                # SKILL.md可能换了目录（同名），来源跟着更新
+                self._write(name, data, "scan", source=path)
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO skill_files (path, mtime_ns, size, name) VALUES (?, ?, ?, ?)",
+                    (path, st.st_mtime_ns, st.st_size, name),
+                )
+                applied += 1
+            for path in removed:
+                if known[path][2]:
+                    self._drop_sourced(known[path][2], path)
+                self.conn.execute("DELETE FROM skill_files WHERE path = ?", (path,))
+            self._prune_journal()
+
+        return {"scanned": len(found), "changed": applied, "removed": len(removed), "skipped": skipped}
+
+    def _drop_sourced(self, name: str, path: str):
+        # 只删除仍然登记在该SKILL.md名下的技能（手工加入的同名技能不受影响）
+        row = self.conn.execute("SELECT source FROM skills WHERE name = ?", (name,)).fetchone()
+        if row and row[0] == path:
+            self._write(name, None, "scan")
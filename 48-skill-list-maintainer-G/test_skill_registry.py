@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""48-skill-list-maintainer 注册表测试"""
+import sqlite3
+
+from skill_registry import SkillRegistry, parse_front_matter
+
+DEFAULTS = {"type": "domain", "priority": "medium"}
+
+
+def make_skill(root, dirname, name, description="", tags=None):
+    """在root下创建 <dirname>/SKILL.md"""
+    lines = ["---", f"name: {name}", f"description: {description}"]
+    if tags:
+        lines.append(f"tags: [{', '.join(tags)}]")
+    lines += ["---", "", f"# {name}"]
+    path = root / dirname / "SKILL.md"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("\n".join(lines), encoding="utf-8")
+    return path
+
+
+def make_registry(tmp_path):
+    return SkillRegistry(tmp_path / "registry.db")
+
+
+def source_of(registry, name):
+    row = registry.conn.execute("SELECT source FROM skills WHERE name = ?", (name,)).fetchone()
+    return row[0] if row else None
+
+
+def test_parse_front_matter():
+    """front matter支持标量、行内列表和 - item 列表"""
+    meta = parse_front_matter("---\nname: demo\ntags: [a, 'b']\nkeywords:\n  - x\n  - y\n---\nbody")
+    assert meta == {"name": "demo", "tags": ["a", "b"], "keywords": ["x", "y"]}
+    assert parse_front_matter("# no front matter") == {}
+
+
+def test_scan_is_incremental(tmp_path):
+    """未变化的SKILL.md不会被重新解析"""
+    roots = [tmp_path / "skills"]
+    make_skill(roots[0], "a", "alpha", "first", ["one"])
+    make_skill(roots[0], "b", "beta")
+    registry = make_registry(tmp_path)
+
+    stats = registry.scan_skill_dirs(roots, DEFAULTS)
+    assert stats == {"scanned": 2, "changed": 2, "removed": 0, "skipped": 0}
+    assert registry.get("alpha")["description"] == "first"
+    assert [name for name, _ in registry.by_tag("one")] == ["alpha"]
+
+    assert registry.scan_skill_dirs(roots, DEFAULTS)["changed"] == 0
+
+
+def test_rescan_after_rollback_restores_skills(tmp_path):
+    """回滚掉扫描结果后，再次扫描会重新登记这些技能"""
+    roots = [tmp_path / "skills"]
+    make_skill(roots[0], "a", "alpha")
+    make_skill(roots[0], "b", "beta")
+    registry = make_registry(tmp_path)
+    registry.scan_skill_dirs(roots, DEFAULTS)
+
+    registry.rollback(1)
+    assert registry.count() == 0
+
+    assert registry.scan_skill_dirs(roots, DEFAULTS)["changed"] == 2
+    assert set(registry.all()) == {"alpha", "beta"}
+    assert source_of(registry, "alpha") == str((roots[0] / "a" / "SKILL.md").resolve())
+
+
+def test_rollback_restores_source(tmp_path):
+    """回滚删除操作时恢复来源，技能仍算作扫描登记的技能"""
+    roots = [tmp_path / "skills"]
+    skill_md = make_skill(roots[0], "a", "alpha")
+    registry = make_registry(tmp_path)
+    registry.scan_skill_dirs(roots, DEFAULTS)
+
+    registry.delete("alpha")
+    registry.rollback(registry.history(limit=1)[0]["id"])
+    assert source_of(registry, "alpha") == str(skill_md.resolve())
+
+    # 仍由SKILL.md管理：文件删除后技能随之删除
+    skill_md.unlink()
+    assert registry.scan_skill_dirs(roots, DEFAULTS)["removed"] == 1
+    assert "alpha" not in registry
+
+
+def test_removed_scanned_skill_is_readded(tmp_path):
+    """手工删除扫描登记的技能后，下次扫描重新加入"""
+    roots = [tmp_path / "skills"]
+    make_skill(roots[0], "a", "alpha", "first")
+    registry = make_registry(tmp_path)
+    registry.scan_skill_dirs(roots, DEFAULTS)
+
+    registry.delete("alpha")
+    assert registry.scan_skill_dirs(roots, DEFAULTS)["changed"] == 1
+    assert registry.get("alpha")["description"] == "first"
+
+
+def test_manual_skill_is_left_alone(tmp_path):
+    """手工加入的同名技能不被扫描修改、登记或删除"""
+    roots = [tmp_path / "skills"]
+    make_skill(roots[0], "a", "alpha", "from file")
+    registry = make_registry(tmp_path)
+    manual = {"type": "domain", "priority": "high", "description": "manual"}
+    registry.put("alpha", manual, op="add")
+
+    stats = registry.scan_skill_dirs(roots, DEFAULTS)
+    assert stats["skipped"] == 1 and stats["changed"] == 0
+    assert registry.get("alpha") == manual
+    assert source_of(registry, "alpha") is None
+
+    (roots[0] / "a" / "SKILL.md").unlink()
+    registry.scan_skill_dirs(roots, DEFAULTS)
+    assert registry.get("alpha") == manual
+
+
+def test_other_priorities_are_listed(tmp_path):
+    """缺失或未知优先级的技能出现在by_other_priority中"""
+    registry = make_registry(tmp_path)
+    registry.put("known", {"priority": "high"})
+    registry.put("missing", {})
+    registry.put("unknown", {"priority": "urgent"})
+    assert [name for name, _ in registry.by_priority("high")] == ["known"]
+    assert [name for name, _ in registry.by_other_priority(["high", "medium", "low"])] == ["unknown"]
+
+
+def test_old_journal_schema_is_migrated(tmp_path):
+    """旧版数据库的journal表会补上来源列"""
+    db_path = tmp_path / "registry.db"
+    conn = sqlite3.connect(str(db_path))
+    conn.execute(
+        "CREATE TABLE journal (id INTEGER PRIMARY KEY AUTOINCREMENT, ts TEXT NOT NULL, "
+        "op TEXT NOT NULL, name TEXT NOT NULL, before TEXT, after TEXT)"
+    )
+    conn.close()
+
+    registry = SkillRegistry(db_path)
+    registry.put("alpha", {"priority": "low"})
+    registry.rollback(1)
+    assert registry.count() == 0
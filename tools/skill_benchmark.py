@@ -0,0 +1,584 @@
+import argparse
+import contextlib
+import csv
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Performance benchmarks for the skill engines on synthetic data.
+#
+# Each benchmark runs in its own worker process, so its peak RSS is measured
+# on its own and engines with the same module name (engine.py) don't clash.
+# A run records throughput, latency percentiles of the individual operations
+# and peak RSS per benchmark to a JSON file; passing a previous run's file as
+# --baseline flags metrics that got worse by more than --threshold.
+#
+#   python tools/skill_benchmark.py --list
+#   python tools/skill_benchmark.py --output reports/benchmarks/baseline.json
+#   python tools/skill_benchmark.py --baseline reports/benchmarks/baseline.json
+#   python tools/skill_benchmark.py --only log_analyzer --scale 32 --repeat 1 --warmup 0
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_DATA_DIR = Path(tempfile.gettempdir()) / "skill-benchmark-data"
+DEFAULT_OUTPUT = Path("reports") / "benchmarks" / "results.json"
+DEFAULT_THRESHOLD = 0.10
+DEFAULT_TIMEOUT_SEC = 3600
+RESULTS_VERSION = 1
+# Synthetic data is regenerated when a generator changes
+DATA_VERSION = 1
+
+# An operation and the number of units (bytes, files, queries, ...) it processes
+Operation = Tuple[Callable[[], Any], int]
+
+
+@dataclass
+class Benchmark:
+    skill_dir: str  # relative to the repo root; put on sys.path in the worker
+    unit: str
+    generate: Callable[[Path, float], Dict[str, Any]]  # writes inputs, returns a manifest
+    operations: Callable[[Dict[str, Any]], List[Operation]]  # runs in the worker
+    description: str
+
+
+# ---------------------------------------------------------------- generators
+# Sizes are for --scale 1 and grow linearly with it. All data is seeded so
+# every machine benchmarks the same inputs. Manifest paths are relative to the
+# data set's directory (see data_file()).
+
+LOG_BYTES_PER_SCALE = 64 * 1024 * 1024
+LOG_LEVELS = ["INFO"] * 14 + ["DEBUG"] * 3 + ["WARN"] * 2 + ["ERROR"]
+LOG_MESSAGES = [
+    "request completed in {n}ms",
+    "cache miss for key user:{n}",
+    "slow query took {n}ms: SELECT * FROM orders WHERE id = {n}",
+    "connection reset by peer after {n} bytes",
+    "failed login attempt for admin from 10.0.{n}.1",
+    "payment gateway timeout after {n}ms",
+]
+
+
+def _log_line(fmt: str, rng: random.Random, seconds: int) -> str:
+    level = rng.choice(LOG_LEVELS)
+    message = rng.choice(LOG_MESSAGES).format(n=rng.randint(1, 5000))
+    ts = datetime(2025, 1, 1, tzinfo=timezone.utc).timestamp() + seconds
+    when = datetime.fromtimestamp(ts, timezone.utc)
+    if fmt == "json":
+        return json.dumps({
+            "timestamp": when.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "level": level,
+            "message": message,
+            "trace_id": f"{rng.getrandbits(64):016x}",
+            "span_id": f"{rng.getrandbits(32):08x}",
+        })
+    if fmt == "nginx":
+        status = 500 if level == "ERROR" else 404 if level == "WARN" else 200
+        return (f'10.0.{rng.randint(0, 255)}.{rng.randint(1, 254)} - - [{when.strftime("%d/%b/%Y:%H:%M:%S +0000")}] '
+                f'"GET /api/v1/items/{rng.randint(1, 99999)} HTTP/1.1" {status} {rng.randint(200, 90000)} '
+                f'"-" "Mozilla/5.0 (bench)"')
+    return f"{when.strftime('%Y-%m-%d %H:%M:%S')} [{level}] {message}"
+
+
+def generate_logs(out_dir: Path, scale: float) -> Dict[str, Any]:
+    rng = random.Random(12)
+    per_file = int(LOG_BYTES_PER_SCALE * scale) // 3
+    files = []
+    for fmt in ("json", "nginx", "custom"):
+        path = out_dir / f"{fmt}.log"
+        written = 0
+        seconds = 0
+        with path.open("w", encoding="utf-8", newline="\n") as f:
+            while written < per_file:
+                lines = []
+                for _ in range(1000):
+                    seconds += rng.randint(0, 2)
+                    lines.append(_log_line(fmt, rng, seconds))
+                chunk = "\n".join(lines) + "\n"
+                f.write(chunk)
+                written += len(chunk.encode("utf-8"))
+        files.append({"path": path.name, "bytes": path.stat().st_size})
+    return {"files": files}
+
+
+def generate_claude_md(out_dir: Path, scale: float) -> Dict[str, Any]:
+    rng = random.Random(34)
+    sections = max(1, int(2000 * scale))
+    words = ["python", "typescript", "review", "testing", "deploy", "docs", "style", "naming", "security", "perf"]
+    path = out_dir / "CLAUDE.md"
+    with path.open("w", encoding="utf-8", newline="\n") as f:
+        f.write("# 用户偏好设置\n\n")
+        for i in range(sections):
+            f.write(f"## 偏好分类 {i}\n\n")
+            for j in range(10):
+                a, b = rng.sample(words, 2)
+                f.write(f"- 规则 {i}.{j}: prefer {a} over {b} when working on {rng.choice(words)} #{a} #{b}\n")
+            f.write("\n")
+    queries = [rng.choice(words) for _ in range(25)] + [f"规则 {rng.randrange(sections)}.{rng.randrange(10)}" for _ in range(25)]
+    section_names = [f"偏好分类 {rng.randrange(sections)}" for _ in range(50)]
+    return {"path": path.name, "queries": queries, "sections": section_names}
+
+
+def _unzip(package: Path, out_dir: Path) -> int:
+    with zipfile.ZipFile(package) as zf:
+        zf.extractall(out_dir)
+        return sum(1 for n in zf.namelist() if n.endswith((".xml", ".rels")))
+
+
+def generate_pptx(out_dir: Path, scale: float) -> Dict[str, Any]:
+    from pptx import Presentation
+    from pptx.util import Inches, Pt
+
+    rng = random.Random(43)
+    slides = max(1, int(100 * scale))
+    prs = Presentation()
+    layout = prs.slide_layouts[6]  # blank
+    for i in range(slides):
+        slide = prs.slides.add_slide(layout)
+        for j in range(6):
+            box = slide.shapes.add_textbox(Inches(0.5 + (j % 2) * 4.5), Inches(0.5 + (j // 2) * 2.3),
+                                           Inches(4.2), Inches(2.0))
+            frame = box.text_frame
+            frame.word_wrap = True
+            for k in range(rng.randint(2, 5)):
+                paragraph = frame.paragraphs[0] if k == 0 else frame.add_paragraph()
+                paragraph.text = f"Slide {i} box {j} point {k}: " + " ".join(
+                    rng.choice(["revenue", "growth", "latency", "roadmap", "hiring", "budget"]) for _ in range(rng.randint(4, 16)))
+                paragraph.font.size = Pt(rng.choice([12, 14, 18, 24]))
+    path = out_dir / "deck.pptx"
+    prs.save(str(path))
+    unpacked = out_dir / "deck"
+    parts = _unzip(path, unpacked)
+    return {"path": path.name, "unpacked": unpacked.name, "slides": slides, "parts": parts}
+
+
+def generate_docx(out_dir: Path, scale: float) -> Dict[str, Any]:
+    import docx
+
+    rng = random.Random(41)
+    paragraphs = max(1, int(5000 * scale))
+    document = docx.Document()
+    for i in range(paragraphs):
+        if i % 50 == 0:
+            document.add_heading(f"Section {i // 50}", level=1)
+        document.add_paragraph(" ".join(
+            rng.choice(["contract", "party", "shall", "terms", "payment", "notice", "clause"]) for _ in range(rng.randint(8, 40))))
+        if i % 500 == 499:
+            table = document.add_table(rows=10, cols=5)
+            for row in table.rows:
+                for cell in row.cells:
+                    cell.text = str(rng.randint(0, 10 ** 6))
+    path = out_dir / "document.docx"
+    document.save(str(path))
+    unpacked = out_dir / "document"
+    parts = _unzip(path, unpacked)
+    return {"path": path.name, "unpacked": unpacked.name, "paragraphs": paragraphs, "parts": parts}
+
+
+SOURCE_SNIPPETS = [
+    'def load_{n}(cursor, user_id):\n    cursor.execute("SELECT * FROM users WHERE id = %s" % user_id)\n    return cursor.fetchall()\n',
+    'def render_{n}(request):\n    return eval(request.args.get("expr", "0"))\n',
+    'API_KEY_{n} = "sk-{key}"\n',
+    'def orders_{n}(db, customers):\n    result = []\n    for customer in customers:\n        result.append(db.query("SELECT * FROM orders WHERE customer = " + str(customer.id)))\n    return result\n',
+    'def classify_{n}(value, limit):\n    if value > limit:\n        if value % 2 == 0:\n            for i in range(value):\n                if i % 3 == 0 and i % 5 == 0:\n                    return "both"\n                elif i % 3 == 0:\n                    continue\n        else:\n            while value > limit:\n                value -= 1\n    return "none"\n',
+    'class Service{n}:\n    def __init__(self, repo):\n        self.repo = repo\n\n    def handle(self, items):\n        total = 0\n        for item in items:\n            for other in items:\n                if item == other:\n                    total += 1\n        return total\n',
+]
+
+
+def generate_source_tree(out_dir: Path, scale: float) -> Dict[str, Any]:
+    rng = random.Random(5)
+    count = max(1, int(200 * scale))
+    files = []
+    for i in range(count):
+        package = out_dir / f"pkg{i // 50}"
+        package.mkdir(parents=True, exist_ok=True)
+        path = package / f"module_{i}.py"
+        parts = ["import os\nimport subprocess\n\n"]
+        for n in range(rng.randint(20, 60)):
+            parts.append(rng.choice(SOURCE_SNIPPETS).format(n=n, key=f"{rng.getrandbits(96):024x}"))
+            parts.append("\n")
+        path.write_text("".join(parts), encoding="utf-8")
+        files.append({"path": path.relative_to(out_dir).as_posix(), "bytes": path.stat().st_size})
+    return {"files": files}
+
+
+def generate_wide_csv(out_dir: Path, scale: float) -> Dict[str, Any]:
+    rng = random.Random(27)
+    rows = max(2, int(20000 * scale))
+    columns = 200
+    path = out_dir / "wide.csv"
+    with path.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow([f"f{c}" for c in range(columns)] + ["group", "target"])
+        for _ in range(rows):
+            values = [rng.random() for _ in range(columns)]
+            target = 3 * values[0] - 2 * values[1] + values[2] + rng.gauss(0, 0.5)
+            writer.writerow([f"{v:.6f}" for v in values] + [rng.choice("ABCD"), f"{target:.6f}"])
+    return {"path": path.name, "bytes": path.stat().st_size, "rows": rows, "columns": columns + 2}
+
+
+# ---------------------------------------------------------------- operations
+# Imported lazily: they run in the worker, with the skill dir on sys.path.
+
+def data_file(manifest: Dict[str, Any], relative: str) -> str:
+    return str(Path(manifest["root"]) / relative)
+
+
+def log_analyzer_operations(manifest: Dict[str, Any]) -> List[Operation]:
+    from log_analyzer import LogAnalyzer
+    return [(lambda path=data_file(manifest, f["path"]): LogAnalyzer().analyze_file(path), f["bytes"])
+            for f in manifest["files"]]
+
+
+def memory_manager_operations(manifest: Dict[str, Any]) -> List[Operation]:
+    from memory_tool import ClaudeMemoryManager
+    path = data_file(manifest, manifest["path"])
+    manager = ClaudeMemoryManager(path)
+    operations = [(lambda: ClaudeMemoryManager(path), 1)]
+    operations += [(lambda q=q: manager.search(q), 1) for q in manifest["queries"]]
+    operations += [(lambda s=s: manager.get_section(s), 1) for s in manifest["sections"]]
+    operations.append((manager.get_statistics, 1))
+    return operations
+
+
+def pptx_inventory_operations(manifest: Dict[str, Any]) -> List[Operation]:
+    from inventory import extract_text_inventory
+    path = Path(data_file(manifest, manifest["path"]))
+    return [(lambda: extract_text_inventory(path, use_cache=False), manifest["slides"])]
+
+
+def _schema_validation_operations(manifest: Dict[str, Any], validator_name: str) -> List[Operation]:
+    import validation
+    validator_class = getattr(validation, validator_name)
+    # Measure the full check, not the on-disk baseline cache
+    validator_class.BASELINE_CACHE_DIR = None
+    unpacked = data_file(manifest, manifest["unpacked"])
+    original = data_file(manifest, manifest["path"])
+    return [(lambda: validator_class(unpacked, original).validate(), manifest["parts"])]
+
+
+def pptx_validation_operations(manifest: Dict[str, Any]) -> List[Operation]:
+    return _schema_validation_operations(manifest, "PPTXSchemaValidator")
+
+
+def docx_validation_operations(manifest: Dict[str, Any]) -> List[Operation]:
+    return _schema_validation_operations(manifest, "DOCXSchemaValidator")
+
+
+def code_review_operations(manifest: Dict[str, Any]) -> List[Operation]:
+    from engine import CodeReviewer
+    reviewer = CodeReviewer()
+    return [(lambda path=data_file(manifest, f["path"]): reviewer.review_file(path), f["bytes"])
+            for f in manifest["files"]]
+
+
+def security_audit_operations(manifest: Dict[str, Any]) -> List[Operation]:
+    from engine import SecurityAuditor
+    auditor = SecurityAuditor()
+    return [(lambda path=data_file(manifest, f["path"]): auditor.audit_file(path), f["bytes"])
+            for f in manifest["files"]]
+
+
+def explainability_operations(manifest: Dict[str, Any]) -> List[Operation]:
+    from engine import ExplainabilityAnalyzer
+    analyzer = ExplainabilityAnalyzer()
+    path = data_file(manifest, manifest["path"])
+    return [(lambda: analyzer.analyze_csv(path, "target", sensitive="group"), manifest["bytes"])]
+
+
+BENCHMARKS: Dict[str, Benchmark] = {
+    "log_analyzer": Benchmark("12-log-analyzer-G", "bytes", generate_logs, log_analyzer_operations,
+                              "LogAnalyzer.analyze_file on JSON, nginx and application logs"),
+    "memory_manager": Benchmark("34-memory-manager-G", "ops", generate_claude_md, memory_manager_operations,
+                                "ClaudeMemoryManager load, search and get_section on a large CLAUDE.md"),
+    "pptx_inventory": Benchmark("43-pptx-G/scripts", "slides", generate_pptx, pptx_inventory_operations,
+                                "inventory.extract_text_inventory on a text-heavy deck (cache off)"),
+    "pptx_validation": Benchmark("43-pptx-G/ooxml/scripts", "parts", generate_pptx, pptx_validation_operations,
+                                 "PPTXSchemaValidator.validate on the unpacked deck"),
+    "docx_validation": Benchmark("41-docx-G/ooxml/scripts", "parts", generate_docx, docx_validation_operations,
+                                 "DOCXSchemaValidator.validate on a long unpacked document"),
+    "code_review": Benchmark("05-code-review-G", "bytes", generate_source_tree, code_review_operations,
+                             "CodeReviewer.review_file over a generated Python source tree"),
+    "security_audit": Benchmark("07-security-audit-G", "bytes", generate_source_tree, security_audit_operations,
+                                "SecurityAuditor.audit_file over a generated Python source tree"),
+    "explainability": Benchmark("27-explainability-analyzer-G", "bytes", generate_wide_csv, explainability_operations,
+                                "ExplainabilityAnalyzer.analyze_csv on a wide numeric CSV"),
+}
+
+
+# ---------------------------------------------------------------- data cache
+
+def data_path(data_dir: Path, bench: Benchmark, scale: float) -> Path:
+    # Keyed by generator, so benchmarks sharing inputs generate them once
+    return data_dir / f"{bench.generate.__name__}-v{DATA_VERSION}-x{scale:g}"
+
+
+def ensure_data(data_dir: Path, bench: Benchmark, scale: float) -> Dict[str, Any]:
+    target = data_path(data_dir, bench, scale)
+    manifest_path = target / "manifest.json"
+    if manifest_path.exists():
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        manifest["root"] = str(target)
+        return manifest
+
+    # Generate next to the target and rename, so an interrupted run never
+    # leaves a half-written data set behind a manifest
+    data_dir.mkdir(parents=True, exist_ok=True)
+    scratch = Path(tempfile.mkdtemp(prefix=f".{target.name}-", dir=data_dir))
+    try:
+        manifest = bench.generate(scratch, scale)
+        (scratch / "manifest.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+        shutil.rmtree(target, ignore_errors=True)
+        os.replace(scratch, target)
+    except BaseException:
+        shutil.rmtree(scratch, ignore_errors=True)
+        raise
+    manifest["root"] = str(target)
+    return manifest
+
+
+# ---------------------------------------------------------------- measurement
+
+def peak_rss_bytes() -> Optional[int]:
+    # Peak resident set size of this process or its largest child (worker pools)
+    try:
+        import resource
+    except ImportError:
+        resource = None
+    if resource is not None:
+        peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                   resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+        return peak if sys.platform == "darwin" else peak * 1024
+    if os.name == "nt":
+        import ctypes
+        from ctypes import wintypes
+
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                        ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                        ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                        ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        handle = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+            return counters.PeakWorkingSetSize
+    return None
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    # Linear interpolation between closest ranks
+    if not sorted_values:
+        return 0.0
+    rank = (len(sorted_values) - 1) * p / 100
+    low = int(rank)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+
+def run_worker(name: str, data_dir: Path, scale: float, repeat: int, warmup: int) -> Dict[str, Any]:
+    bench = BENCHMARKS[name]
+    manifest = ensure_data(data_dir, bench, scale)
+    sys.path.insert(0, str(REPO_ROOT / bench.skill_dir))
+
+    latencies = []
+    units = 0
+    # Engines print progress; keep it out of the measurement output
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        operations = bench.operations(manifest)
+        for iteration in range(warmup + repeat):
+            for operation, op_units in operations:
+                started = time.perf_counter()
+                operation()
+                elapsed = time.perf_counter() - started
+                if iteration >= warmup:
+                    latencies.append(elapsed)
+                    units += op_units
+
+    seconds = sum(latencies)
+    latencies.sort()
+    rss = peak_rss_bytes()
+    return {
+        "unit": bench.unit,
+        "units": units,
+        "ops": len(latencies),
+        "seconds": round(seconds, 6),
+        "throughput": units / seconds if seconds else None,
+        "latency_ms": {
+            "mean": round(seconds / len(latencies) * 1000, 3) if latencies else None,
+            "p50": round(percentile(latencies, 50) * 1000, 3),
+            "p90": round(percentile(latencies, 90) * 1000, 3),
+            "p99": round(percentile(latencies, 99) * 1000, 3),
+            "max": round(latencies[-1] * 1000, 3) if latencies else None,
+        },
+        "peak_rss_mb": round(rss / (1024 * 1024), 1) if rss is not None else None,
+    }
+
+
+def run_benchmark(name: str, data_dir: Path, scale: float, repeat: int, warmup: int, timeout: float) -> Dict[str, Any]:
+    ensure_data(data_dir, BENCHMARKS[name], scale)
+
+    # Fresh HOME so engines that keep state there (e.g. ~/.claude/backups)
+    # don't touch the real one
+    home = data_dir / "home"
+    home.mkdir(parents=True, exist_ok=True)
+    env = dict(os.environ, HOME=str(home), USERPROFILE=str(home))
+
+    fd, result_path = tempfile.mkstemp(prefix="bench-", suffix=".json")
+    os.close(fd)
+    command = [sys.executable, str(Path(__file__).resolve()), "--worker", name,
+               "--data-dir", str(data_dir), "--scale", str(scale), "--repeat", str(repeat),
+               "--warmup", str(warmup), "--result-file", result_path]
+    try:
+        proc = subprocess.run(command, capture_output=True, text=True, encoding="utf-8",
+                              errors="replace", env=env, timeout=timeout)
+        if proc.returncode != 0:
+            return {"error": (proc.stderr or proc.stdout).strip().splitlines()[-1:] or ["worker failed"]}
+        return json.loads(Path(result_path).read_text(encoding="utf-8"))
+    except subprocess.TimeoutExpired:
+        return {"error": [f"timeout after {timeout}s"]}
+    finally:
+        os.unlink(result_path)
+
+
+# ---------------------------------------------------------------- regressions
+
+def find_regressions(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[Dict[str, Any]]:
+    # Lower throughput, or higher p90 latency or peak RSS, by more than
+    # `threshold` (a fraction) compared with the baseline run
+    regressions = []
+    for name, result in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if not base or "error" in base or "error" in result:
+            continue
+        checks = [
+            ("throughput", base.get("throughput"), result.get("throughput"), -1),
+            ("latency_p90_ms", base["latency_ms"].get("p90"), result["latency_ms"].get("p90"), 1),
+            ("peak_rss_mb", base.get("peak_rss_mb"), result.get("peak_rss_mb"), 1),
+        ]
+        for metric, old, new, worse in checks:
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if change * worse > threshold:
+                regressions.append({
+                    "benchmark": name,
+                    "metric": metric,
+                    "baseline": old,
+                    "current": new,
+                    "change_pct": round(change * 100, 1),
+                })
+    return regressions
+
+
+def format_throughput(result: Dict[str, Any]) -> str:
+    value = result.get("throughput")
+    if value is None:
+        return "-"
+    if result["unit"] == "bytes":
+        return f"{value / (1024 * 1024):.1f} MB/s"
+    return f"{value:.1f} {result['unit']}/s"
+
+
+def print_table(results: Dict[str, Dict[str, Any]]) -> None:
+    print(f"{'benchmark':<18} {'throughput':>16} {'p50 ms':>10} {'p90 ms':>10} {'p99 ms':>10} {'peak RSS':>10}")
+    for name, result in results.items():
+        if "error" in result:
+            print(f"{name:<18} ERROR: {' '.join(result['error'])}")
+            continue
+        latency = result["latency_ms"]
+        rss = f"{result['peak_rss_mb']:.0f} MB" if result.get("peak_rss_mb") is not None else "-"
+        print(f"{name:<18} {format_throughput(result):>16} {latency['p50']:>10.1f} {latency['p90']:>10.1f} "
+              f"{latency['p99']:>10.1f} {rss:>10}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark skill engines on synthetic data")
+    parser.add_argument("--list", action="store_true", help="list benchmarks and exit")
+    parser.add_argument("--only", default="", help="comma-separated benchmarks to run (default: all)")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="data size multiplier (1 = 64 MB of logs, 200 source files, 100 slides, ...)")
+    parser.add_argument("--repeat", type=int, default=3, help="measured passes over each benchmark's operations")
+    parser.add_argument("--warmup", type=int, default=1, help="unmeasured passes before measuring")
+    parser.add_argument("--data-dir", default=str(DEFAULT_DATA_DIR), help="where generated data is kept between runs")
+    parser.add_argument("--output", default=str(DEFAULT_OUTPUT), help="results JSON to write")
+    parser.add_argument("--baseline", default="", help="previous results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="relative change that counts as a regression (default: 0.10)")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT_SEC, help="seconds per benchmark")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--result-file", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        result = run_worker(args.worker, Path(args.data_dir), args.scale, args.repeat, args.warmup)
+        Path(args.result_file).write_text(json.dumps(result), encoding="utf-8")
+        return 0
+
+    if args.list:
+        for name, bench in BENCHMARKS.items():
+            print(f"{name:<18} {bench.description}")
+        return 0
+
+    names = [n.strip() for n in args.only.split(",") if n.strip()] or list(BENCHMARKS)
+    unknown = [n for n in names if n not in BENCHMARKS]
+    if unknown:
+        raise SystemExit(f"Unknown benchmark(s): {', '.join(unknown)} (see --list)")
+
+    data_dir = Path(args.data_dir)
+    results: Dict[str, Dict[str, Any]] = {}
+    for name in names:
+        print(f"Running {name}...", flush=True)
+        results[name] = run_benchmark(name, data_dir, args.scale, args.repeat, args.warmup, args.timeout)
+
+    payload: Dict[str, Any] = {
+        "version": RESULTS_VERSION,
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "scale": args.scale,
+        "repeat": args.repeat,
+        "warmup": args.warmup,
+        "results": results,
+    }
+    print()
+    print_table(results)
+
+    exit_code = 1 if any("error" in r for r in results.values()) else 0
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        if baseline.get("scale") != args.scale:
+            print(f"\nWarning: baseline was run at --scale {baseline.get('scale')}, this run at {args.scale}")
+        regressions = find_regressions(payload, baseline, args.threshold)
+        payload["baseline"] = args.baseline
+        payload["regressions"] = regressions
+        print()
+        if regressions:
+            print(f"Regressions against {args.baseline} (threshold {args.threshold:.0%}):")
+            for r in regressions:
+                print(f"- {r['benchmark']} {r['metric']}: {r['baseline']:.4g} -> {r['current']:.4g} ({r['change_pct']:+.1f}%)")
+            exit_code = 1
+        else:
+            print(f"No regressions against {args.baseline} (threshold {args.threshold:.0%})")
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"Wrote benchmark results: {output}")
+    return exit_code
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,10 +2,12 @@ import argparse
 import json
 import os
 import re
-import subprocess
+import shutil
 import time
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
+
+from skill_test_runner import ResultCache, cache_key, isolated_env, run_command, run_parallel
 
 BANNED_MARKERS = [
     "fallback",
@@ -18,6 +20,17 @@ BANNED_MARKERS = [
     "placeholder",
 ]
 
+DEFAULT_TIMEOUT_SEC = 600
+
+# Relative paths in a command that point into a sibling skill
+# (..\05-code-review-G\handler.py) or the shared generated inputs
+# (..\reports\skills-prod-real\_inputs\deps.txt). Output paths under
+# reports are left out, since the command itself writes them.
+COMMAND_INPUT_RE = re.compile(
+    r"\.\.[\\/]((?:\d{2}-[^\\/\s\"'&|<>]+|reports[\\/][^\\/\s\"'&|<>]+[\\/]_inputs)"
+    r"(?:[\\/][^\s\"'&|<>]*)?)"
+)
+
 
 def load_matrix(path: Path) -> List[Dict[str, Any]]:
     with path.open("r", encoding="utf-8-sig") as f:
@@ -54,7 +67,18 @@ def contains_banned_markers(text: str) -> List[str]:
     return hits
 
 
-def run_entry(entry: Dict[str, Any], base_dir: Path, out_dir: Path) -> Dict[str, Any]:
+def command_inputs(command: str, run_dir: Path) -> List[Path]:
+    # Files and directories outside run_dir that the command reads, in order.
+    paths: List[Path] = []
+    for match in COMMAND_INPUT_RE.finditer(command):
+        path = run_dir.parent / match.group(1).replace("\\", "/").rstrip("/")
+        if path not in paths:
+            paths.append(path)
+    return paths
+
+
+def run_entry(entry: Dict[str, Any], base_dir: Path, out_dir: Path,
+              cache: Optional[ResultCache] = None, default_timeout: float = DEFAULT_TIMEOUT_SEC) -> Dict[str, Any]:
     name = entry.get("name", "<unnamed>")
     command = entry.get("command")
     cwd = entry.get("cwd")
@@ -62,6 +86,8 @@ def run_entry(entry: Dict[str, Any], base_dir: Path, out_dir: Path) -> Dict[str,
     must_contain = entry.get("must_contain", []) or []
     min_output_lines = int(entry.get("min_output_lines", 5))
     min_output_chars = int(entry.get("min_output_chars", 200))
+    timeout_sec = float(entry.get("timeout_sec", default_timeout))
+    cache = cache or ResultCache(None)
 
     env_from_file = load_env_file(base_dir / ".env")
     merged_env = os.environ.copy()
@@ -93,26 +119,29 @@ def run_entry(entry: Dict[str, Any], base_dir: Path, out_dir: Path) -> Dict[str,
         result["reason"] = "missing_command"
         return result
 
+    # The cache key covers the skill dir (cwd), the sibling-skill and shared
+    # input paths named in the command, any extra "cache_inputs" paths the
+    # command reads, and every setting of the entry.
+    run_dir = Path(cwd) if cwd else base_dir
+    cache_inputs = [run_dir] + command_inputs(command, run_dir)
+    cache_inputs += [run_dir / p for p in entry.get("cache_inputs", []) or []]
+    config = {k: v for k, v in entry.items() if k != "name"}
+    config["timeout_sec"] = timeout_sec
+    cached = cache.get(cache_key(command, cache_inputs, config))
+    if cached:
+        cached["cached"] = True
+        return cached
+
     entry_dir = out_dir / name
     ensure_dir(entry_dir)
     log_path = entry_dir / "stdout.log"
+    shutil.rmtree(entry_dir / "tmp", ignore_errors=True)
+    env = isolated_env(merged_env, entry_dir)
 
-    start = time.time()
-    env = merged_env
-
-    proc = subprocess.run(
-        command,
-        shell=True,
-        cwd=str(Path(cwd)) if cwd else str(base_dir),
-        capture_output=True,
-        text=True,
-        encoding="utf-8",
-        errors="replace",
-        env=env,
-    )
-    duration = time.time() - start
-    stdout = proc.stdout or ""
-    stderr = proc.stderr or ""
+    proc = run_command(command, run_dir, timeout_sec, env)
+    duration = proc.duration_sec
+    stdout = proc.stdout
+    stderr = proc.stderr
     combined = stdout + ("\n" if stdout and stderr else "") + stderr
 
     result["exit_code"] = proc.returncode
@@ -128,6 +157,11 @@ def run_entry(entry: Dict[str, Any], base_dir: Path, out_dir: Path) -> Dict[str,
     missing_required = [m for m in must_contain if m not in combined]
     result["missing_markers"] = missing_required
 
+    if proc.timed_out:
+        result["status"] = "fail"
+        result["reason"] = "timeout"
+        return result
+
     if proc.returncode != 0:
         result["status"] = "fail"
         result["reason"] = "nonzero_exit"
@@ -149,6 +183,7 @@ def run_entry(entry: Dict[str, Any], base_dir: Path, out_dir: Path) -> Dict[str,
         return result
 
     result["status"] = "pass"
+    cache.put(cache_key(command, cache_inputs, config), result)
     return result
 
 
@@ -181,6 +216,11 @@ def write_summary(results: List[Dict[str, Any]], out_path: Path) -> None:
             extra = f" (missing env: {', '.join(missing_env)})" if missing_env else ""
             lines.append(f"- {r.get('name')}: {reason}{extra}")
     lines.append("")
+    lines.append("## Wall Time")
+    for r in sorted(results, key=lambda r: r.get("duration_sec") or 0, reverse=True):
+        cached = " (cached)" if r.get("cached") else ""
+        lines.append(f"- {r.get('name')}: {r.get('duration_sec') or 0:.1f}s{cached}")
+    lines.append("")
 
     out_path.write_text("\n".join(lines), encoding="utf-8")
 
@@ -195,6 +235,11 @@ def main() -> int:
     parser.add_argument("--append", action="store_true")
     parser.add_argument("--summary", action="store_true")
     parser.add_argument("--results", default="")
+    parser.add_argument("--jobs", type=int, default=1, help="entries to run in parallel")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT_SEC,
+                        help="seconds per entry unless the entry sets timeout_sec")
+    parser.add_argument("--cache", default="", help="result cache file (default: <out-dir>/result-cache.json)")
+    parser.add_argument("--no-cache", action="store_true", help="re-run every entry")
     args = parser.parse_args()
 
     if args.summary:
@@ -219,9 +264,14 @@ def main() -> int:
         end = start + args.count if args.count else None
         matrix = matrix[start:end]
 
-    results: List[Dict[str, Any]] = []
-    for entry in matrix:
-        results.append(run_entry(entry, base_dir, out_dir))
+    cache_path = None if args.no_cache else Path(args.cache) if args.cache else out_dir / "result-cache.json"
+    cache = ResultCache(cache_path)
+    started = time.monotonic()
+    results: List[Dict[str, Any]] = run_parallel(
+        matrix, lambda entry: run_entry(entry, base_dir, out_dir, cache, args.timeout), args.jobs
+    )
+    cache.save()
+    print(f"Ran {len(results)} entries in {time.monotonic() - started:.1f}s with {args.jobs} job(s)")
 
     results_path = out_dir / "results.json"
     if args.append and results_path.exists():
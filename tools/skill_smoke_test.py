@@ -3,12 +3,21 @@ import json
 import os
 import re
 import shlex
-import subprocess
+import shutil
 import time
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 
+from skill_test_runner import (
+    FINGERPRINT_IGNORED_DIRS,
+    ResultCache,
+    cache_key,
+    isolated_env,
+    run_command,
+    run_parallel,
+)
+
 ROOT = Path(r"C:\Users\bigbao\.codex\skills")
 CLAUDE_ROOT = Path(r"C:\Users\bigbao\.claude\skills")
 
@@ -273,127 +282,149 @@ def dry_run(matrix_path: Path, out_dir: Path) -> dict:
     return payload
 
 
-def run_matrix(matrix_path: Path, out_dir: Path) -> dict:
-    matrix = load_json(matrix_path)
-    ensure_dir(out_dir)
-    logs_dir = out_dir / "logs"
-    ensure_dir(logs_dir)
+def run_skill(entry: dict, logs_dir: Path, work_root: Path, cache: ResultCache, isolate: bool = False) -> dict:
+    name = entry.get("name") or "unknown"
+    codex_path = Path(entry.get("codex_path", ""))
+    claude_path = Path(entry.get("claude_path", ""))
+    runtime_dir = Path(entry.get("runtime_dir", "")) if entry.get("runtime_dir") else claude_path
+    command = entry.get("command")
+    manual_required = entry.get("manual_required", False)
+    timeout_sec = int(entry.get("timeout_sec", DEFAULT_TIMEOUT_SEC))
 
-    results = []
+    issues = []
+    warnings = []
+    front_ok, front_issues = validate_front_matter(codex_path)
+    issues.extend(front_issues)
+    missing_refs = validate_refs(codex_path)
+    if missing_refs:
+        warnings.append("missing referenced files")
+    if not claude_path.exists():
+        issues.append("missing claude skill dir")
+
+    if manual_required or not command:
+        return {
+            "name": name,
+            "status": "blocked",
+            "command": command,
+            "runtime_dir": str(runtime_dir),
+            "warnings": warnings,
+            "issues": issues + ["manual_required"],
+            "exit_code": None,
+            "stdout_path": None,
+            "stderr_path": None,
+            "duration_ms": 0,
+        }
 
-    for entry in matrix.get("skills", []):
-        name = entry.get("name") or "unknown"
-        codex_path = Path(entry.get("codex_path", ""))
-        claude_path = Path(entry.get("claude_path", ""))
-        runtime_dir = Path(entry.get("runtime_dir", "")) if entry.get("runtime_dir") else claude_path
-        command = entry.get("command")
-        manual_required = entry.get("manual_required", False)
-        timeout_sec = int(entry.get("timeout_sec", DEFAULT_TIMEOUT_SEC))
+    if not runtime_dir.exists():
+        return {
+            "name": name,
+            "status": "fail",
+            "command": command,
+            "runtime_dir": str(runtime_dir),
+            "warnings": warnings,
+            "issues": issues + ["runtime dir missing"],
+            "exit_code": None,
+            "stdout_path": None,
+            "stderr_path": None,
+            "duration_ms": 0,
+        }
 
-        issues = []
-        warnings = []
-        front_ok, front_issues = validate_front_matter(codex_path)
-        issues.extend(front_issues)
-        missing_refs = validate_refs(codex_path)
-        if missing_refs:
-            warnings.append("missing referenced files")
-        if not claude_path.exists():
-            issues.append("missing claude skill dir")
+    # Skip skills whose directory and command are unchanged since a passing run.
+    config = {"timeout_sec": timeout_sec, "isolate": isolate}
+    cached = cache.get(cache_key(command, [runtime_dir], config))
+    if cached:
+        cached.update({"warnings": warnings, "issues": issues, "cached": True})
+        return cached
+
+    safe = safe_name(name)
+    stdout_path = logs_dir / f"{safe}.stdout.txt"
+    stderr_path = logs_dir / f"{safe}.stderr.txt"
+
+    # Fresh per-skill work dir: temp files always go there, and with
+    # `isolate` the command runs in a copy of the runtime dir as well.
+    work_dir = work_root / safe
+    shutil.rmtree(work_dir, ignore_errors=True)
+    ensure_dir(work_dir)
+    run_dir = runtime_dir
+    if isolate:
+        run_dir = work_dir / "runtime"
+        shutil.copytree(runtime_dir, run_dir, ignore=shutil.ignore_patterns(*FINGERPRINT_IGNORED_DIRS))
+    env = isolated_env(None, work_dir)
+
+    before_files = set(p.name for p in run_dir.glob("*"))
+    proc = run_command(command, run_dir, timeout_sec, env)
+    duration_ms = int(proc.duration_sec * 1000)
+    if proc.timed_out:
+        return {
+            "name": name,
+            "status": "fail",
+            "command": command,
+            "runtime_dir": str(runtime_dir),
+            "warnings": warnings,
+            "issues": issues + [f"timeout after {timeout_sec}s"],
+            "exit_code": None,
+            "stdout_path": None,
+            "stderr_path": None,
+            "duration_ms": duration_ms,
+        }
 
-        if manual_required or not command:
-            results.append({
-                "name": name,
-                "status": "blocked",
-                "command": command,
-                "runtime_dir": str(runtime_dir),
-                "warnings": warnings,
-                "issues": issues + ["manual_required"],
-                "exit_code": None,
-                "stdout_path": None,
-                "stderr_path": None,
-                "duration_ms": 0,
-            })
-            continue
+    stdout = proc.stdout
+    stderr = proc.stderr
+    stdout_path.write_text(stdout, encoding="utf-8", errors="replace")
+    stderr_path.write_text(stderr, encoding="utf-8", errors="replace")
+
+    after_files = set(p.name for p in run_dir.glob("*"))
+    new_files = sorted(list(after_files - before_files))
+    output_non_empty = bool(stdout.strip() or stderr.strip() or new_files)
+
+    status = "pass" if proc.returncode == 0 and output_non_empty else "fail"
+    combined = f"{stdout}\n{stderr}".strip()
+    if status == "fail" and is_blocked_error(combined):
+        status = "blocked"
+        issues.append("blocked: missing dependency or credentials")
+
+    result = {
+        "name": name,
+        "status": status,
+        "command": command,
+        "runtime_dir": str(runtime_dir),
+        "warnings": warnings,
+        "issues": issues,
+        "exit_code": proc.returncode,
+        "stdout_path": str(stdout_path),
+        "stderr_path": str(stderr_path),
+        "duration_ms": duration_ms,
+        "new_files": new_files,
+    }
+    if status == "pass":
+        # Keyed on the directory as the command left it, which is what the
+        # next run will see if nothing else changes.
+        cache.put(cache_key(command, [runtime_dir], config), result)
+    return result
 
-        if not runtime_dir.exists():
-            results.append({
-                "name": name,
-                "status": "fail",
-                "command": command,
-                "runtime_dir": str(runtime_dir),
-                "warnings": warnings,
-                "issues": issues + ["runtime dir missing"],
-                "exit_code": None,
-                "stdout_path": None,
-                "stderr_path": None,
-                "duration_ms": 0,
-            })
-            continue
 
-        safe = safe_name(name)
-        stdout_path = logs_dir / f"{safe}.stdout.txt"
-        stderr_path = logs_dir / f"{safe}.stderr.txt"
-
-        before_files = set(p.name for p in runtime_dir.glob("*"))
-        started = time.time()
-        try:
-            proc = subprocess.run(
-                command,
-                shell=True,
-                capture_output=True,
-                text=True,
-                encoding="utf-8",
-                errors="replace",
-                cwd=runtime_dir,
-                timeout=timeout_sec,
-            )
-            duration_ms = int((time.time() - started) * 1000)
-            stdout = proc.stdout or ""
-            stderr = proc.stderr or ""
-            stdout_path.write_text(stdout, encoding="utf-8", errors="replace")
-            stderr_path.write_text(stderr, encoding="utf-8", errors="replace")
-
-            after_files = set(p.name for p in runtime_dir.glob("*"))
-            new_files = sorted(list(after_files - before_files))
-            output_non_empty = bool(stdout.strip() or stderr.strip() or new_files)
-
-            status = "pass" if proc.returncode == 0 and output_non_empty else "fail"
-            combined = f"{stdout}\n{stderr}".strip()
-            if status == "fail" and is_blocked_error(combined):
-                status = "blocked"
-                issues.append("blocked: missing dependency or credentials")
-
-            results.append({
-                "name": name,
-                "status": status,
-                "command": command,
-                "runtime_dir": str(runtime_dir),
-                "warnings": warnings,
-                "issues": issues,
-                "exit_code": proc.returncode,
-                "stdout_path": str(stdout_path),
-                "stderr_path": str(stderr_path),
-                "duration_ms": duration_ms,
-                "new_files": new_files,
-            })
-        except subprocess.TimeoutExpired:
-            duration_ms = int((time.time() - started) * 1000)
-            results.append({
-                "name": name,
-                "status": "fail",
-                "command": command,
-                "runtime_dir": str(runtime_dir),
-                "warnings": warnings,
-                "issues": issues + [f"timeout after {timeout_sec}s"],
-                "exit_code": None,
-                "stdout_path": None,
-                "stderr_path": None,
-                "duration_ms": duration_ms,
-            })
+def run_matrix(matrix_path: Path, out_dir: Path, jobs: int = 1, isolate: bool = False,
+               cache_path: Path | None = None) -> dict:
+    matrix = load_json(matrix_path)
+    ensure_dir(out_dir)
+    logs_dir = out_dir / "logs"
+    ensure_dir(logs_dir)
+    work_root = out_dir / "work"
+    cache = ResultCache(cache_path)
+
+    started = time.monotonic()
+    results = run_parallel(
+        matrix.get("skills", []),
+        lambda entry: run_skill(entry, logs_dir, work_root, cache, isolate),
+        jobs,
+    )
+    cache.save()
 
     payload = {
         "generated_at": utc_now_iso(),
         "mode": "run",
+        "jobs": jobs,
+        "wall_time_sec": round(time.monotonic() - started, 3),
         "results": results,
     }
     out_path = out_dir / "results.json"
@@ -461,6 +492,14 @@ def summarize(results_path: Path, out_path: Path) -> None:
             reason = "; ".join(r.get("issues", []) or ["blocked"])
             lines.append(f"- {r.get('name')}: {reason}")
 
+    lines.extend(["", "## Wall Time"])
+    if data.get("wall_time_sec") is not None:
+        lines.append(f"Total: {data['wall_time_sec']:.1f}s with {data.get('jobs', 1)} job(s)")
+        lines.append("")
+    for r in sorted(results, key=lambda r: r.get("duration_ms") or 0, reverse=True):
+        cached = " (cached)" if r.get("cached") else ""
+        lines.append(f"- {r.get('name')}: {(r.get('duration_ms') or 0) / 1000:.1f}s{cached}")
+
     out_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
     print(f"Wrote summary: {out_path}")
 
@@ -476,6 +515,10 @@ def main():
     ap.add_argument("--results")
     ap.add_argument("--out")
     ap.add_argument("--out-dir")
+    ap.add_argument("--jobs", type=int, default=1, help="skills to run in parallel")
+    ap.add_argument("--isolate", action="store_true", help="run each command in a copy of its runtime dir")
+    ap.add_argument("--cache", help="result cache file (default: <out-dir>/result-cache.json)")
+    ap.add_argument("--no-cache", action="store_true", help="re-run every skill")
     args = ap.parse_args()
 
     if args.inventory:
@@ -504,7 +547,9 @@ def main():
     if args.run:
         if not args.matrix or not args.out_dir:
             raise SystemExit("--run requires --matrix and --out-dir")
-        run_matrix(Path(args.matrix), Path(args.out_dir))
+        out_dir = Path(args.out_dir)
+        cache_path = None if args.no_cache else Path(args.cache) if args.cache else out_dir / "result-cache.json"
+        run_matrix(Path(args.matrix), out_dir, args.jobs, args.isolate, cache_path)
         return
 
     if args.summary:
@@ -0,0 +1,183 @@
+import hashlib
+import json
+import os
+import signal
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+# Shared by skill_smoke_test.py and skill_prod_test.py: parallel execution,
+# per-command timeouts that also stop child processes, and a cache of passing
+# results keyed by the skill directory contents plus the command.
+
+CACHE_VERSION = 1
+FINGERPRINT_IGNORED_DIRS = {"__pycache__", ".git", ".pytest_cache", ".mypy_cache", "node_modules", "reports"}
+FINGERPRINT_IGNORED_SUFFIXES = (".pyc", ".pyo")
+
+
+@dataclass
+class CommandResult:
+    returncode: Optional[int]
+    stdout: str
+    stderr: str
+    timed_out: bool
+    duration_sec: float
+
+
+def kill_process_tree(proc: subprocess.Popen) -> None:
+    if os.name == "nt":
+        subprocess.run(["taskkill", "/F", "/T", "/PID", str(proc.pid)], capture_output=True)
+    else:
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            proc.kill()
+
+
+def run_command(command: str, cwd: Path, timeout_sec: Optional[float], env: Optional[Dict[str, str]] = None) -> CommandResult:
+    # The command runs in its own process group so that a timeout also stops
+    # whatever the shell started (otherwise they keep the output pipes open).
+    if os.name == "nt":
+        group_kwargs = {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+    else:
+        group_kwargs = {"start_new_session": True}
+    started = time.monotonic()
+    proc = subprocess.Popen(
+        command,
+        shell=True,
+        cwd=str(cwd),
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+        **group_kwargs,
+    )
+    try:
+        stdout, stderr = proc.communicate(timeout=timeout_sec)
+        timed_out = False
+    except subprocess.TimeoutExpired:
+        kill_process_tree(proc)
+        stdout, stderr = proc.communicate()
+        timed_out = True
+    return CommandResult(
+        returncode=None if timed_out else proc.returncode,
+        stdout=stdout or "",
+        stderr=stderr or "",
+        timed_out=timed_out,
+        duration_sec=time.monotonic() - started,
+    )
+
+
+def isolated_env(base_env: Optional[Dict[str, str]], work_dir: Path) -> Dict[str, str]:
+    # Each entry gets its own temp dir so parallel commands don't share scratch files.
+    tmp_dir = work_dir / "tmp"
+    tmp_dir.mkdir(parents=True, exist_ok=True)
+    env = dict(os.environ if base_env is None else base_env)
+    for key in ("TMP", "TEMP", "TMPDIR"):
+        env[key] = str(tmp_dir)
+    env["SKILL_TEST_WORK_DIR"] = str(work_dir)
+    return env
+
+
+def fingerprint_path(path: Path) -> str:
+    # Hash of every file's relative path and contents under `path` (or of a
+    # single file); caches and bytecode are left out.
+    h = hashlib.sha256()
+    if path.is_file():
+        h.update(path.read_bytes())
+        return h.hexdigest()
+    if not path.exists():
+        return "missing"
+    for root, dirs, files in os.walk(path):
+        dirs[:] = sorted(d for d in dirs if d not in FINGERPRINT_IGNORED_DIRS)
+        for name in sorted(files):
+            if name.endswith(FINGERPRINT_IGNORED_SUFFIXES):
+                continue
+            file_path = Path(root) / name
+            h.update(file_path.relative_to(path).as_posix().encode("utf-8") + b"\0")
+            try:
+                with file_path.open("rb") as f:
+                    for block in iter(lambda: f.read(1 << 20), b""):
+                        h.update(block)
+            except OSError:
+                h.update(b"<unreadable>")
+            h.update(b"\0")
+    return h.hexdigest()
+
+
+def cache_key(command: str, inputs: Iterable[Path], config: Optional[Dict[str, Any]] = None) -> str:
+    payload = {
+        "command": command,
+        "config": config or {},
+        "inputs": [[str(p), fingerprint_path(p)] for p in inputs],
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    # Passing results keyed by cache_key(); stored as JSON next to the reports.
+    # A path of None disables the cache.
+
+    def __init__(self, path: Optional[Path]):
+        self.path = path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.lock = threading.Lock()
+        if path and path.exists():
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                data = {}
+            if data.get("version") == CACHE_VERSION:
+                self.entries = data.get("entries", {})
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        if not self.path:
+            return None
+        with self.lock:
+            result = self.entries.get(key)
+        return dict(result) if result else None
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        if not self.path:
+            return
+        with self.lock:
+            self.entries[key] = result
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.lock:
+            data = json.dumps({"version": CACHE_VERSION, "entries": self.entries}, ensure_ascii=False, indent=2)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=".cache-", suffix=".json")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+
+def run_parallel(items: List[Any], fn: Callable[[Any], Dict[str, Any]], jobs: int = 1) -> List[Dict[str, Any]]:
+    # Runs fn over items on `jobs` threads (the work happens in subprocesses)
+    # and returns the results in input order, printing a line as each finishes.
+    results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        futures = {executor.submit(fn, item): index for index, item in enumerate(items)}
+        for done, future in enumerate(as_completed(futures), 1):
+            result = future.result()
+            results[futures[future]] = result
+            duration = result.get("duration_sec")
+            if duration is None:
+                duration = (result.get("duration_ms") or 0) / 1000
+            cached = " (cached)" if result.get("cached") else ""
+            print(f"[{done}/{len(items)}] {result.get('name')}: {result.get('status')} in {duration:.1f}s{cached}")
+    return results
@@ -0,0 +1,117 @@
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from skill_prod_test import command_inputs, run_entry
+from skill_test_runner import ResultCache, cache_key, run_command
+
+PYTHON = subprocess.list2cmdline([sys.executable])
+# Prints the file named on the command line; enough output for the entry checks
+PRINT_FILE = f'{PYTHON} -c "import sys; print(open(sys.argv[1]).read())"'
+
+
+def make_skills(tmp_path: Path) -> Path:
+    skills = tmp_path / "skills"
+    (skills / "04-test-automation-G").mkdir(parents=True)
+    (skills / "05-code-review-G").mkdir()
+    (skills / "05-code-review-G" / "handler.py").write_text("print('v1')\n", encoding="utf-8")
+    return skills
+
+
+def make_entry(skills: Path, sep: str = "/") -> dict:
+    return {
+        "name": "04-test-automation-G",
+        "command": f"{PRINT_FILE} ..{sep}05-code-review-G{sep}handler.py",
+        "cwd": str(skills / "04-test-automation-G"),
+        "min_output_lines": 1,
+        "min_output_chars": 1,
+    }
+
+
+def test_command_inputs_finds_sibling_skills_and_shared_inputs():
+    run_dir = Path("skills") / "07-security-audit-G"
+    command = (
+        'cmd /c "mkdir ..\\reports\\skills-prod-real\\07-security-audit-G 2>nul & python handler.py '
+        "--file ..\\05-code-review-G\\handler.py --deps ..\\reports\\skills-prod-real\\_inputs\\deps.txt "
+        '--output ..\\reports\\skills-prod-real\\07-security-audit-G\\security.md"'
+    )
+    assert command_inputs(command, run_dir) == [
+        Path("skills") / "05-code-review-G" / "handler.py",
+        Path("skills") / "reports" / "skills-prod-real" / "_inputs" / "deps.txt",
+    ]
+
+
+def test_cache_key_changes_with_inputs(tmp_path):
+    source = tmp_path / "input.txt"
+    source.write_text("a", encoding="utf-8")
+    key = cache_key("cmd", [tmp_path])
+    assert cache_key("cmd", [tmp_path]) == key
+    source.write_text("b", encoding="utf-8")
+    assert cache_key("cmd", [tmp_path]) != key
+    assert cache_key("other", [tmp_path]) != cache_key("cmd", [tmp_path])
+
+
+@pytest.mark.parametrize("sep", ["/", "\\"])
+def test_run_entry_cache_hit_and_miss(tmp_path, sep):
+    if sep == "\\" and os.name != "nt":
+        pytest.skip("backslash paths only resolve on Windows")
+    skills = make_skills(tmp_path)
+    entry = make_entry(skills, sep)
+    cache = ResultCache(tmp_path / "cache.json")
+
+    first = run_entry(entry, tmp_path, tmp_path / "out", cache)
+    assert first["status"] == "pass" and not first.get("cached")
+
+    # Unchanged inputs: served from the cache, also after a save and reload
+    cache.save()
+    cache = ResultCache(tmp_path / "cache.json")
+    assert run_entry(entry, tmp_path, tmp_path / "out", cache).get("cached")
+
+    # A change in the sibling skill the command reads invalidates the entry
+    (skills / "05-code-review-G" / "handler.py").write_text("print('v2')\n", encoding="utf-8")
+    third = run_entry(entry, tmp_path, tmp_path / "out", cache)
+    assert third["status"] == "pass" and not third.get("cached")
+
+    # ...and so does a change in the entry's settings
+    entry["min_output_chars"] = 2
+    assert not run_entry(entry, tmp_path, tmp_path / "out", cache).get("cached")
+
+
+def test_failing_entry_is_not_cached(tmp_path):
+    skills = make_skills(tmp_path)
+    entry = make_entry(skills)
+    entry["must_contain"] = ["not in the output"]
+    cache = ResultCache(tmp_path / "cache.json")
+    assert run_entry(entry, tmp_path, tmp_path / "out", cache)["status"] == "fail"
+    assert run_entry(entry, tmp_path, tmp_path / "out", cache)["status"] == "fail"
+    assert cache.entries == {}
+
+
+@pytest.mark.skipif(os.name == "nt", reason="checks the POSIX process group")
+def test_timeout_kills_process_group(tmp_path):
+    # The command starts a grandchild that would outlive a plain kill of the shell
+    script = (
+        "import subprocess, sys; "
+        "p = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)']); "
+        "print(p.pid, flush=True); p.wait()"
+    )
+    command = f'{PYTHON} -c "{script}"'
+    started = time.monotonic()
+    result = run_command(command, tmp_path, timeout_sec=1)
+    assert result.timed_out and result.returncode is None
+    assert time.monotonic() - started < 30
+
+    grandchild = int(result.stdout.split()[0])
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        try:
+            os.kill(grandchild, 0)
+        except ProcessLookupError:
+            break
+        time.sleep(0.05)
+    else:
+        pytest.fail("grandchild process survived the timeout")